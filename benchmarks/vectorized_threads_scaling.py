@@ -0,0 +1,90 @@
+"""
+Strong scaling benchmark of the multi-threaded vectorized simulator.
+
+For each number of qubits, a random 3-regular MaxCut instance is simulated with
+an increasing number of threads, and the time of one expectation value
+evaluation is reported together with the speedup over the first thread count
+(a single thread by default).
+
+Example
+-------
+    python benchmarks/vectorized_threads_scaling.py --qubits 20 24 28 --threads 1 2 4 8 16 32
+"""
+import argparse
+import time
+
+import networkx as nx
+
+from openqaoa.backends import QAOAvectorizedBackendSimulator
+from openqaoa.qaoa_components import (
+    Hamiltonian,
+    QAOADescriptor,
+    create_qaoa_variational_params,
+)
+from openqaoa.utilities import X_mixer_hamiltonian
+
+
+def maxcut_descriptor(n_qubits: int, p: int, seed: int) -> QAOADescriptor:
+    graph = nx.random_regular_graph(3, n_qubits, seed=seed)
+    cost_hamiltonian = Hamiltonian.classical_hamiltonian(
+        [list(edge) for edge in graph.edges],
+        [1.0] * graph.number_of_edges(),
+        constant=0,
+    )
+    return QAOADescriptor(cost_hamiltonian, X_mixer_hamiltonian(n_qubits), p=p)
+
+
+def time_expectation(backend, variational_params, repeats: int) -> float:
+    # a first evaluation allocates the buffers and spins up the thread pool
+    backend.expectation(variational_params)
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        backend.expectation(variational_params)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--qubits", type=int, nargs="+", default=[20, 22, 24])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--p", type=int, default=2)
+    parser.add_argument("--param-type", default="extended")
+    parser.add_argument("--precision", default="double")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'qubits':>6} {'threads':>7} {'time [s]':>10} {'speedup':>8}")
+    for n_qubits in args.qubits:
+        qaoa_descriptor = maxcut_descriptor(n_qubits, args.p, args.seed)
+        variational_params = create_qaoa_variational_params(
+            qaoa_descriptor, args.param_type, "ramp"
+        )
+
+        single_thread_time = None
+        for n_threads in args.threads:
+            backend = QAOAvectorizedBackendSimulator(
+                qaoa_descriptor,
+                prepend_state=None,
+                append_state=None,
+                init_hadamard=True,
+                precision=args.precision,
+                n_threads=n_threads,
+            )
+            elapsed = time_expectation(backend, variational_params, args.repeats)
+            single_thread_time = single_thread_time or elapsed
+            print(
+                f"{n_qubits:>6} {n_threads:>7} {elapsed:>10.4f} "
+                f"{single_thread_time / elapsed:>8.2f}"
+            )
+
+            # release the wavefunction and its buffers before the next run
+            del backend
+
+
+if __name__ == "__main__":
+    main()
@@ -237,6 +237,31 @@ class Workflow(ABC):
                 'PRAGMA INITIAL_REWIRING "PARTIAL"'. If None, defaults to NAIVE
             disable_qubit_rewiring: `bool`
                 Disable automatic qubit rewiring on AWS braket backend
+            precision: `str`
+                Floating point precision of the vectorized simulator, either
+                'double' or 'single'. Defaults to 'double'
+            n_threads: `int`
+                Number of threads used by the vectorized simulator to apply
+                the gates. Defaults to 1
+            memmap_dir: `str`
+                Directory of the files of the memory-mapped vectorized
+                simulator. Defaults to the system temporary directory
+            block_qubits: `int`
+                Base-2 logarithm of the number of amplitudes processed at once
+                by the memory-mapped vectorized simulator. Defaults to 22
+            max_cone_qubits: `int`
+                Largest number of qubits of a light cone simulated by the
+                lightcone simulator. Defaults to 24
+            max_bond_dim: `int`
+                Largest bond dimension of the matrix-product state of the mps
+                simulator. Defaults to 64
+            truncation_error: `float`
+                Largest relative weight of the singular values discarded at
+                each truncation of the mps simulator. Defaults to 1e-10
+            hamming_weight: `Union[int, List[int]]`
+                Hamming weight of the states simulated by the subspace
+                simulator, starting from the corresponding Dicke state.
+                Defaults to the weights of the prepend state
         """
 
         for key, value in kwargs.items():
@@ -266,10 +291,10 @@ class Workflow(ABC):
                 Maximum number of function evaluations.
             jac: str
                 Method to compute the gradient vector. Choose from:
-                    - ['finite_difference', 'param_shift', 'stoch_param_shift', 'grad_spsa']
+                    - ['finite_difference', 'param_shift', 'stoch_param_shift', 'grad_spsa', 'adjoint', 'analytical']
             hess: str
                 Method to compute the hessian. Choose from:
-                    - ['finite_difference', 'param_shift', 'stoch_param_shift', 'grad_spsa']
+                    - ['finite_difference', 'analytical']
             constraints: scipy.optimize.LinearConstraints, scipy.optimize.NonlinearConstraints
                 Scipy-based constraints on parameters of optimization. Will be available soon
             bounds: scipy.optimize.Bounds
@@ -302,6 +327,20 @@ class Workflow(ABC):
             save_intermediate: bool
                 If True, the intermediate parameters of the optimization and job ids,
                 if available, are saved throughout the run. This is set to False by default.
+            cache_evaluations: bool
+                If True, the evaluations of the cost function are kept in a cache shared
+                with the gradient and hessian, so that the points visited more than once
+                are not re-evaluated. This is set to False by default.
+            cache_options: dict
+                Dictionary of options of the evaluation cache.
+                    max_size : int
+                        Maximum number of evaluations kept.
+                    resolution : float
+                        Spacing of the grid on which the parameters are quantised.
+            n_workers: int
+                Number of worker processes evaluating the candidates of the population
+                optimizers ('differential_evolution', 'cma_es'), -1 to use all the
+                available cores. By default, they are evaluated in the main process.
         """
         for key, value in kwargs.items():
             if hasattr(self.classical_optimizer, key):
@@ -7,19 +7,40 @@ import matplotlib.pyplot as plt
 
 from ...qaoa_components import Hamiltonian
 from ...utilities import (
-    qaoa_probabilities,
+    StateProbabilities,
+    FoldedStatevector,
+    SubspaceVector,
+    CompiledHamiltonian,
+    bitstrings_from_indices,
+    bits_from_bitstrings,
+    HamiltonianSpectrum,
     bitstring_energy,
     convert2serialize,
     delete_keys_from_dict,
 )
 from ...backends.basebackend import QAOABaseBackend, QAOABaseBackendStatevector
 from ...backends.qaoa_analytical_sim import QAOABackendAnalyticalSimulator
+from ...backends.qaoa_lightcone import QAOABackendLightconeSimulator
 
 
 def most_probable_bitstring(cost_hamiltonian, measurement_outcomes):
     """
     Computing the most probable bitstring
     """
+    if isinstance(measurement_outcomes, StateProbabilities):
+        probabilities = measurement_outcomes.probabilities
+        n_likeliest_states = np.count_nonzero(probabilities == np.max(probabilities))
+        solutions_bitstrings = list(
+            measurement_outcomes.top_k(n_likeliest_states).keys()
+        )
+
+        return {
+            "solutions_bitstrings": solutions_bitstrings,
+            "bitstring_energy": bitstring_energy(
+                cost_hamiltonian, solutions_bitstrings[0]
+            ),
+        }
+
     mea_out = list(measurement_outcomes.values())
     index_likliest_states = np.argwhere(mea_out == np.max(mea_out))
     # degeneracy = len(index_likliest_states)
@@ -33,6 +54,18 @@ def most_probable_bitstring(cost_hamiltonian, measurement_outcomes):
     }
 
 
+def _full_statevector(measurement_outcomes):
+    """
+    Returns the full statevector of measurement outcomes logged in a compact
+    form, i.e. in the folded basis of the spin-flip symmetry or on the basis
+    states of a subspace, and any other measurement outcomes as is.
+    """
+    if isinstance(measurement_outcomes, (FoldedStatevector, SubspaceVector)):
+        return np.asarray(measurement_outcomes)
+
+    return measurement_outcomes
+
+
 class QAOAResult:
     """
     A class to handle the results of QAOA workflows
@@ -72,7 +105,10 @@ class QAOAResult:
         self.intermediate = {
             "angles": np.array(log.param_log.history).tolist(),
             "cost": log.cost.history,
-            "measurement_outcomes": log.measurement_outcomes.history,
+            "measurement_outcomes": [
+                _full_statevector(outcomes)
+                for outcomes in log.measurement_outcomes.history
+            ],
             "job_id": log.job_ids.history,
         }
 
@@ -81,9 +117,11 @@ class QAOAResult:
             if log.param_log.best != []
             else [],
             "cost": log.cost.best[0] if log.cost.best != [] else None,
-            "measurement_outcomes": log.measurement_outcomes.best[0]
-            if log.measurement_outcomes.best != []
-            else {},
+            "measurement_outcomes": (
+                _full_statevector(log.measurement_outcomes.best[0])
+                if log.measurement_outcomes.best != []
+                else {}
+            ),
             "job_id": log.job_ids.best[0] if len(log.job_ids.best) != 0 else [],
             "eval_number": log.eval_number.best[0]
             if len(log.eval_number.best) != 0
@@ -92,9 +130,10 @@ class QAOAResult:
 
         self.most_probable_states = (
             most_probable_bitstring(
-                cost_hamiltonian, self.get_counts(log.measurement_outcomes.best[0])
+                cost_hamiltonian, self.get_counts(self.optimized["measurement_outcomes"])
             )
-            if type_backend != QAOABackendAnalyticalSimulator
+            if type_backend
+            not in [QAOABackendAnalyticalSimulator, QAOABackendLightconeSimulator]
             and log.measurement_outcomes.best != []
             else []
         )
@@ -158,7 +197,7 @@ class QAOAResult:
 
         complex_to_str = (
             lambda x: str(x)
-            if isinstance(x, np.complex128) or isinstance(x, complex)
+            if isinstance(x, np.complexfloating) or isinstance(x, complex)
             else x
         )
 
@@ -304,13 +343,16 @@ class QAOAResult:
 
         Returns
         -------
-        `dict`
-            The count dictionary obtained either throught the statevector or
-            the actual measurement counts.
+        `Union[StateProbabilities, dict]`
+            The probabilities of the basis states obtained from the statevector,
+            as a ``StateProbabilities`` which behaves as a read-only dictionary,
+            or the actual measurement counts.
         """
 
         if isinstance(measurement_outcomes, type(np.array([]))):
-            measurement_outcomes = qaoa_probabilities(measurement_outcomes)
+            measurement_outcomes = StateProbabilities.from_statevector(
+                measurement_outcomes
+            )
 
         return measurement_outcomes
 
@@ -394,16 +436,8 @@ class QAOAResult:
             # needed to be able to divide the tuple by 'norm'
             norm = np.float64(sum(outcome.values()))
 
-        # sorting dictionary. adding a callback function to sort by values instead of keys
-        # setting reverse = True to be able to obtain the states with highest counts
-        outcome_list = sorted(outcome.items(), key=lambda item: item[1], reverse=True)
-        states, counts = zip(*outcome_list)
-
-        # normalizing to obtain probabilities
-        probs = counts / norm
-
         # total number of states / number of states with != 0 counts for shot simulators
-        total = len(states)
+        total = len(outcome)
 
         # number of states that fit without distortion in figure
         upper_bound = 40
@@ -428,21 +462,36 @@ class QAOAResult:
             else:
                 n_states_to_keep = total
 
+        # only the states kept are sorted by decreasing probability
+        if isinstance(outcome, StateProbabilities):
+            top_outcome = outcome.top_k(n_states_to_keep)
+            outcome_total = np.sum(outcome.probabilities)
+        else:
+            # sorting dictionary. adding a callback function to sort by values instead of keys
+            # setting reverse = True to be able to obtain the states with highest counts
+            outcome_list = sorted(
+                outcome.items(), key=lambda item: item[1], reverse=True
+            )
+            top_outcome = dict(outcome_list[:n_states_to_keep])
+            outcome_total = sum(outcome.values())
+        states = list(top_outcome.keys())
+
+        # normalizing to obtain probabilities
+        probs = np.array(list(top_outcome.values()), dtype=float) / norm
+
         # formatting labels
-        labels = [
-            r"$\left|{}\right>$".format(state) for state in states[:n_states_to_keep]
-        ]
+        labels = [r"$\left|{}\right>$".format(state) for state in states]
         labels.append("rest")
 
         # represent the bar with the addition of all the remaining probabilities
-        rest = sum(probs[n_states_to_keep:])
+        rest = outcome_total / norm - np.sum(probs)
 
         if ax is None:
             fig, ax = plt.subplots(figsize=figsize)
 
         colors = [color for _ in range(n_states_to_keep)] + ["xkcd:magenta"]
 
-        ax.bar(labels, np.append(probs[:n_states_to_keep], rest), color=colors)
+        ax.bar(labels, np.append(probs, rest), color=colors)
         ax.set_xlabel("Eigen-State")
         ax.set_ylabel("Probability")
         ax.set_title(label)
@@ -602,15 +651,14 @@ class QAOAResult:
             measurement_outcomes = self.get_counts(
                 self.optimized["measurement_outcomes"]
             )
-            solution_bitstring = list(measurement_outcomes.keys())
+            return self._lowest_cost_basis_states(measurement_outcomes, n_bitstrings)
         else:
             raise TypeError(
                 f"The measurement outcome {type(self.optimized['measurement_outcomes'])} is not valid."
             )
-        energies = [
-            bitstring_energy(self.cost_hamiltonian, bitstring)
-            for bitstring in solution_bitstring
-        ]
+        energies = CompiledHamiltonian(self.cost_hamiltonian).energies(
+            bits_from_bitstrings(solution_bitstring)
+        )
         args_sorted = np.argsort(energies)
         if n_bitstrings > len(energies):
             n_bitstrings = len(energies)
@@ -629,3 +677,27 @@ class QAOAResult:
             ],
         }
         return best_results
+
+    def _lowest_cost_basis_states(
+        self, probabilities: StateProbabilities, n_bitstrings: int
+    ) -> dict:
+        """
+        Finds the basis states with the lowest energies, together with their
+        probabilities, scanning the spectrum of the cost Hamiltonian in chunks
+        of which only the ``n_bitstrings`` lowest states are kept.
+        """
+        energies, indices = HamiltonianSpectrum(
+            self.cost_hamiltonian, n_qubits=probabilities.n_qubits
+        ).lowest(n_bitstrings)
+
+        total_probability = np.sum(probabilities.probabilities)
+        best_results = {
+            "solutions_bitstrings": bitstrings_from_indices(
+                indices, probabilities.n_qubits
+            ).tolist(),
+            "bitstrings_energies": energies.tolist(),
+            "probabilities": (
+                probabilities.probabilities[indices] / total_probability
+            ).tolist(),
+        }
+        return best_results
@@ -5,7 +5,7 @@ import numpy as np
 from .qaoa_result import QAOAResult
 from ..workflow_properties import CircuitProperties
 from ..baseworkflow import Workflow, check_compiled
-from ...backends import QAOABackendAnalyticalSimulator
+from ...backends import QAOABackendAnalyticalSimulator, QAOABackendLightconeSimulator
 from ...backends.devices_core import DeviceLocal
 from ...backends.qaoa_backend import get_qaoa_backend
 from ...problems import QUBO
@@ -400,8 +400,11 @@ class QAOA(Workflow):
             "uncertainty": None,
             "measurement_results": None,
         }
-        # if the backend is the analytical simulator, we just return the expectation value of the cost Hamiltonian
-        if isinstance(self.backend, QAOABackendAnalyticalSimulator):
+        # if the backend is the analytical or lightcone simulator, we just return the expectation value of the cost Hamiltonian
+        if isinstance(
+            self.backend,
+            (QAOABackendAnalyticalSimulator, QAOABackendLightconeSimulator),
+        ):
             output_dict.update({"cost": self.backend.expectation(params_obj)[0]})
 
         else:
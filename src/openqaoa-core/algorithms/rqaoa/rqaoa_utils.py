@@ -1,7 +1,7 @@
 import numpy as np
 
 from ...qaoa_components import Hamiltonian
-from ...utilities import bitstring_energy
+from ...utilities import bitstring_energy, CompiledHamiltonian, bits_from_bitstrings
 from ...problems import QUBO
 
 
@@ -595,10 +595,13 @@ def final_solution(
                         j, prev_corr ^ 1
                     )
 
-        # Store solution states and their energy
-        full_solution.update(
-            {"".join(str(i) for i in state): bitstring_energy(hamiltonian, state)}
-        )
+        # Store solution states, their energies are computed all together below
+        full_solution.update({"".join(str(i) for i in state): None})
+
+    # Compute the energies of the solution states in one batch
+    states = list(full_solution.keys())
+    energies = CompiledHamiltonian(hamiltonian).energies(bits_from_bitstrings(states))
+    full_solution = dict(zip(states, energies.tolist()))
 
     return full_solution
 
@@ -2,7 +2,11 @@ from typing import List, Optional, Union
 import numpy as np
 from scipy.optimize._minimize import MINIMIZE_METHODS
 
-from ..optimizers.training_vqa import CustomScipyGradientOptimizer, PennyLaneOptimizer
+from ..optimizers.training_vqa import (
+    CustomScipyGradientOptimizer,
+    PennyLaneOptimizer,
+    PopulationOptimizer,
+)
 from ..backends.devices_core import SUPPORTED_LOCAL_SIMULATORS
 from ..backends.basebackend import QuantumCircuitBase
 from ..utilities import convert2serialize
@@ -24,6 +28,7 @@ ALLOWED_MINIMIZATION_METHODS = (
     MINIMIZE_METHODS
     + CustomScipyGradientOptimizer.CUSTOM_GRADIENT_OPTIMIZERS
     + PennyLaneOptimizer.PENNYLANE_OPTIMIZERS
+    + PopulationOptimizer.POPULATION_OPTIMIZERS
 )
 
 ALLOWED_QVM_DEVICES = ["Aspen-11", "Aspen-M-1"]
@@ -217,6 +222,27 @@ class BackendProperties(WorkflowProperties):
         Specify the rewiring strategy for compilation for Rigetti QPUs through QCS
     disable_qubit_rewiring: bool
         enable/disbale qubit rewiring when accessing QPUs via the AWS `braket`
+    precision: str
+        Floating point precision of the vectorized simulator, either 'double'
+        (complex128 wavefunction) or 'single' (complex64 wavefunction)
+    n_threads: int
+        Number of threads used by the vectorized simulator to apply the gates
+    memmap_dir: str
+        Directory of the files of the memory-mapped vectorized simulator
+    block_qubits: int
+        Base-2 logarithm of the number of amplitudes processed at once by the
+        memory-mapped vectorized simulator
+    max_cone_qubits: int
+        Largest number of qubits of a light cone simulated by the lightcone
+        simulator
+    max_bond_dim: int
+        Largest bond dimension of the matrix-product state of the mps simulator
+    truncation_error: float
+        Largest weight of the singular values discarded at each truncation of
+        the mps simulator, relative to the squared norm of the state
+    hamming_weight: Union[int, List[int]]
+        Hamming weight of the states simulated by the subspace simulator, whose
+        initial state is then the corresponding Dicke state
     """
 
     def __init__(
@@ -235,6 +261,14 @@ class BackendProperties(WorkflowProperties):
         active_reset: Optional[bool] = None,
         rewiring: Optional[str] = None,
         disable_qubit_rewiring: Optional[bool] = None,
+        precision: Optional[str] = None,
+        n_threads: Optional[int] = None,
+        memmap_dir: Optional[str] = None,
+        block_qubits: Optional[int] = None,
+        max_cone_qubits: Optional[int] = None,
+        max_bond_dim: Optional[int] = None,
+        truncation_error: Optional[float] = None,
+        hamming_weight: Optional[Union[int, List[int]]] = None,
     ):
 
         self.init_hadamard = init_hadamard
@@ -249,6 +283,14 @@ class BackendProperties(WorkflowProperties):
         self.active_reset = active_reset
         self.rewiring = rewiring
         self.disable_qubit_rewiring = disable_qubit_rewiring
+        self.precision = precision
+        self.n_threads = n_threads
+        self.memmap_dir = memmap_dir
+        self.block_qubits = block_qubits
+        self.max_cone_qubits = max_cone_qubits
+        self.max_bond_dim = max_bond_dim
+        self.truncation_error = truncation_error
+        self.hamming_weight = hamming_weight
 
     # @property
     # def cvar_alpha(self):
@@ -279,10 +321,10 @@ class ClassicalOptimizer(WorkflowProperties):
         Maximum number of function evaluations.
     jac: str
         Method to compute the gradient vector. Choose from:
-            - ['finite_difference', 'param_shift', 'stoch_param_shift', 'grad_spsa']
+            - ['finite_difference', 'param_shift', 'stoch_param_shift', 'grad_spsa', 'adjoint', 'analytical']
     hess:
         Method to compute the hessian. Choose from:
-            - ['finite_difference', 'param_shift', 'stoch_param_shift', 'grad_spsa']
+            - ['finite_difference', 'analytical']
     constraints: `scipy.optimize.LinearConstraints`, `scipy.optimize.NonlinearConstraints`
         Scipy-based constraints on parameters of optimization
     bounds: `scipy.scipy.optimize.Bounds`
@@ -313,6 +355,21 @@ class ClassicalOptimizer(WorkflowProperties):
     save_intermediate: bool
         Outputs the jobids and parameters used for each circuit into
         seperate csv files. Defaults to `False`.
+    cache_evaluations: bool
+        Whether to keep the evaluations of the cost function in a cache shared
+        with the gradient and hessian, so that the points visited more than once
+        are not re-evaluated. Defaults to `False`.
+    cache_options: dict
+        Dictionary of options of the evaluation cache, defaults to ``None``.
+            max_size : int
+                Maximum number of evaluations kept. Defaults to 128.
+            resolution : float
+                Spacing of the grid on which the parameters are quantised to
+                match evaluations. Defaults to 1e-10.
+    n_workers: int
+        Number of worker processes evaluating the candidates of the population
+        optimizers ('differential_evolution', 'cma_es'), -1 to use all the
+        available cores. Defaults to `None`, evaluating them in the main process.
     """
 
     def __init__(
@@ -333,6 +390,9 @@ class ClassicalOptimizer(WorkflowProperties):
         cost_progress: bool = True,
         parameter_log: bool = True,
         save_intermediate: bool = False,
+        cache_evaluations: bool = False,
+        cache_options: dict = None,
+        n_workers: int = None,
     ):
         self.optimize = optimize
         self.method = method.lower()
@@ -351,6 +411,9 @@ class ClassicalOptimizer(WorkflowProperties):
         self.cost_progress = cost_progress
         self.parameter_log = parameter_log
         self.save_intermediate = save_intermediate
+        self.cache_evaluations = cache_evaluations
+        self.cache_options = cache_options
+        self.n_workers = n_workers
 
     # @property
     # def method(self):
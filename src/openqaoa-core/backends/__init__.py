@@ -12,9 +12,20 @@ Currently Supported:
 		Statevector Simulator
 	Vectorized:
 		Fast numpy native Statevector Simulator
+		Memory-mapped Statevector Simulator for states larger than the memory
+	Lightcone:
+		Term by term simulation of the causal cones on sparse problems
+	MPS:
+		Matrix-product state simulator for circuits with low entanglement
+	Subspace:
+		Statevector simulator restricted to fixed Hamming weights, for XY mixers
 """
 from .plugin_finder import plugin_finder_dict
 from .qaoa_vectorized import QAOAvectorizedBackendSimulator
+from .qaoa_vectorized_memmap import QAOAvectorizedMemmapBackendSimulator
 from .qaoa_analytical_sim import QAOABackendAnalyticalSimulator
+from .qaoa_lightcone import QAOABackendLightconeSimulator
+from .qaoa_mps import QAOABackendMPSSimulator
+from .qaoa_subspace import QAOABackendSubspaceSimulator
 from .devices_core import DeviceLocal
 from .qaoa_device import create_device
\ No newline at end of file
@@ -22,8 +22,29 @@ from ..qaoa_components import (
 from ..qaoa_components.variational_parameters.variational_baseparams import (
     QAOAVariationalBaseParams,
 )
-from ..utilities import qaoa_probabilities, round_value
-from .cost_function import cost_function
+from ..utilities import (
+    qaoa_probabilities,
+    round_value,
+    bitstrings_from_indices,
+    CompiledHamiltonian,
+    HamiltonianSpectrum,
+)
+from .cost_function import cost_function, cost_statistics
+
+
+def _n_shots_per_row(
+    n_shots: Optional[Union[int, List[int]]], batch_size: int
+) -> list:
+    """
+    Returns the number of shots of each parameter set of a batch, given either a
+    single value for all of them or one value per parameter set.
+    """
+    if isinstance(n_shots, (list, tuple, np.ndarray)):
+        assert (
+            len(n_shots) == batch_size
+        ), "n_shots must be a list of length equal to the number of parameter sets."
+        return list(n_shots)
+    return [n_shots] * batch_size
 
 
 class QuantumCircuitBase:
@@ -127,6 +148,8 @@ class QAOABaseBackend(VQABaseBackend):
 
         self.qaoa_descriptor = qaoa_descriptor
         self.cost_hamiltonian = qaoa_descriptor.cost_hamiltonian
+        # evaluates the energies of measured bitstrings in batches
+        self.compiled_cost_hamiltonian = CompiledHamiltonian(self.cost_hamiltonian)
         self.n_qubits = self.qaoa_descriptor.n_qubits
         self.init_hadamard = init_hadamard
         self.cvar_alpha = cvar_alpha
@@ -282,9 +305,7 @@ class QAOABaseBackend(VQABaseBackend):
             Expectation value of cost operator wrt to quantum state produced by QAOA circuit
         """
         counts = self.get_counts(params, n_shots)
-        cost = cost_function(
-            counts, self.qaoa_descriptor.cost_hamiltonian, self.cvar_alpha
-        )
+        cost = cost_function(counts, self.compiled_cost_hamiltonian, self.cvar_alpha)
         return cost
 
     @round_value
@@ -309,19 +330,98 @@ class QAOABaseBackend(VQABaseBackend):
             to quantum state produced by QAOA circuit.
         """
         counts = self.get_counts(params, n_shots)
-        cost = cost_function(
-            counts, self.qaoa_descriptor.cost_hamiltonian, self.cvar_alpha
-        )
-        cost_sq = cost_function(
-            counts,
-            self.qaoa_descriptor.cost_hamiltonian.hamiltonian_squared,
-            self.cvar_alpha,
-        )
 
-        uncertainty = np.sqrt(cost_sq - cost**2)
+        # the variance comes from the same energies as the cost, E and E^2 per outcome
+        cost, variance = cost_statistics(
+            counts, self.compiled_cost_hamiltonian, self.cvar_alpha
+        )
+        uncertainty = np.sqrt(variance)
 
         return (cost, uncertainty)
 
+    def get_counts_batch(
+        self,
+        params: QAOAVariationalBaseParams,
+        params_array: np.ndarray,
+        n_shots: Optional[Union[int, List[int]]] = None,
+    ) -> List[dict]:
+        """
+        Get the measurement counts for a batch of parameter sets. Backends able
+        to submit several circuits in a single job should override this method;
+        by default the circuits are executed one after the other.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters object defining the parametrisation used to
+            interpret each row of ``params_array``. Its values are left untouched.
+        params_array: `np.ndarray`
+            Array of shape (batch_size, n_params), where each row has the format
+            of ``params.raw()``.
+        n_shots: `Union[int, List[int]]`
+            The number of shots to be used for every parameter set, or a list with
+            the number of shots of each parameter set. If None, the backend default.
+
+        Returns
+        -------
+        List[dict]:
+            The counts dictionary of each parameter set.
+        """
+        params_array = np.atleast_2d(params_array)
+        n_shots_list = _n_shots_per_row(n_shots, len(params_array))
+        original_raw = params.raw()
+
+        counts_list = []
+        for each_raw, each_n_shots in zip(params_array, n_shots_list):
+            params.update_from_raw(each_raw)
+            counts_list.append(self.get_counts(params, each_n_shots))
+        params.update_from_raw(original_raw)
+
+        return counts_list
+
+    def expectation_batch(
+        self,
+        params: QAOAVariationalBaseParams,
+        params_array: np.ndarray,
+        n_shots: Optional[Union[int, List[int]]] = None,
+    ) -> np.ndarray:
+        """
+        Compute the expectation value of the cost operator for a batch of
+        parameter sets. Backends able to simulate several states at once, or to
+        submit several circuits in a single job, should override this method;
+        by default the parameter sets are evaluated one after the other.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters object defining the parametrisation used to
+            interpret each row of ``params_array``. Its values are left untouched.
+        params_array: `np.ndarray`
+            Array of shape (batch_size, n_params), where each row has the format
+            of ``params.raw()``.
+        n_shots: `Union[int, List[int]]`
+            The number of shots to be used for every parameter set, or a list with
+            the number of shots of each parameter set. If None, the backend default.
+
+        Returns
+        -------
+        np.ndarray:
+            Array of shape (batch_size,) with the expectation value of the cost
+            operator for each parameter set.
+        """
+        params_array = np.atleast_2d(params_array)
+        n_shots_list = _n_shots_per_row(n_shots, len(params_array))
+        original_raw = params.raw()
+
+        exp_vals = []
+        for each_raw, each_n_shots in zip(params_array, n_shots_list):
+            params.update_from_raw(each_raw)
+            n_shots_dict = {"n_shots": each_n_shots} if each_n_shots else {}
+            exp_vals.append(self.expectation(params, **n_shots_dict))
+        params.update_from_raw(original_raw)
+
+        return np.array(exp_vals)
+
     @abstractmethod
     def reset_circuit(self):
         """
@@ -333,7 +433,8 @@ class QAOABaseBackend(VQABaseBackend):
     def exact_solution(self):
         """
         Computes exactly the minimum energy of the cost function and its
-        corresponding configuration of variables using standard numpy module.
+        corresponding configuration of variables, scanning the spectrum in
+        chunks with ``HamiltonianSpectrum``.
 
         Returns
         -------
@@ -343,36 +444,14 @@ class QAOABaseBackend(VQABaseBackend):
               configuration: qubit-0 as the first element in the sequence
         """
         register = self.qaoa_descriptor.qureg
-        terms = self.cost_hamiltonian.terms
-        coeffs = self.cost_hamiltonian.coeffs
-        constant_energy = self.cost_hamiltonian.constant
 
-        diag = np.zeros((2 ** len(register)))
-        for i, term in enumerate(terms):
-            out = np.real(coeffs[i])
-            for qubit in register:
-                if qubit in term.qubit_indices:
-                    out = np.kron([1, -1], out)
-                else:
-                    out = np.kron([1, 1], out)
-            diag += out
-
-        # add the constant energy contribution
-        diag += constant_energy
-
-        # index = np.argmin(diag)
-        energy = np.min(diag)
-        indices = []
-        for idx in range(len(diag)):
-            if diag[idx] == energy:
-                indices.append(idx)
-
-        config_strings = [
-            np.binary_repr(index, len(register))[::-1] for index in indices
-        ]
-        configs = [
-            np.array([int(x) for x in config_str]) for config_str in config_strings
-        ]
+        # scan the spectrum in chunks, keeping only the ground states
+        energy, _, indices = HamiltonianSpectrum(
+            self.cost_hamiltonian, n_qubits=len(register)
+        ).extrema()
+
+        # bits of the ground states, qubit-0 first
+        configs = list((indices[:, None] >> np.arange(len(register))) & 1)
 
         return energy, configs
 
@@ -435,6 +514,57 @@ class QAOABaseBackendStatevector(QAOABaseBackend):
         """
         pass
 
+    def probabilities(self, params: QAOAVariationalBaseParams) -> np.ndarray:
+        """
+        Get the probabilities of all the basis states in the state produced by
+        the QAOA circuit, as an array indexed by the integer basis states.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters - an object of one of the parameter classes, containing
+            the variational parameters (angles).
+
+        Returns
+        -------
+        np.ndarray:
+            Array of shape (2**n_qubits,) with the probability of each basis state.
+        """
+        wf = np.asarray(self.wavefunction(params))
+        return np.real(np.conjugate(wf) * wf).astype(np.float64)
+
+    def sample_counts(
+        self, params: QAOAVariationalBaseParams, n_shots: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sample measurement outcomes from the statevector with a single multinomial
+        draw over the probabilities of the basis states, which uses the global
+        NumPy random state so that ``np.random.seed`` makes it reproducible.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters as a 1D array (derived from an object of one of the
+            parameter classes, containing hyperparameters and variable parameters).
+        n_shots: `int`
+            The number of measurement shots required; specified as integer
+
+        Returns
+        -------
+        outcomes: `np.ndarray[int]`
+            The basis states measured at least once, in increasing order, where
+            qubit k is the k-th bit. ``bitstrings_from_indices`` converts them
+            to the bitstrings used as keys by ``get_counts``.
+        counts: `np.ndarray[int]`
+            The number of times each outcome was measured.
+        """
+        prob_vec = self.probabilities(params)
+        counts = np.random.multinomial(n_shots, prob_vec / np.sum(prob_vec))
+
+        outcomes = np.flatnonzero(counts)
+
+        return outcomes, counts[outcomes]
+
     def sample_from_wavefunction(
         self, params: QAOAVariationalBaseParams, n_samples: int
     ) -> np.ndarray:
@@ -455,10 +585,13 @@ class QAOABaseBackendStatevector(QAOABaseBackend):
         np.ndarray:
             A list of measurement outcomes sampled from a statevector
         """
-        wf = self.wavefunction(params)
-        prob_vec = np.real(np.conjugate(wf) * wf)
-        samples = np.random.choice(len(prob_vec), p=prob_vec, size=n_samples)
-        samples = [np.binary_repr(num, self.n_qubits)[::-1] for num in samples]
+        outcomes, counts = self.sample_counts(params, n_samples)
+
+        # the bitstrings are built once per distinct outcome, and shots are shuffled
+        bitstrings = bitstrings_from_indices(outcomes, self.n_qubits)
+        samples = bitstrings[
+            np.random.permutation(np.repeat(np.arange(len(outcomes)), counts))
+        ]
 
         return samples
 
@@ -501,10 +634,11 @@ class QAOABaseBackendStatevector(QAOABaseBackend):
         Dict[str, float]:
             A dictionary of measurement outcomes vs frequency sampled from a statevector
         """
-        samples = self.sample_from_wavefunction(params, n_shots)
+        outcomes, frequency = self.sample_counts(params, n_shots)
 
-        unique_nums, frequency = np.unique(samples, return_counts=True)
-        counts = dict(zip(unique_nums, frequency))
+        # bitstrings are only built for the outcomes that were measured
+        bitstrings = bitstrings_from_indices(outcomes, self.n_qubits)
+        counts = dict(zip(bitstrings.tolist(), frequency.tolist()))
 
         return counts
 
@@ -554,6 +688,69 @@ class QAOABaseBackendShotBased(QAOABaseBackend):
         """
         pass
 
+    def _circuits_batch(
+        self,
+        params: QAOAVariationalBaseParams,
+        params_array: np.ndarray,
+        n_shots: Optional[Union[int, List[int]]] = None,
+    ) -> Tuple[list, List[int]]:
+        """
+        Builds the circuit of every parameter set of a batch, for the backends
+        that submit them together in ``get_counts_batch``, along with the number
+        of shots of each circuit, None being replaced by the default ``n_shots``.
+        """
+        params_array = np.atleast_2d(params_array)
+        n_shots_list = [
+            self.n_shots if each_n_shots is None else each_n_shots
+            for each_n_shots in _n_shots_per_row(n_shots, len(params_array))
+        ]
+        original_raw = params.raw()
+
+        circuits = []
+        for each_raw in params_array:
+            params.update_from_raw(each_raw)
+            circuits.append(self.qaoa_circuit(params))
+        params.update_from_raw(original_raw)
+
+        return circuits, n_shots_list
+
+    def expectation_batch(
+        self,
+        params: QAOAVariationalBaseParams,
+        params_array: np.ndarray,
+        n_shots: Optional[Union[int, List[int]]] = None,
+    ) -> np.ndarray:
+        """
+        Compute the expectation value of the cost operator for a batch of
+        parameter sets, from the counts of all the circuits obtained at once
+        with ``get_counts_batch``.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters object defining the parametrisation used to
+            interpret each row of ``params_array``. Its values are left untouched.
+        params_array: `np.ndarray`
+            Array of shape (batch_size, n_params), where each row has the format
+            of ``params.raw()``.
+        n_shots: `Union[int, List[int]]`
+            The number of shots to be used for every parameter set, or a list with
+            the number of shots of each parameter set. If None, the backend default.
+
+        Returns
+        -------
+        np.ndarray:
+            Array of shape (batch_size,) with the expectation value of the cost
+            operator for each parameter set.
+        """
+        counts_list = self.get_counts_batch(params, params_array, n_shots)
+        return np.array(
+            [
+                cost_function(counts, self.compiled_cost_hamiltonian, self.cvar_alpha)
+                for counts in counts_list
+            ]
+        )
+
 
 class QAOABaseBackendCloud:
     """
@@ -1,12 +1,108 @@
 # Cost function to be used for QAOA training
-from typing import Dict
+from typing import Dict, Tuple, Union
 import numpy as np
 
 from ..qaoa_components import Hamiltonian
-from ..utilities import bitstring_energy
+from ..utilities import CompiledHamiltonian, bits_from_bitstrings
 
 
-def expectation_value_classical(counts: Dict, hamiltonian: Hamiltonian):
+def _counts_energies(
+    counts: Dict, hamiltonian: Union[Hamiltonian, CompiledHamiltonian]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the number of counts and the energy of every basis state in
+    ``counts`` as arrays, evaluated in a single batch.
+    """
+    if not isinstance(hamiltonian, CompiledHamiltonian):
+        hamiltonian = CompiledHamiltonian(hamiltonian)
+
+    basis_states = list(counts.keys())
+    frequencies = np.fromiter(counts.values(), dtype=float, count=len(basis_states))
+    energies = hamiltonian.energies(bits_from_bitstrings(basis_states))
+
+    return frequencies, energies
+
+
+def _cvar_tail(
+    frequencies: np.ndarray, energies: np.ndarray, alpha: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Selects the lowest-energy ``alpha`` fraction of the shots. Each outcome has
+    at least the smallest frequency, which bounds the number of outcomes that
+    may be in the tail: those are found with ``np.argpartition``, and only them
+    are sorted.
+
+    Returns
+    -------
+    tail_frequencies, tail_energies:
+        The number of shots of each outcome that fall in the tail, where the
+        outcome at its boundary only counts partially, and their energies.
+    """
+    n_tail_shots = alpha * np.sum(frequencies)
+
+    min_frequency = np.min(frequencies, initial=np.inf)
+    n_candidates = len(energies)
+    if min_frequency > 0 and n_tail_shots / min_frequency < n_candidates - 1:
+        # one more candidate than needed, in case of rounding errors
+        n_candidates = int(np.ceil(n_tail_shots / min_frequency)) + 1
+        candidates = np.argpartition(energies, n_candidates - 1)[:n_candidates]
+    else:
+        candidates = np.arange(n_candidates)
+    candidates = candidates[np.argsort(energies[candidates], kind="stable")]
+
+    # shots of the lower-energy outcomes, preceding each candidate
+    frequencies, energies = frequencies[candidates], energies[candidates]
+    shots_before = np.cumsum(frequencies) - frequencies
+    tail_frequencies = np.clip(n_tail_shots - shots_before, 0, frequencies)
+
+    return tail_frequencies, energies
+
+
+def cost_statistics(
+    counts: Dict,
+    hamiltonian: Union[Hamiltonian, CompiledHamiltonian],
+    alpha: float = 1,
+) -> Tuple[float, float]:
+    """
+    Computes the mean and the variance of the energy over the measured shots,
+    restricted to the lowest-energy ``alpha`` fraction of them for CVaR. The
+    unique outcomes are decoded and their energies computed once, in a batch.
+
+    Parameters
+    ----------
+    counts: `dict`
+            The counts of the measurements.
+    hamiltonian: `Hamiltonian`
+            The Cost Hamiltonian defined for the optimization problem,
+            or its ``CompiledHamiltonian``.
+    alpha: `float`
+            The CVaR parameter, the fraction of the shots that is considered.
+
+    Returns
+    -------
+    cost: `float`
+            The expectation value of the energy, or its CVaR if ``alpha < 1``.
+    variance: `float`
+            The variance of the energy over the same shots.
+    """
+    assert (
+        alpha > 0 and alpha <= 1
+    ), "Please specify a valid alpha value between 0 and 1"
+    frequencies, energies = _counts_energies(counts, hamiltonian)
+
+    if alpha < 1:
+        frequencies, energies = _cvar_tail(frequencies, energies, alpha)
+
+    shots = np.sum(frequencies)
+    cost = frequencies @ energies / shots
+    variance = frequencies @ np.abs(energies - cost) ** 2 / shots
+
+    return cost, variance
+
+
+def expectation_value_classical(
+    counts: Dict, hamiltonian: Union[Hamiltonian, CompiledHamiltonian]
+):
     """
     Evaluate the cost function, i.e. expectation value ``$$\langle|H \rangle$$``
     w.r.t to the measurements results ``counts``.
@@ -16,20 +112,21 @@ def expectation_value_classical(counts: Dict, hamiltonian: Hamiltonian):
     counts: dict
                 The counts of the measurements.
     hamiltonian: Hamiltonian
-                The Cost Hamiltonian defined for the optimization problem
+                The Cost Hamiltonian defined for the optimization problem,
+                or its ``CompiledHamiltonian``.
     """
-    shots = sum(counts.values())
-    cost = 0
-    for basis_state, count in counts.items():
-        cost += count * (bitstring_energy(hamiltonian, basis_state) / shots)
+    frequencies, energies = _counts_energies(counts, hamiltonian)
+    shots = np.sum(frequencies)
+    cost = frequencies @ energies / shots
     return cost
 
 
 def cvar_expectation_value_classical(
-    counts: Dict, hamiltonian: Hamiltonian, alpha: float
+    counts: Dict, hamiltonian: Union[Hamiltonian, CompiledHamiltonian], alpha: float
 ):
     """
-    CVaR computation of cost function. For the definition of the cost function, refer
+    CVaR computation of cost function, the average energy of the lowest-energy
+    ``alpha`` fraction of the shots. For the definition of the cost function, refer
     to https://arxiv.org/abs/1907.04769.
 
     Parameters
@@ -37,29 +134,25 @@ def cvar_expectation_value_classical(
     counts: `dict`
             The counts of the measurements.
     hamiltonian: `Hamiltonian`
-            The Cost Hamiltonian defined for the optimization problem
+            The Cost Hamiltonian defined for the optimization problem,
+            or its ``CompiledHamiltonian``.
     alpha: `float`
             The CVaR parameter.
     """
     assert alpha > 0 and alpha < 1, "Please specify a valid alpha value between 0 and 1"
-    shots = sum(counts.values())
+    frequencies, energies = _counts_energies(counts, hamiltonian)
 
-    cost_list = []
-
-    # eigen-energy computation of each basis state in counts
-    for basis_state, count in counts.items():
-        cost_list.append(count * (bitstring_energy(hamiltonian, basis_state) / shots))
-
-    # sort costs in ascending order
-    sorted_cost_list = np.sort(np.array(cost_list))
-
-    K = max([int(len(cost_list) * alpha), 1])
-    cost = sum(sorted_cost_list[:K])
+    tail_frequencies, tail_energies = _cvar_tail(frequencies, energies, alpha)
+    cost = tail_frequencies @ tail_energies / np.sum(tail_frequencies)
 
     return cost
 
 
-def cost_function(counts: Dict, hamiltonian: Hamiltonian, alpha: float = 1):
+def cost_function(
+    counts: Dict,
+    hamiltonian: Union[Hamiltonian, CompiledHamiltonian],
+    alpha: float = 1,
+):
     """
     The cost function to be used for QAOA training.
 
@@ -68,7 +161,8 @@ def cost_function(counts: Dict, hamiltonian: Hamiltonian, alpha: float = 1):
     counts: `dict`
             The counts of the measurements.
     hamiltonian: `Hamiltonian`
-            The Cost Hamiltonian defined for the optimization problem
+            The Cost Hamiltonian defined for the optimization problem,
+            or its ``CompiledHamiltonian``.
     alpha: `float`
             The CVaR parameter.
     """
@@ -10,8 +10,12 @@ SUPPORTED_LOCAL_SIMULATORS = [
     "qiskit.shot_simulator",
     "qiskit.statevector_simulator",
     "vectorized",
+    "vectorized_memmap",
     "pyquil.statevector_simulator",
     "analytical_simulator",
+    "lightcone",
+    "mps",
+    "subspace",
 ]
 
 
@@ -9,7 +9,7 @@ from ..qaoa_components import (
 from ..qaoa_components.variational_parameters.variational_baseparams import (
     QAOAVariationalBaseParams,
 )
-from ..utilities import energy_expectation_analytical, generate_uuid, round_value
+from ..utilities import AnalyticalP1Graph, generate_uuid, round_value
 
 
 class QAOABackendAnalyticalSimulator(QAOABaseBackend):
@@ -71,6 +71,9 @@ class QAOABackendAnalyticalSimulator(QAOABaseBackend):
             self.qaoa_descriptor.mixer_qubits_pairs == []
         ), "Analytical formula only holds for X mixer."
 
+        # couplings and neighbourhoods of the cost Hamiltonian, shared by all evaluations
+        self.analytical_graph = AnalyticalP1Graph(self.cost_hamiltonian)
+
     def assign_angles(self):
         raise NotImplementedError("This method is irrelevant for this backend")
 
@@ -110,7 +113,7 @@ class QAOABackendAnalyticalSimulator(QAOABaseBackend):
         betas = params.betas
         gammas = params.gammas
 
-        cost = energy_expectation_analytical([betas, gammas], self.cost_hamiltonian)
+        cost = self.analytical_graph.energy([betas, gammas])
         return cost
 
     def expectation_w_uncertainty(self, params):
@@ -3,7 +3,11 @@ import numpy as np
 
 from .plugin_finder import plugin_finder_dict
 from .qaoa_vectorized import QAOAvectorizedBackendSimulator
+from .qaoa_vectorized_memmap import QAOAvectorizedMemmapBackendSimulator
 from .qaoa_analytical_sim import QAOABackendAnalyticalSimulator
+from .qaoa_lightcone import QAOABackendLightconeSimulator
+from .qaoa_mps import QAOABackendMPSSimulator
+from .qaoa_subspace import QAOABackendSubspaceSimulator
 from .devices_core import DeviceBase, DeviceLocal
 from .basebackend import QuantumCircuitBase, QAOABaseBackend
 from ..qaoa_components import QAOADescriptor
@@ -16,7 +20,11 @@ def _create_mappers(input_plugin_dict: dict) -> dict:
     DEVICE_ACCESS_OBJECT_MAPPER = dict()
     
     DEVICE_NAME_TO_OBJECT_MAPPER["vectorized"] = QAOAvectorizedBackendSimulator
+    DEVICE_NAME_TO_OBJECT_MAPPER["vectorized_memmap"] = QAOAvectorizedMemmapBackendSimulator
     DEVICE_NAME_TO_OBJECT_MAPPER["analytical_simulator"] = QAOABackendAnalyticalSimulator
+    DEVICE_NAME_TO_OBJECT_MAPPER["lightcone"] = QAOABackendLightconeSimulator
+    DEVICE_NAME_TO_OBJECT_MAPPER["mps"] = QAOABackendMPSSimulator
+    DEVICE_NAME_TO_OBJECT_MAPPER["subspace"] = QAOABackendSubspaceSimulator
     
     for each_entry_key, each_entry_value in input_plugin_dict.items():
         if hasattr(each_entry_value, 'device_access'):
@@ -38,11 +46,39 @@ def _backend_arg_mapper(
     rewiring=None,
     disable_qubit_rewiring: Optional[bool] = None,
     initial_qubit_mapping=None,
+    precision: Optional[str] = None,
+    n_threads: Optional[int] = None,
+    memmap_dir: Optional[str] = None,
+    block_qubits: Optional[int] = None,
+    max_cone_qubits: Optional[int] = None,
+    max_bond_dim: Optional[int] = None,
+    truncation_error: Optional[float] = None,
+    hamming_weight: Optional[Union[int, List[int]]] = None,
 ):
     
     BACKEND_ARGS_MAPPER = {
         QAOABackendAnalyticalSimulator: {},
-        QAOAvectorizedBackendSimulator: {},
+        QAOAvectorizedBackendSimulator: {
+            "precision": precision,
+            "n_threads": n_threads,
+        },
+        QAOAvectorizedMemmapBackendSimulator: {
+            "precision": precision,
+            "memmap_dir": memmap_dir,
+            "block_qubits": block_qubits,
+        },
+        QAOABackendLightconeSimulator: {
+            "max_cone_qubits": max_cone_qubits,
+        },
+        QAOABackendMPSSimulator: {
+            "n_shots": n_shots,
+            "seed_simulator": seed_simulator,
+            "max_bond_dim": max_bond_dim,
+            "truncation_error": truncation_error,
+        },
+        QAOABackendSubspaceSimulator: {
+            "hamming_weight": hamming_weight,
+        },
     }
     
     local_vars = locals()
@@ -131,6 +167,27 @@ def get_qaoa_backend(
             A list of physical qubits to be used for the QAOA circuit.
         n_shots: `int`
             The number of shots to be used for the shot-based computation.
+        precision: `str`
+            The floating point precision of the vectorized simulator, either
+            'double' or 'single'.
+        n_threads: `int`
+            The number of threads used by the vectorized simulator to apply the gates.
+        memmap_dir: `str`
+            The directory of the files of the memory-mapped vectorized simulator.
+        block_qubits: `int`
+            The base-2 logarithm of the number of amplitudes processed at once
+            by the memory-mapped vectorized simulator.
+        max_cone_qubits: `int`
+            The largest number of qubits of a light cone simulated by the
+            lightcone simulator.
+        max_bond_dim: `int`
+            The largest bond dimension of the mps simulator.
+        truncation_error: `float`
+            The largest relative weight of the singular values discarded at
+            each truncation of the mps simulator.
+        hamming_weight: `Union[int, List[int]]`
+            The Hamming weight of the states simulated by the subspace
+            simulator, when there is no prepend state.
 
     Returns
     -------
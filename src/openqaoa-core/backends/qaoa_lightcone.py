@@ -0,0 +1,493 @@
+"""
+Light-cone simulator for QAOA on sparse problems. The expectation value of each
+term of the cost Hamiltonian only depends on the gates in its reverse causal
+cone, which for a circuit of depth p is the p-hop neighbourhood of the term, so
+every term is computed from a small wavefunction instead of the full one.
+"""
+from typing import List, Tuple
+import numpy as np
+import networkx as nx
+from networkx.algorithms.isomorphism import GraphMatcher
+
+from .basebackend import QAOABaseBackend
+from ..qaoa_components import QAOADescriptor
+from ..qaoa_components.ansatz_constructor.gatemap import (
+    RXGateMap,
+    RZGateMap,
+    RZZGateMap,
+)
+from ..qaoa_components.variational_parameters.variational_baseparams import (
+    QAOAVariationalBaseParams,
+)
+from ..utilities import generate_uuid, round_value
+
+
+class _LightCone:
+    """
+    The part of the circuit acting on the reverse causal cone of a term, shared
+    by the terms with isomorphic cones.
+
+    The cone is made of the qubits within ``p - 1`` hops from the term, which are
+    simulated explicitly together with the qubits ``p`` hops away coupled to more
+    than one of them. The remaining outer qubits only act on the cone through
+    the ZZ gate of the first layer with their single inner neighbour, and since
+    nothing acts on them afterwards, they dephase it by the factor
+    :math:`\\cos(\\theta)` of the gate angle. Their effect is simulated with a
+    single ancilla qubit per inner neighbour, in an entangled initial state.
+
+    Parameters
+    ----------
+    n_term_qubits: `int`
+        Number of qubits of the term, which are the first of the ``qubits``.
+    qubits: `List[int]`
+        The qubits of the cone simulated explicitly.
+    pairs: `List[Tuple[int, int]]`
+        Pairs of ``qubits`` coupled by ZZ gates.
+    absorbed: `dict`
+        The outer qubits absorbed into an ancilla, by inner neighbour.
+    distances: `dict`
+        The number of hops between each qubit and the term.
+    p: `int`
+        Number of layers of the circuit.
+    """
+
+    def __init__(
+        self,
+        n_term_qubits: int,
+        qubits: List[int],
+        pairs: List[Tuple[int, int]],
+        absorbed: dict,
+        distances: dict,
+        p: int,
+    ):
+        local = {q: i for i, q in enumerate(qubits)}
+        parents = sorted(absorbed, key=local.get)
+
+        self.n_term_qubits = n_term_qubits
+        self.n_qubits = len(qubits)
+        self.qubits = qubits
+        self.pairs = [(local[a], local[b]) for a, b in pairs]
+        self.parents = [local[parent] for parent in parents]
+        self.n_absorbed = [len(absorbed[parent]) for parent in parents]
+        self.absorbed_pairs = [
+            (q, parent) for parent in parents for q in absorbed[parent]
+        ]
+        self.distances = np.array([distances[q] for q in qubits])
+        self.pair_distances = np.array(
+            [min(distances[a], distances[b]) for a, b in pairs], dtype=int
+        )
+        self.p = p
+
+        # rows of slots of the members of the group, see `_lightcone_slots`
+        self.member_slots = []
+        self.member_terms = []
+
+    @property
+    def n_simulated_qubits(self) -> int:
+        """
+        Number of qubits of the wavefunction of the cone, including the ancillas.
+        """
+        return self.n_qubits + len(self.parents)
+
+    def _split_angles(self, angles: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Splits a row of angles, ordered as the slots, into the angles of the
+        RZ gates, the RZZ gates, the RX gates and the absorbed RZZ gates.
+        """
+        sizes = np.cumsum(
+            [self.p * self.n_qubits, self.p * len(self.pairs), self.p * self.n_qubits]
+        )
+        singles, pairs, mixers, absorbed = np.split(angles, sizes)
+
+        return (
+            singles.reshape(self.p, self.n_qubits),
+            pairs.reshape(self.p, len(self.pairs)),
+            mixers.reshape(self.p, self.n_qubits),
+            absorbed,
+        )
+
+    def expectation(self, angles: np.ndarray) -> float:
+        """
+        Simulates the cone with the given gate angles and returns the expectation
+        value of the Z string on the term qubits.
+
+        Parameters
+        ----------
+        angles: `np.ndarray`
+            The angles of the gates, ordered as the slots of the cone.
+
+        Returns
+        -------
+        exp_val: `float`
+            The expectation value of the term.
+        """
+        singles, pairs, mixers, absorbed = self._split_angles(angles)
+        n_qubits = self.n_qubits
+
+        signs = [
+            np.array([1.0, -1.0]).reshape((1,) * i + (2,) + (1,) * (n_qubits - i - 1))
+            for i in range(n_qubits)
+        ]
+
+        # |+> on the explicit qubits, and an ancilla purifying the dephasing by
+        # the absorbed qubits of each parent, with overlap prod(cos(theta))
+        wavefn = np.full((2,) * n_qubits, 2 ** (-n_qubits / 2), dtype=complex)
+        absorbed_by_parent = np.split(absorbed, np.cumsum(self.n_absorbed)[:-1])
+        for parent, parent_angles in zip(self.parents, absorbed_by_parent):
+            overlap = np.clip(np.prod(np.cos(parent_angles)), -1, 1)
+            alpha = np.arccos(overlap) / 2
+            ancilla = np.array(
+                [[np.cos(alpha), np.sin(alpha)], [np.cos(alpha), -np.sin(alpha)]]
+            )
+            shape = [1] * (wavefn.ndim + 1)
+            shape[parent], shape[-1] = 2, 2
+            wavefn = wavefn[..., None] * ancilla.reshape(shape)
+
+        ancilla_axes = (None,) * len(self.parents)
+        buffers = np.empty((2,) + wavefn[(0,)].shape, dtype=complex)
+        for layer in range(self.p):
+            # only the gates on the qubits within p - 1 - layer hops from the term
+            # and the ZZ gates touching them affect its expectation value
+            reach = self.p - 1 - layer
+
+            # the cost block is diagonal, all its gates are applied as one phase
+            phases = np.zeros((2,) * n_qubits)
+            for qubit in np.flatnonzero(self.distances <= reach):
+                phases += singles[layer, qubit] / 2 * signs[qubit]
+            for pair in np.flatnonzero(self.pair_distances <= reach):
+                qubit_1, qubit_2 = self.pairs[pair]
+                phases += pairs[layer, pair] / 2 * signs[qubit_1] * signs[qubit_2]
+            wavefn *= np.exp(-1j * phases)[(...,) + ancilla_axes]
+
+            for qubit in np.flatnonzero(self.distances <= reach):
+                cos = np.cos(mixers[layer, qubit] / 2)
+                sin = np.sin(mixers[layer, qubit] / 2)
+                amplitudes_0 = wavefn[(slice(None),) * qubit + (0,)]
+                amplitudes_1 = wavefn[(slice(None),) * qubit + (1,)]
+                buffer_0, buffer_1 = (b.reshape(amplitudes_0.shape) for b in buffers)
+                np.multiply(amplitudes_0, -1j * sin, out=buffer_0)
+                np.multiply(amplitudes_1, -1j * sin, out=buffer_1)
+                amplitudes_0 *= cos
+                amplitudes_0 += buffer_1
+                amplitudes_1 *= cos
+                amplitudes_1 += buffer_0
+
+        probabilities = np.abs(wavefn) ** 2
+        probabilities = probabilities.sum(
+            axis=tuple(range(self.n_term_qubits, probabilities.ndim))
+        )
+        term_signs = np.array([1.0, -1.0])
+        for _ in range(self.n_term_qubits - 1):
+            term_signs = np.multiply.outer(term_signs, [1.0, -1.0])
+
+        return np.sum(term_signs * probabilities)
+
+
+class QAOABackendLightconeSimulator(QAOABaseBackend):
+    """
+    A simulator class for QAOA on sparse problems, starting with a layer of
+    Hadamards and using the X mixer, for any number of layers and any
+    parametrisation. The expectation value of each linear and quadratic term of
+    the cost Hamiltonian is computed from its reverse causal cone, i.e. the
+    qubits within ``p`` hops from the term in the graph of the problem, so that
+    the cost only grows with the number of terms and the size of the cones
+    rather than exponentially in the number of qubits.
+
+    Terms whose cones are isomorphic, including the weights of the problem, are
+    grouped when the backend is created, and each group is simulated once for
+    every distinct set of angles of its gates, e.g. once per evaluation for the
+    standard parametrisation on a regular graph with uniform weights.
+
+    Parameters
+    ----------
+    qaoa_descriptor: QAOADescriptor
+        An object of the class ``QAOADescriptor`` which contains information on
+        circuit construction and depth of the circuit.
+        Note that it only works with the X mixer.
+    max_cone_qubits: int
+        The largest number of qubits of a cone, ancillas included, above which
+        the simulator cannot be created. Defaults to 24.
+    """
+
+    def __init__(
+        self,
+        qaoa_descriptor: QAOADescriptor,
+        prepend_state=None,
+        append_state=None,
+        init_hadamard=True,
+        cvar_alpha=1,
+        max_cone_qubits: int = 24,
+    ):
+
+        # checking if not supported parameters are passed
+        for k, val in {
+            "Prepend_state": (prepend_state, None),
+            "append_state": (append_state, None),
+            "init_hadamard": (init_hadamard, True),
+            "cvar_alpha": (cvar_alpha, 1),
+        }.items():
+            if val[0] != val[1]:
+                print(
+                    f"{k} is not supported for the lightcone backend. {k} is set to None."
+                )
+
+        QAOABaseBackend.__init__(
+            self,
+            qaoa_descriptor,
+            prepend_state=None,
+            append_state=None,
+            init_hadamard=True,
+            cvar_alpha=1,
+        )
+
+        self.measurement_outcomes = (
+            {}
+        )  # passing empty dict for the logger since measurements are irrelevant for this backend.
+        self.max_cone_qubits = max_cone_qubits
+
+        # check if the conditions for the light cones are met
+        assert not self.qaoa_descriptor.routed, "Routed circuits are not supported."
+        assert (
+            self.qaoa_descriptor.mixer_qubits_pairs == []
+        ), "The lightcone simulator only supports the X mixer."
+        for each_gate in self.abstract_circuit:
+            assert isinstance(
+                each_gate, (RXGateMap, RZGateMap, RZZGateMap)
+            ), "The lightcone simulator only supports the X mixer and cost Hamiltonians with linear and quadratic terms."
+            assert (
+                isinstance(each_gate, RXGateMap)
+                == (each_gate.gate_label.type.value == "MIXER")
+            ), "The lightcone simulator only supports the X mixer."
+
+        self._init_slots()
+        self._init_lightcones()
+
+    def _init_slots(self):
+        """
+        Assigns a slot to every gate of the abstract circuit, shared by the
+        gates of the same kind acting on the same qubits in the same layer,
+        whose angles are added since they commute.
+        """
+        self._slot_index = {}
+        self._gate_slots = []
+        for each_gate in self.abstract_circuit:
+            qubits = (each_gate.qubit_1,)
+            if isinstance(each_gate, RZZGateMap):
+                qubits = tuple(sorted([each_gate.qubit_1, each_gate.qubit_2]))
+            key = (each_gate.gate_label.layer, type(each_gate).__name__, qubits)
+            self._gate_slots.append(
+                self._slot_index.setdefault(key, len(self._slot_index))
+            )
+
+        self._gate_slots = np.array(self._gate_slots, dtype=int)
+
+    def _slot(self, layer: int, gate_name: str, qubits: tuple) -> int:
+        """
+        Returns the slot of a gate, or -1 if there is no such gate in the circuit.
+        """
+        return self._slot_index.get((layer, gate_name, qubits), -1)
+
+    def _init_lightcones(self):
+        """
+        Builds the light cone of every term of the cost Hamiltonian, and groups
+        the terms with isomorphic cones.
+        """
+        p = self.qaoa_descriptor.p
+        weights, biases = {}, {}
+        for term, coeff in zip(
+            self.cost_hamiltonian.terms, self.cost_hamiltonian.coeffs
+        ):
+            if len(term) == 1:
+                qubit = term.qubit_indices[0]
+                biases[qubit] = biases.get(qubit, 0) + coeff
+            elif len(term) == 2:
+                pair = tuple(sorted(term.qubit_indices))
+                weights[pair] = weights.get(pair, 0) + coeff
+            else:
+                raise ValueError(
+                    "The lightcone simulator only supports linear and quadratic terms."
+                )
+
+        graph = nx.Graph()
+        graph.add_nodes_from(range(self.n_qubits))
+        graph.add_edges_from(weights)
+
+        self.lightcones = []
+        buckets = {}
+        for term_index, term in enumerate(self.cost_hamiltonian.terms):
+            term_qubits = list(term.qubit_indices)
+            distances = nx.multi_source_dijkstra_path_length(
+                graph, term_qubits, cutoff=p
+            )
+            inner = term_qubits + sorted(
+                q for q, dist in distances.items() if 0 < dist < p
+            )
+            outer_explicit, absorbed = [], {}
+            for q in sorted(q for q, dist in distances.items() if dist == p):
+                inner_neighbours = [n for n in graph[q] if distances.get(n, p) < p]
+                if len(inner_neighbours) == 1:
+                    absorbed.setdefault(inner_neighbours[0], []).append(q)
+                else:
+                    outer_explicit.append(q)
+            explicit = inner + outer_explicit
+
+            n_simulated = len(explicit) + len(absorbed)
+            if n_simulated > self.max_cone_qubits:
+                raise ValueError(
+                    f"The light cone of the term {term} has {n_simulated} qubits, "
+                    f"more than max_cone_qubits={self.max_cone_qubits}."
+                )
+
+            # labelled graph of the cone, to find the isomorphic ones
+            cone_graph = nx.Graph()
+            for q in explicit:
+                role = "term" if q in term_qubits else "explicit"
+                cone_graph.add_node(q, label=f"{role},{biases.get(q, 0)}")
+            for parent in absorbed:
+                for q in absorbed[parent]:
+                    cone_graph.add_node(q, label="absorbed")
+                    cone_graph.add_edge(
+                        parent, q, label=str(weights[tuple(sorted([parent, q]))])
+                    )
+            for pair in graph.subgraph(explicit).edges:
+                cone_graph.add_edge(*pair, label=str(weights[tuple(sorted(pair))]))
+
+            cone_hash = nx.weisfeiler_lehman_graph_hash(
+                cone_graph, node_attr="label", edge_attr="label"
+            )
+            for lightcone, representative in buckets.get(cone_hash, []):
+                matcher = GraphMatcher(
+                    representative,
+                    cone_graph,
+                    node_match=lambda x, y: x["label"] == y["label"],
+                    edge_match=lambda x, y: x["label"] == y["label"],
+                )
+                if matcher.is_isomorphic():
+                    mapping = matcher.mapping
+                    break
+            else:
+                # new group, whose qubits are ordered as in this cone
+                lightcone = _LightCone(
+                    len(term_qubits),
+                    explicit,
+                    list(graph.subgraph(explicit).edges),
+                    absorbed,
+                    distances,
+                    p,
+                )
+                buckets.setdefault(cone_hash, []).append((lightcone, cone_graph))
+                self.lightcones.append(lightcone)
+                mapping = {q: q for q in cone_graph}
+
+            lightcone.member_slots.append(self._lightcone_slots(lightcone, mapping))
+            lightcone.member_terms.append(term_index)
+
+        for lightcone in self.lightcones:
+            lightcone.member_slots = np.array(lightcone.member_slots, dtype=int)
+
+    def _lightcone_slots(self, lightcone: _LightCone, mapping: dict) -> List[int]:
+        """
+        Returns the slots of the gates of a cone, for the term whose cone is
+        mapped onto the qubits of the group by ``mapping``, in the order of
+        ``_LightCone._split_angles``.
+        """
+        qubits = [mapping[q] for q in lightcone.qubits]
+        layers = range(lightcone.p)
+
+        return (
+            [self._slot(l, "RZGateMap", (q,)) for l in layers for q in qubits]
+            + [
+                self._slot(l, "RZZGateMap", tuple(sorted([qubits[a], qubits[b]])))
+                for l in layers
+                for a, b in lightcone.pairs
+            ]
+            + [self._slot(l, "RXGateMap", (q,)) for l in layers for q in qubits]
+            + [
+                self._slot(
+                    0, "RZZGateMap", tuple(sorted([mapping[q], mapping[parent]]))
+                )
+                for q, parent in lightcone.absorbed_pairs
+            ]
+        )
+
+    def assign_angles(self):
+        raise NotImplementedError("This method is irrelevant for this backend")
+
+    def qaoa_circuit(self):
+        raise NotImplementedError("This method is irrelevant for this backend")
+
+    def get_counts(self):
+        raise NotImplementedError("This method is irrelevant for this backend")
+
+    def term_expectations(self, params: QAOAVariationalBaseParams) -> np.ndarray:
+        """
+        Computes the expectation values of all the terms of the cost Hamiltonian,
+        simulating each group of isomorphic cones once per distinct set of angles.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters - an object of one of the parameter classes, containing
+            variable parameters.
+
+        Returns
+        -------
+        exp_vals: `np.ndarray`
+            Expectation values of the terms, in the order of ``cost_hamiltonian.terms``.
+        """
+        angles = self.obtain_angles_for_pauli_list(self.abstract_circuit, params)
+
+        # angles of the slots, with a final 0 for the gates not in the circuit
+        slot_angles = np.bincount(
+            self._gate_slots, weights=angles, minlength=len(self._slot_index) + 1
+        )
+        slot_angles[-1] = 0
+
+        exp_vals = np.zeros(len(self.cost_hamiltonian.terms))
+        for lightcone in self.lightcones:
+            unique_angles, inverse = np.unique(
+                slot_angles[lightcone.member_slots], axis=0, return_inverse=True
+            )
+            cone_exp_vals = np.array(
+                [lightcone.expectation(row) for row in unique_angles]
+            )
+            exp_vals[lightcone.member_terms] = cone_exp_vals[inverse.reshape(-1)]
+
+        return exp_vals
+
+    @round_value
+    def expectation(self, params: QAOAVariationalBaseParams) -> float:
+        """
+        Compute the expectation value w.r.t the Cost Hamiltonian from the light
+        cones of its terms.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters - an object of one of the parameter classes, containing
+            variable parameters.
+
+        Returns
+        -------
+        float:
+            Expectation value of cost operator wrt to the QAOA parameters.
+        """
+        # generate a job id
+        self.job_id = generate_uuid()
+
+        cost = self.cost_hamiltonian.constant + np.dot(
+            self.cost_hamiltonian.coeffs, self.term_expectations(params)
+        )
+        return cost
+
+    def expectation_w_uncertainty(self, params):
+        raise NotImplementedError(
+            "The uncertainty requires the correlations between all the terms, "
+            "which are not local."
+        )
+
+    def reset_circuit(self):
+        raise NotImplementedError("This method is irrelevant for this backend")
+
+    def circuit_to_qasm(self):
+        raise NotImplementedError("This method is irrelevant for this backend")
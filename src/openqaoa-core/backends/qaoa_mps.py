@@ -0,0 +1,615 @@
+"""
+Matrix-product state (MPS) simulator for QAOA circuits with low entanglement.
+The gates of the ``abstract_circuit`` are applied to a chain of tensors whose
+bonds are truncated after every two-qubit gate, so that shallow circuits on
+near one-dimensional or routed nearest-neighbour layouts can be simulated for
+numbers of qubits far beyond the reach of the statevector simulators.
+"""
+from typing import List, Optional, Tuple
+import numpy as np
+import scipy.linalg
+
+from .basebackend import QAOABaseBackend, QAOABaseBackendShotBased
+from .cost_function import cost_function, cost_statistics
+from ..qaoa_components import QAOADescriptor
+from ..qaoa_components.ansatz_constructor.gatemap import (
+    RotationGateMap,
+    SWAPGateMap,
+)
+from ..qaoa_components.variational_parameters.variational_baseparams import (
+    QAOAVariationalBaseParams,
+)
+from ..utilities import generate_uuid, round_value
+
+PAULI_MATRICES = {
+    "X": np.array([[0, 1], [1, 0]], dtype=complex),
+    "Y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "Z": np.array([[1, 0], [0, -1]], dtype=complex),
+}
+
+SWAP_MATRIX = np.array(
+    [[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=complex
+)
+
+
+def _pauli_rotation(pauli_str: str, rotation_angle: float) -> np.ndarray:
+    r"""
+    Returns the matrix of :math:`\exp(-i \frac{\theta}{2} P)`, where :math:`P` is
+    the tensor product of the Pauli matrices in ``pauli_str``, the first of
+    which acts on the first qubit of the gate.
+    """
+    pauli = PAULI_MATRICES[pauli_str[0]]
+    for letter in pauli_str[1:]:
+        pauli = np.kron(pauli, PAULI_MATRICES[letter])
+
+    return np.cos(rotation_angle / 2) * np.eye(len(pauli)) - 1j * np.sin(
+        rotation_angle / 2
+    ) * pauli
+
+
+def _bitstrings_from_bits(bits: np.ndarray) -> List[str]:
+    """
+    Converts a matrix of bits, one row per outcome and the k-th column being
+    the value of qubit k, into a list of bitstrings.
+    """
+    n_qubits = bits.shape[1]
+    code_points = np.ascontiguousarray(bits.astype(np.uint32) + ord("0"))
+    return code_points.view(f"<U{n_qubits}").reshape(-1).tolist()
+
+
+class _MatrixProductState:
+    """
+    A state of ``n_qubits`` qubits stored as a chain of tensors of shape
+    ``(left bond, 2, right bond)``, in mixed canonical form: the tensors left of
+    the orthogonality ``center`` are left-isometric and those right of it are
+    right-isometric, so that the two-site updates truncate the bonds optimally.
+
+    Parameters
+    ----------
+    n_qubits: `int`
+        Number of qubits, i.e. sites of the chain.
+    max_bond_dim: `int`
+        Largest bond dimension kept after a two-qubit gate.
+    truncation_error: `float`
+        Largest weight of the discarded singular values, relative to the
+        squared norm of the state, at every truncation.
+    init_hadamard: `bool`
+        Whether the chain starts in the :math:`|+\\rangle` state instead of
+        :math:`|0\\rangle`.
+    """
+
+    def __init__(
+        self,
+        n_qubits: int,
+        max_bond_dim: int,
+        truncation_error: float,
+        init_hadamard: bool,
+    ):
+        site = np.array([1, 1]) / np.sqrt(2) if init_hadamard else np.array([1, 0])
+
+        self.n_qubits = n_qubits
+        self.max_bond_dim = max_bond_dim
+        self.truncation_error = truncation_error
+        self.tensors = [site.astype(complex).reshape(1, 2, 1) for _ in range(n_qubits)]
+        self.center = 0
+        self.discarded_weight = 0.0
+
+    @property
+    def bond_dimensions(self) -> List[int]:
+        """
+        The dimensions of the ``n_qubits - 1`` bonds of the chain.
+        """
+        return [tensor.shape[2] for tensor in self.tensors[:-1]]
+
+    def move_center(self, site: int):
+        """
+        Moves the orthogonality center to ``site`` with QR decompositions.
+        """
+        while self.center < site:
+            tensor = self.tensors[self.center]
+            left, _, right = tensor.shape
+            q, r = np.linalg.qr(tensor.reshape(left * 2, right))
+            self.tensors[self.center] = q.reshape(left, 2, -1)
+            self.tensors[self.center + 1] = np.tensordot(
+                r, self.tensors[self.center + 1], axes=(1, 0)
+            )
+            self.center += 1
+
+        while self.center > site:
+            tensor = self.tensors[self.center]
+            left, _, right = tensor.shape
+            q, r = np.linalg.qr(tensor.reshape(left, 2 * right).T)
+            self.tensors[self.center] = q.T.reshape(-1, 2, right)
+            self.tensors[self.center - 1] = np.tensordot(
+                self.tensors[self.center - 1], r.T, axes=(2, 0)
+            )
+            self.center -= 1
+
+    def apply_one_qubit_gate(self, site: int, matrix: np.ndarray):
+        """
+        Applies a (2, 2) unitary to ``site``, which keeps the canonical form.
+        """
+        self.tensors[site] = np.einsum("st,atb->asb", matrix, self.tensors[site])
+
+    def apply_two_qubit_gate(self, site_1: int, site_2: int, matrix: np.ndarray):
+        """
+        Applies a (4, 4) unitary to ``site_1`` and ``site_2``, with the index of
+        ``site_1`` first. Distant sites are brought next to each other with
+        SWAP gates, which are undone after the gate.
+        """
+        gate = matrix.reshape(2, 2, 2, 2)
+        if site_1 > site_2:
+            site_1, site_2 = site_2, site_1
+            gate = gate.transpose(1, 0, 3, 2)
+
+        for site in range(site_2 - 1, site_1, -1):
+            self._apply_adjacent(site, SWAP_MATRIX.reshape(2, 2, 2, 2))
+        self._apply_adjacent(site_1, gate)
+        for site in range(site_1 + 1, site_2):
+            self._apply_adjacent(site, SWAP_MATRIX.reshape(2, 2, 2, 2))
+
+    def _apply_adjacent(self, site: int, gate: np.ndarray):
+        """
+        Applies a (2, 2, 2, 2) gate to ``site`` and ``site + 1``, and splits the
+        result with a truncated SVD, leaving the center on ``site + 1``.
+        """
+        self.move_center(site)
+
+        theta = np.tensordot(self.tensors[site], self.tensors[site + 1], axes=(2, 0))
+        theta = np.einsum("stuv,auvb->astb", gate, theta)
+        left, right = theta.shape[0], theta.shape[3]
+        theta = theta.reshape(left * 2, 2 * right)
+
+        try:
+            u, s, vh = np.linalg.svd(theta, full_matrices=False)
+        except np.linalg.LinAlgError:
+            u, s, vh = scipy.linalg.svd(
+                theta, full_matrices=False, lapack_driver="gesvd"
+            )
+
+        # keep the largest singular values whose discarded weight is within tolerance
+        weights = s**2
+        norm = np.sum(weights)
+        tail = np.cumsum(weights[::-1])[::-1] / norm
+        keep = max(1, int(np.sum(tail > self.truncation_error)))
+        keep = min(keep, self.max_bond_dim)
+
+        self.discarded_weight += float(np.sum(weights[keep:]) / norm)
+        s = s[:keep] / np.linalg.norm(s[:keep])
+
+        self.tensors[site] = u[:, :keep].reshape(left, 2, keep)
+        self.tensors[site + 1] = (s[:, None] * vh[:keep]).reshape(keep, 2, right)
+        self.center = site + 1
+
+    def _left_environments(self) -> List[np.ndarray]:
+        """
+        Moves the center to the first site, such that the environment right of
+        any site is the identity, and returns the environments left of every
+        site, ``L[k]`` being the contraction of the sites before ``k``.
+        """
+        self.move_center(0)
+
+        environments = [np.ones((1, 1), dtype=complex)]
+        for tensor in self.tensors[:-1]:
+            environments.append(self._transfer(environments[-1], tensor))
+
+        return environments
+
+    @staticmethod
+    def _transfer(
+        environment: np.ndarray, tensor: np.ndarray, weights: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Contracts a left environment with a site, whose basis states are
+        weighted by ``weights`` (a diagonal operator) if given.
+        """
+        half = np.tensordot(environment, tensor, axes=(1, 0))
+        if weights is not None:
+            half = half * weights[None, :, None]
+        return np.tensordot(tensor.conj(), half, axes=([0, 1], [0, 1]))
+
+    @staticmethod
+    def _site_weights(environment: np.ndarray, tensor: np.ndarray) -> np.ndarray:
+        """
+        Closes a left environment on a site, with the identity on its right,
+        returning the contribution of each of its two basis states.
+        """
+        half = np.tensordot(environment, tensor, axes=(1, 0))
+        return np.einsum("asb,asb->s", tensor.conj(), half).real
+
+    def z_expectations(self, terms: List[Tuple[int, ...]]) -> np.ndarray:
+        """
+        Computes the expectation values of Pauli Z strings.
+
+        Terms sharing all of their sites but the last are computed together,
+        propagating the environment of their common prefix once along the
+        chain and closing it on each of their last sites.
+
+        Parameters
+        ----------
+        terms: `List[Tuple[int, ...]]`
+            The sites of each Z string, in increasing order.
+
+        Returns
+        -------
+        exp_vals: `np.ndarray`
+            The expectation value of every term.
+        """
+        environments = self._left_environments()
+        z_weights = np.array([1.0, -1.0])
+
+        groups = {}
+        for idx, sites in enumerate(terms):
+            groups.setdefault(tuple(sites[:-1]), []).append((sites[-1], idx))
+
+        exp_vals = np.ones(len(terms))
+        for prefix, closings in groups.items():
+            closings.sort()
+            if len(prefix) == 0:
+                for site, idx in closings:
+                    weights = self._site_weights(environments[site], self.tensors[site])
+                    exp_vals[idx] = weights @ z_weights
+                continue
+
+            prefix_sites = set(prefix)
+            environment = environments[prefix[0]]
+            site = prefix[0]
+            for last_site, idx in closings:
+                while site < last_site:
+                    weights = z_weights if site in prefix_sites else None
+                    environment = self._transfer(
+                        environment, self.tensors[site], weights
+                    )
+                    site += 1
+                weights = self._site_weights(environment, self.tensors[last_site])
+                exp_vals[idx] = weights @ z_weights
+
+        return exp_vals
+
+    def sample(self, n_shots: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Samples measurement outcomes in the computational basis, site by site
+        from the conditional probabilities, all shots at once.
+
+        Parameters
+        ----------
+        n_shots: `int`
+            Number of outcomes to sample.
+        rng: `np.random.Generator`
+            The random number generator.
+
+        Returns
+        -------
+        bits: `np.ndarray`
+            Array of shape ``(n_shots, n_qubits)``, the k-th column being the
+            value of site k.
+        """
+        self.move_center(0)
+
+        bits = np.zeros((n_shots, self.n_qubits), dtype=np.uint8)
+        left = np.ones((n_shots, 1), dtype=complex)
+        for site, tensor in enumerate(self.tensors):
+            # amplitudes of the two outcomes of the site for every shot, of shape (shots, 2, bond)
+            amplitudes = np.tensordot(left, tensor, axes=(1, 0))
+            probabilities = np.sum(np.abs(amplitudes) ** 2, axis=2)
+            probabilities /= np.sum(probabilities, axis=1, keepdims=True)
+
+            outcomes = (rng.random(n_shots) >= probabilities[:, 0]).astype(np.uint8)
+            bits[:, site] = outcomes
+
+            left = amplitudes[np.arange(n_shots), outcomes]
+            left /= np.sqrt(probabilities[np.arange(n_shots), outcomes])[:, None]
+
+        return bits
+
+
+class QAOABackendMPSSimulator(QAOABaseBackendShotBased):
+    """
+    A simulator class for QAOA circuits with low entanglement, which applies
+    the gates of the ``abstract_circuit`` to a matrix-product state (MPS). The
+    bond dimension is capped after every two-qubit gate, discarding the
+    smallest singular values, so that the cost only grows polynomially with
+    the number of qubits for shallow circuits on near one-dimensional layouts,
+    such as the nearest-neighbour gate lists of routed circuits. Gates on
+    distant qubits are applied with SWAP gates along the chain.
+
+    The expectation value of the cost Hamiltonian is computed exactly from the
+    MPS, while the measurement outcomes are sampled from it, ``n_shots`` at a
+    time. For a CVaR cost (``cvar_alpha < 1``) the expectation is computed from
+    the samples.
+
+    Parameters
+    ----------
+    qaoa_descriptor: QAOADescriptor
+        An object of the class ``QAOADescriptor`` which contains information on
+        circuit construction and depth of the circuit.
+    init_hadamard: bool
+        Whether to apply Hadamard gates to the beginning of the QAOA part of the circuit.
+    cvar_alpha: float
+        Conditional Value-at-Risk (CVaR) - a float between 0 and 1.
+    n_shots: int
+        The number of outcomes sampled from the MPS. Defaults to 100.
+    seed_simulator: int
+        Seed of the random number generator used for sampling.
+    max_bond_dim: int
+        The largest bond dimension of the MPS. Defaults to 64.
+    truncation_error: float
+        The largest weight of the singular values discarded at each truncation,
+        relative to the squared norm of the state. Defaults to 1e-10.
+    """
+
+    def __init__(
+        self,
+        qaoa_descriptor: QAOADescriptor,
+        prepend_state=None,
+        append_state=None,
+        init_hadamard: bool = True,
+        cvar_alpha: float = 1,
+        n_shots: int = 100,
+        seed_simulator: Optional[int] = None,
+        max_bond_dim: int = 64,
+        truncation_error: float = 1e-10,
+    ):
+
+        # checking if not supported parameters are passed
+        for k, val in {
+            "Prepend_state": (prepend_state, None),
+            "append_state": (append_state, None),
+        }.items():
+            if val[0] is not val[1]:
+                print(f"{k} is not supported for the mps backend. {k} is set to None.")
+
+        QAOABaseBackendShotBased.__init__(
+            self,
+            qaoa_descriptor,
+            n_shots,
+            prepend_state=None,
+            append_state=None,
+            init_hadamard=init_hadamard,
+            cvar_alpha=cvar_alpha,
+        )
+
+        if not (isinstance(max_bond_dim, (int, np.integer)) and max_bond_dim >= 1):
+            raise ValueError(
+                f"max_bond_dim must be a positive integer, got {max_bond_dim}"
+            )
+        if not 0 <= truncation_error < 1:
+            raise ValueError(
+                f"truncation_error must be in the interval [0, 1), got {truncation_error}"
+            )
+
+        self.max_bond_dim = max_bond_dim
+        self.truncation_error = truncation_error
+        self.seed_simulator = seed_simulator
+        self.rng = np.random.default_rng(seed_simulator)
+
+        # the Pauli string generating each rotation gate, e.g. "ZZ" for RZZGateMap
+        self._gate_paulis = []
+        for each_gate in self.abstract_circuit:
+            if isinstance(each_gate, SWAPGateMap):
+                continue
+            gate_name = type(each_gate).__name__
+            pauli_str = gate_name[1 : -len("GateMap")]
+            if not (
+                isinstance(each_gate, RotationGateMap)
+                and pauli_str
+                and set(pauli_str) <= set("XYZ")
+            ):
+                raise ValueError(
+                    f"The gate {gate_name} is not supported by the mps simulator."
+                )
+            self._gate_paulis.append(pauli_str)
+
+        # the qubit each problem qubit is measured on, after the SWAPs of a routed circuit
+        n_problem_qubits = self.cost_hamiltonian.n_qubits
+        self._measured_qubits = (
+            list(self.final_mapping[:n_problem_qubits])
+            if self.final_mapping is not None
+            else list(range(n_problem_qubits))
+        )
+
+        self._term_sites = []
+        for term in self.cost_hamiltonian.terms:
+            if set(term.pauli_str) != {"Z"}:
+                raise ValueError(
+                    "The mps simulator only supports cost Hamiltonians made of "
+                    f"Pauli Z strings, got {term.pauli_str}."
+                )
+            self._term_sites.append(
+                tuple(sorted(self._measured_qubits[q] for q in term.qubit_indices))
+            )
+
+        self.mps = None
+        self.measurement_outcomes = {}
+
+    @property
+    def discarded_weight(self) -> float:
+        """
+        The total weight of the singular values discarded while running the
+        last circuit, an estimate of the infidelity of the simulated state.
+        """
+        return self.mps.discarded_weight if self.mps is not None else 0.0
+
+    def reset_circuit(self):
+        """
+        Resets the MPS to the initial product state.
+        """
+        self.mps = _MatrixProductState(
+            self.n_qubits, self.max_bond_dim, self.truncation_error, self.init_hadamard
+        )
+
+    def qaoa_circuit(self, params: QAOAVariationalBaseParams) -> _MatrixProductState:
+        """
+        Applies the gates of the ``abstract_circuit``, with the angles specified
+        in ``params``, to the initial MPS.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters - an object of one of the parameter classes, containing
+            variable parameters.
+
+        Returns
+        -------
+        mps: `_MatrixProductState`
+            The final state of the circuit.
+        """
+        angles = iter(self.obtain_angles_for_pauli_list(self.abstract_circuit, params))
+        paulis = iter(self._gate_paulis)
+        self.reset_circuit()
+
+        for each_gate in self.abstract_circuit:
+            if isinstance(each_gate, SWAPGateMap):
+                self.mps.apply_two_qubit_gate(
+                    each_gate.qubit_1, each_gate.qubit_2, SWAP_MATRIX
+                )
+                continue
+
+            pauli_str = next(paulis)
+            matrix = _pauli_rotation(pauli_str, next(angles))
+            if len(pauli_str) == 1:
+                self.mps.apply_one_qubit_gate(each_gate.qubit_1, matrix)
+            else:
+                self.mps.apply_two_qubit_gate(
+                    each_gate.qubit_1, each_gate.qubit_2, matrix
+                )
+
+        return self.mps
+
+    def term_expectations(self, params: QAOAVariationalBaseParams) -> np.ndarray:
+        """
+        Runs the circuit and computes the expectation values of all the terms of
+        the cost Hamiltonian from the MPS.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters - an object of one of the parameter classes, containing
+            variable parameters.
+
+        Returns
+        -------
+        exp_vals: `np.ndarray`
+            Expectation values of the terms, in the order of ``cost_hamiltonian.terms``.
+        """
+        self.qaoa_circuit(params)
+        return self.mps.z_expectations(self._term_sites)
+
+    def _sample_counts(self, n_shots: Optional[int]) -> dict:
+        """
+        Samples the measurement outcomes of the problem qubits from the current
+        MPS, and stores them in ``measurement_outcomes``.
+        """
+        n_shots = self.n_shots if n_shots is None else n_shots
+
+        bits = self.mps.sample(n_shots, self.rng)[:, self._measured_qubits]
+        outcomes, counts = np.unique(bits, axis=0, return_counts=True)
+
+        self.measurement_outcomes = dict(
+            zip(_bitstrings_from_bits(outcomes), counts.tolist())
+        )
+        return self.measurement_outcomes
+
+    def get_counts(self, params: QAOAVariationalBaseParams, n_shots=None) -> dict:
+        """
+        Runs the circuit and samples measurement outcomes from the MPS.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters - an object of one of the parameter classes, containing
+            variable parameters.
+        n_shots: `int`
+            The number of outcomes to sample. If None, the backend default.
+
+        Returns
+        -------
+        counts: `dict`
+            The bitstrings, qubit k being the k-th character, and their counts.
+        """
+        # generate a job id
+        self.job_id = generate_uuid()
+
+        self.qaoa_circuit(params)
+        return self._sample_counts(n_shots)
+
+    @round_value
+    def expectation(self, params: QAOAVariationalBaseParams, n_shots=None) -> float:
+        """
+        Compute the expectation value w.r.t the Cost Hamiltonian from the MPS,
+        sampling ``n_shots`` measurement outcomes along the way.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters - an object of one of the parameter classes, containing
+            variable parameters.
+        n_shots: `int`
+            The number of outcomes to sample. If None, the backend default.
+
+        Returns
+        -------
+        float:
+            Expectation value of cost operator wrt to quantum state produced by QAOA circuit
+        """
+        counts = self.get_counts(params, n_shots)
+        if self.cvar_alpha != 1:
+            return cost_function(
+                counts, self.compiled_cost_hamiltonian, self.cvar_alpha
+            )
+
+        cost = self.cost_hamiltonian.constant + np.dot(
+            self.cost_hamiltonian.coeffs, self.mps.z_expectations(self._term_sites)
+        )
+        return cost
+
+    @round_value
+    def expectation_w_uncertainty(
+        self, params: QAOAVariationalBaseParams, n_shots=None
+    ) -> Tuple[float, float]:
+        """
+        Compute the expectation value w.r.t the Cost Hamiltonian from the MPS,
+        and its uncertainty from the spread of the energies of ``n_shots``
+        sampled outcomes.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters - an object of one of the parameter classes, containing
+            variable parameters.
+        n_shots: `int`
+            The number of outcomes to sample. If None, the backend default.
+
+        Returns
+        -------
+        Tuple[float]:
+            expectation value and its uncertainty of cost operator wrt
+            to quantum state produced by QAOA circuit.
+        """
+        counts = self.get_counts(params, n_shots)
+        cost, variance = cost_statistics(
+            counts, self.compiled_cost_hamiltonian, self.cvar_alpha
+        )
+
+        if self.cvar_alpha == 1:
+            cost = self.cost_hamiltonian.constant + np.dot(
+                self.cost_hamiltonian.coeffs, self.mps.z_expectations(self._term_sites)
+            )
+
+        return (cost, np.sqrt(variance))
+
+    def expectation_batch(
+        self,
+        params: QAOAVariationalBaseParams,
+        params_array: np.ndarray,
+        n_shots=None,
+    ) -> np.ndarray:
+        """
+        Compute the expectation value of the cost operator for a batch of
+        parameter sets, one parameter set at a time, so that each of them is
+        computed from the MPS rather than from the sampled outcomes.
+        """
+        return QAOABaseBackend.expectation_batch(self, params, params_array, n_shots)
+
+    def circuit_to_qasm(self):
+        raise NotImplementedError("This method is irrelevant for this backend")
@@ -0,0 +1,548 @@
+"""
+Statevector simulator restricted to the basis states of fixed Hamming weight.
+XY mixers only exchange the values of pairs of qubits and cost Hamiltonians
+made of Pauli Z strings are diagonal, so the states they prepare from a Dicke
+state (or any state supported on a few Hamming weights) never leave the
+subspace spanned by the bitstrings of those weights. For n qubits and weight k
+its dimension is C(n, k), e.g. 2.7M amplitudes instead of 16M for n=24, k=12.
+"""
+from typing import Union, List, Tuple, Type, Optional
+import numpy as np
+
+from .basebackend import QAOABaseBackendStatevector
+from .qaoa_vectorized import QAOAvectorizedBackendSimulator
+from ..qaoa_components import QAOADescriptor
+from ..qaoa_components.ansatz_constructor.gatemap import (
+    RXXGateMap,
+    RYYGateMap,
+    RZGateMap,
+    RZZGateMap,
+)
+from ..qaoa_components.ansatz_constructor.gatemaplabel import GateMapType
+from ..qaoa_components.variational_parameters.variational_baseparams import (
+    QAOAVariationalBaseParams,
+)
+from ..utilities import generate_uuid, round_value, SubspaceVector
+
+# number of basis states whose cost is evaluated at once
+_COST_CHUNK_SIZE = 2**16
+
+
+def _popcounts(indices: np.ndarray, n_qubits: int) -> np.ndarray:
+    """
+    Returns the Hamming weight of each of the basis states ``indices``.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    weights = np.zeros(indices.shape, dtype=np.int64)
+    for qubit in range(n_qubits):
+        weights += (indices >> qubit) & 1
+
+    return weights
+
+
+def _hamming_weight_states(n_qubits: int, hamming_weights: List[int]) -> np.ndarray:
+    """
+    Returns the basis states of ``n_qubits`` qubits with one of the given
+    Hamming weights, as an increasing array of integers whose k-th bit is
+    qubit k.
+
+    The states of each weight are built qubit by qubit: those of the first
+    ``m + 1`` qubits are the states of the first ``m`` qubits with qubit ``m``
+    in 0, followed by those of one less weight with qubit ``m`` in 1, so that
+    they stay sorted without enumerating the 2^n bitstrings.
+    """
+    states = [np.zeros(1, dtype=np.int64)] + [
+        np.zeros(0, dtype=np.int64) for _ in range(n_qubits)
+    ]
+    for qubit in range(n_qubits):
+        for weight in reversed(range(1, qubit + 2)):
+            states[weight] = np.concatenate(
+                [states[weight], states[weight - 1] | (1 << qubit)]
+            )
+
+    return np.sort(np.concatenate([states[weight] for weight in hamming_weights]))
+
+
+class QAOABackendSubspaceSimulator(QAOABaseBackendStatevector):
+    r"""
+    A statevector simulator for QAOA circuits that conserve the Hamming weight,
+    i.e. made of diagonal cost gates (RZ and RZZ) and of XY mixer gates, which
+    only stores the amplitudes of the basis states whose Hamming weight is
+    reached by the initial state.
+
+    The basis of the subspace and, for every pair of qubits of the mixer, the
+    indices of the basis states exchanged by the hopping term
+    :math:`\frac{1}{2}(X_iX_j + Y_iY_j)` are built once, when the simulator is
+    created. The RXX and RYY gates of a pair, applied one after the other with
+    the same angle :math:`\theta` by the XY mixer, then act together as the
+    rotation :math:`\cos\theta - i\sin\theta\,\sigma_x` between the states in
+    which the two qubits take the values 01 and 10, and leave the other states
+    untouched. Cost blocks in which every term is rotated by the same angle are
+    applied at once as a phase built from the cost diagonal, as in the
+    vectorized simulator.
+
+    The initial state is the ``prepend_state``, whose Hamming weights give the
+    subspace, or the uniform superposition of the states of ``hamming_weight``
+    (the Dicke state) when no ``prepend_state`` is given. The hopping indices
+    take two integers for every exchanged pair of basis states, which for the
+    fully connected XY mixer is more than the state itself; the chain and star
+    connectivities are cheaper.
+
+    Parameters
+    ----------
+    qaoa_descriptor: QAOADescriptor
+        An object of the class ``QAOADescriptor`` which contains information on
+        circuit construction and depth of the circuit.
+    prepend_state: np.array
+        The initial state of the circuit, an array of shape :math:`(2^{n_qubits},)`
+        or (2, 2, ..., 2). Defaults to the Dicke state of ``hamming_weight`` if
+        ``None``.
+    append_state: np.array
+        Not supported, must be ``None``.
+    init_hadamard: bool
+        Whether to apply Hadamard gates to the beginning of the QAOA part of the
+        circuit. Since the Hadamard gates do not conserve the Hamming weight, it
+        can only be used without ``prepend_state`` and ``hamming_weight``, the
+        initial state then spanning all the weights.
+    cvar_alpha: float
+        Conditional Value-at-Risk (CVaR) - must be 1 for this simulator.
+    hamming_weight: Union[int, List[int]]
+        The Hamming weight (or weights) of the subspace, required when there is
+        no ``prepend_state`` and ``init_hadamard`` is False. With a
+        ``prepend_state``, it must contain the weights of its basis states.
+    """
+
+    # the fusion of the cost blocks only depends on the abstract circuit
+    _fused_cost_layer_angles = QAOAvectorizedBackendSimulator._fused_cost_layer_angles
+
+    def __init__(
+        self,
+        qaoa_descriptor: QAOADescriptor,
+        prepend_state: Optional[Union[np.ndarray, List[complex]]],
+        append_state: Optional[Union[np.ndarray, List[complex]]],
+        init_hadamard: bool,
+        cvar_alpha: float = 1,
+        hamming_weight: Optional[Union[int, List[int]]] = None,
+    ):
+
+        assert (
+            cvar_alpha == 1
+        ), "Please use the shot-based simulator for simulations with cvar_alpha < 1"
+
+        QAOABaseBackendStatevector.__init__(
+            self,
+            qaoa_descriptor,
+            prepend_state,
+            append_state,
+            init_hadamard,
+            cvar_alpha,
+        )
+
+        if self.append_state is not None:
+            raise ValueError(
+                "append_state is not supported by the subspace simulator."
+            )
+        if self.qaoa_descriptor.routed == True:
+            raise ValueError(
+                "Routed circuits are not supported by the subspace simulator."
+            )
+
+        self._gate_blocks = self._hamming_weight_preserving_blocks()
+
+        if hamming_weight is not None:
+            hamming_weight = sorted(set(np.atleast_1d(hamming_weight).tolist()))
+            if not all(0 <= weight <= self.n_qubits for weight in hamming_weight):
+                raise ValueError(
+                    f"hamming_weight must be between 0 and {self.n_qubits}, "
+                    f"got {hamming_weight}"
+                )
+
+        self._init_basis(hamming_weight)
+        self._init_cost_hamiltonian()
+
+        # basis states exchanged by the hopping term of each pair of qubits
+        self._hopping_indices = {}
+        for block in self._gate_blocks:
+            qubits = self._gate_qubits(self.abstract_circuit[block[0]])
+            if len(block) == 2 and qubits not in self._hopping_indices:
+                self._hopping_indices[qubits] = self._build_hopping_indices(*qubits)
+
+        self.measurement_outcomes = None
+
+    @staticmethod
+    def _gate_qubits(gate) -> tuple:
+        """
+        Returns the qubits a one or two-qubit gate acts on.
+        """
+        if hasattr(gate, "qubit_2"):
+            return (gate.qubit_1, gate.qubit_2)
+        return (gate.qubit_1,)
+
+    def _hamming_weight_preserving_blocks(self) -> List[tuple]:
+        """
+        Splits the ``abstract_circuit`` into blocks of gates applied together:
+        the diagonal RZ and RZZ gates on their own, and the RXX and RYY gates
+        of the XY mixer by pairs acting on the same qubits.
+
+        Returns
+        -------
+        gate_blocks:
+            List of tuples with the indices of the gates of each block.
+        """
+        gate_blocks = []
+        i = 0
+        while i < len(self.abstract_circuit):
+            each_gate = self.abstract_circuit[i]
+            if isinstance(each_gate, (RZGateMap, RZZGateMap)):
+                gate_blocks.append((i,))
+                i += 1
+                continue
+
+            next_gate = (
+                self.abstract_circuit[i + 1]
+                if i + 1 < len(self.abstract_circuit)
+                else None
+            )
+            if not (
+                isinstance(each_gate, RXXGateMap)
+                and isinstance(next_gate, RYYGateMap)
+                and self._gate_qubits(each_gate) == self._gate_qubits(next_gate)
+            ):
+                raise ValueError(
+                    f"The gate {type(each_gate).__name__} does not conserve the "
+                    "Hamming weight. The subspace simulator only supports the XY "
+                    "mixer and cost Hamiltonians with linear and quadratic terms."
+                )
+            gate_blocks.append((i, i + 1))
+            i += 2
+
+        return gate_blocks
+
+    def _init_basis(self, hamming_weight: Optional[List[int]]):
+        """
+        Determines the Hamming weights of the subspace from the initial state,
+        builds its basis ``basis_states``, the values of the qubits on each of
+        its states, and the initial state ``wavefn_init``.
+        """
+        if self.prepend_state is not None:
+            if self.init_hadamard:
+                raise ValueError(
+                    "The Hadamard gates do not conserve the Hamming weight of the "
+                    "prepend_state, please set init_hadamard to False."
+                )
+
+            prepend_state = np.asarray(self.prepend_state, dtype=complex)
+            if prepend_state.size != 2**self.n_qubits or prepend_state.shape not in [
+                (2**self.n_qubits,),
+                (2,) * self.n_qubits,
+            ]:
+                raise ValueError(
+                    "Error : Unsupported prepend_state specified."
+                    "Not of shape (2**n,) or (2, 2, ..., 2))."
+                )
+            prepend_state = prepend_state.reshape(-1)
+
+            support = np.flatnonzero(prepend_state)
+            weights = np.unique(_popcounts(support, self.n_qubits)).tolist()
+            if hamming_weight is not None and not set(weights) <= set(hamming_weight):
+                raise ValueError(
+                    f"The prepend_state has components of Hamming weights {weights}, "
+                    f"outside of hamming_weight {hamming_weight}."
+                )
+            self.hamming_weights = hamming_weight or weights
+
+        elif self.init_hadamard:
+            if hamming_weight is not None:
+                raise ValueError(
+                    "The Hadamard gates prepare a state of every Hamming weight, "
+                    "please set init_hadamard to False to start from the Dicke "
+                    "state of hamming_weight."
+                )
+            self.hamming_weights = list(range(self.n_qubits + 1))
+
+        else:
+            if hamming_weight is None:
+                raise ValueError(
+                    "Please specify the Hamming weight of the subspace, either "
+                    "with a prepend_state or with hamming_weight."
+                )
+            self.hamming_weights = hamming_weight
+
+        self.basis_states = _hamming_weight_states(self.n_qubits, self.hamming_weights)
+        self.subspace_dim = len(self.basis_states)
+
+        # value of each qubit on the basis states, with shape (n_qubits, subspace_dim)
+        self._qubit_values = (
+            (self.basis_states[None, :] >> np.arange(self.n_qubits)[:, None]) & 1
+        ).astype(np.uint8)
+
+        if self.prepend_state is not None:
+            self.wavefn_init = prepend_state[self.basis_states]
+        else:
+            # the Dicke state of the weights, or |+>^n spanning all of them
+            self.wavefn_init = np.full(
+                self.subspace_dim, 1 / np.sqrt(self.subspace_dim), dtype=complex
+            )
+        self.wavefn = self.wavefn_init.copy()
+
+    def _init_cost_hamiltonian(self):
+        """
+        Builds the cost Hamiltonian ``ham_op`` on the basis of the subspace,
+        together with the diagonal without its constant term used for the cost
+        layers.
+        """
+        self.ham_op = np.empty(self.subspace_dim)
+        for start in range(0, self.subspace_dim, _COST_CHUNK_SIZE):
+            stop = start + _COST_CHUNK_SIZE
+            self.ham_op[start:stop] = np.real(
+                self.compiled_cost_hamiltonian.energies(self.basis_states[start:stop])
+            )
+        self._cost_diagonal = self.ham_op - np.real(self.cost_hamiltonian.constant)
+
+    def _build_hopping_indices(self, qubit_1: int, qubit_2: int) -> np.ndarray:
+        """
+        Finds the pairs of basis states exchanged by the hopping term between
+        ``qubit_1`` and ``qubit_2``. Exchanging the values of two qubits adds
+        the same integer to all the states in which they take the values 10,
+        so that the k-th of them is paired with the k-th state in which they
+        take the values 01.
+
+        Returns
+        -------
+        hopping_indices:
+            Array of shape (2, n_pairs), with the indices of the basis states in
+            which ``qubit_1`` and ``qubit_2`` take the values 10 in its first
+            row, and of the states they are exchanged with in the second row.
+        """
+        values_1 = self._qubit_values[qubit_1]
+        values_2 = self._qubit_values[qubit_2]
+
+        # the smallest integer dtype that can index the subspace
+        index_dtype = np.int32 if self.subspace_dim < 2**31 else np.int64
+        return np.stack(
+            [np.flatnonzero(values_1 > values_2), np.flatnonzero(values_1 < values_2)]
+        ).astype(index_dtype)
+
+    def apply_rz(self, qubit_1: int, rotation_angle: float):
+        r"""
+        Applies the RZ($\theta$ = ``rotation_angle``) gate on ``qubit_1``.
+        """
+        phases = np.exp(np.array([-1j, 1j]) * rotation_angle / 2)
+        self.wavefn *= phases[self._qubit_values[qubit_1]]
+
+    def apply_rzz(self, qubit_1: int, qubit_2: int, rotation_angle: float):
+        r"""
+        Applies the RZZ($\theta$ = ``rotation_angle``) gate on ``qubit_1`` and ``qubit_2``.
+        """
+        phases = np.exp(np.array([-1j, 1j]) * rotation_angle / 2)
+        parities = self._qubit_values[qubit_1] ^ self._qubit_values[qubit_2]
+        self.wavefn *= phases[parities]
+
+    def apply_xy_hopping(self, qubit_1: int, qubit_2: int, rotation_angle: float):
+        r"""
+        Applies :math:`R_{XX}(\theta) R_{YY}(\theta)`, with :math:`\theta` =
+        ``rotation_angle``, on ``qubit_1`` and ``qubit_2``, rotating every pair
+        of basis states in which the two qubits take the values 10 and 01 by
+        :math:`\cos\theta - i\sin\theta\,\sigma_x`.
+        """
+        hopping_indices = self._hopping_indices[(qubit_1, qubit_2)]
+
+        # a single gather and scatter, the pairs being rotated by one matrix product
+        cos, sin = np.cos(rotation_angle), -1j * np.sin(rotation_angle)
+        rotation = np.array([[cos, sin], [sin, cos]])
+        self.wavefn[hopping_indices] = rotation @ self.wavefn[hopping_indices]
+
+    def apply_cost_layer(self, gamma: float):
+        r"""
+        Applies the whole cost block of a layer at once, as the diagonal
+        :math:`\exp(-i \gamma (H - c))`, with :math:`c` the constant of the
+        cost Hamiltonian.
+        """
+        self.wavefn *= np.exp(-1j * gamma * self._cost_diagonal)
+
+    def qaoa_circuit(self, params: Type[QAOAVariationalBaseParams]):
+        """
+        Executes the entire QAOA circuit, with angles specified within ``params``,
+        on the initial state restricted to the subspace.
+
+        Parameters
+        ----------
+        params:
+            ``QAOAVariationalBaseParams`` object that contains rotation angles and gates to be applied.
+
+        Returns
+        -------
+            None
+        """
+        # generate a job id for the wavefunction evaluation
+        self.job_id = generate_uuid()
+
+        self.reset_circuit()
+        self.assign_angles(params)
+        fused_angles = self._fused_cost_layer_angles()
+
+        applied_cost_layers = set()
+        for block in self._gate_blocks:
+            each_gate = self.abstract_circuit[block[0]]
+            gate_label = each_gate.gate_label
+            qubits = self._gate_qubits(each_gate)
+
+            if gate_label.type == GateMapType.COST and gate_label.layer in fused_angles:
+                if gate_label.layer not in applied_cost_layers:
+                    self.apply_cost_layer(fused_angles[gate_label.layer])
+                    applied_cost_layers.add(gate_label.layer)
+            elif isinstance(each_gate, RZGateMap):
+                self.apply_rz(*qubits, each_gate.angle_value)
+            elif isinstance(each_gate, RZZGateMap):
+                self.apply_rzz(*qubits, each_gate.angle_value)
+            else:
+                angle_value = each_gate.angle_value
+                if not np.isclose(
+                    angle_value, self.abstract_circuit[block[1]].angle_value
+                ):
+                    raise ValueError(
+                        "The RXX and RYY gates of the XY mixer must have the same "
+                        f"angle to conserve the Hamming weight, on qubits {qubits}."
+                    )
+                self.apply_xy_hopping(*qubits, angle_value)
+
+    def _measurement_outcomes(self) -> SubspaceVector:
+        """
+        Returns a copy of the wavefunction, as a ``SubspaceVector`` of the
+        amplitudes on the basis states of the subspace, expanded to the
+        2**n_qubits amplitudes only when read.
+        """
+        return SubspaceVector(self.wavefn.copy(), self.basis_states, self.n_qubits)
+
+    def wavefunction(self, params: Type[QAOAVariationalBaseParams] = None) -> list:
+        """
+        Get the wavefunction of the state produced by the parametric circuit.
+
+        Parameters
+        ----------
+        params:
+            The QAOA parameters - an object of one of the parameter classes, containing
+            hyperparameters and variable parameters.
+
+        Returns
+        -------
+        wf:
+            A list of the wavefunction amplitudes.
+        """
+        self.qaoa_circuit(params)
+        self.measurement_outcomes = self._measurement_outcomes()
+
+        return list(self.measurement_outcomes.expand())
+
+    def probabilities(self, params: Type[QAOAVariationalBaseParams]) -> SubspaceVector:
+        """
+        Get the probabilities of all the basis states in the state produced by
+        the parametric circuit, which vanish outside of the subspace and are
+        only stored on its basis states.
+
+        Parameters
+        ----------
+        params:
+            The QAOA parameters - an object of one of the parameter classes, containing
+            hyperparameters and variable parameters.
+
+        Returns
+        -------
+        prob_vec:
+            ``SubspaceVector`` of the probabilities, which ``np.asarray`` turns
+            into the array of shape (2**n_qubits,) with the probability of each
+            basis state.
+        """
+        self.qaoa_circuit(params)
+
+        return SubspaceVector(
+            np.abs(self.wavefn) ** 2, self.basis_states, self.n_qubits
+        )
+
+    def sample_counts(
+        self, params: Type[QAOAVariationalBaseParams], n_shots: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sample measurement outcomes with a single multinomial draw over the
+        probabilities of the basis states of the subspace, using the global
+        NumPy random state.
+
+        Parameters
+        ----------
+        params:
+            The QAOA parameters - an object of one of the parameter classes, containing
+            hyperparameters and variable parameters.
+        n_shots:
+            The number of measurement shots required; specified as integer
+
+        Returns
+        -------
+        outcomes:
+            The basis states measured at least once, in increasing order.
+        counts:
+            The number of times each outcome was measured.
+        """
+        self.qaoa_circuit(params)
+
+        prob_vec = np.abs(self.wavefn) ** 2
+        counts = np.random.multinomial(n_shots, prob_vec / np.sum(prob_vec))
+        measured = np.flatnonzero(counts)
+
+        return self.basis_states[measured], counts[measured]
+
+    @round_value
+    def expectation(self, params: Type[QAOAVariationalBaseParams]) -> float:
+        """
+        Call the execute function on the circuit to compute the
+        expectation value of the Quantum Circuit w.r.t cost operator
+
+        Returns
+        -------
+        exp_val:
+            The expectation value of the cost function wrt the state generated by the circuit.
+        """
+        self.qaoa_circuit(params)
+        self.measurement_outcomes = self._measurement_outcomes()
+
+        prob_vec = np.abs(self.wavefn) ** 2
+
+        return np.dot(prob_vec, self.ham_op)
+
+    @round_value
+    def expectation_w_uncertainty(
+        self, params: Type[QAOAVariationalBaseParams]
+    ) -> Tuple[float, float]:
+        """
+        Call the execute function on the circuit to compute the
+        expectation value of the ``QuantumCircuit`` w.r.t cost operator
+        along with its uncertainty
+
+        Returns
+        -------
+        exp_val:
+            The expectation value of the cost function wrt the state generated by the circuit.
+        std_dev:
+            The standard deviation of the cost function wrt the state generated by the circuit.
+        """
+        self.qaoa_circuit(params)
+        self.measurement_outcomes = self._measurement_outcomes()
+
+        prob_vec = np.abs(self.wavefn) ** 2
+        exp_val = np.dot(prob_vec, self.ham_op)
+        exp_val_sq = np.dot(prob_vec, self.ham_op**2)
+        std_dev = max(exp_val_sq - exp_val**2, 0) ** 0.5
+
+        return exp_val, std_dev
+
+    def reset_circuit(self):
+        """
+        Reset the circuit by resetting the wavefunction to the initial state.
+        """
+        np.copyto(self.wavefn, self.wavefn_init)
+
+    def circuit_to_qasm(self):
+        """
+        A method to convert the entire QAOA ``QuantumCircuit`` object into
+        a OpenQASM string
+        """
+        raise NotImplementedError()
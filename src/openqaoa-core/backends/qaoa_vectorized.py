@@ -2,7 +2,13 @@
 Wavefunction simulator with methods focused on fast QAOA implementations.
 Can easily be extended to do the full suite of operations in an ordinary simulator.
 """
-from typing import Union, List, Tuple, Type, Optional
+from typing import Union, List, Tuple, Type, Optional, Callable
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from itertools import product
+import hashlib
+import os
 import numpy as np
 from copy import copy
 from scipy.sparse import csc_matrix, kron, diags
@@ -11,10 +17,17 @@ from scipy.sparse.linalg import expm
 from .basebackend import QAOABaseBackendStatevector
 from .gates_vectorized import VectorizedGateApplicator
 from ..qaoa_components import QAOADescriptor, Hamiltonian
+from ..qaoa_components.ansatz_constructor.gatemap import RXGateMap, RZZGateMap
+from ..qaoa_components.ansatz_constructor.gatemaplabel import GateMapType
 from ..qaoa_components.variational_parameters.variational_baseparams import (
     QAOAVariationalBaseParams,
 )
-from ..utilities import generate_uuid, round_value
+from ..utilities import (
+    generate_uuid,
+    round_value,
+    _cost_hamiltonian_block,
+    FoldedStatevector,
+)
 
 
 # Pauli gates
@@ -125,8 +138,147 @@ def _permute_qubits(wavefn: np.ndarray, perm: list) -> np.ndarray:
     return wavefn
 
 
+def _qubit_slice(qubit_values: dict) -> tuple:
+    """
+    Index selecting the wavefunction components in which each of the given
+    qubits takes the specified value. Qubits are counted from the last axis,
+    so that the index also applies to a batch of wavefunctions stacked along
+    a leading axis.
+
+    Parameters
+    ----------
+    qubit_values:
+        Dictionary mapping qubit indices to their value (0 or 1).
+
+    Returns
+    -------
+    slc:
+        The index to apply to the (..., 2, ..., 2) shaped wavefunction.
+    """
+
+    n_trailing = max(qubit_values) + 1
+    slc = [slice(None)] * n_trailing
+    for qubit, value in qubit_values.items():
+        slc[n_trailing - qubit - 1] = value
+
+    return (Ellipsis,) + tuple(slc)
+
+
+def _batch_broadcast(
+    values: Union[float, np.ndarray], n_dims: int, dtype: Optional[type] = None
+):
+    """
+    Reshapes values given per wavefunction of a batch (e.g. the gate angles)
+    so that they broadcast against ``n_dims`` trailing qubit axes.
+    Scalars are returned as scalars.
+
+    Parameters
+    ----------
+    values:
+        A scalar, or an array of shape (batch_size,).
+
+    n_dims:
+        Number of qubit axes the values are multiplied with.
+
+    dtype:
+        If specified, the values are cast to this dtype, so that the kernels
+        compute in the precision of the wavefunction.
+
+    Returns
+    -------
+    values:
+        The input, reshaped to (batch_size, 1, ..., 1) if it is an array.
+    """
+
+    values = np.asarray(values, dtype=dtype)
+    if values.ndim == 0:
+        return values[()]
+
+    return np.reshape(values, values.shape + (1,) * n_dims)
+
+
+def _negate_slices(wavefn: np.ndarray, qubit_values: dict):
+    """
+    Flips the sign, in place, of the wavefunction components in which each of
+    the given qubits takes the specified value.
+
+    Parameters
+    ----------
+    wavefn:
+        The (..., 2, ..., 2) shaped wavefunction, modified in place.
+
+    qubit_values:
+        Dictionary mapping qubit indices to their value (0 or 1).
+    """
+
+    wfn_slice = wavefn[_qubit_slice(qubit_values)]
+    np.negative(wfn_slice, out=wfn_slice)
+
+
+def _multiply_slices(wavefn: np.ndarray, phases: dict, qubits: tuple):
+    """
+    Multiplies in place each block of wavefunction components, selected by the
+    values of ``qubits``, by its own phase. Phases given per wavefunction of a
+    batch are broadcast over the remaining qubit axes.
+
+    Parameters
+    ----------
+    wavefn:
+        The (..., 2, ..., 2) shaped wavefunction, modified in place.
+
+    phases:
+        Dictionary mapping tuples with the values of ``qubits`` to the phase
+        multiplying the corresponding components.
+
+    qubits:
+        Tuple with the qubit indices selecting the blocks.
+    """
+
+    for values, phase in phases.items():
+        wfn_slice = wavefn[_qubit_slice(dict(zip(qubits, values)))]
+        phase = _batch_broadcast(
+            phase, wfn_slice.ndim - np.ndim(phase), wavefn.dtype
+        )
+        np.multiply(wfn_slice, phase, out=wfn_slice)
+
+
+# complex and real dtypes used by the vectorized simulator for each precision
+PRECISION_DTYPES = {
+    "double": (np.complex128, np.float64),
+    "single": (np.complex64, np.float32),
+}
+
+
+# wavefunctions smaller than this are never split across threads
+MIN_CHUNKED_SIZE = 2**14
+
+# memory budget, in bytes, of a batch simulated at once: its wavefunctions, their
+# scratch buffer and the copies kept in `measurement_outcomes`
+MAX_BATCH_BYTES = 2**30
+
+# thread pools shared by the simulators, one per number of workers
+_THREAD_POOLS = {}
+
+# a forked process inherits the pools but not their threads, so the pools are
+# dropped in the child and recreated on first use
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_THREAD_POOLS.clear)
+
+
+def _get_thread_pool(n_threads: int) -> ThreadPoolExecutor:
+    """
+    Returns the thread pool with ``n_threads`` workers, creating it on first use.
+    The pools are shared at module level so that backend objects remain copyable.
+    """
+
+    if n_threads not in _THREAD_POOLS:
+        _THREAD_POOLS[n_threads] = ThreadPoolExecutor(max_workers=n_threads)
+
+    return _THREAD_POOLS[n_threads]
+
+
 def _build_cost_hamiltonian(
-    n_qubits: int, cost_hamiltonian: Type[Hamiltonian]
+    n_qubits: int, cost_hamiltonian: Type[Hamiltonian], folded: bool = False
 ) -> np.array:
     """
     Builds the cost Hamiltonian as a vector, since it is diagonal.
@@ -142,6 +294,10 @@ def _build_cost_hamiltonian(
         Hamiltonian object containing information about
         single/2-qubit terms and their weights.
 
+    folded:
+        If True, only the half of the diagonal in which the highest qubit is 0
+        is built, as an array of shape [2]*(n_qubits - 1).
+
     Returns
     -------
     ham_op:
@@ -149,60 +305,72 @@ def _build_cost_hamiltonian(
         to a [2]*n_qubits dimensional array
 
     """
+    n_state_qubits = n_qubits - 1 if folded else n_qubits
+    ham_op = _cost_hamiltonian_block(cost_hamiltonian, 0, 2**n_state_qubits)
 
-    bias_qubits = cost_hamiltonian.qubits_singles
-    biases = cost_hamiltonian.single_qubit_coeffs
-    pairs = cost_hamiltonian.qubits_pairs
-    coeffs = cost_hamiltonian.pair_qubit_coeffs
-
-    terms = cost_hamiltonian.terms
-    weights = cost_hamiltonian.coeffs
-
-    # Check for non-classical terms
-    cost_ham_pauli_str_lst = [term.pauli_str for term in terms]
-    for term in cost_ham_pauli_str_lst:
-        if str(term) != "Z" and str(term) != "ZZ":
-            raise Exception(
-                f"Currently, only classical cost Hamiltonians"
-                "that consists of 'Z' and 'ZZ' terms are supported,"
-                "but a '{term}' term was encountered."
-            )
+    return ham_op.reshape([2] * n_state_qubits)
+
+
+# memory budget, in bytes, of the cost Hamiltonians cached across simulators
+COST_HAMILTONIAN_CACHE_BYTES = 2**30
+
+# read-only cost Hamiltonians, in least recently used order
+_COST_HAMILTONIAN_CACHE = OrderedDict()
+_COST_HAMILTONIAN_CACHE_LOCK = Lock()
 
-    ## ZZ operator on first two qubits, identity on all others to the right
-    # Diagonal matrix (vector) for cost function
-    iden_plus = np.ones(2 ** (n_qubits - 2), dtype=int)
-    iden_minus = -1 * np.ones(2 ** (n_qubits - 1), dtype=int)
-    ZZ_op = np.hstack((iden_plus, np.hstack((iden_minus, iden_plus))))
-    ZZ_op.shape = [2] * n_qubits
-
-    ## Z operator on first qubit, identity on all others to the right
-    Z_op = np.hstack(
-        (
-            np.ones(2 ** (n_qubits - 1), dtype=int),
-            -1 * np.ones(2 ** (n_qubits - 1), dtype=int),
-        )
-    )
-    Z_op.shape = [2] * n_qubits
 
-    ham_op = np.zeros([2] * n_qubits)
-    for j in range(len(pairs)):
-        perm, perminv = _get_perm(n_qubits, pairs[j].qubit_indices)
-        ZZ_op = _permute_qubits(ZZ_op, perminv)
+def _hamiltonian_fingerprint(
+    n_qubits: int, cost_hamiltonian: Type[Hamiltonian]
+) -> str:
+    """
+    Returns a digest of the number of qubits, the terms, the weights and the
+    constant of the cost Hamiltonian, identifying its diagonal.
+    """
+    digest = hashlib.sha1(repr((n_qubits, cost_hamiltonian.constant)).encode())
+    for term, weight in zip(cost_hamiltonian.terms, cost_hamiltonian.coeffs):
+        digest.update(
+            repr((str(term.pauli_str), tuple(term.qubit_indices), weight)).encode()
+        )
 
-        ham_op += coeffs[j] * ZZ_op
+    return digest.hexdigest()
 
-        ZZ_op = _permute_qubits(ZZ_op, perm)
 
-    for j in range(len(bias_qubits)):
-        perm, perminv = _get_perm(n_qubits, [bias_qubits[j].qubit_indices])
-        Z_op = _permute_qubits(Z_op, perminv)
+def _cached_cost_hamiltonian(
+    n_qubits: int,
+    cost_hamiltonian: Type[Hamiltonian],
+    dtype: np.dtype,
+    folded: bool = False,
+) -> np.ndarray:
+    """
+    Returns the cost Hamiltonian built by ``_build_cost_hamiltonian`` (or its
+    folded half) and cast to ``dtype``, from a least recently used cache keyed
+    by the fingerprint of the Hamiltonian, so that simulators of the same
+    problem skip the construction.
+    The least recently used entries are evicted when the cached arrays exceed
+    ``COST_HAMILTONIAN_CACHE_BYTES``. The returned array is read-only.
+    """
+    key = (
+        _hamiltonian_fingerprint(n_qubits, cost_hamiltonian),
+        np.dtype(dtype).str,
+        folded,
+    )
 
-        ham_op += biases[j] * Z_op
+    with _COST_HAMILTONIAN_CACHE_LOCK:
+        if key in _COST_HAMILTONIAN_CACHE:
+            _COST_HAMILTONIAN_CACHE.move_to_end(key)
+            return _COST_HAMILTONIAN_CACHE[key]
 
-        Z_op = _permute_qubits(Z_op, perm)
+    ham_op = _build_cost_hamiltonian(n_qubits, cost_hamiltonian, folded).astype(
+        dtype, copy=False
+    )
+    ham_op.flags.writeable = False
 
-    # add the constant term from the hamiltonian
-    ham_op += cost_hamiltonian.constant
+    with _COST_HAMILTONIAN_CACHE_LOCK:
+        _COST_HAMILTONIAN_CACHE[key] = ham_op
+        cached_bytes = sum(array.nbytes for array in _COST_HAMILTONIAN_CACHE.values())
+        while cached_bytes > COST_HAMILTONIAN_CACHE_BYTES:
+            _, evicted = _COST_HAMILTONIAN_CACHE.popitem(last=False)
+            cached_bytes -= evicted.nbytes
 
     return ham_op
 
@@ -231,6 +399,18 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
     Qubit labelling begins from the right, so that the right-most qubit has label 0,
     and the left-most has label n_qubits-1.
 
+    Cost Hamiltonians without single-qubit terms are invariant under the flip of
+    all the spins, and so is the state of a circuit of RZZ and RX gates starting
+    from :math:`|+\rangle^{\otimes n}`. This is detected when the simulator is
+    created (``z2_symmetric``), in which case ``wavefn`` only stores the
+    amplitudes with the highest qubit in 0, scaled by :math:`\sqrt{2}`, halving
+    the memory and the time of the simulation. In this folded basis, an RZZ gate
+    on the highest qubit acts as an RZ gate on the other qubit, and an RX gate
+    on it as the flip of all the remaining qubits. ``wavefunction`` and
+    ``probabilities`` return the full state, while the expectation values keep
+    ``measurement_outcomes`` folded, as a ``FoldedStatevector`` that is unfolded
+    when read (e.g. by ``QAOAResult``).
+
     Parameters
     ----------
     qaoa_descriptor: QAOADescriptor
@@ -250,6 +430,16 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
         only the tail of the probability distribution arising from the circut's
         count dictionary. Must be between 0 and 1.
         Check https://arxiv.org/abs/1907.04769 for further details.
+    precision: str
+        Floating point precision of the simulation, either ``"double"`` (the
+        wavefunction is stored as complex128 and the cost Hamiltonian as float64)
+        or ``"single"`` (complex64 and float32), which halves the memory footprint
+        and bandwidth at the price of accuracy of about 1e-6 on the expectation values.
+    n_threads: int
+        Number of threads used to apply the gates. With more than one thread, the
+        wavefunction is split into independent chunks along qubits not acted upon
+        by the gate, which are processed in parallel (NumPy releases the GIL in
+        its array operations). Defaults to 1.
     """
 
     def __init__(
@@ -259,12 +449,26 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
         append_state: Optional[Union[np.ndarray, List[complex]]],
         init_hadamard: bool,
         cvar_alpha: float = 1,
+        precision: str = "double",
+        n_threads: int = 1,
     ):
 
         assert (
             cvar_alpha == 1
         ), "Please use the shot-based simulator for simulations with cvar_alpha < 1"
 
+        if precision not in PRECISION_DTYPES:
+            raise ValueError(
+                f"Unsupported precision {precision}, please choose from {list(PRECISION_DTYPES)}"
+            )
+        self.precision = precision
+        self.dtype, self.real_dtype = PRECISION_DTYPES[precision]
+
+        if not (isinstance(n_threads, (int, np.integer)) and n_threads >= 1):
+            raise ValueError(f"n_threads must be a positive integer, got {n_threads}")
+        self.n_threads = n_threads
+        self._chunk_slices_cache = {}
+
         QAOABaseBackendStatevector.__init__(
             self,
             qaoa_descriptor,
@@ -274,8 +478,67 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
             cvar_alpha,
         )
 
-        # Build the Hamiltonian operator as an array
-        self.ham_op = _build_cost_hamiltonian(self.n_qubits, self.cost_hamiltonian)
+        # states with the spin-flip symmetry are stored without the highest qubit
+        self.z2_symmetric = self._detect_z2_symmetry()
+        self._n_state_qubits = self.n_qubits - int(self.z2_symmetric)
+
+        # scratch buffer used by the in-place gate kernels, see `_scratch_buffer`
+        self._scratch = None
+
+        self._init_cost_hamiltonian()
+        self._init_wavefunction()
+
+    def _detect_z2_symmetry(self) -> bool:
+        """
+        Whether the state of the circuit is invariant under the flip of all the
+        spins, i.e. the circuit starts from the uniform superposition and is made
+        of RZZ cost gates and RX mixer gates only.
+        """
+        return (
+            self.n_qubits >= 2
+            and self.prepend_state is None
+            and self.append_state is None
+            and self.init_hadamard
+            and not self.qaoa_descriptor.routed
+            and len(self.cost_hamiltonian.qubits_singles) == 0
+            and all(
+                isinstance(each_gate, RZZGateMap)
+                if each_gate.gate_label.type == GateMapType.COST
+                else isinstance(each_gate, RXGateMap)
+                for each_gate in self.abstract_circuit
+            )
+        )
+
+    def _init_cost_hamiltonian(self):
+        """
+        Gets the cost Hamiltonian ``ham_op`` as a read-only array, shared through
+        the cache of cost Hamiltonians by simulators of the same problem,
+        together with the diagonal without its constant term used by
+        ``apply_cost_layer``. Only the half in which the highest qubit is 0 is
+        needed for states with the spin-flip symmetry.
+        """
+        self.ham_op = _cached_cost_hamiltonian(
+            self.n_qubits, self.cost_hamiltonian, self.real_dtype, self.z2_symmetric
+        )
+        self._cost_diagonal = self.ham_op - self.real_dtype(
+            self.cost_hamiltonian.constant
+        )
+
+    def _init_wavefunction(self):
+        """
+        Prepares the initial wavefunction from ``prepend_state`` and
+        ``init_hadamard``, validates ``append_state``, and stores a copy of the
+        initial state in ``wavefn_init``.
+        """
+        if self.z2_symmetric:
+            # the uniform superposition, normalised on the stored half
+            self.wavefn_init = np.full(
+                (2,) * self._n_state_qubits,
+                2 ** (-self._n_state_qubits / 2),
+                dtype=self.dtype,
+            )
+            self.wavefn = copy(self.wavefn_init)
+            return
 
         if self.n_qubits > 0:
             self.wavefn = np.zeros((2**self.n_qubits,), dtype=complex)
@@ -318,12 +581,17 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
                 ):
                     raise ValueError("append_state is not a unitary matrix")
 
+                self.append_state = self.append_state.astype(self.dtype)
+
             else:
                 raise ValueError(
                     "Unsupported append_state specified (Not an ndarray,"
                     "or not of shape (2**n, 2**n)."
                 )
 
+        # the kernels work in place, so the wavefunction owns a complex copy of prepend_state
+        self.wavefn = np.array(self.wavefn, dtype=self.dtype)
+
         # Handle init_hadamard
         if self.init_hadamard:
             for i in range(self.n_qubits):
@@ -360,13 +628,29 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
             None
         """
 
-        C = np.cos(rotation_angle / 2)
-        S = -1j * np.sin(rotation_angle / 2)
-        wfn = (C * self.wavefn) + (
-            S * np.flip(self.wavefn, self.n_qubits - qubit_1 - 1)
+        C = _batch_broadcast(
+            np.cos(rotation_angle / 2), self._n_state_qubits, self.real_dtype
         )
+        S = _batch_broadcast(
+            -1j * np.sin(rotation_angle / 2), self._n_state_qubits, self.dtype
+        )
+
+        if self.z2_symmetric and qubit_1 == self._n_state_qubits:
+            # in the folded basis X on the highest qubit flips all the other ones
+            buffer = self._scratch_buffer()
+            qubit_axes = tuple(range(-self._n_state_qubits, 0))
+            np.multiply(np.flip(self.wavefn, qubit_axes), S, out=buffer)
+            np.multiply(self.wavefn, C, out=self.wavefn)
+            np.add(self.wavefn, buffer, out=self.wavefn)
+            return
+
+        def kernel(wfn, buffer):
+            # C*wfn + S*X(wfn), with the flipped wavefunction read as a strided view
+            np.multiply(np.flip(wfn, -qubit_1 - 1), S, out=buffer)
+            np.multiply(wfn, C, out=wfn)
+            np.add(wfn, buffer, out=wfn)
 
-        self.wavefn = wfn
+        self._apply_chunked(kernel, (qubit_1,))
 
     def apply_ry(self, qubit_1: int, rotation_angle: float):
         r"""
@@ -395,26 +679,21 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
             None
         """
 
-        wfn = copy(self.wavefn)
-
-        # multiply slices with i/-i
-        slc_0 = tuple(
-            0 if i == self.n_qubits - qubit_1 - 1 else slice(None)
-            for i in range(self.n_qubits)
+        C = _batch_broadcast(
+            np.cos(rotation_angle / 2), self._n_state_qubits, self.real_dtype
         )
-        slc_1 = tuple(
-            1 if i == self.n_qubits - qubit_1 - 1 else slice(None)
-            for i in range(self.n_qubits)
+        S = _batch_broadcast(
+            np.sin(rotation_angle / 2), self._n_state_qubits, self.real_dtype
         )
-        wfn[slc_0] *= -1j
-        wfn[slc_1] *= 1j
 
-        C = np.cos(rotation_angle / 2)
-        S = 1j * np.sin(rotation_angle / 2)
+        def kernel(wfn, buffer):
+            # -i*Y maps the 0 (1) component to -1 (+1) times the 1 (0) component
+            np.multiply(np.flip(wfn, -qubit_1 - 1), S, out=buffer)
+            _negate_slices(buffer, {qubit_1: 0})
+            np.multiply(wfn, C, out=wfn)
+            np.add(wfn, buffer, out=wfn)
 
-        self.wavefn = (C * self.wavefn) + (
-            S * np.flip(wfn, self.n_qubits - qubit_1 - 1)
-        )
+        self._apply_chunked(kernel, (qubit_1,))
 
     def apply_rz(self, qubit_1: int, rotation_angle: float):
         r"""
@@ -443,17 +722,14 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
             None
         """
 
-        slc_0 = tuple(
-            0 if i == self.n_qubits - qubit_1 - 1 else slice(None)
-            for i in range(self.n_qubits)
-        )
-        slc_1 = tuple(
-            1 if i == self.n_qubits - qubit_1 - 1 else slice(None)
-            for i in range(self.n_qubits)
-        )
+        phases = {
+            (0,): np.exp(-1j * rotation_angle / 2),
+            (1,): np.exp(1j * rotation_angle / 2),
+        }
 
-        self.wavefn[slc_0] *= np.exp(-1j * rotation_angle / 2)
-        self.wavefn[slc_1] *= np.exp(1j * rotation_angle / 2)
+        self._apply_chunked(
+            lambda wfn, buffer: _multiply_slices(wfn, phases, (qubit_1,)), (qubit_1,)
+        )
 
     def apply_rxx(self, qubit_1: int, qubit_2: int, rotation_angle: float):
         r"""
@@ -488,18 +764,19 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
             None
         """
 
-        # SH TODO : investigate if slicing 01 and 10 coefficients and swapping once them is faster than flipping twice
-        C = np.cos(rotation_angle / 2)
-        S = -1j * np.sin(rotation_angle / 2)
-
-        wfn = (C * self.wavefn) + (
-            S
-            * np.flip(
-                np.flip(self.wavefn, self.n_qubits - qubit_1 - 1),
-                self.n_qubits - qubit_2 - 1,
-            )
+        C = _batch_broadcast(
+            np.cos(rotation_angle / 2), self._n_state_qubits, self.real_dtype
         )
-        self.wavefn = wfn
+        S = _batch_broadcast(
+            -1j * np.sin(rotation_angle / 2), self._n_state_qubits, self.dtype
+        )
+
+        def kernel(wfn, buffer):
+            np.multiply(np.flip(wfn, (-qubit_1 - 1, -qubit_2 - 1)), S, out=buffer)
+            np.multiply(wfn, C, out=wfn)
+            np.add(wfn, buffer, out=wfn)
+
+        self._apply_chunked(kernel, (qubit_1, qubit_2))
 
     def apply_ryy(self, qubit_1: int, qubit_2: int, rotation_angle: float):
         r"""
@@ -534,40 +811,22 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
             None
         """
 
-        wfn = copy(self.wavefn)
-
-        slc_q1_0 = tuple(
-            0 if i == self.n_qubits - qubit_1 - 1 else slice(None)
-            for i in range(self.n_qubits)
-        )
-        slc_q1_1 = tuple(
-            1 if i == self.n_qubits - qubit_1 - 1 else slice(None)
-            for i in range(self.n_qubits)
+        C = _batch_broadcast(
+            np.cos(rotation_angle / 2), self._n_state_qubits, self.real_dtype
         )
-        slc_q2_0 = tuple(
-            0 if i == self.n_qubits - qubit_2 - 1 else slice(None)
-            for i in range(self.n_qubits)
+        S = _batch_broadcast(
+            1j * np.sin(rotation_angle / 2), self._n_state_qubits, self.dtype
         )
-        slc_q2_1 = tuple(
-            1 if i == self.n_qubits - qubit_2 - 1 else slice(None)
-            for i in range(self.n_qubits)
-        )
-
-        wfn[slc_q1_0] *= 1j
-        wfn[slc_q1_1] *= -1j
-
-        wfn[slc_q2_0] *= -1j
-        wfn[slc_q2_1] *= 1j
 
-        C = np.cos(rotation_angle / 2)
-        S = 1j * np.sin(rotation_angle / 2)
+        def kernel(wfn, buffer):
+            # -i*YY picks up a minus sign on the 01 and 10 components
+            np.multiply(np.flip(wfn, (-qubit_1 - 1, -qubit_2 - 1)), S, out=buffer)
+            _negate_slices(buffer, {qubit_1: 0, qubit_2: 1})
+            _negate_slices(buffer, {qubit_1: 1, qubit_2: 0})
+            np.multiply(wfn, C, out=wfn)
+            np.add(wfn, buffer, out=wfn)
 
-        self.wavefn = (C * self.wavefn) + (
-            S
-            * np.flip(
-                np.flip(wfn, self.n_qubits - qubit_1 - 1), self.n_qubits - qubit_2 - 1
-            )
-        )
+        self._apply_chunked(kernel, (qubit_1, qubit_2))
 
     def apply_rzz(self, qubit_1: int, qubit_2: int, rotation_angle: float):
         r"""
@@ -601,41 +860,25 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
             None
         """
 
-        """
-        # Note : one can also slice the 01 and 10 elements:
-        slc_pair01 = tuple(1 if i == self.n_qubits - qubit_1 - 1
-                           else 0 if i == self.n_qubits - qubit_2 - 1
-                           else slice(None) for i in range(self.n_qubits))
-        slc_pair10 = tuple(1 if i == self.n_qubits - qubit_2 - 1
-                           else 0 if i == self.n_qubits - qubit_1 - 1
-                           else slice(None) for i in range(self.n_qubits))
-        """
-
-        slc_pair00 = tuple(
-            0
-            if i
-            in [
-                self.n_qubits - qubit_1 - 1,
-                self.n_qubits - qubit_2 - 1,
-            ]
-            else slice(None)
-            for i in range(self.n_qubits)
-        )
-        slc_pair11 = tuple(
-            1
-            if i
-            in [
-                self.n_qubits - qubit_1 - 1,
-                self.n_qubits - qubit_2 - 1,
-            ]
-            else slice(None)
-            for i in range(self.n_qubits)
+        if self.z2_symmetric and self._n_state_qubits in (qubit_1, qubit_2):
+            # in the folded basis the highest qubit is 0, leaving an RZ on the other
+            other_qubit = qubit_2 if qubit_1 == self._n_state_qubits else qubit_1
+            return self.apply_rz(other_qubit, rotation_angle)
+
+        phase_even = np.exp(-1j * rotation_angle / 2)
+        phase_odd = np.exp(1j * rotation_angle / 2)
+        phases = {
+            (0, 0): phase_even,
+            (1, 1): phase_even,
+            (0, 1): phase_odd,
+            (1, 0): phase_odd,
+        }
+
+        self._apply_chunked(
+            lambda wfn, buffer: _multiply_slices(wfn, phases, (qubit_1, qubit_2)),
+            (qubit_1, qubit_2),
         )
 
-        self.wavefn[slc_pair00] *= np.exp(-1j * rotation_angle)
-        self.wavefn[slc_pair11] *= np.exp(-1j * rotation_angle)
-        self.wavefn *= np.exp(1j * rotation_angle / 2)
-
     def apply_rxy(self, qubit_1: int, qubit_2: int, rotation_angle: float):
         """
         Applies the RXY($\theta$ = ``rotation_angle``) gate on ``qubit_1`` and ``qubit_2`` in a vectorized way.
@@ -656,29 +899,22 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
             None
         """
 
-        wfn = copy(self.wavefn)
-
-        # Action of Y part
-        slc_q2_0 = tuple(
-            0 if i == self.n_qubits - qubit_2 - 1 else slice(None)
-            for i in range(self.n_qubits)
+        C = _batch_broadcast(
+            np.cos(rotation_angle / 2), self._n_state_qubits, self.real_dtype
         )
-        slc_q2_1 = tuple(
-            1 if i == self.n_qubits - qubit_2 - 1 else slice(None)
-            for i in range(self.n_qubits)
-        )
-        wfn[slc_q2_0] *= -1j
-        wfn[slc_q2_1] *= 1j
-
-        C = np.cos(rotation_angle / 2)
-        S = 1j * np.sin(rotation_angle / 2)
-        self.wavefn = (C * self.wavefn) + (
-            S
-            * np.flip(
-                np.flip(wfn, self.n_qubits - qubit_1 - 1), self.n_qubits - qubit_2 - 1
-            )
+        S = _batch_broadcast(
+            np.sin(rotation_angle / 2), self._n_state_qubits, self.real_dtype
         )
 
+        def kernel(wfn, buffer):
+            # Action of -i*XY: flip both qubits, minus sign where qubit_2 ends up in 0
+            np.multiply(np.flip(wfn, (-qubit_1 - 1, -qubit_2 - 1)), S, out=buffer)
+            _negate_slices(buffer, {qubit_2: 0})
+            np.multiply(wfn, C, out=wfn)
+            np.add(wfn, buffer, out=wfn)
+
+        self._apply_chunked(kernel, (qubit_1, qubit_2))
+
     def apply_rzx(self, qubit_1: int, qubit_2: int, rotation_angle: float):
         """
         Applies the RZX($\theta$ = ``rotation_angle``) gate on ``qubit_1`` and ``qubit_2`` in a vectorized way.
@@ -699,25 +935,21 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
             None
         """
 
-        wfn = copy(self.wavefn)
-
-        # Action of Z part
-        slc_q2_0 = tuple(
-            0 if i == self.n_qubits - qubit_1 - 1 else slice(None)
-            for i in range(self.n_qubits)
+        C = _batch_broadcast(
+            np.cos(rotation_angle / 2), self._n_state_qubits, self.real_dtype
         )
-        slc_q2_1 = tuple(
-            1 if i == self.n_qubits - qubit_1 - 1 else slice(None)
-            for i in range(self.n_qubits)
+        S = _batch_broadcast(
+            -1j * np.sin(rotation_angle / 2), self._n_state_qubits, self.dtype
         )
-        wfn[slc_q2_0] *= 1
-        wfn[slc_q2_1] *= -1
 
-        C = np.cos(rotation_angle / 2)
-        S = -1j * np.sin(rotation_angle / 2)
-        self.wavefn = (C * self.wavefn) + (
-            S * np.flip(wfn, self.n_qubits - qubit_2 - 1)
-        )
+        def kernel(wfn, buffer):
+            # Action of ZX: flip qubit_2, minus sign where qubit_1 is 1
+            np.multiply(np.flip(wfn, -qubit_2 - 1), S, out=buffer)
+            _negate_slices(buffer, {qubit_1: 1})
+            np.multiply(wfn, C, out=wfn)
+            np.add(wfn, buffer, out=wfn)
+
+        self._apply_chunked(kernel, (qubit_1, qubit_2))
 
     def apply_ryz(self, qubit_1: int, qubit_2: int, rotation_angle: float):
         """
@@ -739,37 +971,22 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
             None
         """
 
-        wfn = copy(self.wavefn)
-
-        # Action of Y part
-        slc_q1_0 = tuple(
-            0 if i == self.n_qubits - qubit_1 - 1 else slice(None)
-            for i in range(self.n_qubits)
+        C = _batch_broadcast(
+            np.cos(rotation_angle / 2), self._n_state_qubits, self.real_dtype
         )
-        slc_q1_1 = tuple(
-            1 if i == self.n_qubits - qubit_1 - 1 else slice(None)
-            for i in range(self.n_qubits)
+        S = _batch_broadcast(
+            np.sin(rotation_angle / 2), self._n_state_qubits, self.real_dtype
         )
-        wfn[slc_q1_0] *= -1j
-        wfn[slc_q1_1] *= 1j
 
-        # Action of Z part
-        slc_q2_0 = tuple(
-            0 if i == self.n_qubits - qubit_2 - 1 else slice(None)
-            for i in range(self.n_qubits)
-        )
-        slc_q2_1 = tuple(
-            1 if i == self.n_qubits - qubit_2 - 1 else slice(None)
-            for i in range(self.n_qubits)
-        )
-        wfn[slc_q2_0] *= 1
-        wfn[slc_q2_1] *= -1
+        def kernel(wfn, buffer):
+            # Action of -i*YZ: flip qubit_1, minus sign on the 00 and 11 components
+            np.multiply(np.flip(wfn, -qubit_1 - 1), S, out=buffer)
+            _negate_slices(buffer, {qubit_1: 0, qubit_2: 0})
+            _negate_slices(buffer, {qubit_1: 1, qubit_2: 1})
+            np.multiply(wfn, C, out=wfn)
+            np.add(wfn, buffer, out=wfn)
 
-        C = np.cos(rotation_angle / 2)
-        S = 1j * np.sin(rotation_angle / 2)
-        self.wavefn = (C * self.wavefn) + (
-            S * np.flip(wfn, self.n_qubits - qubit_1 - 1)
-        )
+        self._apply_chunked(kernel, (qubit_1, qubit_2))
 
     def apply_hadamard(self, qubit_1: int):
         """
@@ -784,23 +1001,107 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
         -------
             None
         """
+
         # TODO : Combine init_hadamard and prepend_state into one.
         # vectorized hadamard gate, for when init_hadamard = True
-        wfn = copy(self.wavefn)
+        def kernel(wfn, buffer):
+            np.copyto(buffer, np.flip(wfn, -qubit_1 - 1))
+            _negate_slices(wfn, {qubit_1: 1})
+            np.add(wfn, buffer, out=wfn)
+            np.multiply(wfn, 1 / np.sqrt(2), out=wfn)
 
-        slc_0 = tuple(
-            0 if i == self.n_qubits - qubit_1 - 1 else slice(None)
-            for i in range(self.n_qubits)
-        )
-        slc_1 = tuple(
-            1 if i == self.n_qubits - qubit_1 - 1 else slice(None)
-            for i in range(self.n_qubits)
+        self._apply_chunked(kernel, (qubit_1,))
+
+    def apply_cost_layer(self, gamma: float):
+        r"""
+        Applies the whole cost block of a QAOA layer as a single diagonal phase,
+        using the cost Hamiltonian ``ham_op`` already stored as a vector.
+
+        **Definition of the cost layer:**
+
+        .. math::
+
+            U_C(\gamma) = \exp\left(-i \gamma (H_C - c)\right)
+            = \prod_{j} RZZ_j(2\gamma w_j) \prod_{k} RZ_k(2\gamma h_k)
+
+        where :math:`c` is the constant term of the cost Hamiltonian, which is
+        left out so that the result matches the gate-by-gate application exactly.
+
+        Parameters
+        ----------
+        gamma:
+            The angle multiplying the cost Hamiltonian, or an array with one
+            angle per wavefunction when simulating a batch.
+
+        Returns
+        -------
+            None
+        """
+
+        phase = _batch_broadcast(
+            -1j * np.asarray(gamma), self._n_state_qubits, self.dtype
         )
-        wfn[slc_1] *= -1
-        wfn[slc_0] += self.wavefn[slc_1]
-        wfn[slc_1] += self.wavefn[slc_0]
 
-        self.wavefn = wfn / np.sqrt(2)
+        def kernel(wfn, buffer, cost_diagonal):
+            # exp(-i*gamma*(H - c)) is built in the scratch buffer, one phase per component
+            np.multiply(cost_diagonal, phase, out=buffer)
+            np.exp(buffer, out=buffer)
+            np.multiply(wfn, buffer, out=wfn)
+
+        self._apply_chunked(kernel, (), self._cost_diagonal)
+
+    def _fused_cost_layer_angles(self) -> dict:
+        """
+        Finds the layers whose cost block can be applied as a single diagonal
+        phase with ``apply_cost_layer``. This is the case when every cost gate
+        in the layer is rotated by the angle ``2*gamma*coeff``, with ``coeff``
+        the coefficient of its term in the cost Hamiltonian and ``gamma`` shared
+        by the whole layer. Angles must have been assigned to the
+        ``abstract_circuit`` beforehand.
+
+        Returns
+        -------
+        fused_angles: `dict`
+            A dictionary mapping the layer numbers that can be fused to their
+            ``gamma`` value (an array of values when simulating a batch).
+        """
+
+        # SWAP gates change the qubits the cost gates act on
+        if self.qaoa_descriptor.routed == True:
+            return {}
+
+        single_qubit_coeffs = self.qaoa_descriptor.cost_single_qubit_coeffs
+        pair_qubit_coeffs = self.qaoa_descriptor.cost_pair_qubit_coeffs
+
+        layer_terms = {}
+        for each_gate in self.abstract_circuit:
+            gate_label = each_gate.gate_label
+            if gate_label.type == GateMapType.COST:
+                coeffs = (
+                    pair_qubit_coeffs if gate_label.n_qubits == 2 else single_qubit_coeffs
+                )
+                layer_terms.setdefault(gate_label.layer, []).append(
+                    (each_gate.angle_value, coeffs[gate_label.sequence])
+                )
+
+        fused_angles = {}
+        for layer, terms in layer_terms.items():
+            # angles have shape (n_terms,) or (n_terms, batch_size)
+            angles = np.array([angle for angle, _ in terms], dtype=float)
+            coeffs = np.array([coeff for _, coeff in terms], dtype=float)
+            nonzero = coeffs != 0
+
+            # terms with no weight cannot be rotated in the fused phase
+            if not np.allclose(angles[~nonzero], 0, rtol=0, atol=1e-12):
+                continue
+
+            ratios = (angles[nonzero].T / coeffs[nonzero]).T
+            if len(ratios) == 0:
+                fused_angles[layer] = 0.0
+            elif np.allclose(ratios, ratios[0], rtol=1e-12, atol=1e-12):
+                fused_angles[layer] = ratios[0] / 2
+
+        return fused_angles
 
     def qaoa_circuit(self, params: Type[QAOAVariationalBaseParams]):
         """
@@ -809,7 +1110,9 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
         1) Creates a (2,...,2) dimensional matrix that represents a 2**n dimensional wavefunction
         2) Modify it according to the ``prepend_state`` option.
         3) Modify it according to ``init_hadamard`` option.
-        4) Modify it according to list of gates in ``params``.
+        4) Modify it according to list of gates in ``params``. Cost blocks in which
+           every term is rotated by the same ``gamma`` are applied at once with
+           ``apply_cost_layer``, instead of gate by gate.
         5) Modify it accoding to ``append_state`` option.
 
         Parameters
@@ -821,8 +1124,6 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
         -------
             None
         """
-        gates_applicator = VectorizedGateApplicator()
-        
         # generate a job id for the wavefunction evaluation
         self.job_id = generate_uuid()
 
@@ -831,22 +1132,212 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
 
         # Assign angles and apply gates
         self.assign_angles(params)
+        self._apply_abstract_circuit()
 
-        low_level_gate_list = []
-        for each_gate in self.abstract_circuit:
-            low_level_gate_list.extend(each_gate.decomposition("trivial"))
+    def qaoa_circuit_batch(
+        self, params: Type[QAOAVariationalBaseParams], params_array: np.ndarray
+    ):
+        """
+        Executes the entire QAOA circuit for a batch of parameter sets at once.
+        The wavefunctions are stacked along a leading axis, so that ``self.wavefn``
+        is of shape (batch_size, 2, ..., 2), and every gate is applied to all of
+        them in a single call with one angle per wavefunction.
+
+        Parameters
+        ----------
+        params:
+            ``QAOAVariationalBaseParams`` object defining the parametrisation used
+            to interpret each row of ``params_array``. Its values are left untouched.
+        params_array:
+            Array of shape (batch_size, n_params), where each row has the format
+            of ``params.raw()``.
+
+        Returns
+        -------
+            None
+        """
+        params_array = np.atleast_2d(params_array)
+
+        # generate a job id for the wavefunction evaluation
+        self.job_id = generate_uuid()
+
+        # reset the wavefunctions back to their initialisation state
+        self.reset_circuit(batch_size=len(params_array))
+
+        # Assign the angles of every parameter set and apply gates
+        self.assign_batch_angles(params, params_array)
+        self._apply_abstract_circuit()
+
+    def assign_batch_angles(
+        self, params: Type[QAOAVariationalBaseParams], params_array: np.ndarray
+    ):
+        """
+        Assigns to each gate of the ``abstract_circuit`` the array of its angles
+        for every parameter set in ``params_array``.
+
+        Parameters
+        ----------
+        params:
+            ``QAOAVariationalBaseParams`` object defining the parametrisation used
+            to interpret each row of ``params_array``. Its values are left untouched.
+        params_array:
+            Array of shape (batch_size, n_params), where each row has the format
+            of ``params.raw()``.
+        """
+        original_raw = params.raw()
+
+        angles = []
+        for each_raw in params_array:
+            params.update_from_raw(each_raw)
+            angles.append(self.obtain_angles_for_pauli_list(self.abstract_circuit, params))
+        params.update_from_raw(original_raw)
+
+        # angles have shape (batch_size, n_gates)
+        angles = np.array(angles)
+        for each_gate, gate_angles in zip(self.abstract_circuit, angles.T):
+            each_gate.angle_value = gate_angles
+
+    def _apply_abstract_circuit(self):
+        """
+        Applies the gates of the ``abstract_circuit``, with their assigned angles,
+        followed by the ``append_state``.
+        """
+        gates_applicator = VectorizedGateApplicator()
+        fused_angles = self._fused_cost_layer_angles()
 
-        for each_tuple in low_level_gate_list:
-            gate = each_tuple[0](gates_applicator, *each_tuple[1])
-            gate.apply_gate(self)
+        applied_cost_layers = set()
+        for each_gate in self.abstract_circuit:
+            gate_label = each_gate.gate_label
+            if gate_label.type == GateMapType.COST and gate_label.layer in fused_angles:
+                # the cost block of a layer is contiguous, so the phase is applied
+                # in place of its first gate and the remaining ones are skipped
+                if gate_label.layer not in applied_cost_layers:
+                    self.apply_cost_layer(fused_angles[gate_label.layer])
+                    applied_cost_layers.add(gate_label.layer)
+                continue
+
+            for each_tuple in each_gate.decomposition("trivial"):
+                gate = each_tuple[0](gates_applicator, *each_tuple[1])
+                gate.apply_gate(self)
 
         # Handle append state
         if self.append_state is not None:
 
-            # Flatten (2,...,2) shaped wfn into a 2**n-dim column vector before multiplying with unitary matrix, ...
-            self.wavefn = np.matmul(self.append_state, self.wavefn.flatten())
-            # then re-shape it back to (2,...,2)
-            self.wavefn = self.wavefn.reshape([2] * self.n_qubits)
+            # Flatten (2,...,2) shaped wfn(s) into 2**n-dim vectors before multiplying with unitary matrix, ...
+            buffer = self._scratch_buffer()
+            np.matmul(
+                self.wavefn.reshape(-1, 2**self.n_qubits),
+                self.append_state.T,
+                out=buffer.reshape(-1, 2**self.n_qubits),
+            )
+            # then swap the wavefunction with the scratch buffer holding the result
+            self._scratch, self.wavefn = self.wavefn, buffer
+
+    def adjoint_gradient(self, params: Type[QAOAVariationalBaseParams]) -> np.ndarray:
+        r"""
+        Computes the derivatives of the expectation value of the cost operator with
+        respect to the angle of every gate in the ``abstract_circuit``, using the
+        adjoint method.
+
+        After a single forward simulation producing :math:`|\psi\rangle`, the state
+        :math:`|\lambda\rangle = H|\psi\rangle` is built and both states are swept
+        backwards through the circuit by un-applying each gate. Since every gate is
+        of the form :math:`G(\theta) = \exp(-i \frac{\theta}{2} P)`, with :math:`P`
+        a Pauli string, the derivative with respect to its angle reads
+
+        .. math::
+
+            \frac{\partial \langle H \rangle}{\partial \theta} =
+            \mathrm{Im} \langle \lambda | P | \psi \rangle =
+            \mathrm{Re} \langle \lambda | G(\pi) | \psi \rangle,
+
+        where both states are taken right after the gate. The cost of the whole
+        gradient is a small constant number of circuit simulations, independently
+        of the number of angles.
+
+        Parameters
+        ----------
+        params:
+            ``QAOAVariationalBaseParams`` object that contains rotation angles and gates to be applied.
+
+        Returns
+        -------
+        angles_gradient:
+            Array with the derivative of the expectation value with respect to the
+            angle of each gate, in the order of the ``abstract_circuit``.
+        """
+        self.qaoa_circuit(params)
+        final_wavefn = self.wavefn
+
+        # |psi> and |lambda> = H|psi> are swept backwards together, stacked on a batch axis
+        states = np.stack([final_wavefn, self.ham_op * final_wavefn])
+
+        if self.append_state is not None:
+            states = np.matmul(
+                states.reshape(2, -1), self.append_state.conj()
+            ).reshape(states.shape)
+
+        gates_mapper = VectorizedGateApplicator.VECTORIZED_OQ_GATE_MAPPER(self)
+        angles_gradient = np.zeros(len(self.abstract_circuit))
+        probe_wavefn = np.empty_like(final_wavefn)
+
+        # the kernels alternate between the probe and the pair of states, so each
+        # gets its own scratch buffer for the whole sweep, the one of the probe
+        # being left by the forward simulation
+        probe_scratch = self._scratch_buffer()
+        states_scratch = np.empty_like(states)
+
+        for i in reversed(range(len(self.abstract_circuit))):
+            # every rotation GateMap decomposes trivially into a single rotation gate
+            ((gate_class, gate_args),) = self.abstract_circuit[i].decomposition("trivial")
+            apply_gate = gates_mapper[gate_class.__name__]
+            qubits, angle = gate_args[:-1], gate_args[-1].rotation_angle
+
+            # G(pi) = -iP, so that Im<lambda|P|psi> = Re<lambda|G(pi)|psi>
+            np.copyto(probe_wavefn, states[0])
+            self.wavefn, self._scratch = probe_wavefn, probe_scratch
+            apply_gate(*qubits, np.pi)
+            angles_gradient[i] = np.real(np.vdot(states[1], self.wavefn))
+
+            # un-apply the gate on both states
+            self.wavefn, self._scratch = states, states_scratch
+            apply_gate(*qubits, -angle)
+            states = self.wavefn
+
+        self.wavefn, self._scratch = final_wavefn, probe_scratch
+
+        return angles_gradient
+
+    def _full_wavefunction(self) -> np.ndarray:
+        """
+        Returns a copy of the wavefunction (or of each wavefunction of a batch)
+        as a flat vector of 2**n_qubits amplitudes. States stored in the folded
+        basis are unfolded, the amplitudes with the highest qubit in 1 being
+        those of the flipped bitstrings.
+        """
+        wavefn_ = self.wavefn.reshape(
+            self.wavefn.shape[: self.wavefn.ndim - self._n_state_qubits] + (-1,)
+        )
+        if not self.z2_symmetric:
+            return wavefn_.copy()
+
+        return FoldedStatevector(wavefn_).unfold()
+
+    def _measurement_outcomes(self) -> Union[np.ndarray, FoldedStatevector]:
+        """
+        Returns a copy of the wavefunction (or of each wavefunction of a batch) to
+        keep in ``measurement_outcomes``. States stored in the folded basis are
+        kept folded, as a ``FoldedStatevector`` unfolded only when read, so that
+        evaluations never allocate the full wavefunction.
+        """
+        if not self.z2_symmetric:
+            return self._full_wavefunction()
+
+        return FoldedStatevector(
+            self.wavefn.reshape(
+                self.wavefn.shape[: self.wavefn.ndim - self._n_state_qubits] + (-1,)
+            ).copy()
+        )
 
     def wavefunction(self, params: Type[QAOAVariationalBaseParams] = None) -> list:
 
@@ -867,15 +1358,43 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
 
         self.qaoa_circuit(params)
 
-        self.wavefn.shape = 2**self.n_qubits
-
-        self.measurement_outcomes = self.wavefn.flatten()
+        self.measurement_outcomes = self._full_wavefunction()
 
         # Make format same as ProjectQ
-        wf = [(component) for component in self.wavefn]
+        wf = [(component) for component in self.measurement_outcomes]
 
         return wf
 
+    def probabilities(self, params: Type[QAOAVariationalBaseParams]) -> np.ndarray:
+        """
+        Get the probabilities of all the basis states in the state produced by
+        the parametric circuit, computed directly from the wavefunction array.
+
+        Parameters
+        ----------
+        params:
+            The QAOA parameters - an object of one of the parameter classes, containing
+            hyperparameters and variable parameters.
+
+        Returns
+        -------
+        prob_vec:
+            Array of shape (2**n_qubits,) with the probability of each basis state.
+        """
+
+        self.qaoa_circuit(params)
+
+        wavefn_ = self.wavefn.reshape(-1)
+        prob_vec = np.square(wavefn_.real, dtype=np.float64)
+        prob_vec += np.square(wavefn_.imag, dtype=np.float64)
+
+        if self.z2_symmetric:
+            # each stored amplitude stands for a bitstring and its flip
+            prob_vec /= 2
+            prob_vec = np.concatenate([prob_vec, prob_vec[::-1]])
+
+        return prob_vec
+
     @round_value
     def expectation(self, params: Type[QAOAVariationalBaseParams]) -> float:
         """
@@ -890,14 +1409,10 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
 
         self.qaoa_circuit(params)
 
-        # Reshape wavefunction
-        wavefn_ = self.wavefn
+        self.measurement_outcomes = self._measurement_outcomes()
 
-        self.measurement_outcomes = wavefn_.flatten()
-
-        # Compute the expectation value and its standard deviation
-        ham_wf = self.ham_op * wavefn_
-        exp_val = np.real(np.vdot(wavefn_, ham_wf))
+        # Compute the expectation value
+        (exp_val,) = self._cost_moments(1)[:, 0]
 
         out = exp_val
 
@@ -922,26 +1437,224 @@ class QAOAvectorizedBackendSimulator(QAOABaseBackendStatevector):
 
         self.qaoa_circuit(params)
 
-        # Reshape wavefunction
-        wavefn_ = self.wavefn
-
-        self.measurement_outcomes = wavefn_.flatten()
+        self.measurement_outcomes = self._measurement_outcomes()
 
         # Compute the expectation value and its standard deviation
-        ham_wf = self.ham_op * wavefn_
-        exp_val = np.real(np.vdot(wavefn_, ham_wf))
-
-        exp_val_sq = np.real(np.vdot(ham_wf, ham_wf))
+        exp_val, exp_val_sq = self._cost_moments(2)[:, 0]
         std_dev = (exp_val_sq - exp_val**2) ** 0.5
         out = exp_val, std_dev
 
         return out
 
-    def reset_circuit(self):
+    @round_value
+    def expectation_batch(
+        self, params: Type[QAOAVariationalBaseParams], params_array: np.ndarray
+    ) -> np.ndarray:
+        """
+        Compute the expectation value of the cost operator for a batch of
+        parameter sets, simulating all the wavefunctions at once. Batches whose
+        simulation takes more than ``MAX_BATCH_BYTES`` (the wavefunctions, the
+        scratch buffer and the copies kept in ``measurement_outcomes``) are split
+        into sub-batches, in which case ``measurement_outcomes`` only holds the
+        wavefunctions of the last one.
+
+        Parameters
+        ----------
+        params:
+            ``QAOAVariationalBaseParams`` object defining the parametrisation used
+            to interpret each row of ``params_array``. Its values are left untouched.
+        params_array:
+            Array of shape (batch_size, n_params), where each row has the format
+            of ``params.raw()``.
+
+        Returns
+        -------
+        exp_vals:
+            Array of shape (batch_size,) with the expectation values of the cost
+            function wrt the states generated by each parameter set.
+        """
+
+        params_array = np.atleast_2d(params_array)
+
+        # the wavefunction, the scratch buffer and the measurement outcomes of
+        # each parameter set take one stored state each (folded if symmetric)
+        state_bytes = 2**self._n_state_qubits * np.dtype(self.dtype).itemsize
+        sub_batch_size = max(MAX_BATCH_BYTES // (3 * state_bytes), 1)
+
+        exp_vals = []
+        for start in range(0, len(params_array), sub_batch_size):
+            self.qaoa_circuit_batch(
+                params, params_array[start : start + sub_batch_size]
+            )
+
+            self.measurement_outcomes = self._measurement_outcomes()
+
+            # Contract the probabilities of every wavefunction with the diagonal Hamiltonian
+            exp_vals.append(self._cost_moments(1)[0])
+
+        return np.concatenate(exp_vals)
+
+    def _cost_moments(self, n_moments: int) -> np.ndarray:
+        r"""
+        Computes the moments :math:`\langle H^k \rangle`, for k = 1, ..., ``n_moments``,
+        of the cost operator with respect to the current wavefunction, or to each
+        wavefunction of a batch. The products are built in the scratch buffer and
+        summed pairwise in double precision, so that the result stays accurate
+        for single precision simulations.
+
+        Parameters
+        ----------
+        n_moments:
+            The highest order of the moments to compute.
+
+        Returns
+        -------
+        moments:
+            Array of shape (n_moments, n_wavefunctions).
+        """
+        qubit_axes = tuple(range(-self._n_state_qubits, 0))
+
+        def kernel(wfn, buffer, ham_op):
+            # probabilities of each basis state
+            np.conjugate(wfn, out=buffer)
+            np.multiply(buffer, wfn, out=buffer)
+
+            moments = []
+            for _ in range(n_moments):
+                np.multiply(buffer, ham_op, out=buffer)
+                moments.append(np.sum(buffer.real, axis=qubit_axes, dtype=np.float64))
+
+            return moments
+
+        moments = np.sum(self._apply_chunked(kernel, (), self.ham_op), axis=0)
+
+        return np.reshape(moments, (n_moments, -1))
+
+    def _chunk_slices(self, qubits: tuple) -> Optional[List[tuple]]:
+        """
+        Returns the indices of the chunks the wavefunction is split into for a
+        gate acting on ``qubits``, or ``None`` if the gate is applied at once.
+        The chunks fix the values of the highest qubits not acted upon by the
+        gate, keeping them as length-one axes so that qubit axes are unchanged.
+        """
+
+        n_chunk_qubits = self._n_chunk_qubits()
+        if n_chunk_qubits == 0:
+            return None
+
+        key = (qubits, n_chunk_qubits)
+        if key not in self._chunk_slices_cache:
+            chunk_qubits = [
+                qubit
+                for qubit in reversed(range(self._n_state_qubits))
+                if qubit not in qubits
+            ][:n_chunk_qubits]
+
+            self._chunk_slices_cache[key] = [
+                _qubit_slice(
+                    {
+                        qubit: slice(value, value + 1)
+                        for qubit, value in zip(chunk_qubits, values)
+                    }
+                )
+                for values in product((0, 1), repeat=len(chunk_qubits))
+            ]
+
+        return self._chunk_slices_cache[key]
+
+    def _n_chunk_qubits(self) -> int:
+        """
+        Returns the number of qubits whose values are fixed by each chunk of
+        the wavefunction, enough to give every thread its own chunk, or 0 when
+        the gates are applied on the whole wavefunction at once.
+        """
+        if self.n_threads == 1 or self.wavefn.size < MIN_CHUNKED_SIZE:
+            return 0
+
+        return int(np.ceil(np.log2(self.n_threads)))
+
+    def _apply_chunked(self, kernel: Callable, qubits: tuple, *operands) -> list:
+        """
+        Runs ``kernel(wavefn, buffer, *operands)`` on the wavefunction and its
+        scratch buffer. With ``n_threads > 1`` the kernel is instead run in the
+        thread pool on every chunk of the arrays that is independent for a gate
+        acting on ``qubits``.
+
+        Parameters
+        ----------
+        kernel:
+            Function working in place on views of the wavefunction, the scratch
+            buffer and the ``operands``, which are indexed the same way.
+        qubits:
+            Tuple with the qubits the kernel acts upon.
+        operands:
+            Additional arrays with trailing qubit axes, e.g. the cost diagonal.
+
+        Returns
+        -------
+        outputs:
+            List with the outputs of the kernel, one per chunk.
+        """
+        wfn, buffer = self.wavefn, self._scratch_buffer()
+
+        chunk_slices = self._chunk_slices(qubits)
+        if chunk_slices is None:
+            return [kernel(wfn, buffer, *operands)]
+
+        return list(
+            _get_thread_pool(self.n_threads).map(
+                lambda slc: kernel(
+                    wfn[slc], buffer[slc], *[operand[slc] for operand in operands]
+                ),
+                chunk_slices,
+            )
+        )
+
+    def _scratch_buffer(self, shape: Optional[tuple] = None) -> np.ndarray:
+        """
+        Returns the preallocated array, with the dtype of the wavefunction and the
+        given shape (by default the one of the current wavefunction), that the gate
+        kernels use as a second state buffer in order to work in place. A single
+        buffer is kept, replaced whenever the size of the states changes, so that
+        the buffers of the batches evaluated earlier are not kept alive.
+        """
+        shape = self.wavefn.shape if shape is None else shape
+        if (
+            self._scratch is None
+            or self._scratch.size != np.prod(shape)
+            or self._scratch.dtype != self.wavefn.dtype
+        ):
+            self._scratch = np.empty(shape, dtype=self.wavefn.dtype)
+
+        if self._scratch.shape == shape:
+            return self._scratch
+        return self._scratch.reshape(shape)
+
+    def reset_circuit(self, batch_size: Optional[int] = None):
         """
         Reset the circuit by resetting the wavefunction.
+
+        Parameters
+        ----------
+        batch_size:
+            If specified, the wavefunction is reset to a stack of ``batch_size``
+            copies of the initial state, of shape (batch_size, 2, ..., 2).
         """
-        self.wavefn = copy(self.wavefn_init)
+        shape = self.wavefn_init.shape
+        if batch_size is not None:
+            shape = (batch_size,) + shape
+
+        # the wavefunction buffer is reused across evaluations whenever possible
+        if (
+            not isinstance(self.wavefn, np.ndarray)
+            or self.wavefn is self.wavefn_init
+            or self.wavefn.size != np.prod(shape)
+            or self.wavefn.dtype != self.wavefn_init.dtype
+        ):
+            self.wavefn = np.empty(shape, dtype=self.wavefn_init.dtype)
+
+        self.wavefn.shape = shape
+        np.copyto(self.wavefn, self.wavefn_init)
 
     def circuit_to_qasm(self):
         """
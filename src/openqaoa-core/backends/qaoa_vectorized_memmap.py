@@ -0,0 +1,347 @@
+"""
+Out-of-core variant of the vectorized simulator, for exact simulations of
+wavefunctions that do not fit in main memory. The wavefunction and the cost
+Hamiltonian are stored in memory-mapped files, and the gates are applied by
+streaming through them in blocks.
+"""
+import os
+import shutil
+import tempfile
+import weakref
+from typing import Union, List, Tuple, Type, Optional, Callable
+import numpy as np
+
+from .basebackend import QAOABaseBackendStatevector
+from .qaoa_vectorized import QAOAvectorizedBackendSimulator
+from ..qaoa_components import QAOADescriptor
+from ..qaoa_components.variational_parameters.variational_baseparams import (
+    QAOAVariationalBaseParams,
+)
+from ..utilities import round_value, _cost_hamiltonian_block
+
+
+class QAOAvectorizedMemmapBackendSimulator(QAOAvectorizedBackendSimulator):
+    """
+    Out-of-core version of the vectorized simulator, which keeps the wavefunction
+    and the cost Hamiltonian in ``np.memmap`` files instead of main memory, so
+    that the exact simulation of 30+ qubits is bounded by the disk space rather
+    than the RAM (a double precision wavefunction of 32 qubits takes 64 GiB).
+
+    The gates are applied block by block: each block fixes the values of the
+    highest qubits not acted upon by the gate and spans ``2**block_qubits``
+    amplitudes, which are processed in an in-memory scratch buffer. Blocks are
+    visited in the order of the files, and a gate on one of the highest qubits
+    reads its block as a pair of contiguous regions, one for each value of the
+    qubit, so that the I/O is sequential and predictable. A fast local disk
+    (e.g. NVMe) is recommended.
+
+    Unlike the in-memory simulator, ``append_state``, batches of parameters and
+    adjoint gradients are not supported, since they would require additional
+    full copies of the state, and ``measurement_outcomes`` is a view of the
+    memory-mapped wavefunction, overwritten by the next evaluation.
+
+    Parameters
+    ----------
+    qaoa_descriptor: QAOADescriptor
+        An object of the class ``QAOADescriptor`` which contains information on
+        circuit construction and depth of the circuit.
+    prepend_state: np.array
+        The initial state of the circuit (before Hadamards).
+        An array of shape :math:`(2^{n_qubits},)` or (2, 2, ..., 2), which can
+        itself be a ``np.memmap``. Defaults to ``[1,0,...,0]`` if ``None``.
+    append_state: np.array
+        Not supported, must be ``None``.
+    init_hadamard: bool
+        Whether to apply Hadamard gates to the beginning of the QAOA part of the circuit.
+    cvar_alpha: float
+        Conditional Value-at-Risk (CVaR) - must be 1 for this simulator.
+    precision: str
+        Floating point precision of the simulation, either ``"double"`` or
+        ``"single"``, the latter halving the size of the files and the I/O.
+    memmap_dir: str
+        Directory in which the memory-mapped files are created, inside a
+        temporary subdirectory that is removed together with the simulator.
+        Defaults to the system temporary directory.
+    block_qubits: int
+        Base-2 logarithm of the number of amplitudes processed at once. The
+        in-memory scratch buffer takes ``2**block_qubits`` amplitudes.
+        Defaults to 22, i.e. 64 MiB blocks in double precision.
+    """
+
+    def __init__(
+        self,
+        qaoa_descriptor: QAOADescriptor,
+        prepend_state: Optional[Union[np.ndarray, List[complex]]],
+        append_state: Optional[Union[np.ndarray, List[complex]]],
+        init_hadamard: bool,
+        cvar_alpha: float = 1,
+        precision: str = "double",
+        memmap_dir: Optional[str] = None,
+        block_qubits: int = 22,
+    ):
+
+        if not (isinstance(block_qubits, (int, np.integer)) and block_qubits >= 1):
+            raise ValueError(
+                f"block_qubits must be a positive integer, got {block_qubits}"
+            )
+        self.block_qubits = block_qubits
+
+        # the files live in a private directory, removed when the simulator is collected
+        self.memmap_dir = tempfile.mkdtemp(prefix="openqaoa_memmap_", dir=memmap_dir)
+        self._finalizer = weakref.finalize(
+            self, shutil.rmtree, self.memmap_dir, ignore_errors=True
+        )
+
+        QAOAvectorizedBackendSimulator.__init__(
+            self,
+            qaoa_descriptor,
+            prepend_state,
+            append_state,
+            init_hadamard,
+            cvar_alpha,
+            precision,
+        )
+
+    def _detect_z2_symmetry(self) -> bool:
+        """
+        The files always store the full wavefunction, the folded basis of the
+        in-memory simulator is not used.
+        """
+        return False
+
+    def _memmap(self, name: str, dtype: np.dtype) -> np.memmap:
+        """
+        Creates a memory-mapped array of shape (2, ..., 2) in ``memmap_dir``.
+        """
+        return np.memmap(
+            os.path.join(self.memmap_dir, f"{name}.dat"),
+            dtype=dtype,
+            mode="w+",
+            shape=(2,) * self.n_qubits,
+        )
+
+    def _init_cost_hamiltonian(self):
+        """
+        Builds the memory-mapped cost Hamiltonian ``ham_op`` block by block.
+        The constant term is kept in ``ham_op`` and factored out of the cost
+        layers as a global phase, so that a single file is needed.
+        """
+        self.ham_op = self._memmap("ham_op", self.real_dtype)
+
+        ham_op_flat = self.ham_op.reshape(-1)
+        block_size = 2 ** min(self.block_qubits, self.n_qubits)
+        for start in range(0, ham_op_flat.size, block_size):
+            ham_op_flat[start : start + block_size] = _cost_hamiltonian_block(
+                self.cost_hamiltonian, start, block_size
+            )
+
+    def _init_wavefunction(self):
+        """
+        Creates the memory-mapped wavefunction. Product initial states are
+        written directly by ``reset_circuit``, while a ``prepend_state`` is
+        copied, rotated by the Hadamard gates, and stored in a second file.
+        """
+        if self.append_state is not None:
+            raise ValueError(
+                "append_state is not supported by the memory-mapped simulator, "
+                "since it requires the full (2**n, 2**n) unitary in memory."
+            )
+
+        self.wavefn = self._memmap("wavefn", self.dtype)
+
+        if self.prepend_state is None:
+            self.wavefn_init = None
+            self.reset_circuit()
+            return
+
+        if not isinstance(self.prepend_state, np.ndarray):
+            raise ValueError(
+                "Error : Unsupported prepend_state specified. Not an ndarray."
+            )
+        if np.shape(self.prepend_state) not in [
+            self.wavefn.shape,
+            (2**self.n_qubits,),
+        ]:
+            raise ValueError(
+                "Error : Unsupported prepend_state specified."
+                "Not of shape (2**n,) or (2, 2, ..., 2))."
+            )
+        prepend_state = self.prepend_state.reshape(self.wavefn.shape)
+
+        self._apply_chunked(
+            lambda wfn, buffer, state: np.copyto(wfn, state), (), prepend_state
+        )
+
+        if self.init_hadamard:
+            for i in range(self.n_qubits):
+                self.apply_hadamard(i)
+
+        self.wavefn_init = self._memmap("wavefn_init", self.dtype)
+        self._apply_chunked(
+            lambda wfn, buffer, wfn_init: np.copyto(wfn_init, wfn), (), self.wavefn_init
+        )
+
+    def apply_cost_layer(self, gamma: float):
+        r"""
+        Applies the whole cost block of a QAOA layer as a single diagonal phase,
+        :math:`\exp(-i \gamma (H_C - c))`, computed block by block from the
+        memory-mapped ``ham_op`` and corrected by the global phase
+        :math:`\exp(i \gamma c)`, where :math:`c` is the constant term.
+
+        Parameters
+        ----------
+        gamma:
+            The angle multiplying the cost Hamiltonian.
+
+        Returns
+        -------
+            None
+        """
+        phase = self.dtype(-1j * gamma)
+        global_phase = self.dtype(np.exp(1j * gamma * self.cost_hamiltonian.constant))
+
+        def kernel(wfn, buffer, ham_op):
+            np.multiply(ham_op, phase, out=buffer)
+            np.exp(buffer, out=buffer)
+            np.multiply(buffer, global_phase, out=buffer)
+            np.multiply(wfn, buffer, out=wfn)
+
+        self._apply_chunked(kernel, (), self.ham_op)
+
+    def adjoint_gradient(self, params: Type[QAOAVariationalBaseParams]) -> np.ndarray:
+        """
+        Not supported, since the adjoint method keeps three copies of the state.
+        """
+        raise NotImplementedError(
+            "Adjoint gradients are not supported by the memory-mapped simulator."
+        )
+
+    @round_value
+    def expectation(self, params: Type[QAOAVariationalBaseParams]) -> float:
+        """
+        Call the execute function on the circuit to compute the
+        expectation value of the Quantum Circuit w.r.t cost operator
+
+        Returns
+        -------
+        exp_val:
+            The expectation value of the cost function wrt the state generated by the circuit.
+        """
+
+        self.qaoa_circuit(params)
+
+        # plain ndarray view of the file, the wavefunction is not copied to memory
+        self.measurement_outcomes = np.asarray(self.wavefn).reshape(-1)
+
+        (exp_val,) = self._cost_moments(1)[:, 0]
+
+        return exp_val
+
+    @round_value
+    def expectation_w_uncertainty(
+        self, params: Type[QAOAVariationalBaseParams]
+    ) -> Tuple[float, float]:
+        """
+        Call the execute function on the circuit to compute the
+        expectation value of the ``QuantumCircuit`` w.r.t cost operator
+        along with its uncertainty
+
+        Returns
+        -------
+        exp_val:
+            The expectation value of the cost function wrt the state generated by the circuit.
+        std_dev:
+            The standard deviation of the cost function wrt the state generated by the circuit.
+        """
+
+        self.qaoa_circuit(params)
+
+        # plain ndarray view of the file, the wavefunction is not copied to memory
+        self.measurement_outcomes = np.asarray(self.wavefn).reshape(-1)
+
+        exp_val, exp_val_sq = self._cost_moments(2)[:, 0]
+        std_dev = (exp_val_sq - exp_val**2) ** 0.5
+
+        return exp_val, std_dev
+
+    def expectation_batch(
+        self, params: Type[QAOAVariationalBaseParams], params_array: np.ndarray
+    ) -> np.ndarray:
+        """
+        Compute the expectation value of the cost operator for a batch of
+        parameter sets, one parameter set at a time.
+        """
+        return QAOABaseBackendStatevector.expectation_batch(self, params, params_array)
+
+    def _n_chunk_qubits(self) -> int:
+        """
+        Returns the number of qubits fixed by each block, such that every block
+        has ``2**block_qubits`` amplitudes.
+        """
+        return max(self.n_qubits - self.block_qubits, 0)
+
+    def _apply_chunked(self, kernel: Callable, qubits: tuple, *operands) -> list:
+        """
+        Runs ``kernel(wavefn, buffer, *operands)`` on every block of the
+        memory-mapped arrays that is independent for a gate acting on ``qubits``,
+        sequentially and in file order, with an in-memory scratch buffer.
+
+        Parameters
+        ----------
+        kernel:
+            Function working in place on views of the wavefunction, the scratch
+            buffer and the ``operands``, which are indexed the same way.
+        qubits:
+            Tuple with the qubits the kernel acts upon.
+        operands:
+            Additional arrays with trailing qubit axes, e.g. the cost Hamiltonian.
+
+        Returns
+        -------
+        outputs:
+            List with the outputs of the kernel, one per block.
+        """
+        chunk_slices = self._chunk_slices(qubits) or [(Ellipsis,)]
+
+        outputs = []
+        for slc in chunk_slices:
+            wfn = self.wavefn[slc]
+            outputs.append(
+                kernel(
+                    wfn,
+                    self._scratch_buffer(wfn.shape),
+                    *[operand[slc] for operand in operands],
+                )
+            )
+
+        return outputs
+
+    def reset_circuit(self, batch_size: Optional[int] = None):
+        """
+        Reset the circuit by rewriting the initial state in the memory-mapped
+        wavefunction.
+
+        Parameters
+        ----------
+        batch_size:
+            Not supported, must be ``None``.
+        """
+        if batch_size is not None:
+            raise NotImplementedError(
+                "Batches of wavefunctions are not supported by the memory-mapped simulator."
+            )
+
+        self.wavefn.shape = (2,) * self.n_qubits
+
+        if self.wavefn_init is not None:
+            self._apply_chunked(
+                lambda wfn, buffer, wfn_init: np.copyto(wfn, wfn_init),
+                (),
+                self.wavefn_init,
+            )
+        elif self.init_hadamard:
+            amplitude = 2 ** (-self.n_qubits / 2)
+            self._apply_chunked(lambda wfn, buffer: wfn.fill(amplitude), ())
+        else:
+            self._apply_chunked(lambda wfn, buffer: wfn.fill(0), ())
+            self.wavefn[(0,) * self.n_qubits] = 1
@@ -8,17 +8,22 @@ from openqaoa.qaoa_components.variational_parameters.variational_baseparams impo
 )
 from ..backends.basebackend import QAOABaseBackend
 from ..optimizers.logger_vqa import Logger
-from ..backends.cost_function import cost_function
+from ..optimizers.evaluation_cache import EvaluationCache
+from ..utilities import bits_from_bitstrings
 
 
 def update_and_compute_expectation(
-    backend_obj: QAOABaseBackend, params: QAOAVariationalBaseParams, logger: Logger
+    backend_obj: QAOABaseBackend,
+    params: QAOAVariationalBaseParams,
+    logger: Logger,
+    evaluation_cache: EvaluationCache = None,
 ):
     """
     Helper function that returns a callable that takes in a list/nparray of raw parameters.
     This function will handle:
 
         #. Updating logger object with `logger.log_variables`
+        #. Looking up the expectation in `evaluation_cache`, if given
         #. Updating variational parameters with `update_from_raw`
         #. Computing expectation with `backend_obj.expectation`
 
@@ -32,6 +37,8 @@ def update_and_compute_expectation(
     logger: Logger
         Logger Class required to log information from the evaluations
         required for the jacobian/hessian computation.
+    evaluation_cache: EvaluationCache
+        Cache of the evaluations shared with the optimizer, if any.
     Returns
     -------
     out:
@@ -47,10 +54,21 @@ def update_and_compute_expectation(
         logger.log_variables(
             {"func_evals": current_total_eval, "jac_func_evals": current_jac_eval}
         )
+
+        if evaluation_cache is not None:
+            key = evaluation_cache.key(params, args, n_shots)
+            entry = evaluation_cache.get(key)
+            if entry is not None:
+                return entry["cost"]
+
         params.update_from_raw(args)
 
         n_shots_dict = {"n_shots": n_shots} if n_shots else {}
-        return backend_obj.expectation(params, **n_shots_dict)
+        cost = backend_obj.expectation(params, **n_shots_dict)
+
+        if evaluation_cache is not None:
+            evaluation_cache.put(key, cost=cost)
+        return cost
 
     return fun
 
@@ -101,6 +119,129 @@ def update_and_get_counts(
     return fun
 
 
+def update_and_compute_expectation_batch(
+    backend_obj: QAOABaseBackend,
+    params: QAOAVariationalBaseParams,
+    logger: Logger,
+    evaluation_cache: EvaluationCache = None,
+):
+    """
+    Helper function that returns a callable that takes in a 2D array of raw parameters,
+    one parameter set per row. This function will handle:
+
+        #. Updating logger object with `logger.log_variables`
+        #. Looking up the expectations in `evaluation_cache`, if given
+        #. Computing the expectation of every other parameter set in a single call
+           to `backend_obj.expectation_batch`
+
+    Parameters
+    ----------
+    backend_obj: QAOABaseBackend
+        `QAOABaseBackend` object that contains information about the
+        backend that is being used to perform the QAOA circuit
+    params : QAOAVariationalBaseParams
+        `QAOAVariationalBaseParams` object containing variational angles.
+    logger: Logger
+        Logger Class required to log information from the evaluations
+        required for the jacobian/hessian computation.
+    evaluation_cache: EvaluationCache
+        Cache of the evaluations shared with the optimizer, if any.
+    Returns
+    -------
+    out:
+        A callable that accepts a 2D array of parameters (and optionally a list
+        with the number of shots of each row), and returns the array of computed
+        expectation values.
+    """
+
+    def fun(args_array, n_shots_list=None):
+        current_total_eval = logger.func_evals.best[0]
+        current_total_eval += len(args_array)
+        current_jac_eval = logger.jac_func_evals.best[0]
+        current_jac_eval += len(args_array)
+        logger.log_variables(
+            {"func_evals": current_total_eval, "jac_func_evals": current_jac_eval}
+        )
+
+        if n_shots_list is None:
+            n_shots_list = [None] * len(args_array)
+
+        if evaluation_cache is None:
+            keys, exp_vals = None, np.zeros(len(args_array))
+            missing = np.arange(len(args_array))
+        else:
+            keys = [
+                evaluation_cache.key(params, args, n_shots)
+                for args, n_shots in zip(args_array, n_shots_list)
+            ]
+            entries = evaluation_cache.lookup(keys)
+            exp_vals = np.array(
+                [np.nan if entry is None else entry["cost"] for entry in entries]
+            )
+            missing = np.flatnonzero([entry is None for entry in entries])
+            if len(missing) == 0:
+                return exp_vals
+
+        # only the parameter sets missing from the cache are sent to the backend
+        missing_n_shots = [n_shots_list[i] for i in missing]
+        n_shots_dict = {"n_shots": missing_n_shots} if any(missing_n_shots) else {}
+        exp_vals[missing] = backend_obj.expectation_batch(
+            params, np.asarray(args_array)[missing], **n_shots_dict
+        )
+
+        if evaluation_cache is not None:
+            for i in missing:
+                evaluation_cache.put(keys[i], cost=exp_vals[i])
+        return exp_vals
+
+    return fun
+
+
+def update_and_get_counts_batch(
+    backend_obj: QAOABaseBackend, params: QAOAVariationalBaseParams, logger: Logger
+):
+    """
+    Helper function that returns a callable that takes in a 2D array of raw
+    parameters, one parameter set per row.
+    This function will handle:
+
+        #. Updating logger object with `logger.log_variables`
+        #. Getting the counts dictionaries of every parameter set in a single call
+           to `backend_obj.get_counts_batch`
+
+    PARAMETERS
+    ----------
+    backend_obj: QAOABaseBackend
+        `QAOABaseBackend` object that contains information about the backend
+        that is being used to perform the QAOA circuit
+    params : QAOAVariationalBaseParams
+        `QAOAVariationalBaseParams` object containing variational angles.
+    logger: Logger
+        Logger Class required to log information from the evaluations
+        required for the jacobian/hessian computation.
+
+    Returns
+    -------
+    out:
+        A callable that accepts a 2D array of parameters (and optionally a list
+        with the number of shots of each row), and returns the list of counts
+        dictonaries.
+    """
+
+    def fun(args_array, n_shots_list=None):
+        current_total_eval = logger.func_evals.best[0]
+        current_total_eval += len(args_array)
+        current_jac_eval = logger.jac_func_evals.best[0]
+        current_jac_eval += len(args_array)
+        logger.log_variables(
+            {"func_evals": current_total_eval, "jac_func_evals": current_jac_eval}
+        )
+
+        return backend_obj.get_counts_batch(params, args_array, n_shots_list)
+
+    return fun
+
+
 def derivative(
     backend_obj: QAOABaseBackend,
     params: QAOAVariationalBaseParams,
@@ -108,6 +249,7 @@ def derivative(
     derivative_type: str = None,
     derivative_method: str = None,
     derivative_options: dict = None,
+    evaluation_cache: EvaluationCache = None,
 ):
     """
     Returns a callable function that calculates the gradient according
@@ -127,9 +269,13 @@ def derivative(
         Type of derivative to compute. Either `gradient` or `hessian`.
     derivative_method : str
         Computational method of the derivative.
-        Either `finite_difference`, `param_shift`, `stoch_param_shift`, or `grad_spsa`.
+        Either `finite_difference`, `param_shift`, `stoch_param_shift`, `grad_spsa`,
+        `adjoint`, or `analytical`.
     derivative_options : dict
         Dictionary containing options specific to each `derivative_method`.
+    evaluation_cache : EvaluationCache
+        Cache of the evaluations shared with the cost function of the optimizer,
+        used by the methods evaluating the expectation at shifted parameters.
     cost_std :
         object that computes expectation values when executed. Standard parametrisation.
     cost_ext :
@@ -174,6 +320,8 @@ def derivative(
         "param_shift",
         "stoch_param_shift",
         "grad_spsa",
+        "adjoint",
+        "analytical",
     ]
     assert derivative_method in derivative_methods, (
         "Unknown derivative computation method specified - please choose between "
@@ -185,12 +333,25 @@ def derivative(
     if derivative_type == "gradient":
 
         if derivative_method == "finite_difference":
-            out = grad_fd(backend_obj, params, derivative_options, logger)
+            out = grad_fd(
+                backend_obj,
+                params,
+                derivative_options,
+                logger,
+                evaluation_cache=evaluation_cache,
+            )
         elif derivative_method == "param_shift":
             assert (
                 params.__class__.__name__ == "QAOAVariationalStandardParams"
             ), f"{params.__class__.__name__} not supported - only Standard Parametrisation is supported for parameter shift/stochastic parameter shift for now."
-            out = grad_ps(backend_obj, params, params_ext, derivative_options, logger)
+            out = grad_ps(
+                backend_obj,
+                params,
+                params_ext,
+                derivative_options,
+                logger,
+                evaluation_cache=evaluation_cache,
+            )
         elif derivative_method == "stoch_param_shift":
             assert (
                 params.__class__.__name__ == "QAOAVariationalStandardParams"
@@ -202,9 +363,20 @@ def derivative(
                 derivative_options,
                 logger,
                 stochastic=True,
+                evaluation_cache=evaluation_cache,
             )
         elif derivative_method == "grad_spsa":
-            out = grad_spsa(backend_obj, params, derivative_options, logger)
+            out = grad_spsa(
+                backend_obj,
+                params,
+                derivative_options,
+                logger,
+                evaluation_cache=evaluation_cache,
+            )
+        elif derivative_method == "adjoint":
+            out = grad_adjoint(backend_obj, params, logger)
+        elif derivative_method == "analytical":
+            out = grad_analytical(backend_obj, params, logger)
 
     elif derivative_type == "gradient_w_variance":
 
@@ -241,14 +413,26 @@ def derivative(
             out = grad_spsa(
                 backend_obj, params, derivative_options, logger, variance=True
             )
+        elif derivative_method in ["adjoint", "analytical"]:
+            raise ValueError(
+                f"The {derivative_method} method computes exact gradients, it cannot be used to compute their variance."
+            )
 
     elif derivative_type == "hessian":
 
         if derivative_method == "finite_difference":
-            out = hessian_fd(backend_obj, params, derivative_options, logger)
+            out = hessian_fd(
+                backend_obj,
+                params,
+                derivative_options,
+                logger,
+                evaluation_cache=evaluation_cache,
+            )
+        elif derivative_method == "analytical":
+            out = hessian_analytical(backend_obj, params, logger)
         else:
             raise ValueError(
-                "Only support hessian derivative method is finite_difference. Your choice: {}".format(
+                "Only support hessian derivative methods are finite_difference and analytical. Your choice: {}".format(
                     derivative_method
                 )
             )
@@ -348,13 +532,15 @@ def __create_n_shots_ext_list(n_params, n_associated_params, n_shots):
     return n_shots_list
 
 
-def __gradient(args, backend_obj, params, logger, variance):
+def __gradient(args, backend_obj, params, logger, variance, evaluation_cache=None):
     """
-    Returns a callable function that computes the gradient as `constant*(fun(args + vect_eta) - fun(args - vect_eta))`
-    and its variance (if variance=True).
+    Returns a callable function that computes the gradients
+    `constants[i]*(fun(args + vect_etas[i]) - fun(args - vect_etas[i]))`
+    and their variances (if variance=True), for every row `vect_etas[i]`.
     Where fun is the function that we want to differentiate,
-    vect_eta is a vector of length n_params, and constant is a
-    constant that depends on the derivative method.
+    vect_etas is an array of shape (n_gradients, n_params), and constants
+    depend on the derivative method. All the shifted parameter sets are sent
+    to the backend at once, as a single batch.
 
     Parameters
     ----------
@@ -370,105 +556,136 @@ def __gradient(args, backend_obj, params, logger, variance):
         required for the jacobian/hessian computation.
     variance : bool
         If True, then the variance of the gradient is also computed.
+    evaluation_cache : EvaluationCache
+        Cache of the evaluations shared with the optimizer, if any. Only used
+        when variance=False, since the variance requires the counts.
 
     Returns
     -------
     out:
-        Callable function that computes the gradient and its variance (if variance=True).
+        Callable function that computes the gradients and their variances (if variance=True).
     """
 
-    def fun_w_variance(vect_eta, constant, n_shots=None):
+    def fun_w_variance(vect_etas, constants, n_shots_list):
         """
-        Computes the gradient and its variance as `constant*(fun(args + vect_eta) - fun(args - vect_eta))`.
+        Computes the gradients and their variances as
+        `constants[i]*(fun(args + vect_etas[i]) - fun(args - vect_etas[i]))`.
 
         Parameters
         ----------
-        vect_eta : np.array
-            Vector of length n_params.
-        constant : float
-            Constant that depends on the derivative method.
-        n_shots : int
-            Number of shots to use when calling fun().
+        vect_etas : np.array
+            Array of shape (n_gradients, n_params).
+        constants : np.array
+            Constants that depend on the derivative method, one per gradient.
+        n_shots_list : list
+            Number of shots to use when calling fun(), one per gradient.
 
         Returns
         -------
         out:
-            Gradient and its variance.
+            Gradients and their variances.
         """
 
-        # get value of eta, the function to get counts, hamiltonian, and alpha
-        fun = update_and_get_counts(backend_obj, params, logger)
-        hamiltonian = backend_obj.qaoa_descriptor.cost_hamiltonian
-        alpha = backend_obj.cvar_alpha
-
-        # get counts f(x+eta/2) and f(x-eta/2)
-        counts_i_dict = fun(args - vect_eta, n_shots=n_shots)
-        counts_f_dict = fun(args + vect_eta, n_shots=n_shots)
-
-        # compute cost for each state in the counts dictionaries
-        costs_dict = {
-            key: cost_function({key: 1}, hamiltonian, alpha)
-            for key in counts_i_dict.keys() | counts_f_dict.keys()
-        }
-
-        # for each count get the cost and create a list of shot costs
-        eval_i_list = [
-            costs_dict[key]
-            for key, value in counts_i_dict.items()
-            for _ in range(value)
-        ]
-        eval_f_list = [
-            costs_dict[key]
-            for key, value in counts_f_dict.items()
-            for _ in range(value)
-        ]
+        # get the function to get counts and the hamiltonian
+        fun = update_and_get_counts_batch(backend_obj, params, logger)
+        hamiltonian = backend_obj.compiled_cost_hamiltonian
 
-        # check if the number of shots used in the simulator / QPU is equal to n_shots
-        assert (
-            len(eval_i_list) == n_shots and len(eval_f_list) == n_shots
-        ), "This backend does not support changing the number of shots."
+        # get counts f(x-eta/2) and f(x+eta/2) of all the gradients, in one batch
+        counts_dicts = fun(
+            np.concatenate([args - vect_etas, args + vect_etas]),
+            n_shots_list=list(n_shots_list) * 2,
+        )
+        counts_i_dicts = counts_dicts[: len(vect_etas)]
+        counts_f_dicts = counts_dicts[len(vect_etas) :]
+
+        # compute cost for each state in the counts dictionaries, in one batch
+        states = list(set().union(*counts_dicts))
+        costs_dict = dict(
+            zip(states, hamiltonian.energies(bits_from_bitstrings(states)))
+        )
+
+        grad, var = np.zeros(len(vect_etas)), np.zeros(len(vect_etas))
+        for i, (counts_i_dict, counts_f_dict, n_shots) in enumerate(
+            zip(counts_i_dicts, counts_f_dicts, n_shots_list)
+        ):
+            # for each count get the cost and create an array of shot costs
+            eval_i_list = np.repeat(
+                [costs_dict[key] for key in counts_i_dict.keys()],
+                list(counts_i_dict.values()),
+            )
+            eval_f_list = np.repeat(
+                [costs_dict[key] for key in counts_f_dict.keys()],
+                list(counts_f_dict.values()),
+            )
+
+            # check if the number of shots used in the simulator / QPU is equal to n_shots
+            assert (
+                len(eval_i_list) == n_shots and len(eval_f_list) == n_shots
+            ), "This backend does not support changing the number of shots."
+
+            # compute a list of gradients of one shot cost
+            grad_list = np.real(constants[i] * (eval_f_list - eval_i_list))
 
-        # compute a list of gradients of one shot cost
-        grad_list = np.real(constant * (np.array(eval_f_list) - np.array(eval_i_list)))
+            # average and variance for the gradient for this argument
+            grad[i], var[i] = np.mean(grad_list), np.var(grad_list)
 
-        # return average and variance for the gradient for this argument
-        return np.mean(grad_list), np.var(grad_list)
+        return grad, var
 
-    def fun(vect_eta, constant, n_shots=None):
+    def fun(vect_etas, constants, n_shots_list):
         """
-        Computes the gradient as `constant*(fun(args + vect_eta) - fun(args - vect_eta))`.
+        Computes the gradients as
+        `constants[i]*(fun(args + vect_etas[i]) - fun(args - vect_etas[i]))`.
 
         Parameters
         ----------
-        vect_eta : np.array
-            Vector of length n_params.
-        constant : float
-            Constant that depends on the derivative method.
-        n_shots : int
-            Number of shots to use when calling fun().
+        vect_etas : np.array
+            Array of shape (n_gradients, n_params).
+        constants : np.array
+            Constants that depend on the derivative method, one per gradient.
+        n_shots_list : list
+            Number of shots to use when calling fun(), one per gradient.
 
         Returns
         -------
         out:
-            Gradient.
+            Gradients, and zero variances.
         """
-        fun = update_and_compute_expectation(backend_obj, params, logger)
+        fun = update_and_compute_expectation_batch(
+            backend_obj, params, logger, evaluation_cache
+        )
+
+        # evaluate f(x+eta/2) and f(x-eta/2) of all the gradients, in one batch
+        exp_vals = fun(
+            np.concatenate([args + vect_etas, args - vect_etas]),
+            n_shots_list=list(n_shots_list) * 2,
+        )
         return (
-            constant
-            * (
-                fun(args + vect_eta, n_shots=n_shots)
-                - fun(args - vect_eta, n_shots=n_shots)
-            ),
-            0,
+            constants * (exp_vals[: len(vect_etas)] - exp_vals[len(vect_etas) :]),
+            np.zeros(len(vect_etas)),
         )
 
-    if variance:
-        return fun_w_variance
-    else:
-        return fun
+    def gradient_function(vect_etas, constants, n_shots_list):
+        vect_etas = np.atleast_2d(vect_etas)
+        if len(vect_etas) == 0:
+            return np.zeros(0), np.zeros(0)
+
+        constants = np.broadcast_to(constants, len(vect_etas))
+        if variance:
+            return fun_w_variance(vect_etas, constants, n_shots_list)
+        else:
+            return fun(vect_etas, constants, n_shots_list)
+
+    return gradient_function
 
 
-def grad_fd(backend_obj, params, gradient_options, logger, variance: bool = False):
+def grad_fd(
+    backend_obj,
+    params,
+    gradient_options,
+    logger,
+    variance: bool = False,
+    evaluation_cache: EvaluationCache = None,
+):
     """
     Returns a callable function that calculates the gradient (and its variance if `variance=True`)
     with the finite difference method.
@@ -487,6 +704,8 @@ def grad_fd(backend_obj, params, gradient_options, logger, variance: bool = Fals
     variance : `bool`
         If True, the variance of the gradient is also computed.
         If False, only the gradient is computed.
+    evaluation_cache : `EvaluationCache`
+        cache of the evaluations shared with the optimizer, if any.
 
     RETURNS
     -------
@@ -500,25 +719,23 @@ def grad_fd(backend_obj, params, gradient_options, logger, variance: bool = Fals
     def grad_fd_func(args, n_shots=None):
 
         # get the function to compute the gradient and its variance
-        __gradient_function = __gradient(args, backend_obj, params, logger, variance)
+        __gradient_function = __gradient(
+            args, backend_obj, params, logger, variance, evaluation_cache
+        )
 
         # if n_shots is int or None create a list with len of args
         # (if it is none, it will use the default n_shots)
         n_shots_list = __create_n_shots_list(len(args), n_shots)
 
-        # lists of gradients and variances for each argument, initialized with zeros
-        grad, var = np.zeros(len(args)), np.zeros(len(args))
-
-        for i in range(len(args)):
-            # vector and constant to compute the gradient for the i-th argument
-            vect_eta = np.zeros(len(args))
-            vect_eta[i] = eta / 2
-            const = 1 / eta
+        # vectors and constants to compute the gradient of each argument,
+        # the i-th row shifting the i-th argument
+        vect_etas = np.eye(len(args)) * eta / 2
+        const = 1 / eta
 
-            # Finite diff. calculation of gradient
-            grad[i], var[i] = __gradient_function(
-                vect_eta, const, n_shots_list[i]
-            )  # const*[f(args + vect_eta) - f(args - vect_eta)]
+        # Finite diff. calculation of all the gradients, in one batch
+        grad, var = __gradient_function(
+            vect_etas, const, n_shots_list
+        )  # const*[f(args + vect_eta) - f(args - vect_eta)]
 
         # if variance is True, add the number of shots per argument to the logger
         if variance:
@@ -544,6 +761,7 @@ def grad_ps(
     logger,
     stochastic: bool = False,
     variance: bool = False,
+    evaluation_cache: EvaluationCache = None,
 ):
     """
     If `stochastic=False` returns a callable function that calculates the gradient
@@ -573,6 +791,8 @@ def grad_ps(
     variance : `bool`
         If True, the variance of the gradient is also computed.
         If False, only the gradient is computed.
+    evaluation_cache : `EvaluationCache`
+        cache of the evaluations shared with the optimizer, if any.
 
     RETURNS
     -------
@@ -608,7 +828,7 @@ def grad_ps(
 
         # get the function to compute the gradient and its variance
         __gradient_function = __gradient(
-            args_ext, backend_obj, params_ext, logger, variance
+            args_ext, backend_obj, params_ext, logger, variance, evaluation_cache
         )
 
         # we call the function that returns the number of shots for each extended parameter,
@@ -621,27 +841,24 @@ def grad_ps(
         # with the stochastic parameter shift method lists of gradients and variances
         # for each argument (extended), initialized with zeros
         grad_ext, var_ext = np.zeros(len(args_ext)), np.zeros(len(args_ext))
-        # variable to count the number of shots used
-        n_shots_used = 0
-        # Apply parameter shifts
-        for i, sample_param_bool in enumerate(__sample_params()):
-            # __sample_params is only relevant if stochastic=True, if stochastic=False
-            # we loop over all extended parameters. __sample_params() returns a list with True or False
-            # for each extended parameter (`i` is the index of the extended parameter,
-            # and `sample_param_bool` is True if the parameter is sampled)
-            if not sample_param_bool:
-                # (only relevant if stochastic=True) if the parameter is not
-                # sampled (`sample_param_bool==False`), skip it
-                continue
-            r = coeffs_list[i]
-            vect_eta = np.zeros(len(args_ext))
-            vect_eta[i] = np.pi / (4 * r)
-            grad_ext[i], var_ext[i] = __gradient_function(
-                vect_eta, r, n_shots_list[i]
-            )  # r*[f(args + vect_eta) - f(args - vect_eta)]
-            n_shots_used += (
-                n_shots_list[i] * 2 if n_shots_list[i] != None else 0
-            )  # we multiply by 2 because we call the function twice to compute the gradient
+        # __sample_params is only relevant if stochastic=True, if stochastic=False
+        # all extended parameters are shifted. __sample_params() returns a list with True or False
+        # for each extended parameter, True if the parameter is sampled
+        sampled_indices = np.flatnonzero(__sample_params())
+        # Apply parameter shifts, one row of shifts for each sampled extended parameter
+        r = np.array(coeffs_list)[sampled_indices]
+        vect_etas = np.zeros((len(sampled_indices), len(args_ext)))
+        vect_etas[np.arange(len(sampled_indices)), sampled_indices] = np.pi / (4 * r)
+        sampled_n_shots = [n_shots_list[i] for i in sampled_indices]
+        (
+            grad_ext[sampled_indices],
+            var_ext[sampled_indices],
+        ) = __gradient_function(
+            vect_etas, r, sampled_n_shots
+        )  # r*[f(args + vect_eta) - f(args - vect_eta)], for all the shifts in one batch
+        # variable to count the number of shots used, we multiply by 2 because
+        # we evaluate the function twice to compute each gradient
+        n_shots_used = sum(2 * shots for shots in sampled_n_shots if shots != None)
 
         ## convert extended form back into standard form
         # sum all the gradients for each parameter of each coefficient according to the indices in l,
@@ -727,7 +944,14 @@ def grad_ps(
     return grad_ps_func
 
 
-def grad_spsa(backend_obj, params, gradient_options, logger, variance: bool = False):
+def grad_spsa(
+    backend_obj,
+    params,
+    gradient_options,
+    logger,
+    variance: bool = False,
+    evaluation_cache: EvaluationCache = None,
+):
     """
     Returns a callable function that calculates the gradient approxmiation with the
     Simultaneous Perturbation Stochastic Approximation (SPSA) method.
@@ -743,6 +967,8 @@ def grad_spsa(backend_obj, params, gradient_options, logger, variance: bool = Fa
             stepsize of stochastic shift.
     logger : `Logger`
         logger object to log the number of function evaluations.
+    evaluation_cache : `EvaluationCache`
+        cache of the evaluations shared with the optimizer, if any.
 
     RETURNS
     -------
@@ -759,7 +985,9 @@ def grad_spsa(backend_obj, params, gradient_options, logger, variance: bool = Fa
             logger.log_variables({"n_shots": [n_shots]})
 
         # get the function to compute the gradient and its variance
-        __gradient_function = __gradient(args, backend_obj, params, logger, variance)
+        __gradient_function = __gradient(
+            args, backend_obj, params, logger, variance, evaluation_cache
+        )
 
         # vector and constant to compute the gradient and its variance
         delta = 2 * np.random.randint(0, 2, size=len(args)) - 1
@@ -767,7 +995,7 @@ def grad_spsa(backend_obj, params, gradient_options, logger, variance: bool = Fa
         const = 1 / eta
 
         # compute the gradient and its variance: const*[f(args + vect_eta) - f(args - vect_eta)]
-        grad, var = __gradient_function(vector_eta, const, n_shots)
+        (grad,), (var,) = __gradient_function(vector_eta, const, [n_shots])
 
         if variance:
             return (
@@ -781,9 +1009,137 @@ def grad_spsa(backend_obj, params, gradient_options, logger, variance: bool = Fa
     return grad_spsa_func
 
 
-def hessian_fd(backend_obj, params, hessian_options, logger):
+def grad_adjoint(backend_obj, params, logger):
+    """
+    Returns a callable function that calculates the exact gradient with the adjoint
+    method. The backend computes the derivatives with respect to every gate angle
+    in one forward and one backward sweep, which are then mapped onto the raw
+    parameters with the jacobian of the (linear) map from parameters to angles.
+
+    PARAMETERS
+    ----------
+    backend_obj : `QAOABaseBackend`
+        backend object implementing `adjoint_gradient`, e.g. the vectorized simulator.
+    params : `QAOAVariationalBaseParams`
+        variational parameters object.
+    logger : `Logger`
+        logger object to log the number of function evaluations.
+
+    RETURNS
+    -------
+    grad_adjoint_func: `Callable`
+        Callable derivative function.
+    """
+    if not hasattr(backend_obj, "adjoint_gradient"):
+        raise ValueError(
+            f"The adjoint method is not supported by {type(backend_obj).__name__}, "
+            "please use the vectorized simulator."
+        )
+
+    # the angles of the gates depend linearly on the raw parameters for every
+    # parametrisation, so the jacobian is computed once from unit vectors
+    def angles_at(args):
+        params.update_from_raw(args)
+        return np.array(
+            backend_obj.obtain_angles_for_pauli_list(
+                backend_obj.abstract_circuit, params
+            )
+        )
+
+    n_params = len(params.raw())
+    angles_zero = angles_at(np.zeros(n_params))
+    angles_jacobian = np.column_stack(
+        [angles_at(vect) - angles_zero for vect in np.eye(n_params)]
+    )
+
+    def grad_adjoint_func(args, n_shots=None):
+        current_total_eval = logger.func_evals.best[0]
+        current_total_eval += 1
+        current_jac_eval = logger.jac_func_evals.best[0]
+        current_jac_eval += 1
+        logger.log_variables(
+            {"func_evals": current_total_eval, "jac_func_evals": current_jac_eval}
+        )
+        params.update_from_raw(args)
+
+        # chain rule from the derivatives wrt the gate angles to the raw parameters
+        return backend_obj.adjoint_gradient(params) @ angles_jacobian
+
+    return grad_adjoint_func
+
+
+def __analytical_derivatives(backend_obj, params, logger, log_key):
+    """
+    Returns a callable function that computes the energy, gradient and hessian of
+    the closed-form p=1 expression of the analytical simulator, wrt the raw
+    parameters (betas, gammas) of the standard parametrisation.
+    """
+    if not hasattr(backend_obj, "analytical_graph"):
+        raise ValueError(
+            f"The analytical method is not supported by {type(backend_obj).__name__}, "
+            "please use the analytical simulator."
+        )
+    assert (
+        params.__class__.__name__ == "QAOAVariationalStandardParams"
+    ), f"{params.__class__.__name__} not supported - only Standard Parametrisation is supported for analytical derivatives."
+
+    def derivatives_func(args):
+        current_total_eval = logger.func_evals.best[0]
+        current_total_eval += 1
+        log_dict = {"func_evals": current_total_eval}
+        if log_key is not None:
+            log_dict[log_key] = getattr(logger, log_key).best[0] + 1
+        logger.log_variables(log_dict)
+        params.update_from_raw(args)
+
+        return backend_obj.analytical_graph.energy_derivatives(
+            [params.betas, params.gammas]
+        )
+
+    return derivatives_func
+
+
+def grad_analytical(backend_obj, params, logger):
+    """
+    Returns a callable function that calculates the exact gradient of the closed-form
+    expression for p=1 used by the analytical simulator, in a single pass over the
+    terms of the cost Hamiltonian.
+
+    PARAMETERS
+    ----------
+    backend_obj : `QAOABackendAnalyticalSimulator`
+        analytical simulator backend object.
+    params : `QAOAVariationalStandardParams`
+        variational parameters object, standard parametrisation with p=1.
+    logger : `Logger`
+        logger object to log the number of function evaluations.
+
+    RETURNS
+    -------
+    grad_analytical_func: `Callable`
+        Callable derivative function.
+    """
+    derivatives_func = __analytical_derivatives(
+        backend_obj, params, logger, "jac_func_evals"
+    )
+
+    def grad_analytical_func(args, n_shots=None):
+        return derivatives_func(args)[1]
+
+    return grad_analytical_func
+
+
+def hessian_fd(
+    backend_obj,
+    params,
+    hessian_options,
+    logger,
+    evaluation_cache: EvaluationCache = None,
+):
     """
     Returns a callable function that calculates the hessian with the finite difference method.
+    The distinct points of the stencil (2n^2 + 2n + 1 for n parameters, using the symmetry
+    of the hessian) are each evaluated once, in a single call to `backend_obj.expectation_batch`.
 
     PARAMETERS
     ----------
@@ -796,6 +1152,8 @@ def hessian_fd(backend_obj, params, hessian_options, logger):
             stepsize of finite difference.
     logger : `Logger`
         logger object to log the number of function evaluations.
+    evaluation_cache : `EvaluationCache`
+        cache of the evaluations shared with the optimizer, if any.
 
     RETURNS
     -------
@@ -805,36 +1163,78 @@ def hessian_fd(backend_obj, params, hessian_options, logger):
     """
 
     eta = hessian_options["stepsize"]
-    fun = update_and_compute_expectation(backend_obj, params, logger)
+    fun = update_and_compute_expectation_batch(
+        backend_obj, params, logger, evaluation_cache
+    )
 
     def hessian_fd_func(args):
+        args = np.asarray(args, dtype=float)
+        vect_etas = np.eye(len(args)) * eta
+        # the hessian is symmetric, only the pairs i < j are computed
+        pairs_i, pairs_j = np.triu_indices(len(args), k=1)
+
+        # Every distinct point of the stencil is evaluated once, in one batch:
+        # the centre, the shifts by 2*eta, eta, -eta, -2*eta along each axis (diagonals)
+        # and the shifts by (eta, eta), (eta, -eta), (-eta, eta), (-eta, -eta) along
+        # each pair of axes (off-diagonals)
+        points = np.vstack(
+            [args[None, :]]
+            + [args + shift * vect_etas for shift in (2, 1, -1, -2)]
+            + [
+                args + shift_i * vect_etas[pairs_i] + shift_j * vect_etas[pairs_j]
+                for shift_i, shift_j in ((1, 1), (1, -1), (-1, 1), (-1, -1))
+            ]
+        )
+        exp_vals = fun(points)
+
+        centre = exp_vals[0]
+        plus_2, plus_1, minus_1, minus_2 = exp_vals[1 : 1 + 4 * len(args)].reshape(
+            4, len(args)
+        )
+        plus_plus, plus_minus, minus_plus, minus_minus = exp_vals[
+            1 + 4 * len(args) :
+        ].reshape(4, len(pairs_i))
+
         hess = np.zeros((len(args), len(args)))
 
-        for i in range(len(args)):
-            for j in range(len(args)):
-                vect_eta1 = np.zeros(len(args))
-                vect_eta2 = np.zeros(len(args))
-                vect_eta1[i] = 1
-                vect_eta2[j] = 1
-
-                if i == j:
-                    # Central diff. hessian diagonals (https://v8doc.sas.com/sashtml/ormp/chap5/sect28.htm)
-                    hess[i][i] = (
-                        -fun(args + 2 * eta * vect_eta1)
-                        + 16 * fun(args + eta * vect_eta1)
-                        - 30 * fun(args)
-                        + 16 * fun(args - eta * vect_eta1)
-                        - fun(args - 2 * eta * vect_eta1)
-                    ) / (12 * eta**2)
-                # grad_diff[i] = (grad_fd_ext(params + (eta/2)*vect_eta)[i] - grad_fd_ext(params - (eta/2)*vect_eta)[i])/eta
-                else:
-                    hess[i][j] = (
-                        fun(args + eta * vect_eta1 + eta * vect_eta2)
-                        - fun(args + eta * vect_eta1 - eta * vect_eta2)
-                        - fun(args - eta * vect_eta1 + eta * vect_eta2)
-                        + fun(args - eta * vect_eta1 - eta * vect_eta2)
-                    ) / (4 * eta**2)
+        # Central diff. hessian diagonals (https://v8doc.sas.com/sashtml/ormp/chap5/sect28.htm)
+        hess[np.diag_indices(len(args))] = (
+            -plus_2 + 16 * plus_1 - 30 * centre + 16 * minus_1 - minus_2
+        ) / (12 * eta**2)
+
+        hess[pairs_i, pairs_j] = (
+            plus_plus - plus_minus - minus_plus + minus_minus
+        ) / (4 * eta**2)
+        hess[pairs_j, pairs_i] = hess[pairs_i, pairs_j]
 
         return hess
 
     return hessian_fd_func
+
+
+def hessian_analytical(backend_obj, params, logger):
+    """
+    Returns a callable function that calculates the exact hessian of the closed-form
+    expression for p=1 used by the analytical simulator, in a single pass over the
+    terms of the cost Hamiltonian.
+
+    PARAMETERS
+    ----------
+    backend_obj : `QAOABackendAnalyticalSimulator`
+        analytical simulator backend object.
+    params : `QAOAVariationalStandardParams`
+        variational parameters object, standard parametrisation with p=1.
+    logger : `Logger`
+        logger object to log the number of function evaluations.
+
+    RETURNS
+    -------
+    hessian_analytical_func:
+        Callable derivative function.
+    """
+    derivatives_func = __analytical_derivatives(backend_obj, params, logger, None)
+
+    def hessian_analytical_func(args):
+        return derivatives_func(args)[2]
+
+    return hessian_analytical_func
@@ -34,6 +34,10 @@ def qfim(
     Quantum Fisher Information Matrix at `args` according to :
     $$[QFI]_{ij} = Re(<∂iφ|∂jφ>) − <∂iφ|φ><φ|∂jφ>$$.
 
+    The derivative state `|∂jφ>` of each parameter is computed once, from two
+    shifted wavefunctions, so that the whole matrix takes 2n+1 wavefunction
+    evaluations followed by the Gram matrix of the n derivative states.
+
     Parameters
     ----------
     params: `QAOAVariationalBaseParams`
@@ -56,46 +60,30 @@ def qfim(
             "QFIM computation is not currently available on shot-based"
         )
 
-    psi = backend_obj.wavefunction(params)
-    log_qfim_evals(logger)
-
-    qfim_array = np.zeros((len(params), len(params)))
-
     copied_params = deepcopy(params)
 
-    def qfim_fun(args):
-
-        for i in range(len(args)):
-            for j in range(i + 1):
-                vi, vj = np.zeros(len(args)), np.zeros(len(args))
-                vi[i] = eta
-                vj[j] = eta
-
-                copied_params.update_from_raw(args + vi)
-                wavefunction_plus_i = np.array(backend_obj.wavefunction(copied_params))
-                log_qfim_evals(logger)
+    def wavefunction_at(args):
+        copied_params.update_from_raw(args)
+        log_qfim_evals(logger)
+        return np.asarray(backend_obj.wavefunction(copied_params))
 
-                copied_params.update_from_raw(args - vi)
-                wavefunction_minus_i = np.array(backend_obj.wavefunction(copied_params))
-                log_qfim_evals(logger)
-
-                copied_params.update_from_raw(args + vj)
-                wavefunction_plus_j = np.array(backend_obj.wavefunction(copied_params))
-                log_qfim_evals(logger)
+    def qfim_fun(args):
 
-                copied_params.update_from_raw(args - vj)
-                wavefunction_minus_j = np.array(backend_obj.wavefunction(copied_params))
-                log_qfim_evals(logger)
+        args = np.asarray(args, dtype=float)
+        psi = wavefunction_at(args)
 
-                di_psi = (wavefunction_plus_i - wavefunction_minus_i) / eta
-                dj_psi = (wavefunction_plus_j - wavefunction_minus_j) / eta
+        # derivative states |∂iφ>, one row per parameter
+        derivative_states = np.empty((len(args), psi.size), dtype=complex)
+        for i, vi in enumerate(np.eye(len(args)) * eta):
+            derivative_states[i] = (
+                wavefunction_at(args + vi) - wavefunction_at(args - vi)
+            ) / eta
 
-                qfim_array[i][j] = np.real(np.vdot(di_psi, dj_psi)) - np.vdot(
-                    di_psi, psi
-                ) * np.vdot(psi, dj_psi)
+        # Gram matrix <∂iφ|∂jφ> and overlaps <∂iφ|φ> of all the derivative states
+        gram_matrix = derivative_states.conj() @ derivative_states.T
+        overlaps = derivative_states.conj() @ psi
 
-                if i != j:
-                    qfim_array[j][i] = qfim_array[i][j]
+        qfim_array = np.real(gram_matrix - np.outer(overlaps, overlaps.conj()))
 
         return qfim_array
 
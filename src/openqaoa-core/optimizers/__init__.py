@@ -4,6 +4,7 @@ Optimizer directory for the classical optimization loop for QAOA
 Currently supports:
 	ScipyOptimizers (both gradient-free and gradient-based)
 	PennylaneOptimizers (adagrad, adam, gradient descent, nestrov momentum, rms prop, rotosolve, spsa)
+	PopulationOptimizers (differential evolution, cma-es)
 """
 
 from .training_vqa import *
@@ -0,0 +1,174 @@
+from collections import OrderedDict
+from typing import Optional, Hashable
+
+import numpy as np
+
+from .logger_vqa import Logger
+from ..qaoa_components.variational_parameters.variational_baseparams import (
+    QAOAVariationalBaseParams,
+)
+
+
+class EvaluationCache(object):
+    """
+    Bounded least recently used (LRU) memo of the evaluations of the cost
+    function, shared between the cost function and the derivative functions of
+    an optimizer, so that points visited more than once (e.g. by the line
+    searches of BFGS and L-BFGS-B, or by the stencils of finite differences)
+    are only simulated once.
+
+    The evaluations are keyed by the parametrisation, the raw parameter vector
+    quantised on a grid of spacing ``resolution``, and the number of shots.
+    Note that, for shot-based backends, a cached evaluation returns the same
+    sampled value every time the point is revisited.
+
+    Parameters
+    ----------
+    max_size: int
+        Maximum number of evaluations kept, the least recently used being
+        discarded first. Each evaluation made by the optimizer also keeps its
+        measurement outcomes, i.e. a full wavefunction for statevector backends.
+    resolution: float
+        Spacing of the grid on which the parameters are quantised. Parameter
+        vectors whose components all round to the same grid points share the
+        same evaluation.
+    logger: Logger
+        If given, the ``cache_hits`` and ``cache_misses`` variables of the
+        logger are updated after every lookup.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 128,
+        resolution: float = 1e-10,
+        logger: Optional[Logger] = None,
+    ):
+        if not (isinstance(max_size, (int, np.integer)) and max_size >= 1):
+            raise ValueError(f"max_size must be a positive integer, got {max_size}")
+        if not resolution > 0:
+            raise ValueError(f"resolution must be positive, got {resolution}")
+
+        self.max_size = max_size
+        self.resolution = resolution
+        self.logger = logger
+
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of the lookups served from the cache.
+        """
+        n_lookups = self.hits + self.misses
+        return self.hits / n_lookups if n_lookups else 0.0
+
+    def key(
+        self,
+        params: QAOAVariationalBaseParams,
+        args: np.ndarray,
+        n_shots: Optional[int] = None,
+    ) -> Hashable:
+        """
+        Returns the key of the evaluation of the cost function at the raw
+        parameters ``args`` of the parametrisation of ``params``.
+
+        Parameters
+        ----------
+        params: QAOAVariationalBaseParams
+            The parameters object used to interpret ``args``.
+        args: np.ndarray
+            The raw parameter vector.
+        n_shots: int
+            The number of shots of the evaluation, None for the backend default.
+
+        Returns
+        -------
+        key:
+            The hashable key of the evaluation.
+        """
+        quantised_args = np.rint(np.asarray(args, dtype=float) / self.resolution)
+        return (
+            type(params).__name__,
+            quantised_args.astype(np.int64).tobytes(),
+            n_shots,
+        )
+
+    def get(self, key: Hashable, required: tuple = ("cost",)) -> Optional[dict]:
+        """
+        Looks up an evaluation, updating the hit statistics.
+
+        Parameters
+        ----------
+        key:
+            The key of the evaluation, as returned by ``key``.
+        required: tuple
+            The fields the cached evaluation must hold to be a hit.
+
+        Returns
+        -------
+        entry: dict
+            The cached evaluation, or None if missing.
+        """
+        return self.lookup([key], required)[0]
+
+    def lookup(self, keys: list, required: tuple = ("cost",)) -> list:
+        """
+        Looks up a batch of evaluations, updating the hit statistics once.
+
+        Parameters
+        ----------
+        keys: list
+            The keys of the evaluations, as returned by ``key``.
+        required: tuple
+            The fields a cached evaluation must hold to be a hit.
+
+        Returns
+        -------
+        entries: list
+            The cached evaluation of each key, None for the missing ones.
+        """
+        entries = []
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None and all(field in entry for field in required):
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                entry = None
+                self.misses += 1
+            entries.append(entry)
+
+        self._log_statistics()
+        return entries
+
+    def put(self, key: Hashable, **fields):
+        """
+        Stores the fields (e.g. ``cost``) of an evaluation, merging them with
+        those already cached, and discards the least recently used evaluations
+        beyond ``max_size``.
+        """
+        self._entries[key] = {**self._entries.get(key, {}), **fields}
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Empties the cache, keeping the hit statistics.
+        """
+        self._entries.clear()
+
+    def _log_statistics(self):
+        """
+        Logs the number of hits and misses so far.
+        """
+        if self.logger is not None:
+            self.logger.log_variables(
+                {"cache_hits": self.hits, "cache_misses": self.misses}
+            )
@@ -0,0 +1,148 @@
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+
+def CMA_ES(
+    fun,
+    x0,
+    args=(),
+    maxfev=None,
+    sigma0=0.1,
+    popsize=None,
+    maxiter=100,
+    tol=10 ** (-6),
+    bounds=None,
+    seed=None,
+    callback=None,
+    **options
+):
+    """
+    Minimize a function `fun` with the covariance matrix adaptation evolution
+    strategy (CMA-ES), following "The CMA Evolution Strategy: A Tutorial"
+    (https://arxiv.org/abs/1604.00772). Each generation of `popsize` candidates
+    is sampled from a multivariate normal distribution, whose mean, step size and
+    covariance matrix are adapted from the best half of the candidates.
+
+    PARAMETERS
+    ----------
+    fun : callable
+        Function evaluating a whole generation, a 2D array with one candidate per
+        row, returning the 1D array of their values.
+    x0 : ndarray
+        Initial guess, the initial mean of the distribution.
+    args : sequence, optional
+        Arguments to pass to `func`.
+    maxfev : int, optional
+        Maximum number of function evaluations.
+    sigma0 : float
+        Initial step size, the standard deviation of the initial distribution.
+    popsize : int, optional
+        Number of candidates of each generation. Defaults to 4 + 3*log(n) for
+        n parameters.
+    maxiter : int, optional
+        Maximum number of generations.
+    tol : float
+        Tolerance before the optimizer terminates; if the standard deviation of
+        the distribution along every direction is smaller than `tol`, terminate
+        optimization.
+    bounds : `scipy.optimize.Bounds`, optional
+        Bounds on the parameters, the candidates outside are clipped to them.
+    seed : int, optional
+        Seed of the random number generator sampling the candidates.
+    callback : callable, optional
+        Called after each generation, as ``callback(xk)``, where ``xk`` is the
+        current mean of the distribution.
+
+    RETURNS
+    -------
+    OptimizeResult : OptimizeResult
+        Scipy OptimizeResult object.
+    """
+
+    n = len(x0)
+    rng = np.random.default_rng(seed)
+
+    # selection and recombination
+    popsize = 4 + int(3 * np.log(n)) if popsize is None else popsize
+    mu = popsize // 2
+    weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+    weights = weights / np.sum(weights)
+    mu_eff = 1 / np.sum(weights**2)
+
+    # adaptation of the step size and of the covariance matrix
+    cc = (4 + mu_eff / n) / (n + 4 + 2 * mu_eff / n)
+    cs = (mu_eff + 2) / (n + mu_eff + 5)
+    c1 = 2 / ((n + 1.3) ** 2 + mu_eff)
+    cmu = min(1 - c1, 2 * (mu_eff - 2 + 1 / mu_eff) / ((n + 2) ** 2 + mu_eff))
+    damps = 1 + 2 * max(0, np.sqrt((mu_eff - 1) / (n + 1)) - 1) + cs
+    chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n**2))
+
+    if bounds is not None:
+        lb, ub = np.broadcast_to(bounds.lb, n), np.broadcast_to(bounds.ub, n)
+
+    # the covariance matrix is C = B diag(D**2) B^T
+    mean = np.array(x0, dtype=float)
+    sigma = sigma0
+    C, B, D = np.eye(n), np.eye(n), np.ones(n)
+    pc, ps = np.zeros(n), np.zeros(n)
+
+    bestx = np.copy(mean)
+    besty = np.real(fun(mean[None, :], *args))[0]
+    funcalls = 1
+    niter = 0
+    converged = False
+
+    while niter < maxiter:
+        niter += 1
+
+        # sample a generation, y being the steps in units of sigma
+        y = (rng.standard_normal((popsize, n)) * D) @ B.T
+        x = mean + sigma * y
+        if bounds is not None:
+            x = np.clip(x, lb, ub)
+            y = (x - mean) / sigma
+
+        values = np.real(fun(x, *args))
+        funcalls += popsize
+
+        order = np.argsort(values)
+        if values[order[0]] < besty:
+            bestx, besty = np.copy(x[order[0]]), values[order[0]]
+
+        # move the mean towards the weighted best half of the generation
+        y_selected = y[order[:mu]]
+        y_mean = weights @ y_selected
+        mean = mean + sigma * y_mean
+
+        # evolution paths, the one of the step size in the isotropic coordinates
+        ps = (1 - cs) * ps + np.sqrt(cs * (2 - cs) * mu_eff) * (
+            B @ ((B.T @ y_mean) / D)
+        )
+        hsig = np.linalg.norm(ps) / np.sqrt(1 - (1 - cs) ** (2 * niter)) < (
+            1.4 + 2 / (n + 1)
+        ) * chi_n
+        pc = (1 - cc) * pc + hsig * np.sqrt(cc * (2 - cc) * mu_eff) * y_mean
+
+        # rank-one and rank-mu updates of the covariance matrix
+        C = (
+            (1 - c1 - cmu) * C
+            + c1 * (np.outer(pc, pc) + (1 - hsig) * cc * (2 - cc) * C)
+            + cmu * (y_selected.T * weights) @ y_selected
+        )
+        sigma = sigma * np.exp((cs / damps) * (np.linalg.norm(ps) / chi_n - 1))
+
+        C = (C + C.T) / 2
+        eigenvalues, B = np.linalg.eigh(C)
+        D = np.sqrt(np.maximum(eigenvalues, 0))
+
+        if callback is not None:
+            callback(mean)
+        if sigma * np.max(D) < tol:
+            converged = True
+            break
+        if maxfev is not None and funcalls >= maxfev:
+            break
+
+    return OptimizeResult(
+        fun=besty, x=bestx, nit=niter, nfev=funcalls, success=converged
+    )
@@ -7,3 +7,4 @@ from .SPSA import SPSA
 # from .stochastic_grad_descent import stochastic_grad_descent
 from .CANS import CANS
 from .iCANS import iCANS
+from .CMA_ES import CMA_ES
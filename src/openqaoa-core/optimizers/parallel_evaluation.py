@@ -0,0 +1,140 @@
+import os
+import multiprocessing
+from typing import List, Optional
+
+import numpy as np
+
+from ..backends.basebackend import VQABaseBackend, QAOABaseBackendCloud
+from ..backends.qaoa_vectorized_memmap import QAOAvectorizedMemmapBackendSimulator
+from ..qaoa_components.variational_parameters.variational_baseparams import (
+    QAOAVariationalBaseParams,
+)
+
+# backend and parameters of a worker process, set once by `_initialize_worker`
+_worker_state = {}
+
+
+def _check_parallel_backend(vqa_object: VQABaseBackend):
+    """
+    Raises a ValueError if the evaluations of `vqa_object` cannot be spread
+    across worker processes: cloud backends submit jobs to remote devices, and
+    the workers of the memory-mapped simulator would share its files.
+    """
+    if isinstance(
+        vqa_object, (QAOABaseBackendCloud, QAOAvectorizedMemmapBackendSimulator)
+    ):
+        raise ValueError(
+            "Parallel evaluations are only supported on local in-memory backends, "
+            f"not on {type(vqa_object).__name__}"
+        )
+
+
+def _initialize_worker(
+    vqa_object: VQABaseBackend, variational_params: QAOAVariationalBaseParams
+):
+    """
+    Initializer of the worker processes, keeping the backend and the parameters
+    received (once per worker) for all the evaluations made by the worker.
+    """
+    _worker_state["vqa"] = vqa_object
+    _worker_state["variational_params"] = variational_params
+
+    # forked workers inherit the random state of the parent process, reseed it
+    # so that the shot-based backends of the workers sample independently
+    np.random.seed()
+
+
+def _evaluate(args: np.ndarray) -> dict:
+    """
+    Evaluates the cost function at the raw parameters `args` with the backend of
+    the worker, returning the fields logged by the optimizer.
+    """
+    vqa = _worker_state["vqa"]
+    variational_params = _worker_state["variational_params"]
+
+    variational_params.update_from_raw(args)
+    return {
+        "cost": vqa.expectation(variational_params),
+        "measurement_outcomes": vqa.measurement_outcomes,
+        "job_id": getattr(vqa, "job_id", None),
+    }
+
+
+class ParallelEvaluator(object):
+    """
+    Pool of worker processes evaluating the cost function of a VQA at many
+    points, e.g. the candidates of a generation of a population-based optimizer.
+
+    The backend and the parameters are sent to each worker once, when the pool
+    starts, and every worker then evaluates its share of the points with its own
+    copy of the backend. Only the raw parameters and the evaluations are sent
+    between processes afterwards.
+
+    Parameters
+    ----------
+    vqa_object: VQABaseBackend
+        The backend evaluating the cost function. Cloud backends, which submit
+        jobs to remote devices, and the memory-mapped simulator, whose files
+        would be shared by the workers, are not supported.
+    variational_params: QAOAVariationalBaseParams
+        The parameters object used to interpret the raw parameters.
+    n_workers: int
+        Number of worker processes, -1 to use all the available cores.
+    start_method: str
+        The start method of the worker processes (`fork`, `spawn` or
+        `forkserver`), defaults to the one of the platform.
+    """
+
+    def __init__(
+        self,
+        vqa_object: VQABaseBackend,
+        variational_params: QAOAVariationalBaseParams,
+        n_workers: int = -1,
+        start_method: Optional[str] = None,
+    ):
+        _check_parallel_backend(vqa_object)
+        if n_workers == -1:
+            n_workers = os.cpu_count()
+        if not (isinstance(n_workers, (int, np.integer)) and n_workers >= 1):
+            raise ValueError(
+                f"n_workers must be a positive integer or -1, got {n_workers}"
+            )
+
+        self.n_workers = n_workers
+        self._pool = multiprocessing.get_context(start_method).Pool(
+            n_workers,
+            initializer=_initialize_worker,
+            initargs=(vqa_object, variational_params),
+        )
+
+    def evaluate(self, args_array: np.ndarray) -> List[dict]:
+        """
+        Evaluates the cost function at each row of `args_array`, spreading the
+        rows evenly across the workers.
+
+        Parameters
+        ----------
+        args_array: np.ndarray
+            2D array of raw parameters, one point per row.
+
+        Returns
+        -------
+        evaluations: List[dict]
+            The `cost`, `measurement_outcomes` and `job_id` of each point.
+        """
+        args_array = np.atleast_2d(args_array)
+        chunksize = max(-(-len(args_array) // self.n_workers), 1)
+        return self._pool.map(_evaluate, list(args_array), chunksize=chunksize)
+
+    def close(self):
+        """
+        Terminates the worker processes.
+        """
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -2,6 +2,7 @@ from .training_vqa import (
     ScipyOptimizer,
     CustomScipyGradientOptimizer,
     PennyLaneOptimizer,
+    PopulationOptimizer,
 )
 from ..qaoa_components.variational_parameters.variational_baseparams import (
     QAOAVariationalBaseParams,
@@ -18,6 +19,7 @@ def available_optimizers():
         "scipy": ScipyOptimizer.SCIPY_METHODS,
         "custom_scipy_gradient": CustomScipyGradientOptimizer.CUSTOM_GRADIENT_OPTIMIZERS,
         "custom_scipy_pennylane": PennyLaneOptimizer.PENNYLANE_OPTIMIZERS,
+        "population": PopulationOptimizer.POPULATION_OPTIMIZERS,
     }
 
     return optimizers
@@ -56,6 +58,7 @@ def get_optimizer(
         "scipy": ScipyOptimizer,
         "custom_scipy_gradient": CustomScipyGradientOptimizer,
         "custom_scipy_pennylane": PennyLaneOptimizer,
+        "population": PopulationOptimizer,
     }
 
     method = optimizer_dict["method"].lower()
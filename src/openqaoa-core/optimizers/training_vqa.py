@@ -7,7 +7,12 @@ from typing import Type, Callable, List
 from datetime import datetime
 
 from scipy.optimize._minimize import minimize, MINIMIZE_METHODS
-from scipy.optimize import LinearConstraint, NonlinearConstraint, Bounds
+from scipy.optimize import (
+    LinearConstraint,
+    NonlinearConstraint,
+    Bounds,
+    differential_evolution,
+)
 
 from ..backends.basebackend import VQABaseBackend
 from ..backends.qaoa_vectorized import QAOAvectorizedBackendSimulator
@@ -18,6 +23,8 @@ from . import optimization_methods as om
 from .pennylane import optimization_methods_pennylane as ompl
 
 from .logger_vqa import Logger
+from .evaluation_cache import EvaluationCache
+from .parallel_evaluation import ParallelEvaluator, _check_parallel_backend
 from ..algorithms.qaoa.qaoa_result import QAOAResult
 
 from ..derivatives.derivative_functions import derivative
@@ -147,6 +154,14 @@ class OptimizeVQA(ABC):
                     "history_update_bool": True,
                     "best_update_string": "Replace",
                 },
+                "cache_hits": {
+                    "history_update_bool": False,
+                    "best_update_string": "HighestOnly",
+                },
+                "cache_misses": {
+                    "history_update_bool": False,
+                    "best_update_string": "HighestOnly",
+                },
             },
             {
                 "root_nodes": [
@@ -155,6 +170,8 @@ class OptimizeVQA(ABC):
                     "jac_func_evals",
                     "qfim_func_evals",
                     "n_shots",
+                    "cache_hits",
+                    "cache_misses",
                 ],
                 "best_update_structure": (
                     ["cost", "param_log"],
@@ -169,6 +186,15 @@ class OptimizeVQA(ABC):
             {"func_evals": 0, "jac_func_evals": 0, "qfim_func_evals": 0}
         )
 
+        # evaluations shared between the cost function and the derivatives, opt-in
+        if optimizer_dict.get("cache_evaluations", False):
+            self.evaluation_cache = EvaluationCache(
+                **(optimizer_dict.get("cache_options") or {}), logger=self.log
+            )
+            self.log.log_variables({"cache_hits": 0, "cache_misses": 0})
+        else:
+            self.evaluation_cache = None
+
     @abstractmethod
     def __repr__(self):
         """
@@ -213,11 +239,55 @@ class OptimizeVQA(ABC):
             Cost Value evaluated on the declared backed or on the Wavefunction Simulator if specified so
         """
 
-        log_dict = {}
-
         self.variational_params.update_from_raw(deepcopy(x))
-        log_dict.update({"param_log": self.variational_params.raw()})
+        self._log_parameters(x)
+
+        # points already evaluated are served from the cache, if enabled
+        evaluation = None
+        if self.evaluation_cache is not None:
+            cache_key = self.evaluation_cache.key(self.variational_params, x, n_shots)
+            evaluation = self.evaluation_cache.get(
+                cache_key, required=("cost", "measurement_outcomes")
+            )
+
+        if evaluation is None:
+            n_shots_dict = {"n_shots": n_shots} if n_shots else {}
+            evaluation = {
+                "cost": self.vqa.expectation(self.variational_params, **n_shots_dict),
+                "measurement_outcomes": self.vqa.measurement_outcomes,
+                "job_id": getattr(self.vqa, "job_id", None),
+            }
+            if self.evaluation_cache is not None:
+                self.evaluation_cache.put(
+                    cache_key, **self._cached_fields(evaluation)
+                )
+
+        return self._log_evaluation(evaluation)
 
+    @staticmethod
+    def _cached_fields(evaluation: dict) -> dict:
+        """
+        Returns the fields of `evaluation` to keep in the evaluation cache. The
+        measurement outcomes that are views of a buffer of the backend (e.g. the
+        memory-mapped wavefunction), overwritten by the next evaluation, are left out.
+        """
+        measurement_outcomes = evaluation["measurement_outcomes"]
+        if (
+            isinstance(measurement_outcomes, np.ndarray)
+            and not measurement_outcomes.flags.owndata
+        ):
+            return {
+                field: value
+                for field, value in evaluation.items()
+                if field != "measurement_outcomes"
+            }
+        return evaluation
+
+    def _log_parameters(self, x):
+        """
+        Logs the parameters `x` about to be evaluated, which the variational
+        parameters must have been updated to.
+        """
         if hasattr(self.vqa, "log_with_backend") and callable(
             getattr(self.vqa, "log_with_backend")
         ):
@@ -230,8 +300,18 @@ class OptimizeVQA(ABC):
         if self.save_to_csv:
             save_parameter("param_log", deepcopy(x))
 
-        n_shots_dict = {"n_shots": n_shots} if n_shots else {}
-        callback_cost = self.vqa.expectation(self.variational_params, **n_shots_dict)
+    def _log_evaluation(self, evaluation: dict):
+        """
+        Logs an evaluation of the cost function at the current variational
+        parameters, given as a dictionary with its `cost`, `measurement_outcomes`
+        and `job_id`, and returns its cost.
+        """
+
+        log_dict = {}
+        log_dict.update({"param_log": self.variational_params.raw()})
+
+        callback_cost = evaluation["cost"]
+        measurement_outcomes = evaluation["measurement_outcomes"]
 
         log_dict.update({"cost": callback_cost})
 
@@ -249,22 +329,22 @@ class OptimizeVQA(ABC):
             }
         )  # this one will say which evaluation is the optimized one
 
-        log_dict.update({"measurement_outcomes": self.vqa.measurement_outcomes})
+        log_dict.update({"measurement_outcomes": measurement_outcomes})
 
         if hasattr(self.vqa, "log_with_backend") and callable(
             getattr(self.vqa, "log_with_backend")
         ):
             self.vqa.log_with_backend(
                 metric_name="measurement_outcomes",
-                value=self.vqa.measurement_outcomes,
+                value=measurement_outcomes,
                 iteration_number=self.log.func_evals.best[0],
             )
 
         if hasattr(self.vqa, "job_id"):
-            log_dict.update({"job_ids": self.vqa.job_id})
+            log_dict.update({"job_ids": evaluation["job_id"]})
 
             if self.save_to_csv:
-                save_parameter("job_ids", self.vqa.job_id)
+                save_parameter("job_ids", evaluation["job_id"])
 
         self.log.log_variables(log_dict)
 
@@ -351,6 +431,8 @@ class ScipyOptimizer(OptimizeVQA):
         * 'maxiter': sets ``maxiters = 100`` by default if not specified.
         * 'maxfev': sets ``maxfev = 100`` by default if not specified.
         * 'optimizer_options': dictionary of optimiser-specific arguments, defaults to ``None``
+        * 'cache_evaluations': whether to cache the evaluations shared by the cost function, gradient and hessian
+        * 'cache_options': dictionary of options of the ``EvaluationCache``, defaults to ``None``
     """
 
     GRADIENT_FREE = ["cobyla", "nelder-mead", "powell", "slsqp"]
@@ -397,6 +479,7 @@ class ScipyOptimizer(OptimizeVQA):
                     "gradient",
                     jac,
                     jac_options,
+                    evaluation_cache=self.evaluation_cache,
                 )
             else:
                 self.jac = jac
@@ -413,6 +496,7 @@ class ScipyOptimizer(OptimizeVQA):
                     "hessian",
                     hess,
                     hess_options,
+                    evaluation_cache=self.evaluation_cache,
                 )
             else:
                 self.hess = hess
@@ -605,6 +689,7 @@ class CustomScipyGradientOptimizer(OptimizeVQA):
                         "gradient",
                         jac,
                         jac_options,
+                        evaluation_cache=self.evaluation_cache,
                     )
                 else:
                     self.jac = None
@@ -615,6 +700,7 @@ class CustomScipyGradientOptimizer(OptimizeVQA):
                         "gradient_w_variance",
                         jac,
                         jac_options,
+                        evaluation_cache=self.evaluation_cache,
                     )
 
             else:
@@ -631,6 +717,7 @@ class CustomScipyGradientOptimizer(OptimizeVQA):
                     "hessian",
                     hess,
                     hess_options,
+                    evaluation_cache=self.evaluation_cache,
                 )
             else:
                 self.hess = hess
@@ -816,6 +903,7 @@ class PennyLaneOptimizer(OptimizeVQA):
                     "gradient",
                     jac,
                     jac_options,
+                    evaluation_cache=self.evaluation_cache,
                 )
             else:
                 self.jac = jac
@@ -906,3 +994,235 @@ class PennyLaneOptimizer(OptimizeVQA):
             self.results_dictionary()
 
         return self
+
+
+class PopulationOptimizer(OptimizeVQA):
+    """
+    Population-based global optimizers for the VQA class, differential evolution
+    (from ``scipy.optimize``) and the CMA-ES evolution strategy. The candidates
+    of each generation are evaluated together, across a pool of worker processes
+    if `n_workers` is specified, each worker evaluating its candidates with its
+    own copy of the backend.
+
+    .. Tip::
+        Workers only pay off for expensive evaluations, e.g. simulations of
+        many qubits, as each evaluation is sent back to the main process.
+
+    Parameters
+    ----------
+    vqa_object:
+        Backend object of class VQABaseBackend which contains information on
+        the backend used to perform computations, and the VQA circuit.
+
+    variational_params:
+        Object of class QAOAVariationalBaseParams, which contains information on
+        the circuit to be executed,  the type of parametrisation,
+        and the angles of the VQA circuit.
+
+    optimizer_dict:
+        * 'bounds': parameter bounds while training, defaults to the initial parameters +- pi
+        * 'tol': Tolerance for termination
+        * 'maxiter': maximum number of generations.
+        * 'maxfev': maximum number of function evaluations, for CMA-ES only.
+        * 'optimizer_options': dictionary of optimiser-specific arguments, defaults to ``None``
+          (e.g. ``popsize`` and ``seed``, ``sigma0`` for CMA-ES, ``mutation`` and ``recombination``
+          for differential evolution). The initial parameters and bounds, as well as `updating` and
+          `workers` for differential evolution, are set by the optimizer
+        * 'n_workers': number of worker processes evaluating the candidates, -1 to use all the
+          available cores, defaults to ``None`` to evaluate them in the main process
+        * 'cache_evaluations': whether to cache the evaluations of the cost function
+        * 'cache_options': dictionary of options of the ``EvaluationCache``, defaults to ``None``
+    """
+
+    POPULATION_OPTIMIZERS = ["differential_evolution", "cma_es"]
+
+    def __init__(
+        self,
+        vqa_object: Type[VQABaseBackend],
+        variational_params: Type[QAOAVariationalBaseParams],
+        optimizer_dict: dict,
+    ):
+
+        super().__init__(vqa_object, variational_params, optimizer_dict)
+
+        self.vqa_object = vqa_object
+        self.parallel_evaluator = None
+        self._validate_and_set_params(optimizer_dict)
+
+    def _validate_and_set_params(self, optimizer_dict):
+        """
+        Verify that the specified arguments are valid for the particular optimizer.
+        """
+
+        if self.method not in PopulationOptimizer.POPULATION_OPTIMIZERS:
+            raise ValueError(
+                f"Please choose from the supported methods: {PopulationOptimizer.POPULATION_OPTIMIZERS}"
+            )
+
+        bounds = optimizer_dict.get("bounds", None)
+        if bounds is None:
+            self.bounds = Bounds(
+                self.initial_params - np.pi, self.initial_params + np.pi
+            )
+        elif isinstance(bounds, Bounds):
+            self.bounds = bounds
+        elif isinstance(bounds, List):
+            lb = np.array(bounds).T[0]
+            ub = np.array(bounds).T[1]
+            self.bounds = Bounds(lb, ub)
+        else:
+            raise ValueError(
+                f"Bounds for population optimization should be of type {Bounds},"
+                "or a list in the form [[ub1, lb1], [ub2, lb2], ...]"
+            )
+
+        self.options = dict(optimizer_dict.get("optimizer_options") or {})
+        # arguments set by the optimizer itself, the candidates of each generation of
+        # differential evolution being evaluated together across the n_workers processes
+        reserved_options = ["x0", "bounds"]
+        if self.method == "differential_evolution":
+            reserved_options += ["updating", "workers"]
+        for key in reserved_options:
+            if key in self.options:
+                raise ValueError(
+                    f"'{key}' cannot be set in the optimizer_options of {self.method}, "
+                    f"it is set by the optimizer (options {reserved_options})"
+                )
+        if optimizer_dict.get("maxiter") is not None:
+            self.options["maxiter"] = optimizer_dict.get("maxiter")
+        if optimizer_dict.get("maxfev") is not None and self.method == "cma_es":
+            self.options["maxfev"] = optimizer_dict.get("maxfev")
+        if optimizer_dict.get("tol") is not None:
+            self.options["tol"] = optimizer_dict.get("tol")
+
+        n_workers = optimizer_dict.get("n_workers", None)
+        if n_workers is not None and not (
+            isinstance(n_workers, (int, np.integer))
+            and (n_workers >= 1 or n_workers == -1)
+        ):
+            raise ValueError(
+                f"n_workers must be a positive integer or -1, got {n_workers}"
+            )
+        if n_workers is not None:
+            _check_parallel_backend(self.vqa_object)
+        self.n_workers = n_workers
+
+        return self
+
+    def __repr__(self):
+        """
+        Overview of the instantiated optimier/trainer.
+        """
+        maxiter = self.options.get("maxiter")
+        string = f"Optimizer for VQA of type: {type(self.vqa).__base__.__name__} \n"
+        string += f"Backend: {type(self.vqa).__name__} \n"
+        string += f"Method: {str(self.method).upper()} with Max Iterations: {maxiter}\n"
+
+        return string
+
+    def evaluate_population(self, args_array: np.ndarray) -> np.ndarray:
+        """
+        Evaluates and logs the cost function at each row of `args_array`, across
+        the worker processes if the optimizer has any.
+
+        Parameters
+        ----------
+        args_array:
+            2D array of raw parameters, one candidate per row.
+
+        Returns
+        -------
+        :
+            The cost of each candidate.
+        """
+        args_array = np.atleast_2d(args_array)
+
+        if self.parallel_evaluator is None:
+            return np.array([self.optimize_this(args) for args in args_array])
+
+        # only the candidates missing from the cache are sent to the workers
+        evaluations = [None] * len(args_array)
+        if self.evaluation_cache is not None:
+            cache_keys = [
+                self.evaluation_cache.key(self.variational_params, args)
+                for args in args_array
+            ]
+            evaluations = self.evaluation_cache.lookup(
+                cache_keys, required=("cost", "measurement_outcomes")
+            )
+
+        missing = [i for i, evaluation in enumerate(evaluations) if evaluation is None]
+        for i, evaluation in zip(
+            missing, self.parallel_evaluator.evaluate(args_array[missing])
+        ):
+            evaluations[i] = evaluation
+            if self.evaluation_cache is not None:
+                self.evaluation_cache.put(
+                    cache_keys[i], **self._cached_fields(evaluation)
+                )
+
+        costs = []
+        for args, evaluation in zip(args_array, evaluations):
+            self.variational_params.update_from_raw(deepcopy(args))
+            self._log_parameters(args)
+            costs.append(self._log_evaluation(evaluation))
+
+        return np.array(costs)
+
+    def _map_population(self, func, iterable):
+        """
+        Map-like callable given to ``scipy.optimize.differential_evolution`` as
+        `workers`, evaluating each generation with `evaluate_population` instead
+        of `func`, which wraps `optimize_this`.
+        """
+        return self.evaluate_population(np.array(list(iterable)))
+
+    def optimize(self):
+        """
+        Main method which implements the optimization process, with
+        ``scipy.optimize.differential_evolution`` or CMA-ES.
+
+        Returns
+        -------
+        :
+            Returns self after the optimization process is completed.
+        """
+
+        try:
+            if self.n_workers is not None:
+                self.parallel_evaluator = ParallelEvaluator(
+                    self.vqa_object, self.variational_params, self.n_workers
+                )
+
+            if self.method == "differential_evolution":
+                result = differential_evolution(
+                    self.optimize_this,
+                    bounds=self.bounds,
+                    x0=self.initial_params,
+                    updating="deferred",
+                    workers=self._map_population,
+                    **self.options,
+                )
+            else:
+                result = om.CMA_ES(
+                    self.evaluate_population,
+                    x0=self.initial_params,
+                    bounds=self.bounds,
+                    **self.options,
+                )
+        except ConnectionError as e:
+            print(e, "\n")
+            print(
+                "The optimization has been terminated early. Most likely due to a connection error."
+                "You can retrieve results from the optimization runs that were completed"
+                "through the .results_information method."
+            )
+        except Exception as e:
+            raise e
+        finally:
+            if self.parallel_evaluator is not None:
+                self.parallel_evaluator.close()
+                self.parallel_evaluator = None
+            self.results_dictionary()
+
+        return self
@@ -1,6 +1,7 @@
 """
 Construct Pauli operators and Hamiltonians.
 """
+import weakref
 from collections import Counter
 from typing import List, Union, Tuple
 from sympy import Symbol
@@ -13,6 +14,10 @@ PauliZ = np.array(([1, 0], [0, -1]), dtype=complex)
 
 PAULIS_SET = set("XYZI")
 
+# squares of the Hamiltonians, with the terms, coefficients and constant they were
+# computed from. Kept outside of the instances, so that they are not serialized
+_HAMILTONIAN_SQUARED_CACHE = weakref.WeakKeyDictionary()
+
 PAULI_MULT_RULES = {
     "XX": "I",
     "YY": "I",
@@ -601,13 +606,20 @@ class Hamiltonian:
     def hamiltonian_squared(self):
         """
         Compute the squared of the Hamiltonian, necessary for computing
-        the error in expectation values.
+        the error in expectation values. The result is cached, and computed
+        again only if the terms, coefficients or constant of the Hamiltonian
+        change, so it should not be modified in place.
 
         Returns
         -------
         hamil_squared: `Hamiltonian`
             Hamiltonian squared.
         """
+        cache_key = (tuple(self.terms), tuple(self.coeffs), self.constant)
+        cached_key, hamil_squared = _HAMILTONIAN_SQUARED_CACHE.get(self, (None, None))
+        if cached_key == cache_key:
+            return hamil_squared
+
         hamil_sq_terms = []
         hamil_sq_coeffs = []
         hamil_sq_constant = self.constant**2
@@ -636,6 +648,8 @@ class Hamiltonian:
             hamil_sq_constant,
             divide_into_singles_and_pairs=False,
         )
+        _HAMILTONIAN_SQUARED_CACHE[self] = (cache_key, hamil_squared)
+
         return hamil_squared
 
     @classmethod
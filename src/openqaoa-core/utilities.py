@@ -3,9 +3,13 @@ Utility and convenience functions for a number of QAOA applications.
 """
 
 from __future__ import annotations
-from typing import Optional, Union, List, Tuple
+from typing import Optional, Union, List, Tuple, Iterator
+from collections.abc import Mapping
 import itertools
+import functools
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+from scipy.sparse import csr_matrix
 import uuid
 import matplotlib.pyplot as plt
 import networkx as nx
@@ -589,12 +593,278 @@ def random_classical_hamiltonian(
 ################################################################################
 
 
+def _z_string_signs(indices: np.ndarray, qubits: List[int]) -> np.ndarray:
+    """
+    Returns the eigenvalues, +1 or -1, of the Pauli Z string acting on ``qubits``
+    for the basis states with the given ``indices``, read from the parity of
+    their bits, where qubit ``q`` is bit ``q`` of the index.
+    """
+    parity = np.zeros_like(indices)
+    for qubit in qubits:
+        np.bitwise_xor(parity, indices >> qubit, out=parity)
+
+    return 1 - 2 * (parity & 1)
+
+
+def _cost_hamiltonian_block(
+    cost_hamiltonian: Hamiltonian, start: int, size: int
+) -> np.ndarray:
+    """
+    Builds the diagonal of the cost Hamiltonian on the basis states with indices
+    ``start`` to ``start + size``, where ``size`` is a power of two and ``start``
+    a multiple of it, directly from the bits of the indices.
+
+    The free bits of the block are split into a high and a low half, such that
+    every term contributes either to a vector over the high bits, to a vector
+    over the low bits, or, when it acts on both halves, to a column of the
+    matrix product (high signs) @ (low signs) which builds the whole block
+    with a single BLAS call. The bits above the block only flip signs.
+
+    Parameters
+    ----------
+    cost_hamiltonian:
+        Hamiltonian object containing information about
+        single/2-qubit terms and their weights.
+    start:
+        Index of the first basis state of the block.
+    size:
+        Number of basis states in the block.
+
+    Returns
+    -------
+    ham_block:
+        Array of shape (size,) with the cost of each basis state.
+    """
+    # Check for non-classical terms
+    cost_ham_pauli_str_lst = [term.pauli_str for term in cost_hamiltonian.terms]
+    for term in cost_ham_pauli_str_lst:
+        if str(term) != "Z" and str(term) != "ZZ":
+            raise Exception(
+                f"Currently, only classical cost Hamiltonians"
+                "that consists of 'Z' and 'ZZ' terms are supported,"
+                "but a '{term}' term was encountered."
+            )
+
+    n_bits = int(size).bit_length() - 1
+    n_low_bits = n_bits // 2
+    high_indices = np.arange(2 ** (n_bits - n_low_bits), dtype=np.int64)
+    low_indices = np.arange(2**n_low_bits, dtype=np.int64)
+
+    high_part = np.zeros(len(high_indices))
+    low_part = np.full(len(low_indices), float(cost_hamiltonian.constant))
+    cross_high_signs, cross_low_signs = [], []
+
+    for term, weight in zip(cost_hamiltonian.terms, cost_hamiltonian.coeffs):
+        high_qubits, low_qubits = [], []
+        for qubit in term.qubit_indices:
+            if qubit < n_low_bits:
+                low_qubits.append(qubit)
+            elif qubit < n_bits:
+                high_qubits.append(qubit - n_low_bits)
+            elif (start >> qubit) & 1:
+                weight = -weight
+
+        if high_qubits and low_qubits:
+            cross_high_signs.append(
+                weight * _z_string_signs(high_indices, high_qubits)
+            )
+            cross_low_signs.append(_z_string_signs(low_indices, low_qubits))
+        elif high_qubits:
+            high_part += weight * _z_string_signs(high_indices, high_qubits)
+        else:
+            low_part += weight * _z_string_signs(low_indices, low_qubits)
+
+    ham_block = np.zeros((len(high_indices), len(low_indices)))
+    if cross_high_signs:
+        np.matmul(
+            np.transpose(cross_high_signs),
+            np.array(cross_low_signs, dtype=float),
+            out=ham_block,
+        )
+    ham_block += high_part[:, None]
+    ham_block += low_part
+
+    return ham_block.reshape(-1)
+
+
+class HamiltonianSpectrum:
+    """
+    Streaming engine over the energies of the :math:`2^n` basis states of a
+    classical Hamiltonian. The basis states are enumerated in chunks of fixed
+    size, whose energies are computed from the bits of their indices, and each
+    chunk is reduced to a small result (its minimum, its lowest states, or its
+    states below a threshold) before the next one is computed. The memory used
+    is therefore set by the chunk size rather than by the number of qubits, and
+    the chunks can be distributed over a pool of processes.
+
+    The basis states are identified by their index, whose k-th bit is the value
+    of qubit k, as in ``qaoa_probabilities``.
+
+    Parameters
+    ----------
+    hamiltonian: `Hamiltonian`
+        Classical Hamiltonian, with 'Z' and 'ZZ' terms.
+    chunk_qubits: `int`, optional
+        Base-2 logarithm of the number of basis states in each chunk. Defaults
+        to 20, i.e. 8 MiB of energies per chunk.
+    n_processes: `int`, optional
+        Number of processes over which the chunks are distributed. If None,
+        the chunks are processed sequentially in the current process.
+    n_qubits: `int`, optional
+        Number of qubits of the register, if larger than the number of qubits
+        of the Hamiltonian.
+    """
+
+    def __init__(
+        self,
+        hamiltonian: Hamiltonian,
+        chunk_qubits: int = 20,
+        n_processes: Optional[int] = None,
+        n_qubits: Optional[int] = None,
+    ):
+        self.hamiltonian = hamiltonian
+        self.n_qubits = hamiltonian.n_qubits if n_qubits is None else n_qubits
+        self.chunk_size = 2 ** min(chunk_qubits, self.n_qubits)
+        self.n_processes = n_processes
+
+    def _map_chunks(self, function, *args) -> Iterator:
+        """
+        Applies ``function(start, *args)`` to every chunk, given by the index of
+        its first basis state, and yields the results in the order of the chunks.
+        """
+        starts = range(0, 2**self.n_qubits, self.chunk_size)
+        task = functools.partial(function, *args)
+
+        if self.n_processes is None or len(starts) == 1:
+            yield from map(task, starts)
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_processes) as pool:
+                yield from pool.map(task, starts)
+
+    def _chunk_energies(self, start: int) -> np.ndarray:
+        """
+        Energies of the basis states of the chunk starting at ``start``.
+        """
+        return _cost_hamiltonian_block(self.hamiltonian, start, self.chunk_size)
+
+    def _chunk_extrema(self, start: int) -> Tuple[float, float, np.ndarray]:
+        energies = self._chunk_energies(start)
+        min_energy = np.min(energies)
+
+        ground_state_indices = start + np.flatnonzero(energies == min_energy)
+
+        return min_energy, np.max(energies), ground_state_indices
+
+    def _chunk_lowest(self, k: int, start: int) -> Tuple[np.ndarray, np.ndarray]:
+        energies = self._chunk_energies(start)
+        indices = smallest_k_indices(energies, k)
+
+        return energies[indices], start + indices
+
+    def _chunk_below(
+        self, threshold: float, start: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        energies = self._chunk_energies(start)
+        (indices,) = np.nonzero(energies <= threshold)
+
+        return energies[indices], start + indices
+
+    def energies(self) -> np.ndarray:
+        """
+        Computes the whole spectrum, which takes memory for all the
+        :math:`2^n` energies.
+
+        Returns
+        -------
+        energies: `np.ndarray`
+            The energy of every basis state, by index.
+        """
+        return np.concatenate(list(self._map_chunks(self._chunk_energies)))
+
+    def extrema(self) -> Tuple[float, float, np.ndarray]:
+        """
+        Computes the minimum and maximum energies, together with the indices of
+        all the basis states with the minimum energy.
+
+        Returns
+        -------
+        min_energy: `float`
+            The ground state energy.
+        max_energy: `float`
+            The energy of the highest excited state.
+        ground_state_indices: `np.ndarray[int]`
+            The indices of the ground states, in increasing order.
+        """
+        min_energy, max_energy, ground_state_indices = np.inf, -np.inf, []
+        for chunk_min, chunk_max, chunk_indices in self._map_chunks(
+            self._chunk_extrema
+        ):
+            if chunk_min < min_energy:
+                min_energy, ground_state_indices = chunk_min, [chunk_indices]
+            elif chunk_min == min_energy:
+                ground_state_indices.append(chunk_indices)
+            max_energy = max(max_energy, chunk_max)
+
+        return min_energy, max_energy, np.concatenate(ground_state_indices)
+
+    def lowest(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the ``k`` basis states with the lowest energies, merging the
+        ``k`` lowest of each chunk as they are computed.
+
+        Parameters
+        ----------
+        k: `int`
+            The number of states.
+
+        Returns
+        -------
+        energies: `np.ndarray`
+            The lowest energies, in increasing order.
+        indices: `np.ndarray[int]`
+            The indices of the corresponding basis states, ties being ordered
+            by index.
+        """
+        energies = np.array([])
+        indices = np.array([], dtype=np.int64)
+        for chunk_energies, chunk_indices in self._map_chunks(self._chunk_lowest, k):
+            energies = np.concatenate([energies, chunk_energies])
+            indices = np.concatenate([indices, chunk_indices])
+
+            # chunks come in order, so the positions order the ties by index
+            lowest = smallest_k_indices(energies, k)
+            energies, indices = energies[lowest], indices[lowest]
+
+        return energies, indices
+
+    def below(self, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the basis states with energies up to ``threshold``.
+
+        Parameters
+        ----------
+        threshold: `float`
+            The largest energy of the states.
+
+        Returns
+        -------
+        energies: `np.ndarray`
+            The energies of the states.
+        indices: `np.ndarray[int]`
+            The indices of the states, in increasing order.
+        """
+        energies, indices = zip(*self._map_chunks(self._chunk_below, threshold))
+
+        return np.concatenate(energies), np.concatenate(indices)
+
+
 def ground_state_hamiltonian(
-    hamiltonian: Hamiltonian, bounded=True
+    hamiltonian: Hamiltonian, bounded=True, n_processes: Optional[int] = None
 ) -> Tuple[float, list]:
     """
     Computes the exact ground state and ground state energy of a classical Hamiltonian.
-    Uses standard numpy module.
+    The spectrum is scanned in chunks by ``HamiltonianSpectrum``, so the memory
+    does not grow with the number of qubits.
 
     Parameters
     ----------
@@ -604,6 +874,9 @@ def ground_state_hamiltonian(
         If set to True, the function will not perform computations for qubit
         numbers above 25. If False, the user can specify any number. Defaults
         to True.
+    n_processes: `int`, optional
+        Number of processes over which the spectrum is scanned. If None, it is
+        scanned in the current process.
 
     Returns
     -------
@@ -623,39 +896,13 @@ def ground_state_hamiltonian(
             "The number of qubits is too high, computation could take a long time. If still want to proceed set argument `bounded` to False"
         )
 
-    # Generate qubit register
-    register = range(n_qubits)
-
-    # Intialize energies
-    energies = np.zeros(2 ** len(register))
-
-    # Obtain spectrum, scanning term by term
-    for i, term in enumerate(hamiltonian.terms):
-
-        # Extract coefficient
-        out = np.real(hamiltonian.coeffs[i])
-
-        # Compute tensor product
-        for qubit in register:
-            if qubit in term.qubit_indices:
-                out = np.kron([1, -1], out)
-            else:
-                out = np.kron([1, 1], out)
-
-        # Add energy contribution of the term
-        energies += out
-
-    # Add constant term to the spectrum
-    energies += hamiltonian.constant
-
-    # Extract minimum energy
-    min_energy = np.min(energies)
-
-    # Extract indices of minimum energies
-    indices = np.where(energies == min_energy)[0]
+    # Extract minimum energy and indices of the ground states
+    min_energy, _, indices = HamiltonianSpectrum(
+        hamiltonian, n_processes=n_processes
+    ).extrema()
 
     # Generate ground states
-    config_strings = [np.binary_repr(index, len(register))[::-1] for index in indices]
+    config_strings = bitstrings_from_indices(indices, n_qubits).tolist()
 
     return min_energy, config_strings
 
@@ -698,6 +945,166 @@ def bitstring_energy(
     return energy
 
 
+def bits_from_bitstrings(bitstrings: Union[List[str], List[List[int]]]) -> np.ndarray:
+    """
+    Convert a collection of bitstrings into a matrix of bits, one row per
+    bitstring, where the k-th column is the value of qubit k. It is the inverse
+    of ``bitstrings_from_indices``, up to the encoding of the rows.
+
+    Parameters
+    ----------
+    bitstrings: `list`
+        Bitstrings of equal length, either as strings of 0s and 1s or as lists
+        of integers 0 and 1.
+
+    Returns
+    -------
+    bits: `np.ndarray[np.uint8]`
+        Array of shape ``(n_bitstrings, n_qubits)`` with the bits.
+    """
+    bitstrings = np.asarray(bitstrings)
+    if bitstrings.size == 0:
+        return np.zeros((len(bitstrings), 0), dtype=np.uint8)
+
+    if bitstrings.dtype.kind != "U":
+        return bitstrings.astype(np.uint8).reshape(len(bitstrings), -1)
+
+    # each unicode character takes 4 bytes, read as one code point per qubit
+    n_qubits = bitstrings.dtype.itemsize // 4
+    code_points = np.ascontiguousarray(bitstrings).view(np.uint32)
+    return (code_points.reshape(-1, n_qubits) - ord("0")).astype(np.uint8)
+
+
+class CompiledHamiltonian:
+    """
+    A classical cost Hamiltonian compiled into arrays of qubit indices and
+    coefficients, to evaluate the energies of many bitstrings at once. The
+    terms are grouped by their number of qubits, and the energies of a batch of
+    bitstrings take a gather, a parity and a matrix-vector product per group,
+    instead of a Python loop over the terms for every bitstring.
+
+    As in ``bitstring_energy``, every term is taken as a product of Pauli Z
+    operators, regardless of its ``pauli_str``.
+
+    Parameters
+    ----------
+    hamiltonian: `Hamiltonian`
+        Hamiltonian object determining the energy levels.
+
+    Attributes
+    ----------
+    n_qubits: `int`
+        Number of bits needed to evaluate the energies, i.e. one more than the
+        largest qubit index in the Hamiltonian.
+    constant: `float`
+        Constant term of the Hamiltonian.
+    terms: `List[Tuple[np.ndarray, np.ndarray]]`
+        For each term size, the qubit indices of the terms as an array of shape
+        ``(n_terms, size)`` and their coefficients as an array of shape
+        ``(n_terms,)``.
+    """
+
+    # number of gathered bits above which the bitstrings are processed in chunks
+    _CHUNK_SIZE = 2**22
+
+    def __init__(self, hamiltonian: Hamiltonian):
+        # complex coefficients with vanishing imaginary parts are made real
+        values = np.real_if_close(
+            np.array([hamiltonian.constant, *hamiltonian.coeffs])
+        )
+        self.constant, coeffs = values[0], values[1:]
+
+        sizes = np.array([len(term) for term in hamiltonian.terms], dtype=int)
+        self.terms = []
+        for size in np.unique(sizes):
+            (group,) = np.nonzero(sizes == size)
+            indices = np.array(
+                [hamiltonian.terms[i].qubit_indices for i in group], dtype=np.intp
+            )
+            self.terms.append((indices.reshape(len(group), size), coeffs[group]))
+
+        self.n_qubits = max(
+            [int(indices.max()) + 1 for indices, _ in self.terms if indices.size],
+            default=0,
+        )
+
+    def energies(self, bits: np.ndarray) -> np.ndarray:
+        """
+        Computes the energies of a batch of bitstrings.
+
+        Parameters
+        ----------
+        bits: `np.ndarray`
+            The bitstrings, either as an array of shape ``(n_bitstrings, n)`` of
+            0s and 1s where column k is qubit k, as returned by
+            ``bits_from_bitstrings``, or as a 1D array of unsigned integers whose
+            k-th bit is qubit k, as the indices of the basis states.
+
+        Returns
+        -------
+        energies: `np.ndarray`
+            The energies of the bitstrings, with shape ``(n_bitstrings,)``.
+        """
+        bits = np.asarray(bits)
+
+        if bits.ndim == 1:
+            if bits.dtype.kind not in "ui":
+                raise ValueError(
+                    "Bitstrings packed in integers must have an integer dtype, "
+                    f"got {bits.dtype}"
+                )
+            if self.n_qubits > 64:
+                raise ValueError(
+                    f"Cannot pack bitstrings of {self.n_qubits} qubits in 64 bit integers"
+                )
+            shifts = np.arange(self.n_qubits, dtype=np.uint64)
+            bits = (bits.astype(np.uint64)[:, None] >> shifts) & np.uint64(1)
+
+        bits = bits.astype(np.uint8, copy=False)
+        if bits.shape[1] < self.n_qubits:
+            raise ValueError(
+                f"The bitstrings have {bits.shape[1]} bits, but the Hamiltonian "
+                f"acts on {self.n_qubits} qubits"
+            )
+
+        energies = np.empty(len(bits), dtype=np.result_type(self.constant, float))
+        n_gathered = max(sum(indices.size for indices, _ in self.terms), 1)
+        chunk_size = max(self._CHUNK_SIZE // n_gathered, 1)
+
+        for start in range(0, len(bits), chunk_size):
+            chunk = bits[start : start + chunk_size]
+
+            chunk_energies = np.full(len(chunk), self.constant, dtype=energies.dtype)
+            for indices, coeffs in self.terms:
+                # parity of the bits of each term, with shape (chunk_size, n_terms)
+                parities = np.zeros((len(chunk), len(indices)), dtype=np.uint8)
+                for column in indices.T:
+                    np.bitwise_xor(parities, chunk[:, column], out=parities)
+
+                # (-1)**parity = 1 - 2 * parity
+                chunk_energies += np.sum(coeffs) - 2 * (parities @ coeffs)
+
+            energies[start : start + chunk_size] = chunk_energies
+
+        return energies
+
+    def energy(self, bitstring: Union[List[int], str]) -> float:
+        """
+        Computes the energy of a single bitstring.
+
+        Parameters
+        ----------
+        bitstring : `list` or `str`
+            A list of integers 0 and 1, or a string, representing a configuration.
+
+        Returns
+        -------
+        energy: `float`
+            The energy of the given bitstring.
+        """
+        return self.energies(bits_from_bitstrings([bitstring]))[0]
+
+
 def energy_expectation(hamiltonian: Hamiltonian, measurement_counts: dict) -> float:
     """
     Computes the energy expectation value from a set of measurement counts,
@@ -716,40 +1123,16 @@ def energy_expectation(hamiltonian: Hamiltonian, measurement_counts: dict) -> fl
         The energy expectation value for the set of measurement outcomes
     """
 
-    # Starting value for the energy
-    energy = 0
-
-    # Number of measurement shots
-    shots = sum(measurement_counts.values())
-
-    # Compute average energy adding one by one the contribution from each state
-    for state, prob in measurement_counts.items():
-
-        # Number of ones (spins pointing down) from the specific
-        # configuration for each Hamiltonian term
-        num_ones_list = [
-            sum([int(state[i]) for i in term.qubit_indices])
-            for term in hamiltonian.terms
-        ]
-
-        # Compute configuration energy
-        config_energy = sum(
-            [
-                hamiltonian.coeffs[i]
-                if num_ones % 2 == 0
-                else -1 * hamiltonian.coeffs[i]
-                for i, num_ones in enumerate(num_ones_list)
-            ]
-        )
+    bitstrings = list(measurement_counts.keys())
+    counts = np.fromiter(measurement_counts.values(), dtype=float, count=len(bitstrings))
 
-        # Add contribution to total energy
-        energy += prob * config_energy
+    # Energies of all the measured states at once
+    energies = CompiledHamiltonian(hamiltonian).energies(
+        bits_from_bitstrings(bitstrings)
+    )
 
     # Normalize with respect to the number of shots
-    energy *= 1 / shots
-
-    # Add constant term in Hamiltonian
-    energy += hamiltonian.constant
+    energy = counts @ energies / np.sum(counts)
 
     return energy
 
@@ -757,8 +1140,8 @@ def energy_expectation(hamiltonian: Hamiltonian, measurement_counts: dict) -> fl
 def energy_spectrum_hamiltonian(hamiltonian: Hamiltonian) -> np.ndarray:
     """
     Computes exactly the energy spectrum of the hamiltonian defined by terms
-    and weights and its corresponding configuration of variables. Uses
-    standard numpy module.
+    and weights and its corresponding configuration of variables. The energies
+    are computed in chunks from the bits of the basis states.
 
     Parameters
     ----------
@@ -770,35 +1153,7 @@ def energy_spectrum_hamiltonian(hamiltonian: Hamiltonian) -> np.ndarray:
     energies: `np.ndarray`
         The energy spectra of the given hamiltonian
     """
-    # Extract number of qubits
-    n_qubits = hamiltonian.n_qubits
-
-    # Define qubit register
-    register = range(n_qubits)
-
-    # Intialize energies
-    energies = np.zeros((2 ** len(register)))
-
-    # Obtain spectrum, scanning term by term
-    for i, term in enumerate(hamiltonian.terms):
-
-        # Extract coefficients
-        out = np.real(hamiltonian.coeffs[i])
-
-        # Compute tensor product
-        for qubit in register:
-            if qubit in term.qubit_indices:
-                out = np.kron([1, -1], out)
-            else:
-                out = np.kron([1, 1], out)
-
-        # Add energy contribution of the term
-        energies += out
-
-    # Add constant term to the spectrum
-    energies = energies + hamiltonian.constant
-
-    return energies
+    return HamiltonianSpectrum(hamiltonian).energies()
 
 
 def plot_energy_spectrum(
@@ -867,7 +1222,7 @@ def plot_energy_spectrum(
 
 
 def low_energy_states(
-    hamiltonian: Hamiltonian, threshold_per: float
+    hamiltonian: Hamiltonian, threshold_per: float, n_processes: Optional[int] = None
 ) -> Tuple[float, list]:
     """
     Return threshold energy and the low energy states of the
@@ -880,6 +1235,9 @@ def low_energy_states(
     threshold_per: `float`
         Threshold percentage away from the ground state,
         defining the energy we window we search in for low energy states.
+    n_processes: `int`, optional
+        Number of processes over which the spectrum is scanned. If None, it is
+        scanned in the current process.
 
     Returns
     -------
@@ -897,31 +1255,22 @@ def low_energy_states(
     assert threshold_per >= 0.0, "Threshold percentage should be above 0"
     assert threshold_per <= 1.0, "Threshold percentage should be below 1"
 
-    # Compute energy spectrum of the Hamiltonian
-    energies = energy_spectrum_hamiltonian(hamiltonian)
+    # Scan the energy spectrum of the Hamiltonian, without storing it
+    spectrum = HamiltonianSpectrum(hamiltonian, n_processes=n_processes)
 
     # Extract ground state and highest excited state
-    ground_state_energy = np.min(energies)
-    highest_state_energy = np.max(energies)
+    ground_state_energy, highest_state_energy, _ = spectrum.extrema()
 
     # Compute the low energy threshols
     low_energy_threshold = ground_state_energy + threshold_per * np.abs(
         highest_state_energy - ground_state_energy
     )
 
-    # Initilize inndices for low energy states
-    low_energy_indices = []
-
     # Obtain indices for energies below the threshold
-    for idx in range(len(energies)):
-        if energies[idx] <= low_energy_threshold:
-            low_energy_indices.append(idx)
+    _, low_energy_indices = spectrum.below(low_energy_threshold)
 
     # Extract states from the Hamiltonian spectrum
-    states = [
-        np.binary_repr(index, hamiltonian.n_qubits)[::-1]
-        for index in low_energy_indices
-    ]
+    states = bitstrings_from_indices(low_energy_indices, hamiltonian.n_qubits).tolist()
 
     return low_energy_threshold, states
 
@@ -982,7 +1331,7 @@ def exp_val_single(spin: int, prob_dict: dict):
     ----------
     spin: `int`
         Spin whose expectation value we compute.
-    prob_dict: `dict`
+    prob_dict: `Union[dict, StateProbabilities]`
         Dictionary containing the configuration probabilities of each spin.
 
     Returns
@@ -991,6 +1340,10 @@ def exp_val_single(spin: int, prob_dict: dict):
         Expectation value of the spin
     """
 
+    if isinstance(prob_dict, StateProbabilities):
+        marginal = prob_dict.marginal([spin])
+        return (marginal[0] - marginal[1]) / np.sum(marginal)
+
     # Initialize expectation value
     exp_val = 0
     norm = sum(prob_dict.values())
@@ -1021,7 +1374,7 @@ def exp_val_pair(spins: tuple, prob_dict: dict):
     ----------
     spins: `tuple`
         Tuple containing the spins whose correlation is computed.
-    prob_dict: `dict`
+    prob_dict: `Union[dict, StateProbabilities]`
         The dictionary containing the configuration probabilities of each spin.
 
     Returns
@@ -1031,6 +1384,12 @@ def exp_val_pair(spins: tuple, prob_dict: dict):
 
     """
 
+    if isinstance(prob_dict, StateProbabilities):
+        marginal = prob_dict.marginal(list(spins))
+        return (marginal[0] - marginal[1] - marginal[2] + marginal[3]) / np.sum(
+            marginal
+        )
+
     # Initialize correlation
     corr = 0
 
@@ -1054,7 +1413,7 @@ def exp_val_hamiltonian_termwise(
     mixer_type: str,
     p: int,
     qaoa_optimized_angles: Optional[list] = None,
-    qaoa_optimized_counts: Optional[dict] = None,
+    qaoa_optimized_counts: Optional[Union[dict, StateProbabilities]] = None,
     analytical: bool = True,
 ):
     """
@@ -1073,7 +1432,7 @@ def exp_val_hamiltonian_termwise(
         Number of layers in QAOA ansatz.
     qaoa_optimized_angles: `list`
         Optimized angles of the underlying QAOA.
-    qaoa_optimized_counts: `dict`
+    qaoa_optimized_counts: `Union[dict, StateProbabilities]`
         Dictionary containing the measurement counts of optimized QAOA circuit.
     analytical: `bool`
         Boolean that indicates whether to use analytical or numerical expectation
@@ -1105,31 +1464,18 @@ def exp_val_hamiltonian_termwise(
         and isinstance(qaoa_optimized_angles, list)
     ):
 
-        # Compute expectation values and correlations of terms present in the Hamiltonian
-        for term in terms:
-
-            # If bias term compute expectation value
-            if len(term) == 1:
-                i = term.qubit_indices[0]
-                exp_vals_z[i] = exp_val_single_analytical(
-                    i, hamiltonian, qaoa_optimized_angles
-                )
+        # Compute expectation values and correlations of all the terms at once
+        analytical_graph = AnalyticalP1Graph(hamiltonian)
 
-            # If two-body term compute correlation
-            elif len(term) == 2:
-                i, j = term.qubit_indices
-                corr_matrix[i][j] = exp_val_pair_analytical(
-                    (i, j), hamiltonian, qaoa_optimized_angles
-                )
+        exp_vals_z = analytical_graph.single_expectations(qaoa_optimized_angles)
 
-            # If constant term, ignore
-            else:
-                continue
+        i, j = analytical_graph.edges.T
+        corr_matrix[i, j] = analytical_graph.pair_correlations(qaoa_optimized_angles)
 
     # If multilayer ansatz, perform numerical computation
     else:
 
-        if isinstance(qaoa_optimized_counts, dict):
+        if isinstance(qaoa_optimized_counts, (dict, StateProbabilities)):
             counts_dict = qaoa_optimized_counts
         else:
             raise ValueError(
@@ -1321,45 +1667,421 @@ def exp_val_pair_analytical(spins: tuple, hamiltonian: Hamiltonian, qaoa_angles:
     return corr
 
 
-def energy_expectation_analytical(angles: Union[list, tuple], hamiltonian: Hamiltonian):
+def _segment_products(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
     """
-    Computes the expectation value of the Hamiltonian for an analytical expression.
+    Products of consecutive segments of ``values`` with lengths ``counts``,
+    which are 1 for the empty segments.
+    """
+    products = np.ones(len(counts))
+    nonempty = counts > 0
+    if np.any(nonempty):
+        starts = np.cumsum(counts) - counts
+        products[nonempty] = np.multiply.reduceat(values, starts[nonempty])
+
+    return products
+
+
+def _rank_groups(counts: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Groups the entries of consecutive segments with lengths ``counts`` by their
+    position within the segment. Returns a list of (entries, segments) pairs,
+    one for each position, in which every segment appears at most once.
+    """
+    segments = np.repeat(np.arange(len(counts)), counts)
+    ranks = np.arange(len(segments)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    order = np.argsort(ranks, kind="stable")
+    boundaries = np.cumsum(np.bincount(ranks, minlength=1))[:-1]
+
+    return [
+        (entries, segments[entries]) for entries in np.split(order, boundaries)
+    ]
+
+
+def _cos_jet(coefficients: np.ndarray, gamma: float) -> Tuple[np.ndarray, ...]:
+    """
+    Value, first and second derivative of :math:`\\cos(c \\gamma)` wrt gamma.
+    """
+    cos = np.cos(coefficients * gamma)
+    sin = np.sin(coefficients * gamma)
+    return cos, -coefficients * sin, -(coefficients**2) * cos
+
+
+def _sin_jet(coefficients: np.ndarray, gamma: float) -> Tuple[np.ndarray, ...]:
+    """
+    Value, first and second derivative of :math:`\\sin(c \\gamma)` wrt gamma.
+    """
+    cos = np.cos(coefficients * gamma)
+    sin = np.sin(coefficients * gamma)
+    return sin, coefficients * cos, -(coefficients**2) * sin
+
+
+def _jet_product(x: tuple, y: tuple) -> Tuple[np.ndarray, ...]:
+    """
+    Value, first and second derivative of the product of two functions, from
+    their values and derivatives.
+    """
+    return (
+        x[0] * y[0],
+        x[0] * y[1] + x[1] * y[0],
+        x[0] * y[2] + 2 * x[1] * y[1] + x[2] * y[0],
+    )
+
+
+def _segment_jet_products(
+    jet: tuple, groups: List[Tuple[np.ndarray, np.ndarray]], n_segments: int
+) -> Tuple[np.ndarray, ...]:
+    """
+    Value, first and second derivative of the products over consecutive segments
+    of the factors in ``jet``, with the segments grouped by ``_rank_groups``.
+    The product rule is applied one position at a time, so that no division by
+    the factors is needed.
+    """
+    products = np.ones(n_segments), np.zeros(n_segments), np.zeros(n_segments)
+    for entries, segments in groups:
+        factors = tuple(derivative[entries] for derivative in jet)
+        partial = _jet_product(
+            tuple(derivative[segments] for derivative in products), factors
+        )
+        for derivative, value in zip(products, partial):
+            derivative[segments] = value
+
+    return products
+
+
+class AnalyticalP1Graph:
+    """
+    A classical Hamiltonian with up to quadratic terms stored as a sparse,
+    symmetric coupling matrix and a vector of biases, to evaluate the analytical
+    expectation values of a single layer QAOA Ansatz for all the terms at once.
+
+    The correlation of an edge :math:`(u, v)` is a product over the neighbours
+    of :math:`u` and :math:`v` (see ``exp_val_pair_analytical``). The couplings
+    of these neighbours to both spins are gathered once, when the object is
+    built, so that each evaluation only takes a few vectorized operations over
+    the edges and their neighbourhoods, i.e. :math:`O(\\sum_u d_u^2)` work for
+    degrees :math:`d_u`.
 
     .. Important::
-        Only valid for single layer QAOA Ansatz with X mixer Hamiltonian and classical
-        Hamiltonians with up to quadratic terms.
+        Only valid for single layer QAOA Ansatz with X mixer Hamiltonian.
+        Repeated terms are added together.
 
     Parameters
     ----------
-    angles: `list` or `tuple`
-        QAOA angles at which the Hamiltonian expectation value is computed
     hamiltonian: `Hamiltonian`
-        Classical Hamiltonian from which the expectation value is computed.
+        Hamiltonian object containing the problem statement.
+
+    Attributes
+    ----------
+    biases: `np.ndarray`
+        The coefficients of the linear terms, for every qubit.
+    couplings: `scipy.sparse.csr_matrix`
+        The symmetric matrix of the coefficients of the quadratic terms.
+    edges: `np.ndarray`
+        The pairs of qubits :math:`(u, v)`, :math:`u < v`, with quadratic terms.
     """
 
-    # Extract terms and coefficients from the Hamiltonian
-    terms = [pauli_term.qubit_indices for pauli_term in hamiltonian.terms]
-    coeffs = hamiltonian.coeffs
+    def __init__(self, hamiltonian: Hamiltonian):
+        self.n_qubits = hamiltonian.n_qubits
+        self.constant = hamiltonian.constant
 
-    energy = 0
+        self.biases = np.zeros(self.n_qubits)
+        rows, cols, weights = [], [], []
+        for term, coeff in zip(hamiltonian.terms, np.real(hamiltonian.coeffs)):
+            if len(term) == 1:
+                self.biases[term.qubit_indices[0]] += coeff
+            elif len(term) == 2:
+                rows.append(min(term.qubit_indices))
+                cols.append(max(term.qubit_indices))
+                weights.append(coeff)
+            else:
+                raise ValueError(
+                    "The analytical expressions only hold for linear and quadratic terms"
+                )
+
+        # upper triangle of the couplings, with repeated edges added together
+        upper = csr_matrix(
+            (weights, (rows, cols)), shape=(self.n_qubits, self.n_qubits)
+        )
+        upper.sum_duplicates()
+        upper.eliminate_zeros()
+        upper = upper.tocoo()
+        self.edges = np.stack([upper.row, upper.col], axis=1).astype(np.int64)
+
+        self.couplings = (upper + upper.T).tocsr()
+        self.couplings.sort_indices()
+        self._edge_weights = upper.data
+
+        self._build_neighbourhoods()
+
+        # built on the first computation of the derivatives
+        self._rank_groups = None
+        self._last_derivatives = None
+
+    def _lookup(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """
+        Returns the couplings between the qubits in ``rows`` and ``cols``,
+        which are 0 if not connected, from the sorted entries of the matrix.
+        """
+        keys = self._entry_keys
+        queried_keys = rows * self.n_qubits + cols
+        positions = np.minimum(np.searchsorted(keys, queried_keys), len(keys) - 1)
+        found = keys[positions] == queried_keys
+
+        return np.where(found, self.couplings.data[positions], 0.0)
+
+    def _build_neighbourhoods(self):
+        """
+        Gathers, for every edge :math:`(u, v)`, the couplings :math:`J_{un}` and
+        :math:`J_{vn}` of all the other spins :math:`n` connected to either.
+        """
+        indptr, indices = self.couplings.indptr, self.couplings.indices
+        degrees = np.diff(indptr)
+        entry_rows = np.repeat(np.arange(self.n_qubits, dtype=np.int64), degrees)
+        self._entry_keys = entry_rows * self.n_qubits + indices
+
+        edge_ids, j_un, j_vn = [], [], []
+        for side in [0, 1]:
+            spins, others = self.edges[:, side], self.edges[:, 1 - side]
+
+            # all the entries in the rows of the spins, with the edge they belong to
+            n_entries = degrees[spins]
+            edge_of_entry = np.repeat(np.arange(len(self.edges)), n_entries)
+            offsets = np.arange(np.sum(n_entries)) - np.repeat(
+                np.cumsum(n_entries) - n_entries, n_entries
+            )
+            positions = np.repeat(indptr[spins], n_entries) + offsets
+            neighbours = indices[positions]
+            other_couplings = self._lookup(others[edge_of_entry], neighbours)
+
+            # neighbours of both spins are taken from the side of u only
+            keep = neighbours != others[edge_of_entry]
+            if side == 1:
+                keep &= other_couplings == 0
+
+            edge_ids.append(edge_of_entry[keep])
+            own, other = self.couplings.data[positions][keep], other_couplings[keep]
+            j_un.append(own if side == 0 else other)
+            j_vn.append(other if side == 0 else own)
+
+        order = np.argsort(np.concatenate(edge_ids), kind="stable")
+        self._neighbourhood_sizes = np.bincount(
+            np.concatenate(edge_ids), minlength=len(self.edges)
+        )
+        self._j_un = np.concatenate(j_un)[order]
+        self._j_vn = np.concatenate(j_vn)[order]
+
+    @staticmethod
+    def _angles(qaoa_angles: tuple) -> Tuple[float, float]:
+        """
+        Returns the (beta, gamma) angles as floats, also when given as
+        single-element arrays, e.g. the ``betas`` and ``gammas`` of a parameter
+        object.
+        """
+        beta, gamma = (float(np.squeeze(angle)) for angle in qaoa_angles)
+        return beta, gamma
+
+    def single_expectations(self, qaoa_angles: tuple) -> np.ndarray:
+        """
+        Computes the expectation value :math:`<Z_u>` of every spin, as in
+        ``exp_val_single_analytical``.
+
+        Parameters
+        ----------
+        qaoa_angles: `tuple`
+            Pair of (beta, gamma) angles of the QAOA Ansatz.
+
+        Returns
+        -------
+        exp_vals_z: `np.ndarray`
+            The expectation values, by qubit.
+        """
+        beta, gamma = self._angles(qaoa_angles)
+
+        products = _segment_products(
+            np.cos(2 * gamma * self.couplings.data), np.diff(self.couplings.indptr)
+        )
+
+        return -np.sin(2 * beta) * np.sin(2 * gamma * self.biases) * products
+
+    def pair_correlations(self, qaoa_angles: tuple) -> np.ndarray:
+        """
+        Computes the correlation :math:`<Z_u Z_v>` of every edge, as in
+        ``exp_val_pair_analytical``.
+
+        Parameters
+        ----------
+        qaoa_angles: `tuple`
+            Pair of (beta, gamma) angles of the QAOA Ansatz.
+
+        Returns
+        -------
+        correlations: `np.ndarray`
+            The correlations, in the order of ``edges``.
+        """
+        beta, gamma = self._angles(qaoa_angles)
+        s, c = np.sin(2 * beta), np.cos(2 * beta)
+
+        h_u, h_v = self.biases[self.edges[:, 0]], self.biases[self.edges[:, 1]]
+        sizes = self._neighbourhood_sizes
+
+        prod1 = s**2 / 2 * np.cos(2 * gamma * (h_u - h_v))
+        prod1 *= _segment_products(np.cos(2 * gamma * (self._j_un - self._j_vn)), sizes)
+        prod2 = -(s**2) / 2 * np.cos(2 * gamma * (h_u + h_v))
+        prod2 *= _segment_products(np.cos(2 * gamma * (self._j_un + self._j_vn)), sizes)
+
+        sin_j_uv = np.sin(2 * gamma * self._edge_weights)
+        prod3 = -c * s * sin_j_uv * np.cos(2 * gamma * h_u)
+        prod3 *= _segment_products(np.cos(2 * gamma * self._j_un), sizes)
+        prod4 = -c * s * sin_j_uv * np.cos(2 * gamma * h_v)
+        prod4 *= _segment_products(np.cos(2 * gamma * self._j_vn), sizes)
+
+        return prod1 + prod2 + prod3 + prod4
+
+    def energy_derivatives(
+        self, qaoa_angles: tuple
+    ) -> Tuple[float, np.ndarray, np.ndarray]:
+        """
+        Computes the expectation value of the Hamiltonian together with its exact
+        gradient and Hessian wrt the (beta, gamma) angles, in a single pass.
+
+        Every term is the product of a trigonometric function of beta and of a
+        product of cosines of gamma, whose derivatives are accumulated with the
+        product rule factor by factor. The result for the last angles is kept,
+        so that the gradient and the Hessian at the same point share it.
+
+        Parameters
+        ----------
+        qaoa_angles: `tuple`
+            Pair of (beta, gamma) angles of the QAOA Ansatz.
+
+        Returns
+        -------
+        energy: `float`
+            The expectation value of the Hamiltonian.
+        gradient: `np.ndarray`
+            The derivatives wrt (beta, gamma).
+        hessian: `np.ndarray`
+            The (2, 2) matrix of second derivatives wrt (beta, gamma).
+        """
+        beta, gamma = self._angles(qaoa_angles)
+        if self._last_derivatives is not None:
+            last_angles, (energy, gradient, hessian) = self._last_derivatives
+            if last_angles == (beta, gamma):
+                return energy, gradient.copy(), hessian.copy()
+
+        if self._rank_groups is None:
+            self._rank_groups = (
+                _rank_groups(np.diff(self.couplings.indptr)),
+                _rank_groups(self._neighbourhood_sizes),
+            )
+        row_groups, edge_groups = self._rank_groups
+        n_edges = len(self.edges)
+
+        # functions of gamma, i.e. the products of the cosines over the
+        # neighbourhoods times the factors depending on the biases
+        single = _jet_product(
+            _sin_jet(2 * self.biases, gamma),
+            _segment_jet_products(
+                _cos_jet(2 * self.couplings.data, gamma), row_groups, self.n_qubits
+            ),
+        )
+
+        h_u, h_v = self.biases[self.edges[:, 0]], self.biases[self.edges[:, 1]]
+        sin_j_uv = _sin_jet(2 * self._edge_weights, gamma)
+        pair_sym = [
+            _jet_product(
+                _cos_jet(2 * (h_u - h_v), gamma),
+                _segment_jet_products(
+                    _cos_jet(2 * (self._j_un - self._j_vn), gamma), edge_groups, n_edges
+                ),
+            ),
+            _jet_product(
+                _cos_jet(2 * (h_u + h_v), gamma),
+                _segment_jet_products(
+                    _cos_jet(2 * (self._j_un + self._j_vn), gamma), edge_groups, n_edges
+                ),
+            ),
+        ]
+        pair_asym = [
+            _jet_product(
+                _jet_product(sin_j_uv, _cos_jet(2 * h, gamma)),
+                _segment_jet_products(_cos_jet(2 * j_n, gamma), edge_groups, n_edges),
+            )
+            for h, j_n in [(h_u, self._j_un), (h_v, self._j_vn)]
+        ]
 
-    # Compute the expectation value of each term and add its local energy contribution
-    for coeff, term in zip(coeffs, terms):
+        # weighted sums over the terms of the functions of gamma and their derivatives
+        single = [self.biases @ derivative for derivative in single]
+        pair_sym = [
+            self._edge_weights @ (first - second)
+            for first, second in zip(*pair_sym)
+        ]
+        pair_asym = [
+            self._edge_weights @ (first + second)
+            for first, second in zip(*pair_asym)
+        ]
 
-        if len(term) == 2:
+        # functions of beta and their derivatives: -sin(2 beta) for the single spins,
+        # sin(2 beta)**2 / 2 and -sin(4 beta) / 2 for the products in the correlations
+        s2, c2 = np.sin(2 * beta), np.cos(2 * beta)
+        s4, c4 = np.sin(4 * beta), np.cos(4 * beta)
+        beta_factors = [
+            (single, (-s2, -2 * c2, 4 * s2)),
+            (pair_sym, (s2**2 / 2, s4, 4 * c4)),
+            (pair_asym, (-s4 / 2, -2 * c4, 8 * s4)),
+        ]
 
-            local_energy = exp_val_pair_analytical(term, hamiltonian, angles)
+        energy = self.constant
+        gradient = np.zeros(2)
+        hessian = np.zeros((2, 2))
+        for g, b in beta_factors:
+            energy += b[0] * g[0]
+            gradient += [b[1] * g[0], b[0] * g[1]]
+            hessian += [[b[2] * g[0], b[1] * g[1]], [b[1] * g[1], b[0] * g[2]]]
 
-        else:
+        self._last_derivatives = ((beta, gamma), (energy, gradient, hessian))
 
-            local_energy = exp_val_single_analytical(term[0], hamiltonian, angles)
+        return energy, gradient.copy(), hessian.copy()
 
-        energy += coeff * local_energy
+    def energy(self, qaoa_angles: tuple) -> float:
+        """
+        Computes the expectation value of the Hamiltonian.
 
-    # Add constant shift contribution
-    energy += hamiltonian.constant
+        Parameters
+        ----------
+        qaoa_angles: `tuple`
+            Pair of (beta, gamma) angles of the QAOA Ansatz.
+
+        Returns
+        -------
+        energy: `float`
+            The expectation value of the Hamiltonian.
+        """
+        energy = self.constant
+        energy += self.biases @ self.single_expectations(qaoa_angles)
+        energy += self._edge_weights @ self.pair_correlations(qaoa_angles)
+
+        return energy
 
-    return energy
+
+def energy_expectation_analytical(angles: Union[list, tuple], hamiltonian: Hamiltonian):
+    """
+    Computes the expectation value of the Hamiltonian for an analytical expression.
+
+    .. Important::
+        Only valid for single layer QAOA Ansatz with X mixer Hamiltonian and classical
+        Hamiltonians with up to quadratic terms.
+
+    Parameters
+    ----------
+    angles: `list` or `tuple`
+        QAOA angles at which the Hamiltonian expectation value is computed
+    hamiltonian: `Hamiltonian`
+        Classical Hamiltonian from which the expectation value is computed.
+    """
+
+    return AnalyticalP1Graph(hamiltonian).energy(angles)
 
 
 def ring_of_disagrees(reg: List[int]) -> Hamiltonian:
@@ -1427,10 +2149,11 @@ def flip_counts(counts_dictionary: dict) -> dict:
     return output_counts_dictionary
 
 
-@round_value
 def qaoa_probabilities(statevector) -> dict:
     """
     Return a qiskit-style probability dictionary from a statevector.
+    ``StateProbabilities`` provides the same distribution without building
+    a dictionary entry for each of the 2^n basis states.
 
     Parameters
     ----------
@@ -1443,24 +2166,321 @@ def qaoa_probabilities(statevector) -> dict:
         Probabilities represented as a python dictionary with basis states stored
         as keys and their probabilities as their corresponding values.
     """
-    # Define list of probabilities from wavefunction amplitudes
-    prob_vec = np.real(np.conjugate(statevector) * statevector)
+    return dict(StateProbabilities.from_statevector(statevector).items())
+
+
+def bitstrings_from_indices(indices: np.ndarray, n_qubits: int) -> np.ndarray:
+    """
+    Convert integer basis states into their bitstrings, with the same convention
+    as ``qaoa_probabilities``: the k-th character of the string is the value of
+    qubit k, i.e. of the k-th bit of the index.
+
+    Parameters
+    ----------
+    indices: `np.ndarray[int]`
+        The indices of the basis states.
+    n_qubits: `int`
+        The number of qubits, i.e. the length of the bitstrings.
+
+    Returns
+    -------
+    bitstrings: `np.ndarray[str]`
+        Array of bitstrings with the shape of ``indices``.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+
+    # one byte per character, '0' or '1', viewed as fixed length byte strings
+    bits = (indices[..., None] >> np.arange(n_qubits)) & 1
+    characters = np.ascontiguousarray(bits.astype(np.uint8) + ord("0"))
+    bitstrings = characters.view(f"S{n_qubits}")[..., 0]
+
+    return bitstrings.astype(str)
+
+
+def smallest_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Get the indices of the ``k`` smallest values of an array, using
+    ``np.partition`` so that only those are sorted. Equal values are ordered by
+    increasing index, also when selecting among them, as a stable sort would.
+
+    Parameters
+    ----------
+    values: `np.ndarray`
+        1D array of values.
+    k: `int`
+        The number of indices to return.
+
+    Returns
+    -------
+    `np.ndarray[int]`
+        The indices of the ``k`` smallest values, by increasing value.
+    """
+    k = min(k, len(values))
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+
+    kth_value = np.partition(values, k - 1)[k - 1]
+    below = np.flatnonzero(values < kth_value)
+    ties = np.flatnonzero(values == kth_value)[: k - len(below)]
+
+    indices = np.concatenate([below, ties])
+    return indices[np.lexsort((indices, values[indices]))]
+
+
+class FoldedStatevector:
+    """
+    Statevector of a state invariant under the flip of all the qubits, kept in
+    the folded basis of this symmetry: the amplitude of each basis state whose
+    highest qubit is 0 stands for the normalised sum of the basis state and of
+    its flip, so that only half of the 2^n amplitudes are stored. The full
+    statevector is only built when needed, with ``unfold`` or ``np.asarray``.
+
+    Parameters
+    ----------
+    amplitudes: `np.ndarray[complex]`
+        Array of shape (..., 2^(n_qubits-1)) with the folded amplitudes of a
+        statevector, or of each statevector of a batch.
+    """
+
+    def __init__(self, amplitudes: np.ndarray):
+        self.amplitudes = np.asarray(amplitudes)
+        self.n_qubits = int(np.log2(self.amplitudes.shape[-1])) + 1
+
+    def unfold(self) -> np.ndarray:
+        """
+        Returns the full statevector(s), as an array of shape (..., 2^n_qubits)
+        where the amplitudes with the highest qubit in 1 are those of the
+        flipped basis states.
+        """
+        return np.concatenate(
+            [self.amplitudes, self.amplitudes[..., ::-1]], axis=-1
+        ) * np.finfo(self.amplitudes.dtype).dtype.type(2**-0.5)
+
+    def tolist(self) -> list:
+        return self.unfold().tolist()
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        statevector = self.unfold()
+        return statevector if dtype is None else statevector.astype(dtype)
+
+
+class SubspaceVector:
+    """
+    Vector over the 2^n basis states of a register of qubits (e.g. the amplitudes
+    or the probabilities of a state) which vanishes outside of a subspace spanned
+    by some of the basis states, of which only the values on the subspace are
+    stored. The full vector is only built when needed, with ``expand`` or
+    ``np.asarray``.
+
+    Parameters
+    ----------
+    values: `np.ndarray`
+        Array of shape (subspace_dim,) with the values on the basis states of
+        the subspace.
+    basis_states: `np.ndarray[int]`
+        The basis states spanning the subspace, whose k-th bit is qubit k.
+    n_qubits: `int`
+        The number of qubits of the register.
+    """
+
+    def __init__(self, values: np.ndarray, basis_states: np.ndarray, n_qubits: int):
+        self.values = np.asarray(values)
+        self.basis_states = np.asarray(basis_states)
+        self.n_qubits = n_qubits
+
+    def expand(self) -> np.ndarray:
+        """
+        Returns the full vector, as an array of shape (2^n_qubits,) which is
+        zero outside of the subspace.
+        """
+        vector = np.zeros(2**self.n_qubits, dtype=self.values.dtype)
+        vector[self.basis_states] = self.values
+
+        return vector
+
+    def tolist(self) -> list:
+        return self.expand().tolist()
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        vector = self.expand()
+        return vector if dtype is None else vector.astype(dtype)
+
+
+class StateProbabilities(Mapping):
+    """
+    Compact probability distribution over the basis states of a register of
+    qubits, stored as an array indexed by the integer basis states, where qubit
+    k is the k-th bit of the index.
+
+    It can be used as a read-only dictionary with the same bitstring keys as
+    ``qaoa_probabilities``, whose keys are only decoded when iterated over, while
+    ``top_k``, ``to_dict`` and ``marginal`` work directly on the array, so that
+    the 2^n entries are never materialised as python objects.
+
+    Parameters
+    ----------
+    probabilities: `np.ndarray[float]`
+        Array of shape (2^n_qubits,) with the probability of each basis state.
+    """
+
+    # number of keys decoded at once when iterating over the distribution
+    _KEYS_CHUNK_SIZE = 2**16
+
+    def __init__(self, probabilities: np.ndarray):
+        self.probabilities = np.asarray(probabilities).reshape(-1)
+        self.n_qubits = int(np.log2(len(self.probabilities)))
 
-    # Extract number of qubits from size of probability
-    n_qubits = int(np.log2(len(prob_vec)))
+        if 2**self.n_qubits != len(self.probabilities):
+            raise ValueError(
+                "The number of probabilities must be a power of 2, "
+                f"got {len(self.probabilities)}."
+            )
+
+    @classmethod
+    def from_statevector(cls, statevector: np.ndarray) -> StateProbabilities:
+        """
+        Build the probability distribution of the measurement outcomes of a
+        statevector, rounded to 12 decimals like the values of ``round_value``.
+
+        Parameters
+        ----------
+        statevector: `np.ndarray[complex]`
+            The wavefunction whose probability distribution needs to be calculated.
+
+        Returns
+        -------
+        `StateProbabilities`
+            The probability of each basis state.
+        """
+        statevector = np.asarray(statevector)
+        return cls(np.round(np.real(np.conjugate(statevector) * statevector), 12))
+
+    def _index(self, bitstring: str) -> int:
+        """
+        Returns the index of the basis state of a bitstring, or raises a KeyError.
+        """
+        if (
+            not isinstance(bitstring, str)
+            or len(bitstring) != self.n_qubits
+            or set(bitstring) - {"0", "1"}
+        ):
+            raise KeyError(bitstring)
+
+        return int(bitstring[::-1], 2) if self.n_qubits > 0 else 0
+
+    def __getitem__(self, bitstring: str) -> float:
+        return self.probabilities[self._index(bitstring)]
+
+    def __contains__(self, bitstring) -> bool:
+        try:
+            self._index(bitstring)
+        except KeyError:
+            return False
+        return True
 
-    # Initialize probability dictionary
-    prob_dict = {}
+    def __iter__(self) -> Iterator[str]:
+        for start in range(0, len(self), self._KEYS_CHUNK_SIZE):
+            stop = min(start + self._KEYS_CHUNK_SIZE, len(self))
+            yield from bitstrings_from_indices(
+                np.arange(start, stop), self.n_qubits
+            ).tolist()
+
+    def __len__(self) -> int:
+        return len(self.probabilities)
+
+    def values(self) -> np.ndarray:
+        """
+        Returns the array of probabilities, in the order of the keys.
+        """
+        return self.probabilities
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        """
+        Returns an iterator over the bitstrings and their probabilities,
+        decoding the bitstrings lazily.
+        """
+        return zip(iter(self), self.probabilities)
+
+    def top_k(self, k: int) -> dict:
+        """
+        Get the ``k`` most probable basis states, found with ``np.partition``
+        so that only those are sorted.
+
+        Parameters
+        ----------
+        k: `int`
+            The number of basis states to return.
+
+        Returns
+        -------
+        `dict`
+            The bitstrings of the most probable basis states and their probabilities,
+            by decreasing probability (and increasing index for equal probabilities).
+        """
+        indices = smallest_k_indices(-self.probabilities, k)
+
+        return dict(
+            zip(
+                bitstrings_from_indices(indices, self.n_qubits).tolist(),
+                self.probabilities[indices],
+            )
+        )
 
-    for x in range(len(prob_vec)):
+    def to_dict(self, threshold: float = 0.0) -> dict:
+        """
+        Export the basis states with a probability larger than ``threshold``
+        as a sparse dictionary.
+
+        Parameters
+        ----------
+        threshold: `float`
+            The probability below which (or at which) basis states are left out.
+
+        Returns
+        -------
+        `dict`
+            The bitstrings of the basis states kept and their probabilities.
+        """
+        indices = np.flatnonzero(self.probabilities > threshold)
+
+        return dict(
+            zip(
+                bitstrings_from_indices(indices, self.n_qubits).tolist(),
+                self.probabilities[indices],
+            )
+        )
 
-        # Define binary representation of each state, with qubit-0 most significant bit
-        key = np.binary_repr(x, n_qubits)[::-1]
+    def marginal(self, qubits: List[int]) -> np.ndarray:
+        """
+        Get the marginal distribution of a subset of the qubits.
+
+        Parameters
+        ----------
+        qubits: `List[int]`
+            The qubits to keep.
+
+        Returns
+        -------
+        `np.ndarray[float]`
+            Array of shape (2^len(qubits),) with the probability of each basis
+            state of the subset, where ``qubits[k]`` is the k-th bit of the index.
+        """
+        # qubit q is the axis n_qubits - q - 1 of the probabilities as a tensor
+        axes = [self.n_qubits - qubit - 1 for qubit in qubits]
+        other_axes = tuple(
+            axis for axis in range(self.n_qubits) if axis not in axes
+        )
+        marginal = np.sum(
+            self.probabilities.reshape([2] * self.n_qubits), axis=other_axes
+        )
 
-        # Update probability dictionary
-        prob_dict.update({key: prob_vec[x]})
+        # the remaining axes are sorted, put qubits[0] in the last one
+        sorted_axes = sorted(axes)
+        marginal = np.transpose(
+            marginal, [sorted_axes.index(axis) for axis in reversed(axes)]
+        )
 
-    return prob_dict
+        return marginal.reshape(-1)
 
 
 ################################################################################
@@ -1534,7 +2554,7 @@ def convert2serialize(obj, complex_to_string: bool = False):
             for k, v in obj.__dict__.items()
             if not callable(v) and v is not None
         }
-    elif complex_to_string and isinstance(obj, complex):
+    elif complex_to_string and isinstance(obj, (complex, np.complexfloating)):
         return str(obj)
     else:
         return obj
@@ -15,7 +15,7 @@ from openqaoa.qaoa_components.ansatz_constructor.gatemap import (
     RYGateMap,
     RZGateMap,
 )
-from openqaoa.backends.cost_function import cost_function
+from openqaoa.backends.cost_function import cost_function, cost_statistics
 from openqaoa.utilities import generate_uuid, round_value
 
 
@@ -135,7 +135,7 @@ class QAOAPyQuilWavefunctionSimulatorBackend(QAOABaseBackendStatevector):
         """
         prob_dict = self.probability_dict(params)
         cost = cost_function(
-            prob_dict, self.qaoa_descriptor.cost_hamiltonian, self.cvar_alpha
+            prob_dict, self.compiled_cost_hamiltonian, self.cvar_alpha
         )
         return cost
 
@@ -159,16 +159,11 @@ class QAOAPyQuilWavefunctionSimulatorBackend(QAOABaseBackendStatevector):
                 to quantum state produced by QAOA circuit.
         """
         prob_dict = self.probability_dict(params)
-        cost = cost_function(
-            prob_dict, self.qaoa_descriptor.cost_hamiltonian, self.cvar_alpha
-        )
-        cost_sq = cost_function(
-            prob_dict,
-            self.qaoa_descriptor.cost_hamiltonian.hamiltonian_squared,
-            self.cvar_alpha,
+        cost, variance = cost_statistics(
+            prob_dict, self.compiled_cost_hamiltonian, self.cvar_alpha
         )
 
-        uncertainty = np.sqrt(cost_sq - cost**2)
+        uncertainty = np.sqrt(variance)
 
         return (cost, uncertainty)
 
@@ -1,6 +1,7 @@
 import time
-from typing import Optional, List
+from typing import Optional, List, Union
 import warnings
+import numpy as np
 
 # IBM Qiskit imports
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
@@ -218,7 +219,67 @@ class QAOAQiskitQPUBackend(
         n_shots = self.n_shots if n_shots == None else n_shots
 
         circuit = self.qaoa_circuit(params)
+        counts = self._run_job(circuit, n_shots).get_counts()
 
+        # Expose counts
+        final_counts = flip_counts(counts)
+        self.measurement_outcomes = final_counts
+        return final_counts
+
+    def get_counts_batch(
+        self,
+        params: QAOAVariationalBaseParams,
+        params_array: np.ndarray,
+        n_shots: Optional[Union[int, List[int]]] = None,
+    ) -> List[dict]:
+        """
+        Execute the circuits of a batch of parameter sets and obtain their counts.
+        The circuits sharing the same number of shots are submitted as a single job.
+
+        Parameters
+        ----------
+        params: QAOAVariationalBaseParams
+            The QAOA parameters object defining the parametrisation used to
+            interpret each row of ``params_array``. Its values are left untouched.
+        params_array: np.ndarray
+            Array of shape (batch_size, n_params), where each row has the format
+            of ``params.raw()``.
+        n_shots: Union[int, List[int]]
+            The number of shots of every circuit, or a list with the number of
+            shots of each circuit. If None, n_shots is set to the default: self.n_shots
+
+        Returns
+        -------
+            A list with the counts dictionary of each parameter set.
+        """
+        circuits, n_shots_list = self._circuits_batch(params, params_array, n_shots)
+
+        counts_list = [None] * len(circuits)
+        for each_n_shots in set(n_shots_list):
+            indices = [i for i, n in enumerate(n_shots_list) if n == each_n_shots]
+            result = self._run_job([circuits[i] for i in indices], each_n_shots)
+            for experiment, i in enumerate(indices):
+                counts_list[i] = flip_counts(result.get_counts(experiment))
+
+        self.measurement_outcomes = counts_list[-1]
+        return counts_list
+
+    def _run_job(self, circuits, n_shots: int):
+        """
+        Submits the circuit, or a list of circuits, as a single job and waits for
+        its result, retrying when the job fails or the API cannot be contacted.
+
+        Parameters
+        ----------
+        circuits: Union[QuantumCircuit, List[QuantumCircuit]]
+            The circuit(s) to run.
+        n_shots: int
+            The number of times to run each circuit.
+
+        Returns
+        -------
+            The result of the job.
+        """
         job_state = False
         no_of_job_retries = 0
         max_job_retries = 5
@@ -227,7 +288,7 @@ class QAOAQiskitQPUBackend(
             # initial_layout only passed if not azure device
             # if type(self.device).__name__ == "DeviceAzure":
             # job = self.backend_qpu.run(circuit, **input_items)
-            job = self.backend_qpu.run(circuit, shots=n_shots)
+            job = self.backend_qpu.run(circuits, shots=n_shots)
 
             api_contact = False
             no_of_api_retries = 0
@@ -236,7 +297,7 @@ class QAOAQiskitQPUBackend(
             while api_contact == False:
                 try:
                     self.job_id = job.job_id()
-                    counts = job.result().get_counts()
+                    result = job.result()
                     api_contact = True
                     job_state = True
                 except (IBMJobApiError, IBMJobTimeoutError):
@@ -257,10 +318,7 @@ class QAOAQiskitQPUBackend(
             if no_of_job_retries >= max_job_retries:
                 raise ConnectionError("An Error Occurred with the Job(s) sent to IBMQ.")
 
-        # Expose counts
-        final_counts = flip_counts(counts)
-        self.measurement_outcomes = final_counts
-        return final_counts
+        return result
 
     def circuit_to_qasm(self, params: QAOAVariationalBaseParams) -> str:
         """
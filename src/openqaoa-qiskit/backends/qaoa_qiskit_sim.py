@@ -216,6 +216,50 @@ class QAOAQiskitBackendShotBasedSimulator(
         self.measurement_outcomes = final_counts
         return final_counts
 
+    def get_counts_batch(
+        self,
+        params: QAOAVariationalBaseParams,
+        params_array: np.ndarray,
+        n_shots: Optional[Union[int, List[int]]] = None,
+    ) -> List[dict]:
+        """
+        Returns the counts of the QAOA circuits of a batch of parameter sets. The
+        circuits sharing the same number of shots are run as a single job.
+
+        Parameters
+        ----------
+        params: `QAOAVariationalBaseParams`
+            The QAOA parameters object defining the parametrisation used to
+            interpret each row of ``params_array``. Its values are left untouched.
+        params_array: `np.ndarray`
+            Array of shape (batch_size, n_params), where each row has the format
+            of ``params.raw()``.
+        n_shots: `Union[int, List[int]]`
+            The number of shots of every circuit, or a list with the number of
+            shots of each circuit. If None, n_shots is set to the default: self.n_shots
+
+        Returns
+        -------
+        counts_list: `List[dict]`
+            The counts of the QAOA circuit of each parameter set.
+        """
+        # generate a job id for the batch of evaluations
+        self.job_id = generate_uuid()
+
+        circuits, n_shots_list = self._circuits_batch(params, params_array, n_shots)
+
+        counts_list = [None] * len(circuits)
+        for each_n_shots in set(n_shots_list):
+            indices = [i for i, n in enumerate(n_shots_list) if n == each_n_shots]
+            result = self.backend_simulator.run(
+                [circuits[i] for i in indices], shots=each_n_shots
+            ).result()
+            for experiment, i in enumerate(indices):
+                counts_list[i] = flip_counts(result.get_counts(experiment))
+
+        self.measurement_outcomes = counts_list[-1]
+        return counts_list
+
     def circuit_to_qasm(self):
         """
         A method to convert the QAOA circuit to QASM.
@@ -10,8 +10,14 @@ from openqaoa.utilities import (
     XY_mixer_hamiltonian,
     ring_of_disagrees,
     random_k_regular_graph,
+    exp_val_single_analytical,
+    exp_val_pair_analytical,
+)
+from openqaoa.qaoa_components import (
+    Hamiltonian,
+    QAOADescriptor,
+    QAOAVariationalStandardParams,
 )
-from openqaoa.qaoa_components import QAOADescriptor, QAOAVariationalStandardParams
 
 """
 A set of tests for the analytical simulator backend which computes the energy of a given quantum circuit as a function of beta and gamma.
@@ -59,6 +65,52 @@ class TestingQAOABackendAnalyticalSimulator(unittest.TestCase):
         # Check correct expecation value
         assert np.isclose(exp_val, -6)
 
+    def test_expectation_weighted_graph(self):
+        """
+        Testing that the vectorized evaluation over all the terms matches the sum of
+        the single term analytical expressions, for random weighted graphs with biases.
+        """
+        rng = np.random.default_rng(1234)
+        n_qubits = 9
+
+        for _ in range(5):
+            pairs = [
+                [i, j]
+                for i in range(n_qubits)
+                for j in range(i + 1, n_qubits)
+                if rng.random() < 0.5
+            ]
+            singles = [[i] for i in range(n_qubits) if rng.random() < 0.6]
+            cost_hamil = Hamiltonian.classical_hamiltonian(
+                pairs + singles,
+                list(rng.normal(size=len(pairs) + len(singles))),
+                constant=0.5,
+            )
+            qaoa_descriptor = QAOADescriptor(
+                cost_hamil, X_mixer_hamiltonian(cost_hamil.n_qubits), 1
+            )
+            betas, gammas = rng.random(1), rng.random(1)
+            variate_params = QAOAVariationalStandardParams(
+                qaoa_descriptor, betas, gammas
+            )
+
+            backend_analytical = QAOABackendAnalyticalSimulator(qaoa_descriptor)
+            exp_val = backend_analytical.expectation(variate_params)
+
+            angles = (betas[0], gammas[0])
+            expected_exp_val = cost_hamil.constant
+            for term, coeff in zip(cost_hamil.terms, cost_hamil.coeffs):
+                if len(term) == 2:
+                    expected_exp_val += coeff * exp_val_pair_analytical(
+                        term.qubit_indices, cost_hamil, angles
+                    )
+                else:
+                    expected_exp_val += coeff * exp_val_single_analytical(
+                        term.qubit_indices[0], cost_hamil, angles
+                    )
+
+            assert np.isclose(exp_val, expected_exp_val)
+
     def test_p_not_1_fails(self):
         """
         Testing if the analytical backend fails if the number of layers, p, is different than 1.
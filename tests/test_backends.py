@@ -2,6 +2,7 @@ import unittest
 import json
 import pytest
 import subprocess
+import numpy as np
 
 from openqaoa.backends.qaoa_backend import (
     get_qaoa_backend,
@@ -13,14 +14,14 @@ from openqaoa.qaoa_components import (
     create_qaoa_variational_params,
     QAOADescriptor,
 )
-from openqaoa.utilities import X_mixer_hamiltonian
+from openqaoa.utilities import X_mixer_hamiltonian, XY_mixer_hamiltonian
 from openqaoa.backends.qaoa_device import create_device
 from openqaoa.backends.basebackend import QAOABaseBackendShotBased
 
 
-def get_params():
+def get_params(xy_mixer: bool = False):
     cost_hamil = Hamiltonian.classical_hamiltonian([[0, 1]], [1], constant=0)
-    mixer_hamil = X_mixer_hamiltonian(2)
+    mixer_hamil = XY_mixer_hamiltonian(2) if xy_mixer else X_mixer_hamiltonian(2)
 
     qaoa_descriptor = QAOADescriptor(cost_hamil, mixer_hamil, p=1)
     variational_params_std = create_qaoa_variational_params(
@@ -44,15 +45,24 @@ class TestingBackendLocal(unittest.TestCase):
         """
 
         for device_name in DEVICE_NAME_TO_OBJECT_MAPPER.keys():
-            # Analytical device doesn't have any of those so we are skipping it in the tests.
-            if device_name in ["analytical_simulator"]:
+            # Analytical and lightcone devices don't have any of those so we are skipping them in the tests.
+            if device_name in ["analytical_simulator", "lightcone"]:
                 continue
 
             qaoa_descriptor, variational_params_std = get_params()
+            backend_kwargs = {}
+
+            # The subspace device needs a mixer and an initial state conserving the Hamming weight.
+            if device_name == "subspace":
+                qaoa_descriptor, variational_params_std = get_params(xy_mixer=True)
+                backend_kwargs = {"init_hadamard": False, "hamming_weight": 1}
 
             device = create_device(location="local", name=device_name)
             backend = get_qaoa_backend(
-                qaoa_descriptor=qaoa_descriptor, device=device, n_shots=1000
+                qaoa_descriptor=qaoa_descriptor,
+                device=device,
+                n_shots=1000,
+                **backend_kwargs,
             )
 
             assert (
@@ -88,6 +98,24 @@ class TestingBackendLocal(unittest.TestCase):
                         )
                     )
 
+    def test_vectorized_precision(self):
+        """
+        Check that the `precision` argument reaches the vectorized simulator
+        through get_qaoa_backend, and that it defaults to double precision.
+        """
+
+        qaoa_descriptor, variational_params_std = get_params()
+        device = create_device(location="local", name="vectorized")
+
+        backend = get_qaoa_backend(qaoa_descriptor=qaoa_descriptor, device=device)
+        assert backend.precision == "double"
+
+        backend = get_qaoa_backend(
+            qaoa_descriptor=qaoa_descriptor, device=device, precision="single"
+        )
+        assert backend.precision == "single"
+        assert backend.wavefn.dtype == np.complex64
+
 
 class TestingBackendQPUs(unittest.TestCase):
     """
@@ -1,9 +1,11 @@
 import warnings
 import numpy as np
 import unittest
+from unittest.mock import patch
 
 # OpenQAOA imports
-from openqaoa.backends import QAOAvectorizedBackendSimulator
+from openqaoa.backends import QAOAvectorizedBackendSimulator, QAOABackendMPSSimulator
+from openqaoa.backends.qaoa_analytical_sim import QAOABackendAnalyticalSimulator
 from openqaoa.qaoa_components import (
     QAOADescriptor,
     Hamiltonian,
@@ -12,6 +14,7 @@ from openqaoa.qaoa_components import (
 from openqaoa.utilities import X_mixer_hamiltonian
 from openqaoa.optimizers.logger_vqa import Logger
 from openqaoa.derivatives.derivative_functions import derivative
+from openqaoa.derivatives.qfim import qfim
 
 """
 Unittest based testing of derivative computations.
@@ -140,7 +143,12 @@ class TestQAOACostBaseClass(unittest.TestCase):
             terms=[[0, 1]], weights=[1], p=1, nqubits=2
         )
 
-        gradients_types_list = ["finite_difference", "param_shift", "stoch_param_shift"]
+        gradients_types_list = [
+            "finite_difference",
+            "param_shift",
+            "stoch_param_shift",
+            "adjoint",
+        ]
         gradients_fun_list = [
             derivative(
                 backend, params, self.log, "gradient", type_, {"stepsize": 0.0000001}
@@ -168,6 +176,92 @@ class TestQAOACostBaseClass(unittest.TestCase):
                     dCdg, dCdg_, rtol=1e-05, atol=1e-05
                 ), f"Gradient computation failed for {gradient_name} on barbell graph. dCdg: {dCdg}, dCdg_: {dCdg_}"
 
+    def test_adjoint_gradient_computation(self):
+        "Test agreement between adjoint and finite difference gradients for several parametrisations with a weighted graph."
+
+        terms = [[0, 1], [1, 2], [0, 3], [2], [1]]
+        weights = [1, 1.1, 1.5, 2, -0.8]
+        cost_hamiltonian = Hamiltonian.classical_hamiltonian(terms, weights, constant=0.8)
+        mixer_hamiltonian = X_mixer_hamiltonian(4)
+        qaoa_descriptor = QAOADescriptor(cost_hamiltonian, mixer_hamiltonian, p=2)
+        backend = QAOAvectorizedBackendSimulator(
+            qaoa_descriptor, prepend_state=None, append_state=None, init_hadamard=True
+        )
+
+        for params_type, kwargs in [
+            ("standard", {}),
+            ("extended", {}),
+            ("fourier", {"q": 2}),
+            ("annealing", {"total_annealing_time": 2}),
+        ]:
+            params = create_qaoa_variational_params(
+                qaoa_descriptor, params_type, "rand", **kwargs
+            )
+            gradient_adjoint = derivative(
+                backend, params, self.log, "gradient", "adjoint"
+            )
+            gradient_fd = derivative(
+                backend,
+                params,
+                self.log,
+                "gradient",
+                "finite_difference",
+                {"stepsize": 0.000001},
+            )
+
+            point = params.raw()
+            assert np.allclose(
+                gradient_adjoint(point), gradient_fd(point), rtol=1e-05, atol=1e-05
+            ), f"Adjoint gradient does not agree with finite difference for {params_type} parametrisation."
+
+    def test_analytical_derivatives_computation(self):
+        "Test agreement between the analytical p=1 derivatives and finite difference ones with a weighted graph."
+
+        terms = [[0, 1], [1, 2], [0, 2], [0, 3], [2], [1]]
+        weights = [1, 1.1, -0.7, 1.5, 2, -0.8]
+        cost_hamiltonian = Hamiltonian.classical_hamiltonian(terms, weights, constant=0.8)
+        mixer_hamiltonian = X_mixer_hamiltonian(4)
+        qaoa_descriptor = QAOADescriptor(cost_hamiltonian, mixer_hamiltonian, p=1)
+        backend_analytical = QAOABackendAnalyticalSimulator(qaoa_descriptor)
+        backend_vectorized = QAOAvectorizedBackendSimulator(
+            qaoa_descriptor, prepend_state=None, append_state=None, init_hadamard=True
+        )
+        params = create_qaoa_variational_params(qaoa_descriptor, "standard", "ramp")
+
+        gradient_analytical = derivative(
+            backend_analytical, params, self.log, "gradient", "analytical"
+        )
+        hessian_analytical = derivative(
+            backend_analytical, params, self.log, "hessian", "analytical"
+        )
+        gradient_fd = derivative(
+            backend_vectorized,
+            params,
+            self.log,
+            "gradient",
+            "finite_difference",
+            {"stepsize": 0.000001},
+        )
+        hessian_fd = derivative(
+            backend_vectorized,
+            params,
+            self.log,
+            "hessian",
+            "finite_difference",
+            {"stepsize": 0.001},
+        )
+
+        for point in [[0.3, 0.2], [np.pi / 8, np.pi / 4], [1, 2]]:
+            assert np.allclose(
+                gradient_analytical(point), gradient_fd(point), rtol=1e-05, atol=1e-05
+            ), "Analytical gradient does not agree with finite difference."
+            assert np.allclose(
+                hessian_analytical(point), hessian_fd(point), rtol=1e-04, atol=1e-03
+            ), "Analytical hessian does not agree with finite difference."
+
+        with self.assertRaises(ValueError):
+            derivative(backend_vectorized, params, self.log, "gradient", "analytical")
+
     def test_gradient_w_variance_computation(self):
         "Test gradient computation by param. shift, finite difference, and SPS (all gates sampled) on barbell graph."
 
@@ -218,6 +312,101 @@ class TestQAOACostBaseClass(unittest.TestCase):
                     n_shots == x * 1000
                 ), f"The number of shots should be {x*1000} but is {n_shots}."
 
+    def test_batched_parameter_shift(self):
+        "Test that the shifted circuits of the parameter shift rules are evaluated in a single batch, with and without variance."
+
+        terms = [[0, 1], [1, 2], [0, 3], [2], [1]]
+        weights = [1, 1, 1, 1, 1]
+        cost_hamiltonian = Hamiltonian.classical_hamiltonian(terms, weights, constant=0.8)
+        mixer_hamiltonian = X_mixer_hamiltonian(4)
+        qaoa_descriptor = QAOADescriptor(cost_hamiltonian, mixer_hamiltonian, p=3)
+        params = create_qaoa_variational_params(qaoa_descriptor, "standard", "rand")
+        n_ext_params = 3 * (4 + 5)
+        backend = QAOAvectorizedBackendSimulator(
+            qaoa_descriptor, prepend_state=None, append_state=None, init_hadamard=True
+        )
+
+        gradient_ps = derivative(backend, params, self.log, "gradient", "param_shift")
+        gradient_adjoint = derivative(backend, params, self.log, "gradient", "adjoint")
+
+        point = params.raw()
+        func_evals = self.log.func_evals.best[0]
+        with patch.object(
+            backend, "expectation_batch", wraps=backend.expectation_batch
+        ) as expectation_batch, patch.object(
+            backend, "expectation", wraps=backend.expectation
+        ) as expectation:
+            grad = gradient_ps(point)
+        assert expectation_batch.call_count == 1 and expectation.call_count == 0
+        assert self.log.func_evals.best[0] - func_evals == 2 * n_ext_params
+        assert np.allclose(grad, gradient_adjoint(point))
+
+        # shot-based backend, with a number of shots for each standard parameter
+        backend_mps = QAOABackendMPSSimulator(qaoa_descriptor, seed_simulator=0)
+        gradient_ps_variance = derivative(
+            backend_mps,
+            params,
+            self.log,
+            "gradient_w_variance",
+            "param_shift",
+        )
+        n_shots = [100, 200, 300, 400, 500, 600]
+        with patch.object(
+            backend_mps, "get_counts_batch", wraps=backend_mps.get_counts_batch
+        ) as get_counts_batch:
+            grad, var, n_shots_used = gradient_ps_variance(point, n_shots=n_shots)
+        assert get_counts_batch.call_count == 1
+        assert len(get_counts_batch.call_args[0][1]) == 2 * n_ext_params
+        assert n_shots_used == 2 * sum(
+            shots * n for shots, n in zip(n_shots, [4, 4, 4, 5, 5, 5])
+        )
+        assert grad.shape == var.shape == (6,) and np.all(var > 0)
+
+    def test_qfim_computation(self):
+        "Test that the QFIM built from the derivative states agrees with its elementwise definition, at points other than the initial parameters."
+
+        backend, params = self.__backend_params(
+            terms=[[0, 1], [1, 2], [0, 3], [2]], weights=[1, 1.1, 1.5, 2], p=2, nqubits=4
+        )
+        log = Logger(
+            {
+                "func_evals": {
+                    "history_update_bool": False,
+                    "best_update_string": "HighestOnly",
+                },
+                "qfim_func_evals": {
+                    "history_update_bool": False,
+                    "best_update_string": "HighestOnly",
+                },
+            },
+            {"root_nodes": ["func_evals", "qfim_func_evals"], "best_update_structure": []},
+        )
+        log.log_variables({"func_evals": 0, "qfim_func_evals": 0})
+
+        eta = 1e-8
+        qfim_fun = qfim(backend, params, log, eta)
+
+        def wavefunction(args):
+            params.update_from_raw(args)
+            return np.array(backend.wavefunction(params))
+
+        for point in [[0.1, 0.2, 0.3, 0.4], [1, -0.5, 2, 0.7]]:
+            qfim_evals = log.qfim_func_evals.best[0]
+            qfim_array = qfim_fun(point)
+            assert log.qfim_func_evals.best[0] - qfim_evals == 2 * len(point) + 1
+
+            psi = wavefunction(point)
+            for i in range(len(point)):
+                for j in range(len(point)):
+                    vi, vj = np.eye(len(point))[[i, j]] * eta
+                    di_psi = (wavefunction(point + vi) - wavefunction(point - vi)) / eta
+                    dj_psi = (wavefunction(point + vj) - wavefunction(point - vj)) / eta
+                    qfim_ij = np.real(
+                        np.vdot(di_psi, dj_psi)
+                        - np.vdot(di_psi, psi) * np.vdot(psi, dj_psi)
+                    )
+                    assert np.isclose(qfim_array[i][j], qfim_ij, rtol=1e-05, atol=1e-05)
+
     def test_SPS_sampling(self):
         "Test that SPS samples the number of gates specified by the user."
         backend, params = self.__backend_params(
@@ -277,6 +466,41 @@ class TestQAOACostBaseClass(unittest.TestCase):
             assert np.isclose(dCdgg, hessian_fd(point)[1][1], rtol=1e-05, atol=1e-05)
 
 
+    def test_batched_hessian(self):
+        "Test that the distinct points of the finite difference Hessian are evaluated once, in a single batch."
+
+        backend, params = self.__backend_params(
+            terms=[[0, 1], [1, 2], [0, 3], [2]], weights=[1, 1.1, 1.5, 2], p=2, nqubits=4
+        )
+        stepsize = 1e-3
+        hessian_fd = derivative(
+            backend,
+            params,
+            self.log,
+            "hessian",
+            "finite_difference",
+            {"stepsize": stepsize},
+        )
+        gradient_adjoint = derivative(backend, params, self.log, "gradient", "adjoint")
+
+        point = np.array([0.1, 0.2, 0.3, 0.4])
+        func_evals = self.log.func_evals.best[0]
+        with patch.object(
+            backend, "expectation_batch", wraps=backend.expectation_batch
+        ) as expectation_batch:
+            hess = hessian_fd(point)
+        assert expectation_batch.call_count == 1
+        assert self.log.func_evals.best[0] - func_evals == 2 * 4**2 + 2 * 4 + 1
+        assert np.allclose(hess, hess.T)
+
+        # central differences of the exact gradient
+        for i, vect_eta in enumerate(np.eye(len(point)) * stepsize):
+            hess_row = (
+                gradient_adjoint(point + vect_eta) - gradient_adjoint(point - vect_eta)
+            ) / (2 * stepsize)
+            assert np.allclose(hess[i], hess_row, rtol=1e-04, atol=1e-04)
+
+
 if __name__ == "__main__":
     with warnings.catch_warnings():
         warnings.simplefilter("ignore", category=PendingDeprecationWarning)
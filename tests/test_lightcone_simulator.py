@@ -0,0 +1,156 @@
+import unittest
+import numpy as np
+import networkx as nx
+
+from openqaoa.backends import (
+    QAOAvectorizedBackendSimulator,
+    QAOABackendLightconeSimulator,
+)
+from openqaoa.backends.qaoa_device import create_device
+from openqaoa.algorithms import QAOA
+from openqaoa.problems import MaximumCut
+from openqaoa.qaoa_components import (
+    Hamiltonian,
+    QAOADescriptor,
+    create_qaoa_variational_params,
+)
+from openqaoa.utilities import X_mixer_hamiltonian, XY_mixer_hamiltonian
+
+"""
+A set of tests for the lightcone simulator backend, which computes the energy from
+the causal cones of the terms of the cost Hamiltonian.
+"""
+
+
+def random_sparse_hamiltonian(n_qubits: int, n_edges: int, seed: int) -> Hamiltonian:
+    """
+    Helper function for the tests below, a weighted sparse graph with biases
+    """
+    rng = np.random.default_rng(seed)
+    graph = nx.gnm_random_graph(n_qubits, n_edges, seed=seed)
+    terms = [list(edge) for edge in graph.edges] + [
+        [i] for i in range(n_qubits) if rng.random() < 0.4
+    ]
+    return Hamiltonian.classical_hamiltonian(
+        terms, list(rng.normal(size=len(terms))), constant=0.3
+    )
+
+
+class TestingQAOABackendLightconeSimulator(unittest.TestCase):
+    """
+    Unittest based testing of QAOABackendLightconeSimulator
+    """
+
+    def test_expectation(self):
+        """
+        Testing that the expectation value agrees with the vectorized simulator,
+        for several depths and parametrisations.
+        """
+        for seed, (n_qubits, p, param_type, kwargs) in enumerate(
+            [
+                (10, 1, "standard", {}),
+                (10, 2, "standard", {}),
+                (10, 2, "extended", {}),
+                (9, 3, "standard", {}),
+                (8, 2, "fourier", {"q": 2}),
+            ]
+        ):
+            cost_hamil = random_sparse_hamiltonian(n_qubits, int(1.4 * n_qubits), seed)
+            qaoa_descriptor = QAOADescriptor(
+                cost_hamil, X_mixer_hamiltonian(cost_hamil.n_qubits), p
+            )
+            variate_params = create_qaoa_variational_params(
+                qaoa_descriptor, param_type, "rand", **kwargs
+            )
+
+            backend_vectorized = QAOAvectorizedBackendSimulator(
+                qaoa_descriptor, None, None, True
+            )
+            backend_lightcone = QAOABackendLightconeSimulator(qaoa_descriptor)
+
+            assert np.isclose(
+                backend_lightcone.expectation(variate_params),
+                backend_vectorized.expectation(variate_params),
+            ), f"Lightcone expectation is wrong for p={p} and {param_type} parameters."
+
+    def test_isomorphic_cones(self):
+        """
+        Testing that the terms with isomorphic cones are simulated together: on a
+        ring with uniform weights all the edges have the same cone.
+        """
+        n_qubits, p = 30, 2
+        cost_hamil = Hamiltonian.classical_hamiltonian(
+            [[i, (i + 1) % n_qubits] for i in range(n_qubits)],
+            [1.0] * n_qubits,
+            constant=0,
+        )
+        qaoa_descriptor = QAOADescriptor(
+            cost_hamil, X_mixer_hamiltonian(n_qubits), p
+        )
+        variate_params = create_qaoa_variational_params(
+            qaoa_descriptor, "standard", "ramp"
+        )
+        backend_lightcone = QAOABackendLightconeSimulator(qaoa_descriptor)
+
+        assert len(backend_lightcone.lightcones) == 1
+        exp_vals = backend_lightcone.term_expectations(variate_params)
+        assert np.allclose(exp_vals, exp_vals[0])
+
+        # same cone as on a ring with 8 qubits, which is simulated exactly
+        small_hamil = Hamiltonian.classical_hamiltonian(
+            [[i, (i + 1) % 8] for i in range(8)], [1.0] * 8, constant=0
+        )
+        small_descriptor = QAOADescriptor(small_hamil, X_mixer_hamiltonian(8), p)
+        small_params = create_qaoa_variational_params(
+            small_descriptor, "standard", "ramp"
+        )
+        backend_vectorized = QAOAvectorizedBackendSimulator(
+            small_descriptor, None, None, True
+        )
+        assert np.isclose(
+            backend_lightcone.expectation(variate_params),
+            n_qubits / 8 * backend_vectorized.expectation(small_params),
+        )
+
+    def test_max_cone_qubits(self):
+        """
+        Testing that cones larger than max_cone_qubits are rejected.
+        """
+        cost_hamil = random_sparse_hamiltonian(12, 24, 0)
+        qaoa_descriptor = QAOADescriptor(
+            cost_hamil, X_mixer_hamiltonian(cost_hamil.n_qubits), 3
+        )
+
+        with self.assertRaises(ValueError):
+            QAOABackendLightconeSimulator(qaoa_descriptor, max_cone_qubits=4)
+
+    def test_different_mixer_fails(self):
+        """
+        Testing that the XY mixer raises an error.
+        """
+        n_qubits = 6
+        cost_hamil = random_sparse_hamiltonian(n_qubits, 6, 1)
+        qaoa_descriptor = QAOADescriptor(
+            cost_hamil, XY_mixer_hamiltonian(cost_hamil.n_qubits), 1
+        )
+
+        with self.assertRaises(AssertionError):
+            QAOABackendLightconeSimulator(qaoa_descriptor)
+
+    def test_end_to_end_qaoa(self):
+        """
+        Testing the QAOA workflow with the lightcone device on a large sparse graph.
+        """
+        graph = nx.random_regular_graph(3, 60, seed=3)
+        qaoa = QAOA()
+        qaoa.set_device(create_device(location="local", name="lightcone"))
+        qaoa.set_circuit_properties(p=2, init_type="ramp")
+        qaoa.set_classical_optimizer(maxiter=10)
+        qaoa.compile(MaximumCut(graph).qubo)
+        qaoa.optimize()
+
+        assert qaoa.result.optimized["cost"] < 0
+
+
+if __name__ == "__main__":
+    unittest.main()
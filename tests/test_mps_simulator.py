@@ -0,0 +1,219 @@
+import unittest
+import numpy as np
+import networkx as nx
+
+from openqaoa.backends import (
+    QAOAvectorizedBackendSimulator,
+    QAOABackendMPSSimulator,
+)
+from openqaoa.backends.qaoa_device import create_device
+from openqaoa.algorithms import QAOA
+from openqaoa.problems import MaximumCut
+from openqaoa.qaoa_components import (
+    Hamiltonian,
+    QAOADescriptor,
+    create_qaoa_variational_params,
+)
+from openqaoa.utilities import X_mixer_hamiltonian, XY_mixer_hamiltonian
+
+"""
+A set of tests for the matrix-product state simulator backend.
+"""
+
+
+def random_hamiltonian(n_qubits: int, seed: int) -> Hamiltonian:
+    """
+    Helper function for the tests below, a weighted random 3-regular graph with biases
+    """
+    rng = np.random.default_rng(seed)
+    graph = nx.random_regular_graph(3, n_qubits, seed=seed)
+    terms = [list(edge) for edge in graph.edges] + [[0], [n_qubits // 2]]
+    return Hamiltonian.classical_hamiltonian(
+        terms, list(rng.normal(size=len(terms))), constant=0.3
+    )
+
+
+def routing_function_cycle(device, problem_to_solve):
+    """
+    Routes the triangle (0, 1, 2) on a line of 3 qubits, with two SWAPs
+    leaving the logical qubits 0, 1, 2 on the physical qubits 2, 0, 1.
+    """
+    gate_list_indices = [[0, 1], [0, 1], [1, 2], [1, 2], [0, 1]]
+    swap_mask = [False, True, False, True, False]
+    initial_physical_to_logical_mapping = {0: 0, 1: 1, 2: 2}
+    final_mapping = [2, 0, 1]
+
+    return (
+        gate_list_indices,
+        swap_mask,
+        initial_physical_to_logical_mapping,
+        final_mapping,
+    )
+
+
+class TestingQAOABackendMPSSimulator(unittest.TestCase):
+    """
+    Unittest based testing of QAOABackendMPSSimulator
+    """
+
+    def test_expectation(self):
+        """
+        Testing that the expectation value and its uncertainty agree with the
+        vectorized simulator when the bonds are not truncated, for the X and XY
+        mixers and several parametrisations.
+        """
+        for seed, (mixer, p, param_type) in enumerate(
+            [
+                ("x", 1, "standard"),
+                ("x", 2, "extended"),
+                ("xy", 2, "standard"),
+                ("xy", 1, "extended"),
+            ]
+        ):
+            cost_hamil = random_hamiltonian(8, seed)
+            mixer_hamil = (
+                X_mixer_hamiltonian(8) if mixer == "x" else XY_mixer_hamiltonian(8)
+            )
+            qaoa_descriptor = QAOADescriptor(cost_hamil, mixer_hamil, p)
+            variate_params = create_qaoa_variational_params(
+                qaoa_descriptor, param_type, "rand"
+            )
+
+            backend_vectorized = QAOAvectorizedBackendSimulator(
+                qaoa_descriptor, None, None, True
+            )
+            backend_mps = QAOABackendMPSSimulator(
+                qaoa_descriptor, n_shots=20000, seed_simulator=seed, truncation_error=0
+            )
+
+            assert np.isclose(
+                backend_mps.expectation(variate_params),
+                backend_vectorized.expectation(variate_params),
+            ), f"MPS expectation is wrong for the {mixer} mixer and p={p}."
+
+            _, std_mps = backend_mps.expectation_w_uncertainty(variate_params)
+            _, std_vectorized = backend_vectorized.expectation_w_uncertainty(
+                variate_params
+            )
+            assert np.isclose(std_mps, std_vectorized, rtol=0.05)
+
+    def test_sampling(self):
+        """
+        Testing that the sampled outcomes follow the probabilities of the
+        vectorized simulator, with qubit k on the k-th character.
+        """
+        cost_hamil = random_hamiltonian(6, 0)
+        qaoa_descriptor = QAOADescriptor(cost_hamil, X_mixer_hamiltonian(6), 2)
+        variate_params = create_qaoa_variational_params(
+            qaoa_descriptor, "standard", "rand"
+        )
+
+        backend_vectorized = QAOAvectorizedBackendSimulator(
+            qaoa_descriptor, None, None, True
+        )
+        backend_mps = QAOABackendMPSSimulator(
+            qaoa_descriptor, n_shots=50000, seed_simulator=1
+        )
+
+        probabilities = backend_vectorized.probability_dict(variate_params)
+        counts = backend_mps.get_counts(variate_params)
+
+        assert sum(counts.values()) == 50000
+        for bitstring, count in counts.items():
+            assert np.isclose(count / 50000, probabilities[bitstring], atol=0.01)
+
+    def test_routed_circuit(self):
+        """
+        Testing that SWAP gates are applied and the final mapping undone, by
+        comparing a routed circuit with the unrouted one.
+        """
+        cost_hamil = Hamiltonian.classical_hamiltonian(
+            [[0, 1], [0, 2], [1, 2], [0], [1]], [1.0, -0.7, 0.4, 0.5, -0.2], 0
+        )
+        for p in [1, 2]:
+            qaoa_descriptor = QAOADescriptor(cost_hamil, X_mixer_hamiltonian(3), p)
+            routed_descriptor = QAOADescriptor(
+                cost_hamil,
+                X_mixer_hamiltonian(3),
+                p,
+                routing_function=routing_function_cycle,
+            )
+            variate_params = create_qaoa_variational_params(
+                qaoa_descriptor, "extended", "rand"
+            )
+            routed_params = create_qaoa_variational_params(
+                routed_descriptor, "extended", "rand"
+            )
+            routed_params.update_from_raw(variate_params.raw())
+
+            backend_vectorized = QAOAvectorizedBackendSimulator(
+                qaoa_descriptor, None, None, True
+            )
+            backend_mps = QAOABackendMPSSimulator(
+                routed_descriptor, n_shots=50000, seed_simulator=2
+            )
+
+            assert np.isclose(
+                backend_mps.expectation(routed_params),
+                backend_vectorized.expectation(variate_params),
+            ), f"MPS expectation of the routed circuit is wrong for p={p}."
+
+            probabilities = backend_vectorized.probability_dict(variate_params)
+            counts = backend_mps.get_counts(routed_params)
+            for bitstring, count in counts.items():
+                assert np.isclose(count / 50000, probabilities[bitstring], atol=0.01)
+
+    def test_truncation(self):
+        """
+        Testing that the bond dimension is capped by max_bond_dim, and that the
+        discarded weight is reported.
+        """
+        n_qubits = 40
+        cost_hamil = Hamiltonian.classical_hamiltonian(
+            [[i, i + 1] for i in range(n_qubits - 1)]
+            + [[i, i + 3] for i in range(n_qubits - 3)],
+            [1.0] * (2 * n_qubits - 4),
+            constant=0,
+        )
+        qaoa_descriptor = QAOADescriptor(
+            cost_hamil, X_mixer_hamiltonian(n_qubits), 2
+        )
+        variate_params = create_qaoa_variational_params(
+            qaoa_descriptor, "standard", "ramp"
+        )
+
+        backend_exact = QAOABackendMPSSimulator(qaoa_descriptor, max_bond_dim=256)
+        backend_truncated = QAOABackendMPSSimulator(qaoa_descriptor, max_bond_dim=16)
+
+        exact = backend_exact.expectation(variate_params)
+        truncated = backend_truncated.expectation(variate_params)
+
+        assert max(backend_truncated.mps.bond_dimensions) == 16
+        assert backend_truncated.discarded_weight > 0
+        assert backend_exact.discarded_weight < 1e-6
+        assert np.isclose(truncated, exact, rtol=0.01)
+
+        with self.assertRaises(ValueError):
+            QAOABackendMPSSimulator(qaoa_descriptor, max_bond_dim=0)
+
+    def test_end_to_end_qaoa(self):
+        """
+        Testing the QAOA workflow with the mps device on a ring too large for
+        the statevector simulators.
+        """
+        graph = nx.cycle_graph(50)
+        qaoa = QAOA()
+        qaoa.set_device(create_device(location="local", name="mps"))
+        qaoa.set_backend_properties(n_shots=50, max_bond_dim=16)
+        qaoa.set_circuit_properties(p=2, init_type="ramp")
+        qaoa.set_classical_optimizer(maxiter=10)
+        qaoa.compile(MaximumCut(graph).qubo)
+        qaoa.optimize()
+
+        assert qaoa.backend.max_bond_dim == 16
+        assert qaoa.result.optimized["cost"] < 0
+        assert len(qaoa.result.most_probable_states["solutions_bitstrings"][0]) == 50
+
+
+if __name__ == "__main__":
+    unittest.main()
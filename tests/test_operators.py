@@ -1174,6 +1174,35 @@ class TestingOperators(unittest.TestCase):
             constant_sq, correct_constant_sq
         ), f"Hamiltonian squared did not yield correct constant"
 
+    def test_hamiltonian_squared_cache(self):
+        """
+        Tests that the squared Hamiltonian is computed once, and again only after
+        the Hamiltonian is modified.
+        """
+
+        hamiltonian = Hamiltonian.classical_hamiltonian(
+            [(0, 1), (1, 2), (0,)], [1, -0.5, 2], constant=1
+        )
+
+        hamiltonian_sq = hamiltonian.hamiltonian_squared
+        assert (
+            hamiltonian.hamiltonian_squared is hamiltonian_sq
+        ), f"Hamiltonian squared was not cached"
+
+        # adding a Hamiltonian in place changes the square
+        hamiltonian + Hamiltonian.classical_hamiltonian([(0, 1)], [1.5], constant=0)
+        assert np.isclose(
+            hamiltonian.hamiltonian_squared.constant,
+            1 + sum(coeff**2 for coeff in [2.5, -0.5, 2]),
+        ), f"Hamiltonian squared was not recomputed after adding a Hamiltonian"
+
+        # as does changing the constant
+        hamiltonian.constant = 3
+        assert np.isclose(
+            hamiltonian.hamiltonian_squared.constant,
+            9 + sum(coeff**2 for coeff in hamiltonian.coeffs),
+        ), f"Hamiltonian squared was not recomputed after changing the constant"
+
     def test_classical_hamiltonian(self):
         """
         Tests the function that generates a classical Hamiltonian, i.e. a Hamiltonian composed only
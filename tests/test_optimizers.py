@@ -2,9 +2,10 @@ import warnings
 import numpy as np
 import networkx as nw
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 import warnings
 import os
+import multiprocessing
 
 import numpy as np
 from scipy.optimize._minimize import MINIMIZE_METHODS
@@ -22,6 +23,11 @@ from openqaoa.optimizers import get_optimizer
 from openqaoa.algorithms.qaoa.qaoa_result import QAOAResult
 from openqaoa.derivatives.derivative_functions import derivative
 from openqaoa.optimizers.logger_vqa import Logger
+from openqaoa.optimizers.evaluation_cache import EvaluationCache
+from openqaoa.optimizers.parallel_evaluation import ParallelEvaluator, _evaluate
+from openqaoa.backends.qaoa_vectorized_memmap import (
+    QAOAvectorizedMemmapBackendSimulator,
+)
 from openqaoa.derivatives.qfim import qfim
 from openqaoa.problems import MinimumVertexCover
 
@@ -176,6 +182,231 @@ class TestQAOACostBaseClass(unittest.TestCase):
                 y_precomp[i], y_opt[-1], rtol=1e-04, atol=1e-04
             ), f"{optimizer_dict['method']} failed the test."
 
+    def test_evaluation_cache(self):
+        "Check that the evaluation cache is bounded, quantises the parameters, and logs its statistics."
+
+        _, variate_params = self.__backend_params(cost_hamiltonian_1, 4)
+        log = Logger(
+            {
+                "cache_hits": {
+                    "history_update_bool": False,
+                    "best_update_string": "HighestOnly",
+                },
+                "cache_misses": {
+                    "history_update_bool": False,
+                    "best_update_string": "HighestOnly",
+                },
+            },
+            {"root_nodes": ["cache_hits", "cache_misses"], "best_update_structure": []},
+        )
+        cache = EvaluationCache(max_size=2, resolution=1e-8, logger=log)
+
+        keys = [cache.key(variate_params, [0.1 * i, 0.2]) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, cost=float(i))
+
+        # the least recently used evaluation is discarded
+        assert len(cache) == 2
+        assert cache.get(keys[0]) is None
+        assert cache.get(cache.key(variate_params, [0.1 + 1e-12, 0.2]))["cost"] == 1
+        assert cache.get(keys[1], required=("cost", "measurement_outcomes")) is None
+        assert cache.key(variate_params, [0.1, 0.2], n_shots=100) != keys[1]
+
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert log.cache_hits.best[0] == 1 and log.cache_misses.best[0] == 2
+        assert np.isclose(cache.hit_rate, 1 / 3)
+
+        with self.assertRaises(ValueError):
+            EvaluationCache(max_size=0)
+
+    def test_cached_optimization(self):
+        "Check that caching the evaluations leaves the optimization unchanged while saving backend evaluations."
+
+        results = {}
+        for cache_evaluations in [False, True]:
+            backend_obj_vectorized, variate_params = self.__backend_params(
+                cost_hamiltonian_1, 4
+            )
+            optimizer = get_optimizer(
+                backend_obj_vectorized,
+                variate_params,
+                optimizer_dict={
+                    "method": "trust-exact",
+                    "maxiter": 5,
+                    "jac": "finite_difference",
+                    "hess": "finite_difference",
+                    "cache_evaluations": cache_evaluations,
+                },
+            )
+            with patch.object(
+                backend_obj_vectorized,
+                "expectation",
+                wraps=backend_obj_vectorized.expectation,
+            ) as expectation, patch.object(
+                backend_obj_vectorized,
+                "expectation_batch",
+                wraps=backend_obj_vectorized.expectation_batch,
+            ) as expectation_batch:
+                optimizer()
+            n_evaluations = expectation.call_count + sum(
+                len(call[0][1]) for call in expectation_batch.call_args_list
+            )
+            results[cache_evaluations] = (optimizer, n_evaluations)
+
+        (optimizer, n_evaluations), (optimizer_cached, n_evaluations_cached) = (
+            results[False],
+            results[True],
+        )
+        assert np.allclose(
+            optimizer.qaoa_result.intermediate["cost"],
+            optimizer_cached.qaoa_result.intermediate["cost"],
+        )
+        assert (
+            optimizer.log.func_evals.best[0] == optimizer_cached.log.func_evals.best[0]
+        )
+
+        cache_hits = optimizer_cached.log.cache_hits.best[0]
+        assert cache_hits > 0
+        assert n_evaluations_cached == n_evaluations - cache_hits
+        assert optimizer.evaluation_cache is None
+
+    def test_cached_views(self):
+        "Check that the measurement outcomes that are views of the memory-mapped wavefunction are not cached."
+
+        backend_obj_vectorized, variate_params = self.__backend_params(
+            cost_hamiltonian_1, 4
+        )
+        backend_obj_memmap = QAOAvectorizedMemmapBackendSimulator(
+            backend_obj_vectorized.qaoa_descriptor, None, None, True
+        )
+        optimizer = get_optimizer(
+            backend_obj_memmap,
+            variate_params,
+            optimizer_dict={
+                "method": "cobyla",
+                "cache_evaluations": True,
+                "optimization_progress": True,
+            },
+        )
+
+        points = [np.array([0.1, 0.2]), np.array([0.3, 0.4]), np.array([0.1, 0.2])]
+        costs = [optimizer.optimize_this(x) for x in points]
+        assert costs[0] == costs[2]
+        assert optimizer.evaluation_cache.hits == 0
+
+        # the logged wavefunction is the one of the revisited point
+        variate_params.update_from_raw(points[0])
+        assert np.allclose(
+            optimizer.log.measurement_outcomes.history[-1],
+            backend_obj_vectorized.wavefunction(variate_params),
+        )
+
+    def test_population_optimizers(self):
+        "Check that the population optimizers find a pre-computed minimum, and that evaluating the candidates across worker processes leaves the optimization unchanged."
+
+        # differential evolution finds the global minimum, CMA-ES the one closest to the initial parameters
+        y_precomp = [-3.224891854932, -2.5889608823632795]
+        optimizer_dicts = [
+            {
+                "method": "differential_evolution",
+                "maxiter": 20,
+                "optimizer_options": {"popsize": 5, "seed": 0},
+            },
+            {
+                "method": "cma_es",
+                "maxiter": 30,
+                "optimizer_options": {"sigma0": 0.5, "seed": 0},
+            },
+        ]
+        for i, optimizer_dict in enumerate(optimizer_dicts):
+            costs = {}
+            for n_workers in [None, 2]:
+                backend_obj_vectorized, variate_params = self.__backend_params(
+                    cost_hamiltonian_1, 4
+                )
+                vector_optimizer = get_optimizer(
+                    backend_obj_vectorized,
+                    variate_params,
+                    optimizer_dict={**optimizer_dict, "n_workers": n_workers},
+                )
+                vector_optimizer()
+
+                y_opt = vector_optimizer.qaoa_result.intermediate["cost"]
+                assert len(y_opt) == vector_optimizer.log.func_evals.best[0]
+                assert np.isclose(
+                    y_precomp[i], min(y_opt), rtol=1e-03, atol=1e-03
+                ), f"{optimizer_dict['method']} failed the test."
+                assert vector_optimizer.parallel_evaluator is None
+                costs[n_workers] = y_opt
+
+            assert np.allclose(costs[None], costs[2])
+
+        with self.assertRaises(ValueError):
+            get_optimizer(
+                backend_obj_vectorized,
+                variate_params,
+                optimizer_dict={"method": "cma_es", "n_workers": 0},
+            )
+        for key, value in [("updating", "immediate"), ("workers", 2), ("x0", [0, 0])]:
+            with self.assertRaises(ValueError):
+                get_optimizer(
+                    backend_obj_vectorized,
+                    variate_params,
+                    optimizer_dict={
+                        "method": "differential_evolution",
+                        "optimizer_options": {key: value},
+                    },
+                )
+
+        # the workers would share the files of the memory-mapped simulator
+        mixer_hamil = X_mixer_hamiltonian(n_qubits=4)
+        qaoa_descriptor = QAOADescriptor(cost_hamiltonian_1, mixer_hamil, p=1)
+        backend_obj_memmap = QAOAvectorizedMemmapBackendSimulator(
+            qaoa_descriptor, None, None, True
+        )
+        with self.assertRaises(ValueError):
+            ParallelEvaluator(backend_obj_memmap, variate_params, n_workers=2)
+        with self.assertRaises(ValueError):
+            get_optimizer(
+                backend_obj_memmap,
+                variate_params,
+                optimizer_dict={"method": "differential_evolution", "n_workers": 2},
+            )
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "requires fork"
+    )
+    def test_parallel_evaluator_after_threaded_simulation(self):
+        "Check that forked workers can evaluate once the parent has simulated with several threads."
+
+        # the folded wavefunction of 2**14 amplitudes is split across threads
+        n_qubits = 15
+        cost_hamil = Hamiltonian(
+            [PauliOp("ZZ", (i, (i + 1) % n_qubits)) for i in range(n_qubits)],
+            [1] * n_qubits,
+            1,
+        )
+        qaoa_descriptor = QAOADescriptor(
+            cost_hamil, X_mixer_hamiltonian(n_qubits=n_qubits), p=1
+        )
+        variate_params = create_qaoa_variational_params(
+            qaoa_descriptor, "standard", "ramp"
+        )
+        backend_obj_vectorized = get_qaoa_backend(
+            qaoa_descriptor, create_device("local", "vectorized"), n_threads=4
+        )
+        cost = backend_obj_vectorized.expectation(variate_params)
+
+        with ParallelEvaluator(
+            backend_obj_vectorized, variate_params, n_workers=2, start_method="fork"
+        ) as evaluator:
+            # the workers would wait forever on the threads of the parent's pools
+            evaluations = evaluator._pool.map_async(
+                _evaluate, [variate_params.raw()] * 2, chunksize=1
+            ).get(timeout=60)
+
+        assert np.allclose([evaluation["cost"] for evaluation in evaluations], cost)
+
     def test_gradient_optimizers_global(self):
         "Check that final value of all implemented gradient optimizers agrees with pre-computed optimized value."
 
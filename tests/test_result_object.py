@@ -8,7 +8,7 @@ from openqaoa import QAOA
 from openqaoa.problems import MinimumVertexCover
 from openqaoa.qaoa_components import PauliOp, Hamiltonian
 from openqaoa.algorithms.qaoa.qaoa_result import QAOAResult, most_probable_bitstring
-from openqaoa.utilities import qaoa_probabilities
+from openqaoa.utilities import qaoa_probabilities, bitstring_energy
 from openqaoa.problems.converters import FromDocplex2IsingModel
 from openqaoa.backends import create_device
 
@@ -309,6 +309,32 @@ class TestingLoggerClass(unittest.TestCase):
         )  # bitstring optimal solution
         assert np.isclose(lowest_energy["bitstrings_energies"][0], -2.0)  # solution
 
+    def test_lowest_cost_bitstrings_spectrum(self):
+        """Test that the lowest cost bitstrings of a statevector simulation match a brute force sort of the energies"""
+
+        g = nx.circulant_graph(6, [1])
+        vc = MinimumVertexCover(g, field=1.0, penalty=10).qubo
+        q = QAOA()
+        q.compile(vc, verbose=False)
+        q.optimize()
+        result = q.result
+
+        n_qubits = vc.hamiltonian.n_qubits
+        bitstrings = [
+            "".join(str((index >> qubit) & 1) for qubit in range(n_qubits))
+            for index in range(2**n_qubits)
+        ]
+        energies = [
+            bitstring_energy(vc.hamiltonian, bitstring) for bitstring in bitstrings
+        ]
+        order = np.argsort(energies, kind="stable")[:10]
+
+        lowest_energy = result.lowest_cost_bitstrings(10)
+        assert lowest_energy["solutions_bitstrings"] == [bitstrings[i] for i in order]
+        assert np.allclose(
+            lowest_energy["bitstrings_energies"], np.array(energies)[order]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
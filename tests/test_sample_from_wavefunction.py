@@ -7,8 +7,13 @@ from openqaoa.qaoa_components import (
     QAOAVariationalStandardParams,
     Hamiltonian,
 )
-from openqaoa.utilities import random_classical_hamiltonian, X_mixer_hamiltonian
+from openqaoa.utilities import (
+    random_classical_hamiltonian,
+    X_mixer_hamiltonian,
+    bitstring_energy,
+)
 from openqaoa.backends import DeviceLocal
+from openqaoa.backends.cost_function import cost_function, cost_statistics
 
 
 class TestGetSamplesMethod(unittest.TestCase):
@@ -133,6 +138,96 @@ class TestGetSamplesMethod(unittest.TestCase):
             prob_wf_qiskit, samples_prob_qiskit, decimal=3
         )
 
+    def test_sample_counts(self):
+        """
+        Check that the integer counts are reproducible with a seed, sum up to
+        the number of shots, follow the probabilities of the statevector, and
+        agree with the string keyed counts.
+        """
+        nshots = 200000
+
+        reg = [0, 1, 2, 3, 4, 5]
+        cost_hamiltonian = random_classical_hamiltonian(reg)
+        n_qubits = cost_hamiltonian.n_qubits
+        mixer_hamiltonian = X_mixer_hamiltonian(n_qubits)
+        qaoa_descriptor = QAOADescriptor(cost_hamiltonian, mixer_hamiltonian, p=1)
+        variational_params_std = QAOAVariationalStandardParams(
+            qaoa_descriptor, [np.pi / 8], [np.pi / 5]
+        )
+
+        backend_vectorized = get_qaoa_backend(
+            qaoa_descriptor, DeviceLocal("vectorized")
+        )
+        prob_vec = backend_vectorized.probabilities(variational_params_std)
+        assert np.allclose(
+            prob_vec,
+            list(backend_vectorized.probability_dict(variational_params_std).values()),
+        )
+
+        np.random.seed(1234)
+        outcomes, counts = backend_vectorized.sample_counts(
+            variational_params_std, nshots
+        )
+        np.random.seed(1234)
+        outcomes_seeded, counts_seeded = backend_vectorized.sample_counts(
+            variational_params_std, nshots
+        )
+        assert np.array_equal(outcomes, outcomes_seeded)
+        assert np.array_equal(counts, counts_seeded)
+        assert np.issubdtype(counts.dtype, np.integer)
+        assert np.sum(counts) == nshots
+
+        samples_prob_vec = np.zeros(2**n_qubits)
+        samples_prob_vec[outcomes] = counts / nshots
+        np.testing.assert_array_almost_equal(prob_vec, samples_prob_vec, decimal=2)
+
+        np.random.seed(1234)
+        counts_dict = backend_vectorized.get_counts(variational_params_std, nshots)
+        assert counts_dict == {
+            bin(outcome)[2:].zfill(n_qubits)[::-1]: count
+            for outcome, count in zip(outcomes, counts)
+        }
+
+    def test_cost_statistics_from_counts(self):
+        """
+        Check the mean, variance and CVaR computed from counts against the
+        energies of the individual shots, for counts and probabilities.
+        """
+        cost_hamiltonian = random_classical_hamiltonian([0, 1, 2, 3, 4, 5], seed=42)
+        n_qubits = cost_hamiltonian.n_qubits
+
+        np.random.seed(1234)
+        outcomes, counts = np.unique(
+            np.random.randint(0, 2**n_qubits, 1000), return_counts=True
+        )
+        bitstrings = [bin(outcome)[2:].zfill(n_qubits)[::-1] for outcome in outcomes]
+        counts_dict = dict(zip(bitstrings, counts.tolist()))
+        probability_dict = dict(zip(bitstrings, (counts / 1000).tolist()))
+
+        # energies of each shot, sorted
+        shot_energies = np.sort(
+            np.repeat(
+                [bitstring_energy(cost_hamiltonian, key) for key in bitstrings],
+                counts,
+            )
+        )
+
+        for alpha in [1, 0.5, 0.1234]:
+            n_tail = alpha * 1000
+            weights = np.clip(n_tail - np.arange(1000), 0, 1)
+            correct_cost = weights @ shot_energies / n_tail
+            correct_variance = weights @ (shot_energies - correct_cost) ** 2 / n_tail
+
+            for outcomes_dict in [counts_dict, probability_dict]:
+                cost, variance = cost_statistics(
+                    outcomes_dict, cost_hamiltonian, alpha
+                )
+                assert np.isclose(cost, correct_cost)
+                assert np.isclose(variance, correct_variance)
+                assert np.isclose(
+                    cost_function(outcomes_dict, cost_hamiltonian, alpha), correct_cost
+                )
+
     # def testing_w_init_prog(self):
     # 	"""
     # 	This function creates an init_prog and then implements a Hamiltonian
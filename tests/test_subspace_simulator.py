@@ -0,0 +1,274 @@
+import unittest
+import numpy as np
+import networkx as nx
+
+from openqaoa.backends import (
+    QAOAvectorizedBackendSimulator,
+    QAOABackendSubspaceSimulator,
+)
+from openqaoa.backends.qaoa_device import create_device
+from openqaoa.algorithms import QAOA
+from openqaoa.problems import MaximumCut
+from openqaoa.qaoa_components import (
+    Hamiltonian,
+    QAOADescriptor,
+    create_qaoa_variational_params,
+)
+from openqaoa.utilities import (
+    X_mixer_hamiltonian,
+    XY_mixer_hamiltonian,
+    dicke_wavefunction,
+    k_cumulative_excitations,
+    SubspaceVector,
+)
+
+"""
+A set of tests for the Hamming-weight subspace simulator backend.
+"""
+
+
+def random_hamiltonian(n_qubits: int, seed: int) -> Hamiltonian:
+    """
+    Helper function for the tests below, a weighted ring with chords and biases
+    """
+    rng = np.random.default_rng(seed)
+    terms = (
+        [[i, (i + 1) % n_qubits] for i in range(n_qubits)]
+        + [[0, n_qubits // 2], [1, n_qubits - 2]]
+        + [[0], [n_qubits // 2]]
+    )
+    return Hamiltonian.classical_hamiltonian(
+        terms, list(rng.normal(size=len(terms))), constant=0.3
+    )
+
+
+def xy_variational_params(qaoa_descriptor: QAOADescriptor, param_type: str):
+    """
+    Helper function for the tests below, random parameters in which the RXX and
+    RYY gates of each pair of qubits of the mixer share the same angle
+    """
+    variate_params = create_qaoa_variational_params(
+        qaoa_descriptor, param_type, "rand"
+    )
+    if param_type == "extended":
+        variate_params.betas_pairs[:, 1::2] = variate_params.betas_pairs[:, 0::2]
+
+    return variate_params
+
+
+class TestingQAOABackendSubspaceSimulator(unittest.TestCase):
+    """
+    Unittest based testing of QAOABackendSubspaceSimulator
+    """
+
+    def test_expectation(self):
+        """
+        Testing that the wavefunction, the expectation value and its uncertainty
+        agree with the vectorized simulator starting from the same Dicke state,
+        for several connectivities of the XY mixer and parametrisations.
+        """
+        n_qubits, excitations = 7, 3
+        for seed, (connectivity, param_type) in enumerate(
+            [("full", "standard"), ("chain", "extended"), ("star", "standard")]
+        ):
+            cost_hamil = random_hamiltonian(n_qubits, seed)
+            qaoa_descriptor = QAOADescriptor(
+                cost_hamil, XY_mixer_hamiltonian(n_qubits, connectivity), 2
+            )
+            variate_params = xy_variational_params(qaoa_descriptor, param_type)
+            dicke_state = dicke_wavefunction(excitations, n_qubits)
+
+            backend_vectorized = QAOAvectorizedBackendSimulator(
+                qaoa_descriptor, dicke_state, None, False
+            )
+            backend_subspace = QAOABackendSubspaceSimulator(
+                qaoa_descriptor, dicke_state, None, False
+            )
+            backend_weight = QAOABackendSubspaceSimulator(
+                qaoa_descriptor, None, None, False, hamming_weight=excitations
+            )
+
+            assert backend_subspace.hamming_weights == [excitations]
+            assert backend_subspace.subspace_dim == 35
+            assert np.allclose(
+                backend_subspace.wavefunction(variate_params),
+                backend_vectorized.wavefunction(variate_params),
+            ), f"Wrong wavefunction for the {connectivity} XY mixer."
+            assert np.allclose(
+                backend_subspace.expectation_w_uncertainty(variate_params),
+                backend_vectorized.expectation_w_uncertainty(variate_params),
+            )
+            assert np.isclose(
+                backend_weight.expectation(variate_params),
+                backend_vectorized.expectation(variate_params),
+            )
+
+    def test_several_hamming_weights(self):
+        """
+        Testing a prepend state supported on several Hamming weights, and the
+        uniform superposition prepared by the Hadamard gates.
+        """
+        n_qubits = 6
+        cost_hamil = random_hamiltonian(n_qubits, 0)
+        qaoa_descriptor = QAOADescriptor(
+            cost_hamil, XY_mixer_hamiltonian(n_qubits, "chain"), 2
+        )
+        variate_params = xy_variational_params(qaoa_descriptor, "standard")
+
+        for prepend_state, init_hadamard, weights in [
+            (k_cumulative_excitations(2, n_qubits), False, [0, 1, 2]),
+            (None, True, list(range(n_qubits + 1))),
+        ]:
+            backend_vectorized = QAOAvectorizedBackendSimulator(
+                qaoa_descriptor, prepend_state, None, init_hadamard
+            )
+            backend_subspace = QAOABackendSubspaceSimulator(
+                qaoa_descriptor, prepend_state, None, init_hadamard
+            )
+
+            assert backend_subspace.hamming_weights == weights
+            assert np.allclose(
+                backend_subspace.wavefunction(variate_params),
+                backend_vectorized.wavefunction(variate_params),
+            )
+            assert np.isclose(
+                backend_subspace.expectation(variate_params),
+                backend_vectorized.expectation(variate_params),
+            )
+
+    def test_sampling(self):
+        """
+        Testing that the sampled outcomes have the Hamming weight of the
+        subspace and follow the probabilities of the vectorized simulator.
+        """
+        n_qubits, excitations = 6, 2
+        cost_hamil = random_hamiltonian(n_qubits, 1)
+        qaoa_descriptor = QAOADescriptor(
+            cost_hamil, XY_mixer_hamiltonian(n_qubits), 1
+        )
+        variate_params = xy_variational_params(qaoa_descriptor, "standard")
+
+        backend_vectorized = QAOAvectorizedBackendSimulator(
+            qaoa_descriptor, dicke_wavefunction(excitations, n_qubits), None, False
+        )
+        backend_subspace = QAOABackendSubspaceSimulator(
+            qaoa_descriptor, None, None, False, hamming_weight=excitations
+        )
+
+        probabilities = backend_vectorized.probability_dict(variate_params)
+        assert np.allclose(
+            backend_subspace.probabilities(variate_params),
+            backend_vectorized.probabilities(variate_params),
+        )
+
+        np.random.seed(0)
+        counts = backend_subspace.get_counts(variate_params, n_shots=50000)
+        assert sum(counts.values()) == 50000
+        for bitstring, count in counts.items():
+            assert bitstring.count("1") == excitations
+            assert np.isclose(count / 50000, probabilities[bitstring], atol=0.01)
+
+    def test_compact_measurement_outcomes(self):
+        """
+        Testing that the measurement outcomes and the probabilities only store
+        the amplitudes of the subspace, and are expanded to those of the
+        vectorized simulator when read.
+        """
+        n_qubits, excitations = 10, 2
+        cost_hamil = random_hamiltonian(n_qubits, 2)
+        qaoa_descriptor = QAOADescriptor(
+            cost_hamil, XY_mixer_hamiltonian(n_qubits, "chain"), 1
+        )
+        variate_params = xy_variational_params(qaoa_descriptor, "standard")
+
+        backend_vectorized = QAOAvectorizedBackendSimulator(
+            qaoa_descriptor, dicke_wavefunction(excitations, n_qubits), None, False
+        )
+        backend_subspace = QAOABackendSubspaceSimulator(
+            qaoa_descriptor, None, None, False, hamming_weight=excitations
+        )
+
+        for method in ["expectation", "expectation_w_uncertainty"]:
+            getattr(backend_subspace, method)(variate_params)
+            getattr(backend_vectorized, method)(variate_params)
+
+            measurement_outcomes = backend_subspace.measurement_outcomes
+            assert isinstance(measurement_outcomes, SubspaceVector)
+            assert measurement_outcomes.values.size == backend_subspace.subspace_dim
+            assert np.allclose(
+                measurement_outcomes, backend_vectorized.measurement_outcomes
+            )
+
+        # the outcomes logged are copies, not views of the wavefunction
+        backend_subspace.expectation(variate_params)
+        measurement_outcomes = backend_subspace.measurement_outcomes
+        backend_subspace.reset_circuit()
+        assert not np.allclose(measurement_outcomes.values, backend_subspace.wavefn)
+
+        probabilities = backend_subspace.probabilities(variate_params)
+        assert isinstance(probabilities, SubspaceVector)
+        assert probabilities.values.size == backend_subspace.subspace_dim
+        assert np.allclose(
+            probabilities, backend_vectorized.probabilities(variate_params)
+        )
+
+    def test_unsupported_circuits(self):
+        """
+        Testing that the circuits and initial states that do not conserve the
+        Hamming weight are rejected.
+        """
+        n_qubits = 4
+        cost_hamil = random_hamiltonian(n_qubits, 2)
+        dicke_state = dicke_wavefunction(2, n_qubits)
+
+        x_descriptor = QAOADescriptor(cost_hamil, X_mixer_hamiltonian(n_qubits), 1)
+        with self.assertRaises(ValueError):
+            QAOABackendSubspaceSimulator(x_descriptor, dicke_state, None, False)
+
+        xy_descriptor = QAOADescriptor(
+            cost_hamil, XY_mixer_hamiltonian(n_qubits), 1
+        )
+        with self.assertRaises(ValueError):
+            QAOABackendSubspaceSimulator(xy_descriptor, dicke_state, None, True)
+        with self.assertRaises(ValueError):
+            QAOABackendSubspaceSimulator(xy_descriptor, None, None, False)
+        with self.assertRaises(ValueError):
+            QAOABackendSubspaceSimulator(
+                xy_descriptor, dicke_state, None, False, hamming_weight=1
+            )
+
+        # different angles for the RXX and RYY gates of a pair
+        variate_params = create_qaoa_variational_params(
+            xy_descriptor, "extended", "rand"
+        )
+        variate_params.betas_pairs[:, 1] = variate_params.betas_pairs[:, 0] + 0.1
+        backend_subspace = QAOABackendSubspaceSimulator(
+            xy_descriptor, dicke_state, None, False
+        )
+        with self.assertRaises(ValueError):
+            backend_subspace.expectation(variate_params)
+
+    def test_end_to_end_qaoa(self):
+        """
+        Testing the QAOA workflow with the subspace device, looking for the
+        bisection of a ring with the XY mixer.
+        """
+        graph = nx.cycle_graph(10)
+        qaoa = QAOA()
+        qaoa.set_device(create_device(location="local", name="subspace"))
+        qaoa.set_backend_properties(init_hadamard=False, hamming_weight=5)
+        qaoa.set_circuit_properties(
+            p=2, mixer_hamiltonian="xy", mixer_qubit_connectivity="chain"
+        )
+        qaoa.set_classical_optimizer(maxiter=20)
+        qaoa.compile(MaximumCut(graph).qubo)
+        qaoa.optimize()
+
+        assert qaoa.backend.subspace_dim == 252
+        assert qaoa.result.optimized["cost"] < 0
+        for bitstring in qaoa.result.most_probable_states["solutions_bitstrings"]:
+            assert bitstring.count("1") == 5
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -499,6 +499,51 @@ class TestingUtilities(unittest.TestCase):
             # Test computed solution is correcrt
             assert np.allclose(correct_energy, energy), f"Computed energy is incorrect"
 
+    def test_compiled_hamiltonian(self):
+        """
+        Test the compiled Hamiltonian that computes the energies of a batch of
+        bitstrings, given as a matrix of bits or as integers.
+
+        The test consists in comparing the energies with those of ``bitstring_energy``
+        for a random Hamiltonian, its square, which has terms on up to 4 qubits,
+        and all the basis states.
+        """
+
+        hamiltonian = random_classical_hamiltonian(list(range(6)), seed=1234)
+        n_qubits = hamiltonian.n_qubits
+
+        indices = np.arange(2**n_qubits)
+        bitstrings = [np.binary_repr(index, n_qubits)[::-1] for index in indices]
+
+        bits = bits_from_bitstrings(bitstrings)
+        assert bits.shape == (2**n_qubits, n_qubits)
+        assert np.array_equal(
+            bits, bits_from_bitstrings([[int(b) for b in bs] for bs in bitstrings])
+        )
+
+        for ham in [hamiltonian, hamiltonian.hamiltonian_squared]:
+            compiled_hamiltonian = CompiledHamiltonian(ham)
+            correct_energies = [bitstring_energy(ham, bs) for bs in bitstrings]
+
+            assert np.allclose(compiled_hamiltonian.energies(bits), correct_energies)
+            assert np.allclose(
+                compiled_hamiltonian.energies(indices.astype(np.uint64)),
+                correct_energies,
+            )
+            assert np.isclose(
+                compiled_hamiltonian.energy(bitstrings[5]), correct_energies[5]
+            )
+
+        # the energies of the basis states match the diagonal of the Hamiltonian
+        assert np.allclose(
+            CompiledHamiltonian(hamiltonian).energies(indices),
+            energy_spectrum_hamiltonian(hamiltonian),
+        )
+
+        # bitstrings shorter than the register are rejected
+        with self.assertRaises(ValueError):
+            CompiledHamiltonian(hamiltonian).energies(bits[:, :-1])
+
     def test_energy_expectation(self):
         """
         Tests the function that computes the expectation value of a classical Hamiltonian
@@ -611,6 +656,47 @@ class TestingUtilities(unittest.TestCase):
             energies, correct_energies
         ), f"Energy spectrum was not computed correctly"
 
+    def test_hamiltonian_spectrum(self):
+        """
+        Tests the streaming spectrum engine, which scans the basis states in chunks.
+
+        The test consists in comparing the minimum, the lowest states and the states
+        below a threshold with those of the full spectrum, for several chunk sizes
+        and with a pool of processes.
+        """
+
+        hamiltonian = random_classical_hamiltonian(list(range(8)), seed=1234)
+        n_qubits = hamiltonian.n_qubits
+
+        # Full spectrum, from the energies of each bitstring
+        correct_energies = np.array(
+            [
+                bitstring_energy(hamiltonian, np.binary_repr(index, n_qubits)[::-1])
+                for index in range(2**n_qubits)
+            ]
+        )
+        threshold = np.median(correct_energies)
+
+        for chunk_qubits, n_processes in [(2, None), (5, None), (20, None), (4, 2)]:
+            spectrum = HamiltonianSpectrum(
+                hamiltonian, chunk_qubits=chunk_qubits, n_processes=n_processes
+            )
+
+            assert np.allclose(spectrum.energies(), correct_energies)
+
+            min_energy, max_energy, ground_state_indices = spectrum.extrema()
+            assert np.isclose(min_energy, np.min(correct_energies))
+            assert np.isclose(max_energy, np.max(correct_energies))
+            assert ground_state_indices.tolist() == [np.argmin(correct_energies)]
+
+            energies, indices = spectrum.lowest(5)
+            assert indices.tolist() == np.argsort(correct_energies)[:5].tolist()
+            assert np.allclose(energies, np.sort(correct_energies)[:5])
+
+            energies, indices = spectrum.below(threshold)
+            assert np.array_equal(indices, np.nonzero(correct_energies <= threshold)[0])
+            assert np.allclose(energies, correct_energies[indices])
+
     def test_low_energy_states(self):
         """
         Test the function that retrieves the energy eigenstates which are below
@@ -1070,6 +1156,75 @@ class TestingUtilities(unittest.TestCase):
                     prob_dicts[idx][string], correct_prob_dicts[idx][string]
                 ), f"Probablity have not been generated correctly"
 
+    def test_bitstrings_from_indices(self):
+        """
+        Tests the vectorized conversion of integer basis states into bitstrings,
+        which must follow the convention of the keys of qaoa_probabilities.
+        """
+
+        n_qubits = 4
+        keys = list(qaoa_probabilities(np.ones(2**n_qubits) / 4).keys())
+
+        bitstrings = bitstrings_from_indices(np.arange(2**n_qubits), n_qubits)
+        assert bitstrings.tolist() == keys
+
+        bitstrings = bitstrings_from_indices(np.array([[1, 8], [6, 0]]), n_qubits)
+        assert bitstrings.tolist() == [["1000", "0001"], ["0110", "0000"]]
+
+    def test_state_probabilities(self):
+        """
+        Tests the compact probability distribution built from a statevector: its
+        dictionary interface, top-k extraction, sparse export and marginals.
+        """
+
+        n_qubits = 4
+        state_vec = np.random.rand(2**n_qubits) + 1j * np.random.rand(2**n_qubits)
+        state_vec /= np.linalg.norm(state_vec)
+        state_vec[5] = 0
+
+        probabilities = StateProbabilities.from_statevector(state_vec)
+        prob_dict = qaoa_probabilities(state_vec)
+
+        assert probabilities == prob_dict
+        assert list(probabilities.keys()) == list(prob_dict.keys())
+        assert len(probabilities) == 2**n_qubits
+        assert probabilities["1010"] == prob_dict["1010"]
+        assert "1010" in probabilities and "10102" not in probabilities
+
+        # most probable states, by decreasing probability
+        top_states = probabilities.top_k(3)
+        assert list(top_states.items()) == sorted(
+            prob_dict.items(), key=lambda item: item[1], reverse=True
+        )[:3]
+
+        # sparse export, which leaves out the state with zero probability
+        assert probabilities.to_dict() == {
+            key: prob for key, prob in prob_dict.items() if prob > 0
+        }
+        assert "1010" not in probabilities.to_dict()
+        assert probabilities.to_dict(threshold=1) == {}
+
+        # marginal of qubits 2 and 0, where qubit 2 is the first bit
+        marginal = np.zeros(4)
+        for key, prob in prob_dict.items():
+            marginal[int(key[2]) + 2 * int(key[0])] += prob
+        assert np.allclose(probabilities.marginal([2, 0]), marginal)
+
+        for i in range(n_qubits):
+            assert np.isclose(
+                exp_val_single(i, probabilities), exp_val_single(i, prob_dict)
+            )
+            for j in range(i + 1, n_qubits):
+                assert np.isclose(
+                    exp_val_pair((i, j), probabilities),
+                    exp_val_pair((i, j), prob_dict),
+                )
+
+        # ties are ordered by index, also at the boundary of the selection
+        values = np.array([3, 1, 2, 1, 0, 1])
+        assert smallest_k_indices(values, 3).tolist() == [4, 1, 3]
+        assert smallest_k_indices(values, 10).tolist() == [4, 1, 3, 5, 2, 0]
+
     def test_delete_keys_from_dict(self):
         """
         Tests the function that deletes a set of keys from a dictionary: delete_keys_from_dict.
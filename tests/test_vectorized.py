@@ -1,16 +1,31 @@
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
 import numpy as np
 from scipy.linalg import expm
 from scipy.sparse import csc_matrix, kron, diags
 
 # RX and CHPHASE are never used
+from openqaoa.backends import qaoa_vectorized
 from openqaoa.backends.qaoa_vectorized import (
     QAOAvectorizedBackendSimulator,
     _permute_qubits,
     _get_perm,
+    _build_cost_hamiltonian,
+    _cached_cost_hamiltonian,
+    _cost_hamiltonian_block,
     RX,
 )
-from openqaoa.utilities import X_mixer_hamiltonian, ring_of_disagrees
+from openqaoa.backends.qaoa_vectorized_memmap import (
+    QAOAvectorizedMemmapBackendSimulator,
+)
+from openqaoa.backends.gates_vectorized import VectorizedGateApplicator
+from openqaoa.utilities import (
+    X_mixer_hamiltonian,
+    ring_of_disagrees,
+    FoldedStatevector,
+)
 from openqaoa.qaoa_components import (
     QAOAVariationalExtendedParams,
     QAOAVariationalStandardParams,
@@ -117,6 +132,85 @@ class TestingQAOAvectorizedBackend(unittest.TestCase):
     # TESTS OF BASIC CIRCUIT OPERATIONS (SAME AS FOR PROJECTQ)
     ##########################################################
 
+    def test_build_cost_hamiltonian(self):
+        """
+        Checks the bitwise construction of the cost Hamiltonian, as a whole and
+        by blocks, against its definition on every basis state.
+        """
+
+        n_qubits = 7
+        cost_hamil = Hamiltonian.classical_hamiltonian(
+            [[0, 4], [1, 2], [6, 3], [5, 0], [2], [6]],
+            [0.5, -1.2, 0.8, 2.1, -0.3, 1.4],
+            constant=0.7,
+        )
+
+        ham_op_expected = np.zeros(2**n_qubits)
+        for index in range(2**n_qubits):
+            bits = [(index >> qubit) & 1 for qubit in range(n_qubits)]
+            ham_op_expected[index] = cost_hamil.constant + sum(
+                weight * np.prod([1 - 2 * bits[qubit] for qubit in term.qubit_indices])
+                for term, weight in zip(cost_hamil.terms, cost_hamil.coeffs)
+            )
+
+        ham_op = _build_cost_hamiltonian(n_qubits, cost_hamil)
+        assert ham_op.shape == (2,) * n_qubits
+        assert np.allclose(ham_op.flatten(), ham_op_expected)
+
+        for block_qubits in [0, 3, 4]:
+            block_size = 2**block_qubits
+            ham_op_blocks = [
+                _cost_hamiltonian_block(cost_hamil, start, block_size)
+                for start in range(0, 2**n_qubits, block_size)
+            ]
+            assert np.allclose(np.concatenate(ham_op_blocks), ham_op_expected)
+
+    def test_cached_cost_hamiltonian(self):
+        """
+        Checks that simulators of the same problem share a read-only cost
+        Hamiltonian, and that the cache is bounded by its memory budget.
+        """
+
+        n_qubits = 5
+        cost_hamil = Hamiltonian.classical_hamiltonian(
+            [[0, 1], [1, 2], [2, 3], [3, 4], [0]], [1, 2, 3, 4, 5], constant=1
+        )
+        same_cost_hamil = Hamiltonian.classical_hamiltonian(
+            [[0, 1], [1, 2], [2, 3], [3, 4], [0]], [1, 2, 3, 4, 5], constant=1
+        )
+        other_cost_hamil = Hamiltonian.classical_hamiltonian(
+            [[0, 1], [1, 2], [2, 3], [3, 4], [0]], [1, 2, 3, 4, 6], constant=1
+        )
+        mixer_hamil = X_mixer_hamiltonian(n_qubits)
+
+        backends = [
+            QAOAvectorizedBackendSimulator(
+                QAOADescriptor(hamil, mixer_hamil, p=1), None, None, True
+            )
+            for hamil in [cost_hamil, same_cost_hamil, other_cost_hamil]
+        ]
+        assert backends[0].ham_op is backends[1].ham_op
+        assert backends[0].ham_op is not backends[2].ham_op
+        assert not backends[0].ham_op.flags.writeable
+
+        ham_op = _cached_cost_hamiltonian(n_qubits, cost_hamil, np.float64)
+        assert (
+            _cached_cost_hamiltonian(n_qubits, cost_hamil, np.float32) is not ham_op
+        )
+
+        # with a budget of a single array, the least recently used one is evicted
+        with patch.object(
+            qaoa_vectorized, "COST_HAMILTONIAN_CACHE_BYTES", ham_op.nbytes
+        ):
+            new_cost_hamil = Hamiltonian.classical_hamiltonian(
+                [[0, 1], [1, 2]], [1, 2], constant=3
+            )
+            _cached_cost_hamiltonian(n_qubits, new_cost_hamil, np.float64)
+            assert (
+                _cached_cost_hamiltonian(n_qubits, cost_hamil, np.float64)
+                is not ham_op
+            )
+
     def test_qaoa_circuit(self):
 
         # Test circuit with p = 1 on 3 qubits
@@ -142,9 +236,8 @@ class TestingQAOAvectorizedBackend(unittest.TestCase):
             qaoa_descriptor, prepend_state=None, append_state=None, init_hadamard=True
         )
 
-        backend_vectorized.qaoa_circuit(variational_params_std)
-        wf = backend_vectorized.wavefn
-        wf.shape = 2**nqubits
+        # the wavefunction of this bias-free problem is stored in the folded basis
+        wf = np.array(backend_vectorized.wavefunction(variational_params_std))
         wf = wf / wf[0]
 
         expected_wf = np.array([1, 1, 1, 1, 1, 1, 1, 1])
@@ -382,6 +475,518 @@ class TestingQAOAvectorizedBackend(unittest.TestCase):
 
         self.assertRaises(Exception, test_nonclassical_hamiltonian_error)
 
+    def test_fused_cost_layer(self):
+        """
+        Checks that applying each cost block as a single diagonal phase gives
+        the same wavefunction as applying its RZ/RZZ gates one by one.
+        """
+
+        n_qubits = 5
+        terms = [[0, 1], [0, 2], [1, 3], [2, 4], [3, 4], [1], [4]]
+        weights = [1, 0.5, -1.2, 2, 0.3, -0.7, 1.1]
+        cost_hamil = Hamiltonian.classical_hamiltonian(terms, weights, constant=0.4)
+        mixer_hamil = X_mixer_hamiltonian(n_qubits)
+        qaoa_descriptor = QAOADescriptor(cost_hamil, mixer_hamil, p=3)
+        variational_params_std = QAOAVariationalStandardParams(
+            qaoa_descriptor, betas=[0.1, 0.4, 0.7], gammas=[0.9, 0.5, 0.2]
+        )
+
+        backend_vectorized = QAOAvectorizedBackendSimulator(
+            qaoa_descriptor, prepend_state=None, append_state=None, init_hadamard=True
+        )
+        wf_fused = backend_vectorized.wavefunction(variational_params_std)
+
+        fused_angles = backend_vectorized._fused_cost_layer_angles()
+        assert list(fused_angles.keys()) == [0, 1, 2]
+        assert np.allclose(list(fused_angles.values()), [0.9, 0.5, 0.2])
+
+        # apply the same circuit gate by gate
+        gates_applicator = VectorizedGateApplicator()
+        backend_vectorized.reset_circuit()
+        backend_vectorized.assign_angles(variational_params_std)
+        for each_gate in backend_vectorized.abstract_circuit:
+            for each_tuple in each_gate.decomposition("trivial"):
+                gate = each_tuple[0](gates_applicator, *each_tuple[1])
+                gate.apply_gate(backend_vectorized)
+        wf_gates = backend_vectorized.wavefn.flatten()
+
+        assert np.allclose(wf_fused, wf_gates)
+
+    def test_fused_cost_layer_not_applied(self):
+        """
+        Checks that the cost block is only fused when every term of a layer
+        is rotated by the same angle.
+        """
+
+        n_qubits = 3
+        terms = [[0, 1], [0, 2], [0]]
+        weights = [1, 1, -0.5]
+        cost_hamil = Hamiltonian.classical_hamiltonian(terms, weights, constant=0)
+        mixer_hamil = X_mixer_hamiltonian(n_qubits)
+        qaoa_descriptor = QAOADescriptor(cost_hamil, mixer_hamil, p=2)
+        variational_params_ext = QAOAVariationalExtendedParams(
+            qaoa_descriptor,
+            betas_singles=[[0.3] * 3, [0.2] * 3],
+            betas_pairs=[],
+            gammas_singles=[[0.5], [0.1]],
+            gammas_pairs=[[0.5, 0.5], [0.4, 0.1]],
+        )
+
+        backend_vectorized = QAOAvectorizedBackendSimulator(
+            qaoa_descriptor, prepend_state=None, append_state=None, init_hadamard=True
+        )
+        backend_vectorized.assign_angles(variational_params_ext)
+
+        # only the first layer rotates every term by the same angle
+        fused_angles = backend_vectorized._fused_cost_layer_angles()
+        assert list(fused_angles.keys()) == [0]
+        assert np.isclose(fused_angles[0], 0.5)
+
+    def test_expectation_batch(self):
+        """
+        Checks that the batched expectation values agree with evaluating
+        each parameter set on its own, for standard and extended parameters,
+        with and without an appended state.
+        """
+
+        n_qubits = 4
+        terms = [[0, 1], [1, 2], [0, 3], [2], [1]]
+        weights = [1, 1.1, 1.5, 2, -0.8]
+        cost_hamil = Hamiltonian.classical_hamiltonian(terms, weights, constant=0.8)
+        mixer_hamil = X_mixer_hamiltonian(n_qubits)
+        qaoa_descriptor = QAOADescriptor(cost_hamil, mixer_hamil, p=2)
+
+        append_state = np.linalg.qr(
+            np.random.rand(2**n_qubits, 2**n_qubits)
+            + 1j * np.random.rand(2**n_qubits, 2**n_qubits)
+        )[0]
+
+        for param_type in ["standard", "extended"]:
+            for each_append_state in [None, append_state]:
+                variational_params = create_qaoa_variational_params(
+                    qaoa_descriptor, param_type, "rand"
+                )
+                backend_vectorized = QAOAvectorizedBackendSimulator(
+                    qaoa_descriptor,
+                    prepend_state=None,
+                    append_state=each_append_state,
+                    init_hadamard=True,
+                )
+
+                original_raw = variational_params.raw()
+                params_array = np.random.rand(5, len(original_raw)) * np.pi
+
+                exp_vals = backend_vectorized.expectation_batch(
+                    variational_params, params_array
+                )
+                assert exp_vals.shape == (5,)
+                assert np.allclose(variational_params.raw(), original_raw)
+
+                for each_raw, exp_val in zip(params_array, exp_vals):
+                    variational_params.update_from_raw(each_raw)
+                    assert np.isclose(
+                        backend_vectorized.expectation(variational_params), exp_val
+                    )
+
+    def test_repeated_evaluations_in_place(self):
+        """
+        Checks that the in-place kernels leave the prepended state untouched,
+        that reusing the wavefunction buffers across evaluations, interleaved with
+        calls to ``wavefunction`` and batches, gives identical results, and that the
+        scratch buffer of a batch is not kept.
+        """
+
+        n_qubits = 4
+        terms = [[0, 1], [1, 2], [0, 3], [2], [1]]
+        weights = [1, 1.1, 1.5, 2, -0.8]
+        cost_hamil = Hamiltonian.classical_hamiltonian(terms, weights, constant=0.8)
+        mixer_hamil = X_mixer_hamiltonian(n_qubits)
+        qaoa_descriptor = QAOADescriptor(cost_hamil, mixer_hamil, p=2)
+        variational_params = create_qaoa_variational_params(
+            qaoa_descriptor, "extended", "rand"
+        )
+
+        prepend_state = np.zeros(2**n_qubits)
+        prepend_state[3] = 1
+        append_state = np.linalg.qr(
+            np.random.rand(2**n_qubits, 2**n_qubits)
+            + 1j * np.random.rand(2**n_qubits, 2**n_qubits)
+        )[0]
+
+        backend_vectorized = QAOAvectorizedBackendSimulator(
+            qaoa_descriptor,
+            prepend_state=prepend_state,
+            append_state=append_state,
+            init_hadamard=True,
+        )
+        assert np.allclose(prepend_state, np.eye(2**n_qubits)[3])
+
+        exp_val = backend_vectorized.expectation(variational_params)
+        wavefn = np.array(backend_vectorized.wavefunction(variational_params))
+
+        for _ in range(3):
+            assert backend_vectorized.expectation(variational_params) == exp_val
+            assert np.allclose(
+                backend_vectorized.wavefunction(variational_params), wavefn
+            )
+
+        # a single scratch buffer is kept, the one of a batch is released afterwards
+        params_array = np.tile(variational_params.raw(), (5, 1))
+        assert np.allclose(
+            backend_vectorized.expectation_batch(variational_params, params_array),
+            exp_val,
+        )
+        assert backend_vectorized._scratch.size == 5 * 2**n_qubits
+        assert backend_vectorized.expectation(variational_params) == exp_val
+        assert backend_vectorized._scratch.size == 2**n_qubits
+
+    def test_adjoint_gradient_in_place(self):
+        """
+        Checks that the adjoint gradient allocates its state buffers once per
+        sweep, and not at every gate, with and without threads.
+        """
+
+        n_qubits = 6
+        terms = [[i, (i + 1) % n_qubits] for i in range(n_qubits)] + [[0]]
+        weights = list(np.linspace(-1, 1, len(terms)))
+        cost_hamil = Hamiltonian.classical_hamiltonian(terms, weights, constant=0.2)
+        mixer_hamil = X_mixer_hamiltonian(n_qubits)
+
+        # chunk even the small wavefunctions of the test
+        with patch.object(qaoa_vectorized, "MIN_CHUNKED_SIZE", 0):
+            for n_threads in [1, 2]:
+                n_allocations = []
+                for p in [1, 3]:
+                    qaoa_descriptor = QAOADescriptor(cost_hamil, mixer_hamil, p=p)
+                    variational_params = create_qaoa_variational_params(
+                        qaoa_descriptor, "extended", "rand"
+                    )
+                    backend_vectorized = QAOAvectorizedBackendSimulator(
+                        qaoa_descriptor,
+                        prepend_state=None,
+                        append_state=None,
+                        init_hadamard=True,
+                        n_threads=n_threads,
+                    )
+                    gradient = backend_vectorized.adjoint_gradient(variational_params)
+
+                    with patch.object(
+                        np, "empty", wraps=np.empty
+                    ) as empty, patch.object(
+                        np, "empty_like", wraps=np.empty_like
+                    ) as empty_like:
+                        assert np.allclose(
+                            backend_vectorized.adjoint_gradient(variational_params),
+                            gradient,
+                        )
+                    n_allocations.append(empty.call_count + empty_like.call_count)
+
+                    # the scratch buffer of the wavefunction is left in place
+                    assert (
+                        backend_vectorized._scratch.shape
+                        == backend_vectorized.wavefn.shape
+                    )
+
+                # the same buffers serve all the gates, however many there are
+                assert n_allocations[0] == n_allocations[1] <= 2
+
+    def test_single_precision(self):
+        """
+        Checks that single precision simulations store the wavefunction as
+        complex64 and agree with the double precision results.
+        """
+
+        n_qubits = 8
+        register = range(n_qubits)
+        cost_hamil = Hamiltonian.classical_hamiltonian(
+            [[i, (i + 1) % n_qubits] for i in register] + [[0], [3]],
+            list(np.linspace(-1, 1, n_qubits)) + [0.4, -0.7],
+            constant=1.5,
+        )
+        mixer_hamil = X_mixer_hamiltonian(n_qubits)
+        qaoa_descriptor = QAOADescriptor(cost_hamil, mixer_hamil, p=3)
+        variational_params = create_qaoa_variational_params(
+            qaoa_descriptor, "extended", "rand"
+        )
+
+        backends = {
+            precision: QAOAvectorizedBackendSimulator(
+                qaoa_descriptor,
+                prepend_state=None,
+                append_state=None,
+                init_hadamard=True,
+                precision=precision,
+            )
+            for precision in ["double", "single"]
+        }
+
+        wavefn_single = np.array(backends["single"].wavefunction(variational_params))
+        wavefn_double = np.array(backends["double"].wavefunction(variational_params))
+        assert backends["single"].wavefn.dtype == np.complex64
+        assert backends["single"].ham_op.dtype == np.float32
+        assert np.allclose(wavefn_single, wavefn_double, atol=1e-6)
+
+        assert np.isclose(
+            backends["single"].expectation(variational_params),
+            backends["double"].expectation(variational_params),
+            rtol=0,
+            atol=1e-5,
+        )
+        assert np.allclose(
+            backends["single"].expectation_w_uncertainty(variational_params),
+            backends["double"].expectation_w_uncertainty(variational_params),
+            rtol=0,
+            atol=1e-5,
+        )
+
+        params_array = np.random.rand(4, len(variational_params.raw()))
+        assert np.allclose(
+            backends["single"].expectation_batch(variational_params, params_array),
+            backends["double"].expectation_batch(variational_params, params_array),
+            rtol=0,
+            atol=1e-5,
+        )
+        assert np.allclose(
+            backends["single"].adjoint_gradient(variational_params),
+            backends["double"].adjoint_gradient(variational_params),
+            rtol=0,
+            atol=1e-5,
+        )
+
+        with self.assertRaises(ValueError):
+            QAOAvectorizedBackendSimulator(
+                qaoa_descriptor,
+                prepend_state=None,
+                append_state=None,
+                init_hadamard=True,
+                precision="half",
+            )
+
+    def test_multithreaded_kernels(self):
+        """
+        Checks that splitting the wavefunction in chunks processed by several
+        threads gives the same results as the single threaded simulation.
+        """
+
+        n_qubits = 6
+        register = range(n_qubits)
+        cost_hamil = Hamiltonian.classical_hamiltonian(
+            [[i, (i + 1) % n_qubits] for i in register] + [[1]],
+            list(np.linspace(-1, 1, n_qubits)) + [0.6],
+            constant=0.2,
+        )
+        mixer_hamil = X_mixer_hamiltonian(n_qubits)
+        qaoa_descriptor = QAOADescriptor(cost_hamil, mixer_hamil, p=2)
+
+        # chunk even the small wavefunctions of the test
+        with patch.object(qaoa_vectorized, "MIN_CHUNKED_SIZE", 0):
+            for param_type in ["standard", "extended"]:
+                variational_params = create_qaoa_variational_params(
+                    qaoa_descriptor, param_type, "rand"
+                )
+                backends = [
+                    QAOAvectorizedBackendSimulator(
+                        qaoa_descriptor,
+                        prepend_state=None,
+                        append_state=None,
+                        init_hadamard=True,
+                        n_threads=n_threads,
+                    )
+                    for n_threads in [1, 3, 4]
+                ]
+
+                wavefns = [
+                    backend.wavefunction(variational_params) for backend in backends
+                ]
+                exp_vals = [
+                    backend.expectation_w_uncertainty(variational_params)
+                    for backend in backends
+                ]
+                params_array = np.random.rand(3, len(variational_params.raw()))
+                exp_vals_batch = [
+                    backend.expectation_batch(variational_params, params_array)
+                    for backend in backends
+                ]
+
+                for i in range(1, len(backends)):
+                    assert np.allclose(wavefns[0], wavefns[i])
+                    assert np.allclose(exp_vals[0], exp_vals[i])
+                    assert np.allclose(exp_vals_batch[0], exp_vals_batch[i])
+
+        with self.assertRaises(ValueError):
+            QAOAvectorizedBackendSimulator(
+                qaoa_descriptor,
+                prepend_state=None,
+                append_state=None,
+                init_hadamard=True,
+                n_threads=0,
+            )
+
+    def test_memmap_simulator(self):
+        """
+        Checks that the out-of-core simulator, processing small blocks of the
+        memory-mapped wavefunction, matches the in-memory simulator, and that
+        its files are removed together with it.
+        """
+
+        n_qubits = 6
+        register = range(n_qubits)
+        cost_hamil = Hamiltonian.classical_hamiltonian(
+            [[i, (i + 1) % n_qubits] for i in register] + [[1]],
+            list(np.linspace(-1, 1, n_qubits)) + [0.6],
+            constant=0.2,
+        )
+        mixer_hamil = X_mixer_hamiltonian(n_qubits)
+        qaoa_descriptor = QAOADescriptor(cost_hamil, mixer_hamil, p=2)
+        prepend_state = np.random.rand(2**n_qubits) + 1j * np.random.rand(
+            2**n_qubits
+        )
+        prepend_state /= np.linalg.norm(prepend_state)
+
+        with tempfile.TemporaryDirectory() as memmap_dir:
+            for param_type in ["standard", "extended"]:
+                variational_params = create_qaoa_variational_params(
+                    qaoa_descriptor, param_type, "rand"
+                )
+                for state, init_hadamard in [
+                    (None, True),
+                    (None, False),
+                    (prepend_state, True),
+                ]:
+                    backend = QAOAvectorizedBackendSimulator(
+                        qaoa_descriptor,
+                        prepend_state=state,
+                        append_state=None,
+                        init_hadamard=init_hadamard,
+                    )
+                    backend_memmap = QAOAvectorizedMemmapBackendSimulator(
+                        qaoa_descriptor,
+                        prepend_state=state,
+                        append_state=None,
+                        init_hadamard=init_hadamard,
+                        memmap_dir=memmap_dir,
+                        block_qubits=2,
+                    )
+
+                    assert isinstance(backend_memmap.wavefn, np.memmap)
+                    assert np.allclose(backend.ham_op, backend_memmap.ham_op)
+                    assert np.allclose(
+                        backend.wavefunction(variational_params),
+                        backend_memmap.wavefunction(variational_params),
+                    )
+                    assert np.allclose(
+                        backend.expectation(variational_params),
+                        backend_memmap.expectation(variational_params),
+                    )
+                    params_array = np.random.rand(2, len(variational_params.raw()))
+                    assert np.allclose(
+                        backend.expectation_batch(variational_params, params_array),
+                        backend_memmap.expectation_batch(
+                            variational_params, params_array
+                        ),
+                    )
+
+                    files_dir = backend_memmap.memmap_dir
+                    assert os.path.dirname(files_dir) == memmap_dir
+                    del backend_memmap
+                    assert not os.path.exists(files_dir)
+
+        with self.assertRaises(ValueError):
+            QAOAvectorizedMemmapBackendSimulator(
+                qaoa_descriptor,
+                prepend_state=None,
+                append_state=np.eye(2**n_qubits),
+                init_hadamard=True,
+            )
+
+    def test_z2_symmetric_folding(self):
+        """
+        Checks that problems without single-qubit terms are simulated on half of
+        the amplitudes, giving the same results as the simulation of the full
+        wavefunction, which is forced by prepending the uniform superposition.
+        """
+
+        n_qubits = 6
+        register = range(n_qubits)
+        cost_hamil = Hamiltonian.classical_hamiltonian(
+            [[i, (i + 1) % n_qubits] for i in register] + [[0, 3]],
+            list(np.linspace(-1, 1, n_qubits)) + [0.6],
+            constant=0.2,
+        )
+        mixer_hamil = X_mixer_hamiltonian(n_qubits)
+        qaoa_descriptor = QAOADescriptor(cost_hamil, mixer_hamil, p=2)
+        uniform_state = np.full(2**n_qubits, 2 ** (-n_qubits / 2), dtype=complex)
+
+        backend_full = QAOAvectorizedBackendSimulator(
+            qaoa_descriptor,
+            prepend_state=uniform_state,
+            append_state=None,
+            init_hadamard=False,
+        )
+        assert not backend_full.z2_symmetric
+
+        # chunk even the small wavefunctions of the test
+        with patch.object(qaoa_vectorized, "MIN_CHUNKED_SIZE", 0):
+            for n_threads in [1, 4]:
+                backend = QAOAvectorizedBackendSimulator(
+                    qaoa_descriptor,
+                    prepend_state=None,
+                    append_state=None,
+                    init_hadamard=True,
+                    n_threads=n_threads,
+                )
+                assert backend.z2_symmetric
+                assert backend.ham_op.shape == (2,) * (n_qubits - 1)
+
+                for param_type in ["standard", "extended"]:
+                    variational_params = create_qaoa_variational_params(
+                        qaoa_descriptor, param_type, "rand"
+                    )
+
+                    assert np.allclose(
+                        backend.wavefunction(variational_params),
+                        backend_full.wavefunction(variational_params),
+                    )
+                    assert backend.wavefn.size == 2 ** (n_qubits - 1)
+                    assert np.allclose(
+                        backend.probabilities(variational_params),
+                        backend_full.probabilities(variational_params),
+                    )
+                    assert np.allclose(
+                        backend.expectation_w_uncertainty(variational_params),
+                        backend_full.expectation_w_uncertainty(variational_params),
+                    )
+                    # the measurement outcomes are kept folded until read
+                    assert isinstance(backend.measurement_outcomes, FoldedStatevector)
+                    assert backend.measurement_outcomes.amplitudes.size == 2 ** (
+                        n_qubits - 1
+                    )
+                    assert np.allclose(
+                        np.asarray(backend.measurement_outcomes),
+                        backend_full.measurement_outcomes,
+                    )
+                    assert np.allclose(
+                        backend.adjoint_gradient(variational_params),
+                        backend_full.adjoint_gradient(variational_params),
+                    )
+                    params_array = np.random.rand(3, len(variational_params.raw()))
+                    assert np.allclose(
+                        backend.expectation_batch(variational_params, params_array),
+                        backend_full.expectation_batch(
+                            variational_params, params_array
+                        ),
+                    )
+
+        # a single-qubit term breaks the symmetry
+        biased_hamil = Hamiltonian.classical_hamiltonian(
+            [[0, 1], [1, 2], [2]], [1, 1, 0.5], constant=0
+        )
+        biased_descriptor = QAOADescriptor(biased_hamil, X_mixer_hamiltonian(3), p=1)
+        backend_biased = QAOAvectorizedBackendSimulator(
+            biased_descriptor, prepend_state=None, append_state=None, init_hadamard=True
+        )
+        assert not backend_biased.z2_symmetric
+
     ##########################################################
     # TESTS OF APPLY GATE METHODS
     ##########################################################
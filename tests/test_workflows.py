@@ -23,7 +23,7 @@ from openqaoa.algorithms.workflow_properties import (
 )
 from openqaoa.algorithms.rqaoa.rqaoa_workflow_properties import RqaoaParameters
 from openqaoa.backends import create_device, DeviceLocal
-from openqaoa.backends.cost_function import cost_function
+from openqaoa.backends.cost_function import cost_statistics
 
 # from openqaoa.backends.devices_core import SUPPORTED_LOCAL_SIMULATORS
 from openqaoa.qaoa_components import (
@@ -44,6 +44,7 @@ from openqaoa.optimizers.training_vqa import (
     ScipyOptimizer,
     CustomScipyGradientOptimizer,
     PennyLaneOptimizer,
+    PopulationOptimizer,
 )
 from openqaoa_pyquil.backends import DevicePyquil
 from openqaoa_pyquil.backends import QAOAPyQuilWavefunctionSimulatorBackend
@@ -748,6 +749,13 @@ class TestingVanillaQAOA(unittest.TestCase):
             )
             self.assertEqual(isinstance(q.optimizer, PennyLaneOptimizer), True)
 
+        for each_method in available_optimizers()["population"]:
+            q = QAOA()
+            q.set_classical_optimizer(method=each_method)
+            q.compile(problem=qubo_problem)
+
+            self.assertEqual(isinstance(q.optimizer, PopulationOptimizer), True)
+
     def test_set_header(self):
         """
         Test the test_set_header method of the QAOA class. Step by step it is checked that the header is set correctly.
@@ -1143,6 +1151,14 @@ class TestingVanillaQAOA(unittest.TestCase):
             "active_reset",
             "rewiring",
             "disable_qubit_rewiring",
+            "precision",
+            "n_threads",
+            "memmap_dir",
+            "block_qubits",
+            "max_cone_qubits",
+            "max_bond_dim",
+            "truncation_error",
+            "hamming_weight",
             "classical_optimizer",
             "optimize",
             "method",
@@ -1160,6 +1176,9 @@ class TestingVanillaQAOA(unittest.TestCase):
             "optimization_progress",
             "cost_progress",
             "save_intermediate",
+            "cache_evaluations",
+            "cache_options",
+            "n_workers",
             "circuit_properties",
             "qubit_register",
             "q",
@@ -1521,17 +1540,12 @@ class TestingVanillaQAOA(unittest.TestCase):
             abs(result["uncertainty"]) > 0
         ), "When using a shot-based simulator, `evaluate_circuit` should return an uncertanty"
 
-        cost = cost_function(
+        cost, variance = cost_statistics(
             result["measurement_results"],
             q.backend.qaoa_descriptor.cost_hamiltonian,
             q.backend.cvar_alpha,
         )
-        cost_sq = cost_function(
-            result["measurement_results"],
-            q.backend.qaoa_descriptor.cost_hamiltonian.hamiltonian_squared,
-            q.backend.cvar_alpha,
-        )
-        uncertainty = np.sqrt(cost_sq - cost**2)
+        uncertainty = np.sqrt(variance)
         assert (
             np.round(cost, 12) == result["cost"]
         ), "When using a shot-based simulator, `evaluate_circuit` not returning the correct cost"
@@ -2284,6 +2298,14 @@ class TestingRQAOA(unittest.TestCase):
             "active_reset",
             "rewiring",
             "disable_qubit_rewiring",
+            "precision",
+            "n_threads",
+            "memmap_dir",
+            "block_qubits",
+            "max_cone_qubits",
+            "max_bond_dim",
+            "truncation_error",
+            "hamming_weight",
             "classical_optimizer",
             "optimize",
             "method",
@@ -2301,6 +2323,9 @@ class TestingRQAOA(unittest.TestCase):
             "optimization_progress",
             "cost_progress",
             "save_intermediate",
+            "cache_evaluations",
+            "cache_options",
+            "n_workers",
             "circuit_properties",
             "qubit_register",
             "q",